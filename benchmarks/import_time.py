@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the time taken to import each public GWpy sub-package
+
+Each sub-package is imported in a fresh interpreter using
+``python -X importtime`` (Python >= 3.7), reporting the total cumulative
+import time, and the slowest modules imported along the way.
+For older versions of Python only the total wall-clock time is reported.
+
+Results can be written to a JSON file with ``--output``, and compared
+against a previous run with ``--baseline``, e.g.::
+
+    python benchmarks/import_time.py --output before.json
+    # make changes
+    python benchmarks/import_time.py --baseline before.json
+"""
+
+from __future__ import (division, print_function)
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+
+SUBPACKAGES = [
+    'gwpy.astro',
+    'gwpy.cli',
+    'gwpy.detector',
+    'gwpy.frequencyseries',
+    'gwpy.io',
+    'gwpy.plotter',
+    'gwpy.segments',
+    'gwpy.signal',
+    'gwpy.spectrogram',
+    'gwpy.table',
+    'gwpy.time',
+    'gwpy.timeseries',
+    'gwpy.types',
+]
+
+IMPORTTIME = sys.version_info >= (3, 7)
+
+# import time:   self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(
+    r'\Aimport time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|'
+    r'(?P<indent>\s+)(?P<name>\S+)\Z')
+
+WALLTIME_SCRIPT = ('import time; t = time.time(); import {0}; '
+                   'print(int((time.time() - t) * 1e6))')
+
+
+def _run(args):
+    env = os.environ.copy()
+    env.setdefault('MPLBACKEND', 'agg')
+    proc = subprocess.Popen([sys.executable] + args, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise RuntimeError('%s failed:\n%s' % (' '.join(args),
+                                               err.decode('utf-8')))
+    return out.decode('utf-8'), err.decode('utf-8')
+
+
+def parse_importtime(output):
+    """Parse the output of ``python -X importtime``
+
+    Returns
+    -------
+    modules : `list` of `tuple`
+        a ``(name, self, cumulative)`` tuple for each imported module,
+        times are in microseconds
+    """
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules.append((match.group('name'), int(match.group('self')),
+                            int(match.group('cumulative'))))
+    return modules
+
+
+def measure(name, repeat=3):
+    """Measure the time taken to import a module in a fresh interpreter
+
+    Parameters
+    ----------
+    name : `str`
+        the name of the module to import
+
+    repeat : `int`, optional
+        the number of times to import the module, the fastest is kept
+
+    Returns
+    -------
+    total : `int`
+        the import time (microseconds)
+
+    modules : `list` of `tuple`
+        the ``(name, self, cumulative)`` times for each module imported
+        (empty unless ``-X importtime`` is supported)
+    """
+    best = None
+    for _ in range(repeat):
+        if IMPORTTIME:
+            modules = parse_importtime(
+                _run(['-X', 'importtime', '-c', 'import %s' % name])[1])
+            total = modules[-1][2]
+        else:
+            modules = []
+            total = int(_run(['-c', WALLTIME_SCRIPT.format(name)])[0])
+        if best is None or total < best[0]:
+            best = (total, modules)
+    return best
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.
+                                     RawDescriptionHelpFormatter)
+    parser.add_argument('module', nargs='*', default=SUBPACKAGES,
+                        help='modules to import, default: %(default)s')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of imports for each module, the '
+                             'fastest is reported, default: %(default)s')
+    parser.add_argument('-t', '--top', type=int, default=5,
+                        help='number of slowest modules to report for each '
+                             'import, default: %(default)s')
+    parser.add_argument('-o', '--output',
+                        help='path of JSON file in which to write results')
+    parser.add_argument('-b', '--baseline',
+                        help='path of JSON file of results to compare with')
+    return parser
+
+
+def main(args=None):
+    args = create_parser().parse_args(args)
+    if args.baseline:
+        with open(args.baseline, 'r') as fobj:
+            baseline = json.load(fobj)
+    else:
+        baseline = {}
+
+    results = {}
+    for name in args.module:
+        total, modules = measure(name, repeat=args.repeat)
+        results[name] = total
+        line = '%-24s %8.1f ms' % (name, total / 1e3)
+        if name in baseline:
+            line += '  (baseline %8.1f ms, %+6.1f%%)' % (
+                baseline[name] / 1e3, (total / baseline[name] - 1) * 100)
+        print(line)
+        for mod, self_, _ in sorted(modules, key=lambda x: -x[1])[:args.top]:
+            print('    %-40s %8.1f ms' % (mod, self_ / 1e3))
+
+    if args.output:
+        with open(args.output, 'w') as fobj:
+            json.dump(results, fobj, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
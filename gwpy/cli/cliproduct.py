@@ -38,11 +38,56 @@ import sys
 import re
 
 from argparse import ArgumentError
+from threading import Thread
 
-from ..timeseries import TimeSeries
+from six.moves.queue import Queue
 
 __author__ = 'Joseph Areeda <joseph.areeda@ligo.org>'
 
+#: maximum number of start times for which to get data concurrently
+MAX_FETCH_THREADS = 8
+
+
+class _GetDataThread(Thread):
+    """Worker thread to get data for all channels at one start time
+
+    Processes ``(index, start)`` pairs from the input queue until it
+    receives `None`, putting ``(index, result)`` onto the output queue,
+    where ``result`` is a `~gwpy.timeseries.TimeSeriesDict`, or the
+    exception raised.
+    """
+    def __init__(self, inqueue, outqueue, channels, duration,
+                 framecache=None, **kwargs):
+        Thread.__init__(self)
+        self.in_ = inqueue
+        self.out = outqueue
+        self.channels = channels
+        self.duration = duration
+        self.framecache = framecache
+        self.kwargs = kwargs
+
+    def run(self):
+        from ..timeseries import TimeSeriesDict
+        while True:
+            item = self.in_.get()
+            if item is None:
+                self.in_.task_done()
+                break
+            i, start = item
+            end = start + self.duration
+            try:
+                if self.framecache:
+                    result = TimeSeriesDict.read(self.framecache,
+                                                 self.channels,
+                                                 start=start, end=end)
+                else:
+                    result = TimeSeriesDict.fetch(self.channels, start, end,
+                                                  **self.kwargs)
+            except Exception as exc:  # pylint: disable=broad-except
+                result = exc
+            self.out.put((i, result))
+            self.in_.task_done()
+
 
 class CliProduct(object):
     """Base class for all cli plot products
@@ -379,7 +424,6 @@ class CliProduct(object):
         """Verify and interpret arguments to get all
         TimeSeries objects defined
         """
-
         # retrieve channel data from NDS as a TimeSeries
         for chans in arg_list.chan:
             for chan in chans:
@@ -432,24 +476,35 @@ class CliProduct(object):
         if arg_list.lowpass:
             lowpass = float(arg_list.lowpass)
 
-        # Get the data from NDS or Frames
-        # time_groups is a list of timeseries index grouped by
-        # start time for coherence like plots
-        self.time_groups = []
+        # Get the data from NDS or Frames, all channels for each start
+        # time in a single request, with requests for different start
+        # times made concurrently
         for start in self.start_list:
-            time_group = []
+            self.log(2, 'Fetching %s %d, %d using %s'
+                     % (', '.join(self.chan_list), start, self.dur, source))
+        inq = Queue()
+        outq = Queue()
+        for i, start in enumerate(self.start_list):
+            inq.put((i, start))
+        for i in range(min(MAX_FETCH_THREADS, len(self.start_list))):
+            inq.put(None)
+            thread = _GetDataThread(inq, outq, self.chan_list, self.dur,
+                                    framecache=frame_cache, verbose=verb,
+                                    host=arg_list.nds2_server)
+            thread.setDaemon(True)
+            thread.start()
+
+        # filter each group of data as it arrives
+        groups = [None] * len(self.start_list)
+        for count in range(1, len(self.start_list) + 1):
+            i, result = outq.get()
+            if isinstance(result, Exception):
+                raise result
+            self.log(2, 'Received data for %d (%d/%d)'
+                     % (self.start_list[i], count, len(self.start_list)))
+            group = []
             for chan in self.chan_list:
-                if verb:
-                    print('Fetching %s %d, %d using %s'
-                          % (chan, start, self.dur, source))
-                if frame_cache:
-                    data = TimeSeries.read(frame_cache, chan, start=start,
-                                           end=start+self.dur)
-                else:
-                    data = TimeSeries.fetch(chan, start, start+self.dur,
-                                            verbose=verb,
-                                            host=arg_list.nds2_server)
-
+                data = result[chan]
                 if highpass > 0 and lowpass == 0:
                     data = data.highpass(highpass)
                     self.filter += "high pass (%.1f) " % highpass
@@ -459,6 +514,15 @@ class CliProduct(object):
                 elif lowpass > 0 and highpass > 0:
                     data = data.bandpass(highpass, lowpass)
                     self.filter = "band pass (%.1f-%.1f)" % (highpass, lowpass)
+                group.append(data)
+            groups[i] = group
+
+        # time_groups is a list of timeseries index grouped by
+        # start time for coherence like plots
+        self.time_groups = []
+        for group in groups:
+            time_group = []
+            for data in group:
                 self.timeseries.append(data)
                 time_group.append(len(self.timeseries)-1)
             self.time_groups.append(time_group)
@@ -22,8 +22,6 @@
 """Coherence plots
 """
 
-from numpy import percentile
-
 from .cliproduct import CliProduct
 
 __author__ = 'Joseph Areeda <joseph.areeda@ligo.org>'
@@ -94,6 +92,8 @@ class Coherencegram(CliProduct):
         """
         self.is_freq_plot = True
 
+        from numpy import percentile
+
         secpfft = 0.5
         if arg_list.secpfft:
             secpfft = float(arg_list.secpfft)
@@ -121,8 +121,8 @@ class Coherencegram(CliProduct):
         self.fmin = 1 / secpfft
 
         # default time axis
-        self.xmin = self.timeseries[0].times.value.min()
-        self.xmax = self.timeseries[0].times.value.max()
+        self.xmin = self.timeseries[0].times.min().value
+        self.xmax = self.timeseries[0].times.max().value
 
         # set intensity (color) limits
         if arg_list.imin:
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Long-running server for `gwpy-plot`
+
+Most of the run time of a single `gwpy-plot` call is spent importing
+numpy, astropy, matplotlib, and GWpy itself.
+The server started by `serve` imports all of these once, then listens on
+a Unix socket for requests from `run_client`.
+Each request is handled by a child process forked from the server, so
+it starts with everything already imported, and any changes it makes
+(to `matplotlib.rcParams`, for example) do not affect later requests.
+"""
+
+from __future__ import print_function
+
+import errno
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import tempfile
+import traceback
+from importlib import import_module
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+
+#: name of environment variable giving the path of the server socket
+SOCKET_ENV = 'GWPY_PLOT_SOCKET'
+
+#: modules imported by the server before accepting requests
+PRELOAD = [
+    'matplotlib.pyplot',
+    'astropy.time',
+    'gwpy.timeseries',
+    'gwpy.frequencyseries',
+    'gwpy.spectrogram',
+    'gwpy.plotter',
+    'gwpy.plotter.tex',
+]
+
+#: optional modules imported by the server, if available
+PRELOAD_OPTIONAL = [
+    'nds2',
+    'lal',
+    'lalframe',
+]
+
+#: marks the end of the output for a request, followed by the exit code
+SENTINEL = b'\0'
+
+
+def default_socket():
+    """Returns the default path of the server socket
+
+    This is the value of the ``GWPY_PLOT_SOCKET`` environment variable,
+    if set, otherwise a file in the per-user ``XDG_RUNTIME_DIR``, or
+    (if that isn't set) a per-user file in the temporary directory.
+    """
+    try:
+        return os.environ[SOCKET_ENV]
+    except KeyError:
+        pass
+    rundir = os.environ.get('XDG_RUNTIME_DIR')
+    if rundir and os.path.isdir(rundir):
+        return os.path.join(rundir, 'gwpy-plot.sock')
+    return os.path.join(tempfile.gettempdir(),
+                        'gwpy-plot-%d.sock' % os.getuid())
+
+
+def check_socket(path):
+    """Check that a server socket is safe to send requests to
+
+    The socket must be owned by the current user, and only accessible by
+    that user (mode ``0600``), as created by `serve`, otherwise
+    another user could be listening for the environment sent by
+    `run_client`.
+
+    Parameters
+    ----------
+    path : `str`
+        the path of the server socket
+
+    Raises
+    ------
+    socket.error
+        if ``path`` is not a socket owned by, and only accessible to,
+        the current user
+    """
+    try:
+        info = os.stat(path)
+    except OSError as exc:
+        raise socket.error(exc.errno, exc.strerror)
+    if (not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid() or
+            stat.S_IMODE(info.st_mode) != 0o600):
+        raise socket.error(errno.EPERM,
+                           "refusing to use gwpy-plot server socket %s, "
+                           "it must be owned by the current user with "
+                           "mode 0600" % path)
+
+
+def preload():
+    """Import the modules needed to make plots
+
+    Returns
+    -------
+    modules : `list` of `str`
+        the names of the modules imported
+    """
+    import matplotlib
+    matplotlib.use('agg')
+    loaded = []
+    for name in PRELOAD:
+        import_module(name)
+        loaded.append(name)
+    for name in PRELOAD_OPTIONAL:
+        try:
+            import_module(name)
+        except ImportError:
+            continue
+        loaded.append(name)
+    return loaded
+
+
+# -- server -------------------------------------------------------------------
+
+def serve(path=None, verbose=False):
+    """Run the `gwpy-plot` server until interrupted
+
+    Parameters
+    ----------
+    path : `str`, optional
+        the path of the Unix socket on which to listen, defaults to
+        `default_socket`
+
+    verbose : `bool`, optional
+        print a message for each request, default: `False`
+    """
+    if path is None:
+        path = default_socket()
+    modules = preload()
+
+    # remove socket left by an old server, but not one still in use
+    if os.path.exists(path):
+        try:
+            _connect(path).close()
+        except socket.error:
+            os.remove(path)
+        else:
+            raise RuntimeError("gwpy-plot server already running on %s"
+                               % path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)  # only this user can connect
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen(16)
+    # child processes are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    if verbose:
+        print('gwpy-plot server listening on %s (preloaded: %s)'
+              % (path, ', '.join(modules)))
+        sys.stdout.flush()
+
+    try:
+        while True:
+            try:
+                conn = server.accept()[0]
+            except socket.error as exc:
+                if exc.args[0] == errno.EINTR:
+                    continue
+                raise
+            pid = os.fork()
+            if pid == 0:  # child
+                # restore default, so the request can wait for its own
+                # subprocesses
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                server.close()
+                _run_child(conn)
+            conn.close()
+            if verbose:
+                print('Forked request handler %d' % pid)
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(path)
+
+
+def _run_child(conn):
+    """Handle a single request in a forked child process, then exit
+    """
+    try:
+        handle(conn)
+    except Exception:  # pylint: disable=broad-except
+        traceback.print_exc()
+    finally:
+        os._exit(0)  # pylint: disable=protected-access
+
+
+def handle(conn):
+    """Handle a single request from `run_client`
+
+    The request is a single line of JSON giving the ``argv``, ``cwd``,
+    and ``env`` of the client.
+    All output is written to the connection, followed by `SENTINEL` and
+    the exit code.
+
+    Parameters
+    ----------
+    conn : `socket.socket`
+        the connection to the client
+
+    Returns
+    -------
+    code : `int`
+        the exit code of the request
+    """
+    from .gwpy_plot import main
+
+    fobj = conn.makefile('rb')
+    request = json.loads(fobj.readline().decode('utf-8'))
+    fobj.close()
+
+    # run as the client would
+    os.environ.clear()
+    os.environ.update(request.get('env', {}))
+    os.chdir(request.get('cwd', os.getcwd()))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for fileno, name in ((1, 'stdout'), (2, 'stderr')):
+        os.dup2(conn.fileno(), fileno)
+        setattr(sys, name, os.fdopen(fileno, 'w'))
+
+    try:
+        code = _exit_code(main(request['argv'])[0])
+    except SystemExit as exc:
+        code = _exit_code(exc.code)
+    except Exception:  # pylint: disable=broad-except
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.sendall(SENTINEL + ('%d\n' % code).encode('utf-8'))
+    conn.close()
+    return code
+
+
+def _exit_code(code):
+    """Convert a result, or the argument of `SystemExit`, to an exit code
+    """
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+# -- client -------------------------------------------------------------------
+
+def _connect(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error:
+        sock.close()
+        raise
+    return sock
+
+
+def run_client(argv, path=None, stdout=None):
+    """Run `gwpy-plot` with the given arguments on a server
+
+    Parameters
+    ----------
+    argv : `list` of `str`
+        the command-line arguments for `gwpy-plot`
+
+    path : `str`, optional
+        the path of the server socket, defaults to `default_socket`
+
+    stdout : `file`, optional
+        the (binary) file to which to write the output,
+        defaults to `sys.stdout`
+
+    Returns
+    -------
+    code : `int`
+        the exit code of the request, or ``1`` if the server did not
+        report one
+
+    Raises
+    ------
+    socket.error
+        if no server is listening on ``path``, or the socket fails
+        `check_socket`
+    """
+    if path is None:
+        path = default_socket()
+    if stdout is None:
+        stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+    check_socket(path)
+    sock = _connect(path)
+    try:
+        request = json.dumps({
+            'argv': list(argv),
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+        })
+        sock.sendall(request.encode('utf-8') + b'\n')
+        tail = None
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            if tail is not None:
+                tail += chunk
+                continue
+            idx = chunk.find(SENTINEL)
+            if idx == -1:
+                stdout.write(chunk)
+            else:
+                stdout.write(chunk[:idx])
+                tail = chunk[idx+1:]
+            stdout.flush()
+    finally:
+        sock.close()
+    try:
+        return int(tail.strip())
+    except (AttributeError, ValueError):
+        return 1
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Joseph Areeda (2015)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Command line interface to GWpy plotting functions
+"""
+
+import argparse
+import os
+from importlib import import_module
+
+__author__ = 'Joseph Areeda <joseph.areeda@ligo.org>'
+
+# Products are classes that implement a specific plot
+# This is a list of those class names, module names
+PRODUCTS = [
+    'TimeSeries',
+    'Coherence',
+    'Spectrum',
+    'Spectrogram',
+    'Coherencegram'
+]
+
+
+# ---needed to generate help messages---
+class CliHelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('indent_increment', 4)
+        super(CliHelpFormatter, self).__init__(*args, **kwargs)
+
+
+def create_parser():
+    """Create the argument parser for `gwpy-plot`
+
+    The product modules only import their (heavy) dependencies when a
+    plot is actually made, so building the parser is cheap.
+
+    Returns
+    -------
+    parser : `argparse.ArgumentParser`
+        the command-line parser
+
+    actions : `dict`
+        the `~gwpy.cli.cliproduct.CliProduct` for each action name
+    """
+    parser = argparse.ArgumentParser(formatter_class=CliHelpFormatter,
+                                     description=__doc__, prog='gwpy-plot')
+    # Setup the argument parser to act as the parent
+    parentparser = argparse.ArgumentParser(add_help=False)
+
+    # These arguments apply to all commands
+    parentparser.add_argument('-v', '--verbose', action='count', default=1,
+                              help='increase verbose output')
+    parentparser.add_argument('-s', '--silent', default=False,
+                              help='show only fatal errors')
+
+    # subparsers are dependent on which action is chosen
+    subparsers = parser.add_subparsers(
+        dest='mode', title='Actions',
+        description='Select one of the following actions:')
+
+    # Add the subparsers for each plot product
+    actions = dict()
+    for product in PRODUCTS:
+        mod = import_module('gwpy.cli.%s' % product.lower())
+        prod = getattr(mod, product)()
+
+        # the action is the command line argument for which class to call
+        action = prod.get_action()
+        subparser = subparsers.add_parser(action, help=prod.__doc__,
+                                          parents=[parentparser])
+        # the operation is the name of the action
+        subparser.set_defaults(func=action)
+        prod.init_cli(subparser)
+        actions[action] = prod
+    return parser, actions
+
+
+def main(args=None):
+    """Run `gwpy-plot`
+
+    Parameters
+    ----------
+    args : `list` of `str`, optional
+        the command-line arguments, defaults to `sys.argv`
+
+    Returns
+    -------
+    code : `int`
+        the exit code for the process
+
+    product : `~gwpy.cli.cliproduct.CliProduct`
+        the product used to make the plot
+    """
+    # if we're launched with minimum or no environment
+    # variables make some guesses
+    if len(os.getenv('HOME', '')) == 0:
+        os.environ['HOME'] = '/tmp/'
+    # if launched from a terminal with no display
+    if len(os.getenv('DISPLAY', '')) == 0:
+        import matplotlib
+        if matplotlib.get_backend().lower() != 'agg':
+            matplotlib.use('Agg')
+
+    # parse the command line
+    parser, actions = create_parser()
+    args = parser.parse_args(args)
+    if not args.mode:
+        raise RuntimeError("Must specify action. "
+                           "Please try again with --help.")
+    prod = actions[args.func]
+    prod.log(2, ('%s called' % args.func))
+
+    # apply custom styling
+    if args.style:
+        from matplotlib import pyplot
+        pyplot.style.use(args.style)
+
+    # generate the plot
+    return prod.makePlot(args), prod
@@ -128,8 +128,8 @@ class Spectrogram(CliProduct):
         self.fmin = 1 / secpfft
 
         # default time axis
-        self.xmin = self.timeseries[0].times.value.min()
-        self.xmax = self.timeseries[0].times.value.max()
+        self.xmin = self.timeseries[0].times.min().value
+        self.xmax = self.timeseries[0].times.max().value
 
         # set intensity (color) limits
         if arg_list.imin:
@@ -70,8 +70,8 @@ class TimeSeries(CliProduct):
             self.plot = self.timeseries[0].plot(linestyle='None', marker='.')
         self.ymin = self.timeseries[0].min().value
         self.ymax = self.timeseries[0].max().value
-        self.xmin = self.timeseries[0].times.value.min()
-        self.xmax = self.timeseries[0].times.value.max()
+        self.xmin = self.timeseries[0].times.min().value
+        self.xmax = self.timeseries[0].times.max().value
 
         if len(self.timeseries) > 1:
             for idx in range(1, len(self.timeseries)):
@@ -85,9 +85,9 @@ class TimeSeries(CliProduct):
                 self.ymin = min(self.ymin, self.timeseries[idx].min().value)
                 self.ymax = max(self.ymax, self.timeseries[idx].max().value)
                 self.xmin = min(self.xmin,
-                                self.timeseries[idx].times.value.min())
+                                self.timeseries[idx].times.min().value)
                 self.xmax = max(self.xmax,
-                                self.timeseries[idx].times.value.max())
+                                self.timeseries[idx].times.max().value)
         # if they chose to set the range of the x-axis find the range of y
         strt = self.xmin
         stop = self.xmax
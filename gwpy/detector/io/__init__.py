@@ -19,10 +19,16 @@
 """Input/Output routines for Channel and ChannelList
 """
 
-from . import (  # pylint: disable=unused-import
-    cis,  # querying Channel Information System (cis.ligo.org)
-    clf,  # LIGO Channel List File (clf) format
-    omega,  # Omega pipeline scan configurations
-)
+from ...io import registry as io_registry
+
+from ..channel import ChannelList
+
+# build the read/write docstrings once, not once per format
+with io_registry.delay_doc_updates(ChannelList):
+    from . import (  # pylint: disable=unused-import
+        cis,  # querying Channel Information System (cis.ligo.org)
+        clf,  # LIGO Channel List File (clf) format
+        omega,  # Omega pipeline scan configurations
+    )
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
@@ -23,15 +23,17 @@ import warnings
 from copy import deepcopy
 
 from numpy import fft as npfft
-from scipy import signal
 
 from astropy import units
 from astropy.io import registry as io_registry
 
 from ..types import Series
 from ..detector import Channel
+from ..utils.lazy import LazyModule
 
 
+signal = LazyModule('scipy.signal')
+
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org"
 
 __all__ = ['FrequencySeries']
@@ -19,9 +19,15 @@
 """Input/Output routines for gwpy.frequencyseries
 """
 
-from . import (  # pylint: disable=unused-import
-    ascii,
-    hdf5,
-)
+from ...io import registry as io_registry
+
+from .. import (FrequencySeries, SpectralVariance)
+
+# build the read/write docstrings once, not once per format
+with io_registry.delay_doc_updates(FrequencySeries, SpectralVariance):
+    from . import (  # pylint: disable=unused-import
+        ascii,
+        hdf5,
+    )
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
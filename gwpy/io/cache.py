@@ -22,6 +22,7 @@
 from __future__ import division
 
 import os.path
+import sys
 from math import ceil
 from multiprocessing import (cpu_count, Process, Queue as ProcessQueue)
 from six import string_types
@@ -34,19 +35,13 @@ from six import string_types
 from numpy import recarray
 from numpy.lib import recfunctions
 
-try:
-    from glue.lal import Cache
-except ImportError:  # no lal
-    HAS_CACHE = False
-else:
-    HAS_CACHE = True
-    from lal.utils import CacheEntry
-    Cache.entry_class = CacheEntry
-
-from astropy.table import (Table, vstack as vstack_tables)
 from astropy.io.registry import _get_valid_format
 
 from ..time import LIGOTimeGPS
+from ..utils.lazy import module_available
+
+# glue.lal is only imported when needed
+HAS_CACHE = module_available('glue.lal')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -63,6 +58,57 @@ except AttributeError:
 FILE_LIKE = tuple(FILE_LIKE)
 
 
+# -- cache types --------------------------------------------------------------
+
+def _import_cache():
+    """Import and return the `glue.lal.Cache` class
+
+    The `~lal.utils.CacheEntry` is set as the `Cache.entry_class`,
+    if `lal.utils` is available.
+    """
+    from glue.lal import Cache
+    try:
+        from lal.utils import CacheEntry
+    except ImportError:  # use glue.lal.CacheEntry
+        pass
+    else:
+        Cache.entry_class = CacheEntry
+    return Cache
+
+
+def _imported_type(module, name):
+    """Return a type from a module, only if that module is already imported
+    """
+    try:
+        return getattr(sys.modules[module], name)
+    except (KeyError, AttributeError):
+        return None
+
+
+def is_cache(obj):
+    """Returns `True` if ``obj`` is a :class:`glue.lal.Cache`
+
+    This does not import `glue.lal`, if it hasn't been imported already
+    then ``obj`` cannot be a `~glue.lal.Cache`.
+    """
+    cache = _imported_type('glue.lal', 'Cache')
+    return cache is not None and isinstance(obj, cache)
+
+
+def is_cache_entry(obj):
+    """Returns `True` if ``obj`` is a :class:`lal.utils.CacheEntry`
+    or a :class:`glue.lal.CacheEntry`
+
+    This does not import `lal.utils` or `glue.lal`, if neither has been
+    imported already then ``obj`` cannot be a cache entry.
+    """
+    for module in ('lal.utils', 'glue.lal'):
+        entry = _imported_type(module, 'CacheEntry')
+        if entry is not None and isinstance(obj, entry):
+            return True
+    return False
+
+
 # -- cache I/O ----------------------------------------------------------------
 
 def read_cache(lcf, coltype=LIGOTimeGPS):
@@ -82,7 +128,7 @@ def read_cache(lcf, coltype=LIGOTimeGPS):
         a cache object, representing each line in the file as a
         :class:`~lal.utils.CacheEntry`
     """
-    from glue.lal import Cache
+    Cache = _import_cache()
     # open file
     if not isinstance(lcf, FILE_LIKE):
         with open(lcf, 'r') as f:
@@ -184,7 +230,7 @@ def file_name(fobj):
         return fobj
     if isinstance(fobj, FILE_LIKE):
         return fobj.name
-    if HAS_CACHE and isinstance(fobj, CacheEntry):
+    if is_cache_entry(fobj):
         return fobj.path
     raise ValueError("Cannot parse file name for %r" % fobj)
 
@@ -275,10 +321,9 @@ def find_contiguous(*caches):
     caches : `iter` of :class:`~glue.lal.Cache`
         an interable yielding each contiguous cache
     """
-    from glue.lal import Cache
     try:
         flat = flatten(*caches)
     except IndexError:
-        flat = Cache()
+        flat = _import_cache()()
     for segment in cache_segments(flat):
         yield flat.sieve(segment=segment)
@@ -0,0 +1,548 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Lightweight client for the DQSegDB segment database REST API
+
+Queries are made over persistent (keep-alive) HTTP(S) connections, and
+the JSON replies are parsed directly into ``(N, 2)`` `numpy.ndarray`
+segment arrays, which can be clipped and combined without building
+intermediate `~gwpy.segments.SegmentList` objects.
+
+Query results can be stored in a local `SegmentCache`, so that repeated
+queries only go to the server for the parts of the query span that have
+not been seen before.
+"""
+
+from __future__ import absolute_import
+
+import json
+import os
+import socket
+import sqlite3
+from contextlib import contextmanager
+from threading import Lock
+
+from six.moves import http_client
+from six.moves.urllib.error import HTTPError
+from six.moves.urllib.parse import (urlencode, urlparse)
+
+import numpy
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+
+#: default DQSegDB server URL
+DEFAULT_URL = 'https://segments.ligo.org'
+
+#: default maximum number of concurrent connections to a server
+MAX_CONNECTIONS = 8
+
+#: default data to request for each flag
+DEFAULT_INCLUDE = 'metadata,active,known'
+
+#: default location of the local segment cache
+DEFAULT_CACHE = os.path.join('~', '.cache', 'gwpy', 'segments.sqlite')
+
+
+# -- segment array utilities --------------------------------------------------
+
+def segment_array(segments):
+    """Format a list of ``(start, end)`` pairs as a ``(N, 2)`` array
+    """
+    return numpy.asarray(segments, dtype=float).reshape(-1, 2)
+
+
+def coalesce_array(segments, maxgap=0):
+    """Merge overlapping (or nearby) segments in an array
+
+    Parameters
+    ----------
+    segments : `numpy.ndarray`
+        ``(N, 2)`` array of ``(start, end)`` segments, in any order
+
+    maxgap : `float`, optional
+        merge segments separated by a gap no longer than this, use
+        `numpy.inf` to merge everything into a single spanning segment
+
+    Returns
+    -------
+    coalesced : `numpy.ndarray`
+        ``(M, 2)`` array of sorted, disjoint segments
+    """
+    segments = segment_array(segments)
+    segments = segments[segments[:, 1] > segments[:, 0]]
+    if not segments.shape[0]:
+        return segments
+    segments = segments[numpy.argsort(segments[:, 0], kind='mergesort')]
+    ends = numpy.maximum.accumulate(segments[:, 1])
+    # a new group starts wherever a segment starts beyond the running end
+    new = numpy.ones(segments.shape[0], dtype=bool)
+    new[1:] = segments[1:, 0] - ends[:-1] > maxgap
+    starts = numpy.nonzero(new)[0]
+    stops = numpy.append(starts[1:], segments.shape[0]) - 1
+    return numpy.column_stack((segments[starts, 0], ends[stops]))
+
+
+def intersect_arrays(a, b):
+    """Intersect two segment arrays
+
+    Parameters
+    ----------
+    a, b : `numpy.ndarray`
+        ``(N, 2)`` arrays of segments, ``b`` must be sorted and disjoint
+        (e.g. the output of `coalesce_array`)
+
+    Returns
+    -------
+    intersection : `numpy.ndarray`
+        ``(M, 2)`` array of sorted, disjoint segments
+    """
+    a = segment_array(a)
+    b = segment_array(b)
+    # find the range of b segments that overlap each a segment
+    first = numpy.searchsorted(b[:, 1], a[:, 0], side='right')
+    last = numpy.searchsorted(b[:, 0], a[:, 1], side='left')
+    counts = numpy.clip(last - first, 0, None)
+    # build indices for all overlapping pairs without a python loop
+    aidx = numpy.repeat(numpy.arange(a.shape[0]), counts)
+    offset = numpy.arange(aidx.size) - numpy.repeat(
+        numpy.cumsum(counts) - counts, counts)
+    bidx = numpy.repeat(first, counts) + offset
+    out = numpy.column_stack((numpy.maximum(a[aidx, 0], b[bidx, 0]),
+                              numpy.minimum(a[aidx, 1], b[bidx, 1])))
+    return coalesce_array(out)
+
+
+def subtract_arrays(a, b):
+    """Remove the segments in ``b`` from those in ``a``
+
+    Parameters
+    ----------
+    a, b : `numpy.ndarray`
+        ``(N, 2)`` arrays of segments
+
+    Returns
+    -------
+    difference : `numpy.ndarray`
+        ``(M, 2)`` array of sorted, disjoint segments
+    """
+    b = coalesce_array(b)
+    gaps = numpy.column_stack((
+        numpy.concatenate(([-numpy.inf], b[:, 1])),
+        numpy.concatenate((b[:, 0], [numpy.inf])),
+    ))
+    return intersect_arrays(a, coalesce_array(gaps))
+
+
+# -- client -------------------------------------------------------------------
+
+class DQSegDBClient(object):
+    """A persistent connection to a DQSegDB server
+
+    The underlying HTTP(S) connection is kept open between requests, and
+    re-opened automatically if the server closes it.
+
+    Parameters
+    ----------
+    url : `str`, optional
+        URL of the segment database, default: ``'https://segments.ligo.org'``
+
+    timeout : `float`, optional
+        timeout (seconds) for socket operations
+
+    Notes
+    -----
+    HTTPS connections are authenticated using the X509 credential found by
+    :func:`glue.datafind.find_credential`.
+    """
+    def __init__(self, url=DEFAULT_URL, timeout=None):
+        url = urlparse(url)
+        self.scheme = url.scheme or 'http'
+        self.host = url.netloc
+        self.path = url.path.rstrip('/')
+        self.timeout = timeout
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def connect(self):
+        """Open a new connection to the server
+        """
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if self.scheme == 'https':
+            from glue.datafind import find_credential
+            kwargs['cert_file'], kwargs['key_file'] = find_credential()
+            self._connection = http_client.HTTPSConnection(self.host,
+                                                           **kwargs)
+        else:
+            self._connection = http_client.HTTPConnection(self.host, **kwargs)
+        return self._connection
+
+    def close(self):
+        """Close the connection to the server
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _request(self, path):
+        conn = self._connection or self.connect()
+        conn.request('GET', path, headers={'Connection': 'keep-alive'})
+        response = conn.getresponse()
+        return response.status, response.reason, response.read()
+
+    def get_json(self, path, **query):
+        """GET a path from the server, and parse the JSON reply
+
+        Parameters
+        ----------
+        path : `str`
+            the path to request, relative to the server URL
+
+        **query
+            URL query parameters
+
+        Returns
+        -------
+        data : `dict`
+            the parsed JSON reply
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            if the server does not return ``200 OK``
+        """
+        path = self.path + path
+        if query:
+            path += '?' + urlencode(sorted(query.items()))
+        try:
+            status, reason, body = self._request(path)
+        except (http_client.HTTPException, socket.error):
+            # connection dropped (e.g. keep-alive timeout), try once more
+            self.close()
+            status, reason, body = self._request(path)
+        if status != 200:
+            raise HTTPError('%s://%s%s' % (self.scheme, self.host, path),
+                            status, reason, None, None)
+        return json.loads(body.decode('utf-8'))
+
+    def versions(self, ifo, name):
+        """Return the list of versions available for a flag
+
+        Returns
+        -------
+        versions : `list` of `int`
+            the sorted list of versions
+        """
+        return sorted(map(int, self.get_json(
+            '/dq/%s/%s' % (ifo, name))['version']))
+
+    def query_version(self, ifo, name, version, start, end,
+                      include=DEFAULT_INCLUDE):
+        """Query for a single version of a flag in a single interval
+
+        Returns
+        -------
+        data : `dict`
+            the parsed JSON reply
+        """
+        return self.get_json('/dq/%s/%s/%d' % (ifo, name, int(version)),
+                             s=int(start), e=int(end), include=include)
+
+    def query(self, ifo, name, version, segments, include=DEFAULT_INCLUDE,
+              maxgap=numpy.inf):
+        """Query for the segments of a flag
+
+        The query ``segments`` are coalesced (merging gaps shorter than
+        ``maxgap``) before querying, so that the minimum number of requests
+        is made, with the results clipped back to the original query
+        segments.
+
+        Parameters
+        ----------
+        ifo : `str`
+            the interferometer prefix for the flag
+
+        name : `str`
+            the name (tag) of the flag
+
+        version : `int`, `None`
+            the flag version, if `None` all versions are queried, with
+            segments from higher versions taking precedence
+
+        segments : `numpy.ndarray`
+            ``(N, 2)`` array of query segments
+
+        include : `str`, optional
+            comma-separated list of data to request from the server
+
+        maxgap : `float`, optional
+            the largest gap between query segments over which to use a
+            single request, default: `numpy.inf` (one request per version)
+
+        Returns
+        -------
+        known, active : `numpy.ndarray`
+            ``(N, 2)`` arrays of known and active segments
+
+        metadata : `dict`
+            the flag metadata returned by the server
+        """
+        segments = coalesce_array(segments)
+        spans = coalesce_array(segments, maxgap=maxgap)
+        if version is None:
+            versions = self.versions(ifo, name)[::-1]
+        else:
+            versions = [version]
+        known = numpy.zeros((0, 2))
+        active = numpy.zeros((0, 2))
+        metadata = {}
+        for i, vers in enumerate(versions):
+            vknown = []
+            vactive = []
+            for start, end in spans:
+                data = self.query_version(ifo, name, vers, start, end,
+                                          include=include)
+                vknown.extend(data.get('known', []))
+                vactive.extend(data.get('active', []))
+                metadata = metadata or data.get('metadata', {})
+            vknown = intersect_arrays(vknown, segments)
+            vactive = intersect_arrays(vactive, segments)
+            if i:  # higher versions take precedence
+                vknown = subtract_arrays(vknown, known)
+                vactive = intersect_arrays(vactive, vknown)
+            known = coalesce_array(numpy.concatenate((known, vknown)))
+            active = coalesce_array(numpy.concatenate((active, vactive)))
+        return known, active, metadata
+
+
+# -- cache --------------------------------------------------------------------
+
+class SegmentCache(object):
+    """A persistent local store of segment database query results
+
+    Results are stored in an SQLite database, keyed by the server URL,
+    flag name, and version; each entry records the GPS intervals that
+    have been queried, along with the known and active segments inside
+    them.
+
+    Parameters
+    ----------
+    path : `str`, optional
+        path of the SQLite database file, created if needed, defaults to
+        ``~/.cache/gwpy/segments.sqlite``
+
+    ttl : `float`, optional
+        time-to-live (seconds) for results of versionless queries near
+        the time they were made, default: ``3600``
+
+    Notes
+    -----
+    Flags queried with an explicit version are treated as immutable, so
+    cached results never expire, except that no interval after the GPS
+    time at which a query was made is ever considered as covered.
+
+    Versionless queries may see new versions of a flag at any time, so
+    cached intervals ending within ``ttl`` seconds of the time of the
+    original query are queried again once they are older than ``ttl``.
+    """
+    def __init__(self, path=None, ttl=3600):
+        self.path = os.path.expanduser(path or DEFAULT_CACHE)
+        self.ttl = ttl
+        self._lock = Lock()
+        dirname = os.path.dirname(self.path)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    url TEXT, flag TEXT, version INTEGER,
+                    start REAL, end REAL, fetched REAL);
+                CREATE TABLE IF NOT EXISTS segments (
+                    url TEXT, flag TEXT, version INTEGER, type TEXT,
+                    start REAL, end REAL);
+                CREATE TABLE IF NOT EXISTS metadata (
+                    url TEXT, flag TEXT, version INTEGER, metadata TEXT,
+                    PRIMARY KEY (url, flag, version));
+                CREATE INDEX IF NOT EXISTS coverage_key
+                    ON coverage (url, flag, version);
+                CREATE INDEX IF NOT EXISTS segments_key
+                    ON segments (url, flag, version, type);
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:  # commit on success, rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now():
+        from ..time import to_gps
+        return float(to_gps('now'))
+
+    @staticmethod
+    def _key(url, ifo, name, version):
+        return (url, '%s:%s' % (ifo, name),
+                -1 if version is None else int(version))
+
+    def _select(self, conn, table, key, *columns, **where):
+        sql = 'SELECT %s FROM %s WHERE url=? AND flag=? AND version=?' % (
+            ', '.join(columns), table)
+        args = list(key)
+        for col, value in where.items():
+            sql += ' AND %s=?' % col
+            args.append(value)
+        return conn.execute(sql, args).fetchall()
+
+    def covered(self, url, ifo, name, version):
+        """Return the GPS intervals covered by cached results for a flag
+
+        Returns
+        -------
+        covered : `numpy.ndarray`
+            ``(N, 2)`` array of (non-expired) covered segments
+        """
+        key = self._key(url, ifo, name, version)
+        with self._lock, self._connect() as conn:
+            rows = numpy.array(self._select(conn, 'coverage', key, 'start',
+                                            'end', 'fetched'),
+                               dtype=float).reshape(-1, 3)
+        if version is None and rows.shape[0]:
+            stale = ((rows[:, 1] >= rows[:, 2] - self.ttl) &
+                     (self._now() - rows[:, 2] > self.ttl))
+            rows = rows[~stale]
+        return coalesce_array(rows[:, :2])
+
+    def get(self, url, ifo, name, version, segments):
+        """Return the cached segments for a flag, clipped to ``segments``
+
+        Returns
+        -------
+        known, active : `numpy.ndarray`
+            ``(N, 2)`` arrays of known and active segments
+
+        metadata : `dict`
+            the flag metadata stored with the segments
+        """
+        key = self._key(url, ifo, name, version)
+        with self._lock, self._connect() as conn:
+            known = self._select(conn, 'segments', key, 'start', 'end',
+                                 type='known')
+            active = self._select(conn, 'segments', key, 'start', 'end',
+                                  type='active')
+            meta = self._select(conn, 'metadata', key, 'metadata')
+        return (intersect_arrays(known, coalesce_array(segments)),
+                intersect_arrays(active, coalesce_array(segments)),
+                json.loads(meta[0][0]) if meta else {})
+
+    def put(self, url, ifo, name, version, segments, known, active,
+            metadata=None):
+        """Store new query results for a flag
+
+        Any existing cached segments inside the new query ``segments`` are
+        replaced.
+
+        Parameters
+        ----------
+        url : `str`
+            URL of the segment database
+
+        ifo, name : `str`
+            the interferometer prefix and name of the flag
+
+        version : `int`, `None`
+            the version of the flag, or `None` for versionless queries
+
+        segments : `numpy.ndarray`
+            ``(N, 2)`` array of segments covered by the query
+
+        known, active : `numpy.ndarray`
+            ``(N, 2)`` arrays of known and active segments returned by the
+            query
+
+        metadata : `dict`, optional
+            the flag metadata returned by the query
+        """
+        key = self._key(url, ifo, name, version)
+        now = self._now()
+        # never claim coverage of the future
+        segments = intersect_arrays(segments, [(-numpy.inf, now)])
+        with self._lock, self._connect() as conn:
+            for type_, new in (('known', known), ('active', active)):
+                old = self._select(conn, 'segments', key, 'start', 'end',
+                                   type=type_)
+                merged = coalesce_array(numpy.concatenate((
+                    subtract_arrays(old, segments),
+                    intersect_arrays(new, segments))))
+                conn.execute('DELETE FROM segments WHERE url=? AND flag=? '
+                             'AND version=? AND type=?', key + (type_,))
+                conn.executemany('INSERT INTO segments VALUES (?,?,?,?,?,?)',
+                                 [key + (type_,) + tuple(seg) for
+                                  seg in merged.tolist()])
+            conn.executemany('INSERT INTO coverage VALUES (?,?,?,?,?,?)',
+                             [key + tuple(seg) + (now,) for
+                              seg in segments.tolist()])
+            if metadata:
+                conn.execute('INSERT OR REPLACE INTO metadata VALUES '
+                             '(?,?,?,?)', key + (json.dumps(metadata),))
+
+    def query(self, client, ifo, name, version, segments, **kwargs):
+        """Query for a flag, using cached results where possible
+
+        Only the parts of ``segments`` not covered by the cache are
+        queried from the server.
+
+        Parameters
+        ----------
+        client : `DQSegDBClient`
+            the client to use for any new queries
+
+        ifo, name, version, segments
+            see :meth:`DQSegDBClient.query`
+
+        **kwargs
+            other keyword arguments are passed to
+            :meth:`DQSegDBClient.query`
+
+        Returns
+        -------
+        known, active : `numpy.ndarray`
+            ``(N, 2)`` arrays of known and active segments
+
+        metadata : `dict`
+            the flag metadata
+        """
+        url = '%s://%s%s' % (client.scheme, client.host, client.path)
+        segments = coalesce_array(segments)
+        missing = subtract_arrays(segments,
+                                  self.covered(url, ifo, name, version))
+        if missing.shape[0]:
+            known, active, metadata = client.query(ifo, name, version,
+                                                   missing, **kwargs)
+            self.put(url, ifo, name, version, missing, known, active,
+                     metadata=metadata)
+        return self.get(url, ifo, name, version, segments)
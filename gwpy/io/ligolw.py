@@ -23,13 +23,21 @@ an 'io' subdirectory of the containing directory for that class.
 """
 
 import os.path
+import re
 import warnings
 
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
 from six import string_types
 
-from ..utils import gprint
+import numpy
+
+from ..utils import (gprint, mp as mp_utils)
 from .cache import (file_list, FILE_LIKE)
-from .utils import identify_factory
+from .utils import (identify_factory, gopen)
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -62,6 +70,206 @@ def get_partial_contenthandler(table):
     return _ContentHandler
 
 
+# -- streaming ----------------------------------------------------------------
+
+_STREAM_TOKENIZERS = {}
+
+
+def strip_table_name(name):
+    """Return the bare name of a LIGO_LW table
+
+    Examples
+    --------
+    >>> strip_table_name('sngl_burstgroup:sngl_burst:table')
+    'sngl_burst'
+    """
+    if name.endswith(':table'):
+        name = name[:-6]
+    return name.rsplit(':', 1)[-1]
+
+
+def strip_column_name(name):
+    """Return the bare name of a LIGO_LW column
+
+    Examples
+    --------
+    >>> strip_column_name('sngl_burst:peak_time')
+    'peak_time'
+    """
+    return name.rsplit(':', 1)[-1]
+
+
+def _stream_regex(delimiter, ncol, usecols):
+    """Return a regular expression matching one row of a LIGO_LW stream
+
+    Only the tokens in ``usecols`` are captured as groups.
+    """
+    key = (delimiter, ncol, tuple(usecols))
+    try:
+        return _STREAM_TOKENIZERS[key]
+    except KeyError:
+        pass
+    delim = re.escape(delimiter)
+    token = r'\s*(%s"(?:[^"\\]|\\.)*"|[^%s"]*?)\s*%s'
+    usecols = set(usecols)
+    try:
+        regex = re.compile(''.join(
+            token % ('' if i in usecols else '?:', delim, delim) for
+            i in range(ncol)), re.S)
+    except (AssertionError, OverflowError, re.error):
+        # too many groups for this version of python, so match a single
+        # token at a time
+        regex = None
+    _STREAM_TOKENIZERS[key] = regex
+    return regex
+
+
+def tokenize_stream(text, ncol, delimiter=',', usecols=None):
+    """Split the text of a LIGO_LW ``<Stream>`` into columns of tokens
+
+    Only the tokens for the requested columns are kept, so reading a
+    few columns from a wide table does not hold every token in memory.
+
+    Parameters
+    ----------
+    text : `str`
+        the text content of the stream
+
+    ncol : `int`
+        the number of columns in the table
+
+    delimiter : `str`, optional
+        the token delimiter
+
+    usecols : `list` of `int`, optional
+        the (zero-based) indices of the columns to return, default: all
+
+    Returns
+    -------
+    tokens : `list` of `list`
+        the `list` of token strings for each column in ``usecols``, quoted
+        strings are returned with their quotes, and null values as empty
+        strings
+
+    Raises
+    ------
+    ValueError
+        if the number of tokens is not a multiple of ``ncol``
+    """
+    usecols = list(range(ncol) if usecols is None else usecols)
+    if not ncol or not (text or '').strip():
+        return [[] for _ in usecols]
+    text += delimiter
+    regex = _stream_regex(delimiter, ncol, usecols)
+
+    if regex is None:
+        tokens = _stream_regex(delimiter, 1, [0]).findall(text)
+        nrows, extra = divmod(len(tokens), ncol)
+        if extra == 1 and not tokens[-1]:  # trailing delimiter
+            extra = 0
+        if extra:
+            raise ValueError("LIGO_LW stream cannot be split into rows of "
+                             "%d tokens, found %d tokens"
+                             % (ncol, len(tokens)))
+        return [tokens[i:nrows * ncol:ncol] for i in usecols]
+
+    # match one row at a time, capturing only the requested columns
+    rows = []
+    end = 0
+    for match in regex.finditer(text):
+        if match.start() != end:
+            break
+        end = match.end()
+        rows.append(match.groups())
+    # allow a single trailing delimiter at the end of the stream
+    if text[end:].strip() not in ('', delimiter):
+        raise ValueError("LIGO_LW stream cannot be split into rows of %d "
+                         "tokens, failed at character %d" % (ncol, end))
+    # transpose the selected columns (captured in column order)
+    if not rows:
+        return [[] for _ in usecols]
+    columns = dict(zip(sorted(set(usecols)), map(list, zip(*rows))))
+    return [columns[i] for i in usecols]
+
+
+def unquote(tokens):
+    """Convert quoted token strings into (unescaped) python strings
+    """
+    return [t[1:-1].replace('\\"', '"').replace('\\\\', '\\') if
+            t[:1] == '"' else (t or None) for t in tokens]
+
+
+def iter_tables(source, tablenames=None, columns=None):
+    """Iterate over the raw tables in a LIGO_LW file
+
+    The file is parsed incrementally, without building a
+    :class:`~glue.ligolw.ligolw.Document`, and the ``<Stream>`` of each
+    table is split into tokens in a single pass.
+    Tables not listed in ``tablenames`` are skipped without being
+    tokenized.
+
+    Parameters
+    ----------
+    source : `str`, `file`
+        the path of the file to read (optionally gzipped), or an open
+        file object
+
+    tablenames : `list` of `str`, optional
+        the names of the tables to return, default: all tables
+
+    columns : `list` of `str`, optional
+        the names of the columns to tokenize, default: all columns,
+        names not found in a table are ignored
+
+    Yields
+    ------
+    name : `str`
+        the bare name of the table
+
+    columns : `list` of `tuple`
+        the ``(name, type)`` pair for each column in the table
+
+    tokens : `dict`
+        the `list` of token strings for each of the requested columns,
+        keyed by column name, see `tokenize_stream`
+    """
+    if tablenames is not None:
+        tablenames = set(map(strip_table_name, tablenames))
+    if isinstance(source, string_types):
+        fobj = gopen(source, 'rb')
+    else:
+        fobj = source
+    try:
+        table = llwcolumns = None
+        for event, elem in ElementTree.iterparse(fobj,
+                                                 events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'Table':
+                    table = strip_table_name(elem.get('Name', ''))
+                    if tablenames is not None and table not in tablenames:
+                        table = None
+                    llwcolumns = []
+                continue
+            if elem.tag == 'Column' and table is not None:
+                llwcolumns.append((strip_column_name(elem.get('Name')),
+                                   elem.get('Type')))
+            elif elem.tag == 'Stream' and table is not None:
+                names = [col[0] for col in llwcolumns]
+                if columns is not None:
+                    names = [name for name in names if name in columns]
+                usecols = [i for i, col in enumerate(llwcolumns) if
+                           col[0] in names]
+                tokens = tokenize_stream(
+                    elem.text, len(llwcolumns), usecols=usecols,
+                    delimiter=elem.get('Delimiter', ','))
+                yield table, llwcolumns, dict(zip(names, tokens))
+            if elem.tag in ('Table', 'Stream'):
+                elem.clear()  # free memory as we go
+    finally:
+        if fobj is not source:
+            fobj.close()
+
+
 # -- reading ------------------------------------------------------------------
 
 def table_from_file(f, tablename, columns=None, filt=None,
@@ -149,6 +357,164 @@ def table_from_file(f, tablename, columns=None, filt=None,
     return out
 
 
+def _parse_column(tokens, llwtype):
+    """Convert an array of stream tokens into a typed `numpy.ndarray`
+
+    Null numeric values are returned as ``0`` (integers) or ``NaN``
+    (floats), and null strings as empty strings.
+    """
+    from glue.ligolw.types import ToNumPyType
+
+    tokens = numpy.asarray(tokens)
+    if llwtype == 'ilwd:char':  # e.g. "sngl_burst:event_id:10"
+        ids = numpy.char.rpartition(numpy.char.strip(tokens, '"'), ':')
+        ids = ids[..., 2] if ids.size else tokens
+        return numpy.where(ids == '', '0', ids).astype(numpy.int64)
+    try:
+        dtype = numpy.dtype(ToNumPyType[llwtype])
+    except KeyError:  # string or blob
+        return numpy.array([t or '' for t in unquote(tokens)])
+    null = tokens == ''
+    if null.any():
+        tokens = numpy.where(null, '0' if dtype.kind in 'iu' else 'nan',
+                             tokens)
+    return tokens.astype(dtype)
+
+
+def _apply_filters(getcol, nrows, filters):
+    """Return the boolean mask of rows matching a set of column filters
+    """
+    keep = numpy.ones(nrows, dtype=bool)
+    for name, math in filters:
+        col = getcol(name)
+        for threshold, oprtr in math:
+            keep &= oprtr(col, threshold)
+    return keep
+
+
+def _read_table_columns(source, tablename, columns=None, filters=None):
+    """Read one LIGO_LW table from a single file into arrays
+
+    See `read_table_columns` for details.
+    """
+    tablename = strip_table_name(tablename)
+    names = None if columns is None else list(columns)
+    if names is None or filters is None:
+        needed = names
+    else:
+        needed = set(names).union(f_[0] for f_ in filters)
+    parts = []
+
+    for _, llwcolumns, tokens in iter_tables(source, [tablename],
+                                             columns=needed):
+        types = dict(llwcolumns)
+        if names is None:  # use column order from the first table
+            names = [col[0] for col in llwcolumns]
+        for name in names:
+            if name not in types:
+                raise ValueError("column %r not found in %s table"
+                                 % (name, tablename))
+
+        # apply filters first, only converting other columns for the rows
+        # that will be kept
+        parsed = {}
+        keep = None
+
+        def _get(name):
+            try:
+                return parsed[name]
+            except KeyError:
+                col = tokens.pop(name)
+                if keep is not None:
+                    col = numpy.asarray(col)[keep]
+                parsed[name] = col = _parse_column(col, types[name])
+                return col
+
+        if filters:
+            nrows = len(next(iter(tokens.values()))) if tokens else 0
+            keep = _apply_filters(_get, nrows, filters)
+            parsed = dict((key, val[keep]) for key, val in parsed.items())
+        parts.append([_get(name) for name in names])
+
+    if not parts:
+        raise ValueError("document must contain exactly one %s table"
+                         % tablename)
+    return names, parts
+
+
+def read_table_columns(f, tablename, columns=None, filters=None, nproc=1):
+    """Read a LIGO_LW table directly into `numpy` arrays
+
+    This method streams the ``<Stream>`` of the table straight into typed
+    arrays, without building a :class:`~glue.ligolw.ligolw.Document` or
+    any row objects.
+
+    Parameters
+    ----------
+    f : `file`, `str`, `CacheEntry`, `list`, `Cache`
+        object representing one or more files, see `table_from_file`
+
+    tablename : `str`
+        name of the table to read
+
+    columns : `list` of `str`, optional
+        list of column names to read, default: all columns, in the order
+        in which they appear in the (first) file
+
+    filters : `list` of `tuple`, optional
+        column filters to apply while reading, in the format returned by
+        :func:`gwpy.table.filter.parse_column_filters`; the columns
+        referenced by a filter do not need to be included in ``columns``
+
+    nproc : `int`, optional, default: `1`
+        number of parallel processes with which to read multiple files
+
+    Returns
+    -------
+    names : `list` of `str`
+        the names of the columns that were read
+
+    arrays : `list` of `numpy.ndarray`
+        the data for each column
+
+    Raises
+    ------
+    ValueError
+        if the table is not found in any of the given files, or one of the
+        requested ``columns`` is not found
+    """
+    files = [fp.name if isinstance(fp, FILE_LIKE) else fp for
+             fp in file_list(f)]
+
+    def _read(source):
+        try:
+            return _read_table_columns(source, tablename, columns=columns,
+                                       filters=filters)
+        except Exception as exc:
+            if nproc == 1:
+                raise
+            return exc
+
+    output = mp_utils.multiprocess_with_queues(
+        min(nproc, len(files)), _read, files, raise_exceptions=True)
+
+    # merge columns from all files with a single concatenate
+    names = output[0][0]
+    parts = []
+    for fnames, fparts in output:
+        if fnames != names:  # match column order to first file
+            try:
+                order = [fnames.index(name) for name in names]
+            except ValueError:
+                raise ValueError("cannot merge %s tables with different "
+                                 "columns" % tablename)
+            fparts = [[cols[i] for i in order] for cols in fparts]
+        parts.extend(fparts)
+    if len(parts) == 1:
+        return names, parts[0]
+    return names, [numpy.concatenate(cols) for cols in zip(*parts)]
+
+
 # -- writing ------------------------------------------------------------------
 
 def open_xmldoc(f, **kwargs):
@@ -16,17 +16,86 @@
 # You should have received a copy of the GNU General Public License
 # along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
 
+from __future__ import division
+
+import os
 import sys
+import time
 from xml.sax import SAXException
 
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:  # python < 3
+    from inspect import getargspec
+
 from six import string_types
 
 from astropy.io.registry import (_get_valid_format as get_format,
-                                 read as io_read)
+                                 get_reader, read as io_read)
+from astropy.table import Table
 from astropy.utils.data import get_readable_fileobj
 
 from .cache import (FILE_LIKE, file_list)
-from ..utils import mp as mp_utils
+from ..utils import (gprint, mp as mp_utils)
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+
+# column attributes to transfer when unpacking tables
+COLUMN_ATTRS = ('unit', 'description', 'format', 'meta')
+
+
+def pack_table(table):
+    """Reduce a `~astropy.table.Table` to its raw column buffers
+
+    This is much cheaper to pickle (e.g. to send between processes) than
+    the `Table` itself.
+
+    Returns
+    -------
+    packed : `tuple`
+        a tuple of ``(type, names, arrays, attrs, meta)``, see
+        `unpack_table`
+    """
+    cols = list(table.columns.values())
+    return (
+        type(table),
+        table.colnames,
+        [col.data for col in cols],
+        [dict((attr, getattr(col, attr)) for attr in COLUMN_ATTRS) for
+         col in cols],
+        table.meta,
+    )
+
+
+def unpack_table(packed):
+    """Rebuild a `~astropy.table.Table` from its packed form
+
+    The column buffers are not copied.
+
+    See Also
+    --------
+    pack_table
+    """
+    cls, names, arrays, attrs, meta = packed
+    return cls([cls.Column(arr, name=name, copy=False, **kw) for
+                name, arr, kw in zip(names, arrays, attrs)],
+               meta=meta, copy=False)
+
+
+def _reader_takes(cls, format_, name):
+    """Returns `True` if the ``format_`` reader for ``cls`` takes ``name``
+
+    Only arguments named in the signature of the reader (or a function
+    it wraps, via ``__wrapped__``) count, a reader that only takes
+    ``**kwargs`` might not accept it.
+    """
+    func = get_reader(format_, cls)
+    while func is not None:
+        spec = getargspec(func)
+        if name in spec.args or name in getattr(spec, 'kwonlyargs', []):
+            return True
+        func = getattr(func, '__wrapped__', None)
+    return False
 
 
 def read_multi(flatten, cls, source, *args, **kwargs):
@@ -52,6 +121,10 @@ def read_multi(flatten, cls, source, *args, **kwargs):
     *args
         positional arguments to pass to the reader
 
+    verbose : `bool`, optional
+        print the time taken to read each file, this is only passed on to
+        readers that take a ``verbose`` argument
+
     **kwargs
         keyword arguments to pass to the reader
     """
@@ -65,9 +138,11 @@ def read_multi(flatten, cls, source, *args, **kwargs):
     # -- this is basically harvested from astropy.io.registry.read()
     if kwargs.get('format', None) is None:
         ctx = None
+        fileobj = None
         if isinstance(source, FILE_LIKE):
             fileobj = source
-        elif isinstance(source, string_types):
+        elif (isinstance(source, string_types) and
+              not os.path.isdir(files[0])):  # identify directories by name
             try:
                 ctx = get_readable_fileobj(files[0], encoding='binary')
                 fileobj = ctx.__enter__()
@@ -82,29 +157,59 @@ def read_multi(flatten, cls, source, *args, **kwargs):
 
     # calculate maximum number of processes
     nproc = min(kwargs.pop('nproc', 1), len(files))
+    verbose = kwargs.pop('verbose', False)
+    if verbose and _reader_takes(cls, kwargs['format'], 'verbose'):
+        kwargs['verbose'] = verbose
 
     # define multiprocessing method
     def _read_single_file(f):
         try:
-            return f, io_read(cls, f, *args, **kwargs)
+            start = time.time()
+            out = io_read(cls, f, *args, **kwargs)
+            elapsed = time.time() - start
+            if nproc != 1 and isinstance(out, Table) and not out.masked:
+                # only send the raw column buffers back to the parent
+                return f, pack_table(out), elapsed, True
+            return f, out, elapsed, False
         except Exception as e:
             if nproc == 1:
                 raise
             elif isinstance(e, SAXException):  # SAXExceptions don't pickle
-                return f, e.getException()
+                return f, e.getException(), 0, False
             else:
-                return f, e
+                return f, e, 0, False
 
     # read files
     output = mp_utils.multiprocess_with_queues(
         nproc, _read_single_file, files, raise_exceptions=False)
 
     # raise exceptions (from multiprocessing, single process raises inline)
-    for f, x in output:
+    for f, x, _, _ in output:
         if isinstance(x, Exception):
             x.args = ('Failed to read %s: %s' % (f, str(x)),)
             raise x
 
+    # unpack tables
+    out = [unpack_table(x) if packed else x for _, x, _, packed in output]
+
+    # report per-file throughput
+    if verbose:
+        for (f, _, elapsed, _), obj in zip(output, out):
+            _report_throughput(f, obj, elapsed)
+
     # return combined object
-    _, out = zip(*output)
     return flatten(out)
+
+
+def _report_throughput(f, obj, elapsed):
+    """Print the time taken to read a single file
+    """
+    name = getattr(f, 'name', getattr(f, 'path', f))
+    try:
+        nrows = len(obj)
+    except TypeError:
+        gprint('Read %s in %.3f seconds' % (name, elapsed))
+    else:
+        rate = nrows / elapsed if elapsed else float('inf')
+        gprint('Read %d rows from %s in %.3f seconds (%.0f rows/s)'
+               % (nrows, name, elapsed, rate))
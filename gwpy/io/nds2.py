@@ -34,16 +34,13 @@ from six.moves import reduce
 
 import numpy
 
-try:
-    import nds2
-except ImportError:
-    HAS_NDS2 = False
-else:
-    HAS_NDS2 = True
-
 from ..time import to_gps
 from .kerberos import kinit
 from ..utils.compat import OrderedDict
+from ..utils.lazy import module_available
+
+# nds2 is only imported when opening a connection
+HAS_NDS2 = module_available('nds2')
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
@@ -269,6 +266,7 @@ def connect(host, port=None):
     connection : `nds2.connection`
         a new open connection to the given NDS host
     """
+    import nds2
     if port is None:
         return nds2.connection(host)
     else:
@@ -19,8 +19,10 @@
 """I/O registry extensions on top of `astropy.io.registry`
 """
 
+from contextlib import contextmanager
 from functools import wraps
 
+from astropy.io import registry as astropy_registry
 from astropy.io.registry import *
 
 from .cache import file_list
@@ -61,3 +63,42 @@ def register_identifier(data_format, data_class, identifier, force=False):
     return astropy_register_identifier(
         data_format, data_class, identify_with_list(identifier), force=force)
 register_identifier.__doc__ = astropy_register_identifier.__doc__
+
+
+@contextmanager
+def delay_doc_updates(*classes):
+    """Delay updating the ``read`` and ``write`` docstrings of classes
+
+    By default, `astropy.io.registry` rebuilds the table of available
+    formats in the docstring of ``data_class.read`` (or ``.write``) each
+    time a new reader (or writer) is registered, which makes importing
+    modules that register many formats slow.
+    Inside this context the docstrings of the given classes are left
+    alone, and are rebuilt once when the context exits.
+
+    Parameters
+    ----------
+    *classes
+        the classes for which to delay documentation updates
+
+    See Also
+    --------
+    astropy.io.registry.delay_doc_updates
+        for the same thing, for a single class
+    """
+    try:
+        delayed = astropy_registry._delayed_docs_classes
+    except AttributeError:  # astropy < 1.3
+        yield
+        return
+    # classes delayed by an outer context are updated by that context
+    classes = [cls for cls in classes if cls not in delayed]
+    delayed.update(classes)
+    try:
+        yield
+    finally:
+        for cls in classes:
+            delayed.discard(cls)
+            for method in ('read', 'write'):
+                if hasattr(cls, method):
+                    astropy_registry._update__doc__(cls, method)
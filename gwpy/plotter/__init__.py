@@ -40,6 +40,9 @@ from .filter import *
 from .table import *
 from .histogram import *
 
+# batch rendering
+from .batch import *
+
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
 
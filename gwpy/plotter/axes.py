@@ -230,6 +230,13 @@ class Axes(_Axes):
         jquery : `str`, optional
             URL of jquery script, defaults to googleapis.com URL
 
+        mode : `str`, optional
+            ``'map'`` (default) to write an HTML <map>, or ``'json'`` to
+            embed the points as JSON, see :func:`gwpy.plotter.html.map_data`
+
+        merge : `bool`, optional
+            if `True` (default) only map one point per pixel
+
         Returns
         -------
         HTML : `str`
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Render many figures in parallel
+
+This module provides `render_batch`, which renders a list of `PlotSpec`
+figure specifications in a pool of worker processes using the
+non-interactive ``agg`` backend.
+Each worker is set up once and re-used for many figures, data read from
+files are cached by each worker, and in-memory data are shared with the
+workers when they are forked, rather than being pickled.
+"""
+
+import os
+import time
+import traceback
+
+from six import string_types
+
+from matplotlib import (pyplot, rc_context)
+
+from ..utils import (gprint, mp as mp_utils)
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['PlotSpec', 'RenderResult', 'render_batch']
+
+
+class PlotSpec(object):
+    """Specification of a single figure to render
+
+    Parameters
+    ----------
+    data : `object`, `str`, `list`
+        the data to plot, or the path of a file from which to read them,
+        or a `list` of either
+
+    output : `str`
+        the path of the output file
+
+    plot : `type`, `callable`, optional
+        the `~gwpy.plotter.Plot` class to create (e.g.
+        `~gwpy.plotter.TimeSeriesPlot`), or any callable that takes
+        ``(*data, **kwargs)`` and returns a `~matplotlib.figure.Figure`,
+        defaults to the ``plot()`` method of the (single) data object
+
+    cls : `type`, optional
+        the type with which to read any data given as file paths,
+        e.g. `~gwpy.timeseries.TimeSeries`, required if ``data``
+        contains file paths
+
+    read_kw : `dict`, optional
+        keyword arguments to pass to ``cls.read`` when reading data
+
+    savefig_kw : `dict`, optional
+        keyword arguments to pass to
+        :meth:`~matplotlib.figure.Figure.savefig`
+
+    rc : `dict`, optional
+        a template of `matplotlib.rcParams` with which to render this
+        figure
+
+    **kwargs
+        other keyword arguments to pass to ``plot``
+    """
+    def __init__(self, data, output, plot=None, cls=None, read_kw=None,
+                 savefig_kw=None, rc=None, **kwargs):
+        if isinstance(data, (list, tuple)):
+            self.data = list(data)
+        else:
+            self.data = [data]
+        self.output = output
+        self.plot = plot
+        self.cls = cls
+        self.read_kw = read_kw or {}
+        self.savefig_kw = savefig_kw or {}
+        self.rc = rc or {}
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return '<PlotSpec(%s)>' % self.output
+
+    def load(self, cache=None):
+        """Return the data for this figure, reading from files as needed
+
+        Parameters
+        ----------
+        cache : `dict`, optional
+            a cache of data already read, keyed by path, new data read
+            by this method are added to the cache
+        """
+        out = []
+        for data in self.data:
+            if not isinstance(data, string_types):
+                out.append(data)
+                continue
+            if self.cls is None:
+                raise ValueError("cannot read %r for %s without cls"
+                                 % (data, self.output))
+            key = (self.cls, data, tuple(sorted(self.read_kw.items())))
+            try:
+                out.append(cache[key])
+            except (KeyError, TypeError):  # not cached, or unhashable
+                obj = self.cls.read(data, **self.read_kw)
+                if cache is not None:
+                    try:
+                        cache[key] = obj
+                    except TypeError:
+                        pass
+                out.append(obj)
+        return out
+
+    def make_plot(self, data):
+        """Create the figure for this specification from the given data
+        """
+        if self.plot is not None:
+            return self.plot(*data, **self.kwargs)
+        if len(data) != 1:
+            raise ValueError("plot must be given for %s with multiple data "
+                             "objects" % self.output)
+        return data[0].plot(**self.kwargs)
+
+
+class RenderResult(object):
+    """The outcome of rendering a single `PlotSpec`
+
+    Attributes
+    ----------
+    output : `str`
+        the path of the output file
+
+    timing : `dict`
+        the time (seconds) spent in each of the ``'load'``, ``'plot'``,
+        and ``'save'`` stages of rendering
+
+    error : `str`, `None`
+        the formatted traceback of any exception raised while rendering,
+        otherwise `None`
+    """
+    def __init__(self, output, timing=None, error=None):
+        self.output = output
+        self.timing = timing or {}
+        self.error = error
+
+    def __repr__(self):
+        return '<RenderResult(%s, %s, %.3fs)>' % (
+            self.output, 'ok' if self.success else 'failed', self.elapsed)
+
+    @property
+    def success(self):
+        """`True` if the figure was rendered successfully
+        """
+        return self.error is None
+
+    @property
+    def elapsed(self):
+        """The total time (seconds) spent rendering this figure
+        """
+        return sum(self.timing.values())
+
+
+def render(spec, cache=None):
+    """Render a single `PlotSpec`
+
+    Any exception is caught and recorded in the result, so that one bad
+    figure does not stop a batch.
+
+    Parameters
+    ----------
+    spec : `PlotSpec`
+        the figure to render
+
+    cache : `dict`, optional
+        a cache of data read from files, see `PlotSpec.load`
+
+    Returns
+    -------
+    result : `RenderResult`
+        the outcome of rendering
+    """
+    result = RenderResult(spec.output)
+    fig = None
+    stage = 'load'
+    start = time.time()
+    try:
+        with rc_context(rc=spec.rc):
+            data = spec.load(cache=cache)
+            start = _record(result, stage, start)
+            stage = 'plot'
+            fig = spec.make_plot(data)
+            start = _record(result, stage, start)
+            stage = 'save'
+            fig.savefig(spec.output, **spec.savefig_kw)
+            _record(result, stage, start)
+    except Exception:  # pylint: disable=broad-except
+        _record(result, stage, start)
+        result.error = traceback.format_exc()
+    finally:
+        if fig is not None:
+            pyplot.close(fig)
+    return result
+
+
+def _record(result, stage, start):
+    """Record the time for a stage, and return the new start time
+    """
+    now = time.time()
+    result.timing[stage] = now - start
+    return now
+
+
+def _init_worker():
+    """Prepare a worker process for rendering
+
+    This is run once per process.
+    """
+    pyplot.switch_backend('agg')
+
+
+def render_batch(specs, nproc=1, verbose=False):
+    """Render many figures, optionally in parallel
+
+    Parameters
+    ----------
+    specs : `list` of `PlotSpec`
+        the figures to render
+
+    nproc : `int`, optional
+        the number of worker processes to use, default: ``1``; workers
+        use the ``agg`` backend, with ``nproc=1`` figures are rendered
+        in the current process with the current backend
+
+    verbose : `bool`, optional
+        print the timing of each figure, once the whole batch has been
+        rendered, default: `False`
+
+    Returns
+    -------
+    results : `list` of `RenderResult`
+        the outcome of rendering each figure, in the same order as
+        ``specs``; failures are reported via `RenderResult.error`,
+        rather than raised
+
+    Notes
+    -----
+    Worker processes are forked from the current process, so data given
+    as in-memory objects are shared with the workers without being
+    copied or pickled. Data given as file paths are read by each worker
+    the first time they are needed, and re-used for later figures
+    rendered by that worker.
+
+    Examples
+    --------
+    >>> from gwpy.plotter import (PlotSpec, render_batch)
+    >>> specs = [PlotSpec(data, '%s.png' % data.name, figsize=(12, 6))
+    ...          for data in datalist]
+    >>> results = render_batch(specs, nproc=4)
+    >>> failed = [r for r in results if not r.success]
+    """
+    specs = list(specs)
+    nproc = max(min(nproc, len(specs)), 1)
+    parent = os.getpid()
+    cache = {}
+    ready = []
+
+    def _render(index):
+        if os.getpid() != parent and not ready:
+            _init_worker()
+            ready.append(True)
+        return render(specs[index], cache=cache)
+
+    results = mp_utils.multiprocess_with_queues(
+        nproc, _render, range(len(specs)), raise_exceptions=False)
+
+    if verbose:
+        for result in results:
+            _report_timing(result)
+    return results
+
+
+def _report_timing(result):
+    """Print the time taken to render a single figure
+    """
+    stages = ', '.join('%s %.3f' % (stage, result.timing[stage]) for
+                       stage in ('load', 'plot', 'save') if
+                       stage in result.timing)
+    if result.success:
+        gprint('Rendered %s in %.3f seconds (%s)'
+               % (result.output, result.elapsed, stages))
+    else:
+        gprint('Failed to render %s: %s'
+               % (result.output, result.error.strip().splitlines()[-1]))
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Level-of-detail decimation for plotting very long series
+
+Drawing a line with many more vertices than there are pixels across the
+axes wastes time and memory, without changing what is displayed.
+The `MinMaxPyramid` summarises a regularly-sampled array by the minimum
+and maximum of blocks of samples at a number of resolutions, so that the
+extrema of the data in each pixel column of any view can be found
+quickly, and drawn instead of the full data.
+
+Similarly, the `BlockImage` reduces the visible part of a regularly-sampled
+2-D array in blocks no bigger than one pixel, so that images are resampled
+from (at most) one element per pixel.
+"""
+
+from __future__ import division
+
+from math import (ceil, floor)
+
+import numpy
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['MinMaxPyramid', 'BlockImage', 'band_vertices']
+
+
+def _reduce_blocks(mins, maxs, size):
+    """Reduce the min/max arrays in blocks of ``size``
+
+    NaNs are ignored, unless a block contains only NaNs.
+    """
+    nfull = mins.size // size * size
+    outmin = numpy.fmin.reduce(mins[:nfull].reshape(-1, size), axis=1)
+    outmax = numpy.fmax.reduce(maxs[:nfull].reshape(-1, size), axis=1)
+    if nfull < mins.size:  # partial final block
+        outmin = numpy.append(outmin, numpy.fmin.reduce(mins[nfull:]))
+        outmax = numpy.append(outmax, numpy.fmax.reduce(maxs[nfull:]))
+    return outmin, outmax
+
+
+class MinMaxPyramid(object):
+    """Multi-resolution min/max summary of a regularly-sampled array
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        the data array to summarise
+
+    x0 : `float`
+        the x-value of the first sample
+
+    dx : `float`
+        the x-spacing between samples
+
+    base : `int`, optional
+        the number of blocks from each level combined into a single block
+        of the next level, default: ``16``
+
+    Notes
+    -----
+    The pyramid needs ``2 / (base - 1)`` times as much memory as the
+    original data.
+    """
+    #: minimum number of blocks in the coarsest level of the pyramid
+    MIN_LEVEL_SIZE = 256
+
+    def __init__(self, data, x0, dx, base=16):
+        self.data = numpy.asarray(data).ravel()
+        self.x0 = float(x0)
+        self.dx = float(dx)
+        self.base = int(base)
+        #: `list` of ``(blocksize, mins, maxs)`` for each level
+        self.levels = [(1, self.data, self.data)]
+        mins = maxs = self.data
+        blocksize = 1
+        while mins.size >= self.MIN_LEVEL_SIZE * self.base:
+            mins, maxs = _reduce_blocks(mins, maxs, self.base)
+            blocksize *= self.base
+            self.levels.append((blocksize, mins, maxs))
+
+    def __len__(self):
+        return self.data.size
+
+    @property
+    def xspan(self):
+        """The ``(start, end)`` x-span of the data
+        """
+        return self.x0, self.x0 + self.data.size * self.dx
+
+    def _index_range(self, xmin, xmax):
+        """Find the range of samples covering ``[xmin, xmax]``
+
+        One extra sample is included either side, so that lines continue
+        to the edge of the view.
+        """
+        size = self.data.size
+        if xmin is None:
+            start = 0
+        else:
+            start = int(floor((xmin - self.x0) / self.dx)) - 1
+        if xmax is None:
+            end = size
+        else:
+            end = int(ceil((xmax - self.x0) / self.dx)) + 2
+        return min(max(start, 0), size), min(max(end, 0), size)
+
+    def extrema(self, xmin=None, xmax=None, npix=1000):
+        """Return the minimum and maximum of the data in each pixel column
+
+        Parameters
+        ----------
+        xmin, xmax : `float`, optional
+            the x-range of the view, defaults to the full span of the data
+
+        npix : `int`, optional
+            the number of pixel columns across the view
+
+        Returns
+        -------
+        x, mins, maxs : `numpy.ndarray`
+            the x-value of the start of each column, and the minimum and
+            maximum of the data in that column; if the view contains no
+            more than ``2 * npix`` samples, the raw data are returned
+            (with ``mins is maxs``)
+        """
+        if xmin is not None and xmax is not None and xmin > xmax:
+            xmin, xmax = xmax, xmin
+        start, end = self._index_range(xmin, xmax)
+        count = end - start
+        npix = max(int(npix), 1)
+
+        # few enough samples to draw them all
+        if count <= 2 * npix:
+            data = self.data[start:end]
+            return self.x0 + numpy.arange(start, end) * self.dx, data, data
+
+        # find the coarsest level with blocks no bigger than one pixel
+        perpix = count / npix
+        blocksize, mins, maxs = [lvl for lvl in self.levels if
+                                 lvl[0] <= perpix][-1]
+        first = start // blocksize
+        last = -(-end // blocksize)
+
+        # combine blocks into pixel columns
+        group = max(int(perpix // blocksize), 1)
+        mins, maxs = _reduce_blocks(mins[first:last], maxs[first:last], group)
+        x = self.x0 + (first + numpy.arange(mins.size) * group) * (
+            blocksize * self.dx)
+        return x, mins, maxs
+
+    def envelope(self, xmin=None, xmax=None, npix=1000):
+        """Return the vertices of a line tracing the data envelope
+
+        Each pixel column is drawn as a vertical stroke from the minimum
+        to the maximum of the data in that column, which is visually
+        identical to drawing all of the data.
+
+        See `MinMaxPyramid.extrema` for details of the arguments.
+
+        Returns
+        -------
+        x, y : `numpy.ndarray`
+            the vertices to draw
+        """
+        x, mins, maxs = self.extrema(xmin, xmax, npix)
+        if mins is maxs:  # raw data
+            return x, mins
+        return (numpy.repeat(x, 2),
+                numpy.column_stack((mins, maxs)).ravel())
+
+
+def _reduceat(data, factor, axis, method):
+    """Reduce ``data`` in blocks of ``factor`` elements along ``axis``
+    """
+    if factor <= 1:
+        return data
+    size = data.shape[axis]
+    idx = numpy.arange(0, size, factor)
+    if method == 'max':
+        return numpy.fmax.reduceat(data, idx, axis=axis)
+    if method == 'min':
+        return numpy.fmin.reduceat(data, idx, axis=axis)
+    counts = numpy.diff(numpy.append(idx, size)).astype(float)
+    shape = [1] * data.ndim
+    shape[axis] = counts.size
+    return numpy.add.reduceat(data, idx, axis=axis) / counts.reshape(shape)
+
+
+class BlockImage(object):
+    """Block-reduced views of a regularly-sampled 2-D array
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        the 2-D data array, with the x-axis along the first dimension
+
+    x0, dx : `float`
+        the x-value of the first edge of the first column, and the
+        x-spacing between columns
+
+    y0, dy : `float`
+        the y-value of the lower edge of the first row, and the
+        y-spacing between rows
+
+    method : `str`, optional
+        the method used to combine the elements of each block, one of
+        ``'max'`` (default), ``'min'``, or ``'mean'``; the ``'max'`` and
+        ``'min'`` methods ignore NaNs
+    """
+    METHODS = ('max', 'min', 'mean')
+
+    def __init__(self, data, x0, dx, y0, dy, method='max'):
+        self.data = numpy.asarray(data)
+        if self.data.ndim != 2:
+            raise ValueError("BlockImage data must be 2-dimensional")
+        if method not in self.METHODS:
+            raise ValueError("Unrecognised block reduction method %r, "
+                             "select one of: %s"
+                             % (method, ', '.join(self.METHODS)))
+        self.x0 = float(x0)
+        self.dx = float(dx)
+        self.y0 = float(y0)
+        self.dy = float(dy)
+        self.method = method
+        self._cache = (None, None)
+
+    @property
+    def shape(self):
+        """The shape of the full data array
+        """
+        return self.data.shape
+
+    @property
+    def extent(self):
+        """The ``(left, right, bottom, top)`` extent of the full array
+        """
+        nx, ny = self.data.shape
+        return (self.x0, self.x0 + nx * self.dx,
+                self.y0, self.y0 + ny * self.dy)
+
+    @staticmethod
+    def _index_range(vmin, vmax, x0, dx, size, factor, first=0):
+        """Find the range of elements overlapping ``[vmin, vmax]``
+
+        The start is aligned to a whole block (counting from element
+        ``first``), so that the blocks do not shift as the view is panned,
+        and at least one element is always included.
+        """
+        if vmin is None:
+            start = first
+        else:
+            start = int(floor((vmin - x0) / dx))
+        if vmax is None:
+            end = size
+        else:
+            end = int(ceil((vmax - x0) / dx))
+        start = min(max(start, first), size - 1)
+        start = first + (start - first) // factor * factor
+        return start, min(max(end, start + 1), size)
+
+    def view(self, xlim=None, ylim=None, xstep=None, ystep=None,
+             positive=False):
+        """Return the block-reduced data covering a view
+
+        Parameters
+        ----------
+        xlim, ylim : `tuple` of `float`, optional
+            the ``(min, max)`` limits of the view, defaults to the full
+            extent of the data
+
+        xstep, ystep : `float`, optional
+            the (smallest) size of a pixel along each axis, in data units,
+            defaults to no reduction along that axis
+
+        positive : `bool`, optional
+            if `True` exclude rows whose lower edge is not positive, e.g.
+            for display on a log-scaled y-axis, default: `False`
+
+        Returns
+        -------
+        image : `numpy.ndarray`
+            the reduced array, with the y-axis along the first dimension,
+            suitable for :meth:`~matplotlib.axes.Axes.imshow` with
+            ``origin='lower'``
+
+        extent : `tuple`
+            the ``(left, right, bottom, top)`` extent of the image
+
+        Raises
+        ------
+        ValueError
+            if ``positive=True`` and no rows have a positive lower edge
+        """
+        nx, ny = self.data.shape
+        xfac = 1 if not xstep else max(int(xstep // self.dx), 1)
+        yfac = 1 if not ystep else max(int(ystep // self.dy), 1)
+        xlim = sorted(xlim) if xlim is not None else (None, None)
+        ylim = sorted(ylim) if ylim is not None else (None, None)
+        if positive:
+            first = max(int(floor(-self.y0 / self.dy)) + 1, 0)
+            if first >= ny:
+                raise ValueError("No rows with positive lower edge")
+        else:
+            first = 0
+        xs, xe = self._index_range(xlim[0], xlim[1], self.x0, self.dx, nx,
+                                   xfac)
+        ys, ye = self._index_range(ylim[0], ylim[1], self.y0, self.dy, ny,
+                                   yfac, first=first)
+
+        # re-use the last result if nothing has changed
+        key = (xs, xe, xfac, ys, ye, yfac)
+        if self._cache[0] == key:
+            return self._cache[1]
+
+        data = self.data[xs:xe, ys:ye]
+        if self.method == 'mean' and data.dtype.kind in 'biu':
+            data = data.astype(float)
+        data = _reduceat(data, xfac, 0, self.method)
+        data = _reduceat(data, yfac, 1, self.method)
+        extent = (self.x0 + xs * self.dx, self.x0 + xe * self.dx,
+                  self.y0 + ys * self.dy, self.y0 + ye * self.dy)
+        self._cache = (key, (data.T, extent))
+        return data.T, extent
+
+
+def band_vertices(x, lower, upper):
+    """Return the polygons filling the region between two curves
+
+    Parameters
+    ----------
+    x : `numpy.ndarray`
+        the x-values of each point
+
+    lower, upper : `numpy.ndarray`
+        the lower and upper y-values of the band at each point, a non-finite
+        value in either array breaks the band
+
+    Returns
+    -------
+    polygons : `list` of `numpy.ndarray`
+        a list of ``(N, 2)`` vertex arrays, one for each unbroken region
+        of the band, suitable for `~matplotlib.collections.PolyCollection`
+    """
+    valid = numpy.isfinite(lower) & numpy.isfinite(upper)
+    edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(
+        ([0], valid.view('i1'), [0]))))
+    polys = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        xs = x[start:end]
+        polys.append(numpy.column_stack((
+            numpy.concatenate((xs, xs[::-1])),
+            numpy.concatenate((upper[start:end], lower[start:end][::-1])))))
+    return polys
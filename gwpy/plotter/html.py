@@ -19,7 +19,14 @@
 """Construct HTML maps on top of images.
 """
 
-from six.moves import zip
+import json
+
+try:
+    from html import escape
+except ImportError:  # python < 3
+    from cgi import escape
+
+from six import string_types
 
 import numpy
 
@@ -57,7 +64,7 @@ HTML_MAP = """
         var $popup = $('<div />').appendTo('body');
         $popup.attr('id', id_);
         $popup.addClass('gwpy-tooltip');
-        $popup.html('<p>'+$(this).attr('alt')+'</p>');
+        $('<p />').text($(this).attr('alt')).appendTo($popup);
         $popup.css({{position: 'absolute', top: y, left: x+20}});
     }});
     $('area').mouseleave(function() {{
@@ -66,6 +73,77 @@ HTML_MAP = """
 </script>
 """
 
+HTML_JSON_MAP = """
+<img id="{map}" src="{png}" width="{width}" height="{height}"/>
+<script>
+(function() {{
+    // [x, y, alt, href] for each point, in drawing order
+    var points = {data};
+    var radius = {radius};
+    var img = document.getElementById('{map}');
+    // bucket points by pixel cell, so that hover lookups are fast
+    var cells = {{}};
+    for (var i = 0; i < points.length; i++) {{
+        var key = Math.floor(points[i][0] / radius) + ',' +
+                  Math.floor(points[i][1] / radius);
+        (cells[key] = cells[key] || []).push(points[i]);
+    }}
+    function find(event) {{
+        var rect = img.getBoundingClientRect();
+        var x = event.clientX - rect.left;
+        var y = event.clientY - rect.top;
+        var cx = Math.floor(x / radius), cy = Math.floor(y / radius);
+        var best = null, dist = radius * radius;
+        for (var i = cx - 1; i <= cx + 1; i++) {{
+            for (var j = cy - 1; j <= cy + 1; j++) {{
+                var cell = cells[i + ',' + j] || [];
+                for (var k = 0; k < cell.length; k++) {{
+                    var d = Math.pow(cell[k][0] - x, 2) +
+                            Math.pow(cell[k][1] - y, 2);
+                    if (d <= dist) {{
+                        best = cell[k];
+                        dist = d;
+                    }}
+                }}
+            }}
+        }}
+        return best;
+    }}
+    var popup = document.createElement('div');
+    popup.className = 'gwpy-tooltip';
+    popup.style.position = 'absolute';
+    popup.style.display = 'none';
+    var text = popup.appendChild(document.createElement('p'));
+    document.body.appendChild(popup);
+    img.addEventListener('mousemove', function(event) {{
+        var point = find(event);
+        if (point === null) {{
+            popup.style.display = 'none';
+            img.style.cursor = '';
+            return;
+        }}
+        text.textContent = point[2];
+        popup.style.left = (event.pageX + 20) + 'px';
+        popup.style.top = event.pageY + 'px';
+        popup.style.display = 'block';
+        img.style.cursor = 'pointer';
+    }});
+    img.addEventListener('mouseleave', function() {{
+        popup.style.display = 'none';
+    }});
+    img.addEventListener('click', function(event) {{
+        var point = find(event);
+        if (point !== null && point[3] !== '#') {{
+            window.location.href = point[3];
+        }}
+    }});
+}})();
+</script>
+"""
+
+# radius (pixels) of the sensitive area around each point
+AREA_RADIUS = 5
+
 
 def html_area(x, y, href='#', alt=None, shape='circle', **kwargs):
     """Format the HTML <area /> tag for this (x, y) <map> element
@@ -88,20 +166,21 @@ def html_area(x, y, href='#', alt=None, shape='circle', **kwargs):
     Returns
     -------
     area : `str`
-        formatted line of HTML defining <area />
+        formatted line of HTML defining <area />, with all attribute
+        values HTML-escaped
     """
     if alt is None:
         alt = '(%s, %s)' % (x, y)
-    out = ('<area shape="{shape}" coords="{x:d},{y:d},5" href="{href}" '
-           'alt="{alt}" '.format(shape=shape, x=x, y=y, href=href, alt=alt))
-    for attr, value in kwargs.items():
-        out += '%s="%s" ' % (attr, value)
-    out += '/>'
-    return out
+    attrs = [('shape', shape), ('coords', '%d,%d,%d' % (x, y, AREA_RADIUS)),
+             ('href', href), ('alt', alt)] + list(kwargs.items())
+    return '<area %s />' % ' '.join(
+        '%s="%s"' % (attr, escape(str(value), quote=True)) for
+        attr, value in attrs)
 
 
 def map_artist(artist, filename, mapname='points', shape='circle',
-               popup=None, title=None, standalone=True, jquery=JQUERY_URL):
+               popup=None, title=None, standalone=True, jquery=JQUERY_URL,
+               mode='map', merge=True):
     """Construct an HTML <map> to annotate the given `artist`
 
     Parameters
@@ -119,7 +198,7 @@ def map_artist(artist, filename, mapname='points', shape='circle',
         shape for <area> tag, default: ``'circle'``
     popup : `function`, `iterable`, optional
         content for alt tooltip popup, either a function that can be
-        called with the (x, y) pixel coords of each data point, or an
+        called with the data values of each point, or an
         iterable with one `str` text per data point
     standalone : `bool`, optional
         wrap map HTML with required HTML5 header and footer tags,
@@ -128,6 +207,14 @@ def map_artist(artist, filename, mapname='points', shape='circle',
         title name for standalone HTML page
     jquery : `str`, optional
         URL of jquery script
+    mode : `str`, optional
+        type of map to write, either ``'map'`` (default) for an HTML
+        ``<map>`` with one ``<area>`` per point, or ``'json'`` to embed the
+        points as JSON with a small script that finds the point under the
+        cursor, which is much lighter for very large maps
+    merge : `bool`, optional
+        if `True` (default) only map the last-drawn of any points that
+        fall on the same pixel
 
     Returns
     -------
@@ -153,11 +240,13 @@ def map_artist(artist, filename, mapname='points', shape='circle',
         data = numpy.asarray(artist.get_data())
 
     return _map(data, axes, filename, mapname=mapname, shape=shape,
-                popup=popup, title=title, standalone=standalone, jquery=jquery)
+                popup=popup, title=title, standalone=standalone, jquery=jquery,
+                mode=mode, merge=merge)
 
 
 def map_data(data, axes, filename, mapname='points', shape='circle',
-             popup=None, title=None, standalone=True, jquery=JQUERY_URL):
+             popup=None, title=None, standalone=True, jquery=JQUERY_URL,
+             mode='map', merge=True):
     """Construct an HTML <map> to annotate the given `artist`
 
     Parameters
@@ -176,7 +265,7 @@ def map_data(data, axes, filename, mapname='points', shape='circle',
         shape for <area> tag, default: ``'circle'``
     popup : `function`, `iterable`, optional
         content for alt tooltip popup, either a function that can be
-        called with the (x, y) pixel coords of each data point, or an
+        called with the data values of each point, or an
         iterable with one `str` text per data point
     standalone : `bool`, optional
         wrap map HTML with required HTML5 header and footer tags,
@@ -185,6 +274,14 @@ def map_data(data, axes, filename, mapname='points', shape='circle',
         title name for standalone HTML page
     jquery : `str`, optional
         URL of jquery script
+    mode : `str`, optional
+        type of map to write, either ``'map'`` (default) for an HTML
+        ``<map>`` with one ``<area>`` per point, or ``'json'`` to embed the
+        points as JSON with a small script that finds the point under the
+        cursor, which is much lighter for very large maps
+    merge : `bool`, optional
+        if `True` (default) only map the last-drawn of any points that
+        fall on the same pixel
 
     Returns
     -------
@@ -205,52 +302,104 @@ def map_data(data, axes, filename, mapname='points', shape='circle',
         axes = axes.gca()
 
     return _map(data, axes, filename, mapname=mapname, title=title,
-                shape=shape, standalone=standalone, jquery=jquery)
+                shape=shape, popup=popup, standalone=standalone,
+                jquery=jquery, mode=mode, merge=merge)
+
+
+def _default_popups(data):
+    """Format the default ``'(x, y, ...)'`` popup text for each point
+    """
+    ncol = data.shape[1] if data.ndim == 2 else 1
+    fmt = '(%s)' % ', '.join(['%s'] * ncol)
+    # format each column in one call, then combine
+    cols = [data[:, i].astype(str) for i in range(ncol)]
+    return [fmt % row for row in zip(*cols)]
+
+
+def _json_script(obj):
+    """Serialise ``obj`` as JSON that is safe to embed in a ``<script>``
+
+    The characters ``<``, ``>``, and ``&`` are written as unicode escapes,
+    so that strings in ``obj`` cannot close the script element.
+    """
+    return json.dumps(obj).replace('<', '\\u003c').replace(
+        '>', '\\u003e').replace('&', '\\u0026')
+
+
+def _select(values, index, name, npoints):
+    """Select the per-point values for the mapped points
+    """
+    if len(values) != npoints:
+        raise ValueError("%s map with %d elements doesn't match %d data "
+                         "points" % (name, len(values), npoints))
+    if isinstance(values, numpy.ndarray):
+        return values[index]
+    return [values[i] for i in index]
 
 
 def _map(data, axes, filename, href='#', mapname='points', popup=None,
-         title='', shape='circle', standalone=True, jquery=JQUERY_URL):
+         title='', shape='circle', standalone=True, jquery=JQUERY_URL,
+         mode='map', merge=True):
     """Build an HTML <map> for a data set on some axes.
     """
+    if mode not in ('map', 'json'):
+        raise ValueError("Unrecognised map mode %r, select one of 'map' or "
+                         "'json'" % mode)
     fig = axes.figure
-    transform = axes.transData
-
-    # get 2-d pixels
-    pixels = numpy.round(transform.transform(data[:, :2])).astype(int)
+    data = numpy.asarray(data)
+    npoints = data.shape[0]
 
     # get figure size
     dpi = fig.dpi
     width = int(fig.get_figwidth() * dpi)
     height = int(fig.get_figheight() * dpi)
 
-    npix = pixels.shape[0]
-    # configure hrefs
-    if isinstance(href, str):
-        hrefs = [href] * npix
+    # get 2-d pixels for all points at once, and keep those inside the axes
+    pixels = axes.transData.transform(data[:, :2].astype(float))
+    (x0, y0), (x1, y1) = axes.bbox.get_points()
+    with numpy.errstate(invalid='ignore'):
+        inside = ((pixels[:, 0] >= x0) & (pixels[:, 0] <= x1) &
+                  (pixels[:, 1] >= y0) & (pixels[:, 1] <= y1))
+    index = numpy.flatnonzero(inside)[::-1]  # last-drawn first
+    pixels = numpy.round(pixels[index]).astype(int)
+    pixels[:, 1] = height - pixels[:, 1]
+
+    # merge points on the same pixel, keeping the last-drawn
+    if merge and index.size:
+        keep = numpy.sort(numpy.unique(
+            pixels[:, 0] * (height + 1) + pixels[:, 1],
+            return_index=True)[1])
+        index = index[keep]
+        pixels = pixels[keep]
+
+    # configure hrefs and popups for the mapped points only
+    if isinstance(href, string_types):
+        hrefs = [href] * index.size
     elif callable(href):
-        hrefs = map(href, data)
+        hrefs = [href(*data[i]) for i in index]
     else:
-        hrefs = numpy.asarray(href)
-    if not len(hrefs) == npix:
-        raise ValueError("href map with %d elements doesn't match %d data "
-                         "points" % (hrefs.shape[0], npix))
+        hrefs = _select(href, index, 'href', npoints)
+    if popup is None:
+        alts = _default_popups(data[index])
+    elif callable(popup):
+        alts = [popup(*data[i]) for i in index]
+    else:
+        alts = _select(popup, index, 'popup', npoints)
 
     # build map
-    areas = []
-    for i, (datum, pixel, href) in enumerate(
-            zip(data[::-1], pixels[::-1], hrefs[::-1])):
-        if callable(popup):
-            alt = popup(*datum)
-        elif popup is None:
-            alt = '(%s)' % (', '.join(map(str, datum)))
-        else:
-            alt = popup[-i-1]
-        x = pixel[0]
-        y = height - pixel[1]
-        areas.append(html_area(x, y, href=href, alt=alt, shape=shape))
-
-    hmap = HTML_MAP.format(title=title, png=filename, map=mapname, width=width,
-                           height=height, data='\n    '.join(areas))
+    xpix, ypix = pixels.T.tolist()
+    if mode == 'json':
+        points = [[x, y, str(alt), str(ref)] for
+                  x, y, alt, ref in zip(xpix, ypix, alts, hrefs)]
+        hmap = HTML_JSON_MAP.format(png=filename, map=mapname, width=width,
+                                    height=height, radius=AREA_RADIUS,
+                                    data=_json_script(points))
+    else:
+        areas = '\n    '.join([
+            html_area(x, y, href=ref, alt=alt, shape=shape) for
+            x, y, alt, ref in zip(xpix, ypix, alts, hrefs)])
+        hmap = HTML_MAP.format(title=title, png=filename, map=mapname,
+                               width=width, height=height, data=areas)
     if standalone:
         return (HTML_HEADER.format(title=title, jquery=jquery) + hmap +
                 HTML_FOOTER)
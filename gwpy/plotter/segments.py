@@ -21,13 +21,15 @@
 
 import operator
 
+import numpy
+
 from six import string_types
 from six.moves import reduce
 
 from matplotlib.artist import allow_rasterization
 from matplotlib.ticker import (Formatter, MultipleLocator, NullLocator)
 from matplotlib.projections import register_projection
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PolyCollection
 from matplotlib.patches import Rectangle
 try:
     from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -40,6 +42,7 @@ from ..segments import (Segment, SegmentList, DataQualityFlag, DataQualityDict)
 from .timeseries import (TimeSeriesPlot, TimeSeriesAxes)
 from .decorators import auto_refresh
 from .text import to_string
+from .utils import rectangle_vertices
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -168,8 +171,8 @@ class SegmentAxes(TimeSeriesAxes):
 
         Returns
         -------
-        collection : `~matplotlib.patches.PatchCollection`
-            list of `~matplotlib.patches.Rectangle` patches
+        collection : `~matplotlib.collections.PolyCollection`
+            collection of segment polygons
         """
         out = []
         for lab, flag in flags.items():
@@ -208,8 +211,8 @@ class SegmentAxes(TimeSeriesAxes):
 
         Returns
         -------
-        collection : `~matplotlib.patches.PatchCollection`
-            list of `~matplotlib.patches.Rectangle` patches
+        collection : `~matplotlib.collections.PolyCollection`
+            collection of segment polygons
         """
         # get y axis position
         if y is None:
@@ -268,27 +271,25 @@ class SegmentAxes(TimeSeriesAxes):
             y-axis value for new segments
 
         collection : `bool`, default: `True`
-            add all patches as a
-            `~matplotlib.collections.PatchCollection`, doesn't seem
-            to work for hatched rectangles
+            add all segments as a single
+            `~matplotlib.collections.PolyCollection`, otherwise add one
+            `~matplotlib.patches.Rectangle` patch per segment
 
         label : `str`, optional
             custom descriptive name to print as y-axis tick label
 
         **kwargs
             any other keyword arguments acceptable for
-            `~matplotlib.patches.Rectangle`
+            `~matplotlib.collections.PolyCollection`, or
+            `~matplotlib.patches.Rectangle` if ``collection=False``
 
         Returns
         -------
-        collection : `~matplotlib.patches.PatchCollection`
-            list of `~matplotlib.patches.Rectangle` patches
+        collection : `~matplotlib.collections.PolyCollection`
+            collection of segment polygons
         """
         if y is None:
             y = self.get_next_y()
-        patches = []
-        for seg in segmentlist:
-            patches.append(self.build_segment(seg, y, **kwargs))
         try:
             if not self.epoch:
                 self.set_epoch(segmentlist[0][0])
@@ -297,7 +298,7 @@ class SegmentAxes(TimeSeriesAxes):
         except IndexError:
             pass
         if collection:
-            coll = PatchCollection(patches, len(patches) != 0)
+            coll = self.build_segment_collection(segmentlist, y, **kwargs)
             coll.set_rasterized(rasterized)
             if collection == 'ignore':
                 coll._ignore = True
@@ -314,7 +315,8 @@ class SegmentAxes(TimeSeriesAxes):
             coll.set_label(to_string(label))
         else:
             out = []
-            for p in patches:
+            for seg in segmentlist:
+                p = self.build_segment(seg, y, **kwargs)
                 p.set_label(label)
                 p.set_rasterized(rasterized)
                 label = ''
@@ -342,7 +344,7 @@ class SegmentAxes(TimeSeriesAxes):
         Returns
         -------
         collections : `list`
-            list of `~matplotlib.patches.PatchCollection` sets for
+            list of `~matplotlib.collections.PolyCollection` sets for
             each segmentlist
         """
         if y is None:
@@ -396,6 +398,58 @@ class SegmentAxes(TimeSeriesAxes):
         return Rectangle((segment[0], y0), width=width, height=height,
                          **kwargs)
 
+    @staticmethod
+    def build_segment_collection(segmentlist, y, height=.8, valign='center',
+                                 fill=True, **kwargs):
+        """Build a `~matplotlib.collections.PolyCollection` to display
+        a `~gwpy.segments.SegmentList`
+
+        The vertices for all segments are built as a single array, so this
+        is much faster than building one `~matplotlib.patches.Rectangle`
+        per segment for long lists.
+
+        Parameters
+        ----------
+        segmentlist : `~gwpy.segments.SegmentList`
+            list of ``[start, stop)`` GPS segments
+
+        y : `float`
+            y-axis position for segments
+
+        height : `float`, optional, default: 0.8
+            height (in y-axis units) for segments
+
+        valign : `str`
+            alignment of segments on y-axis value:
+            `top`, `center`, or `bottom`
+
+        fill : `bool`, optional, default: `True`
+            whether to fill the segments
+
+        **kwargs
+            any other keyword arguments acceptable for
+            `~matplotlib.collections.PolyCollection`
+
+        Returns
+        -------
+        collection : `~matplotlib.collections.PolyCollection`
+            a collection with one polygon per segment
+        """
+        if valign.lower() == 'bottom':
+            y0 = y
+        elif valign.lower() in ['center', 'centre']:
+            y0 = y - height/2.
+        elif valign.lower() == 'top':
+            y0 = y - height
+        else:
+            raise ValueError("valign must be one of 'top', 'center', or "
+                             "'bottom'")
+        segs = numpy.asarray(segmentlist, dtype=float).reshape((-1, 2))
+        verts = rectangle_vertices(segs[:, 0], segs[:, 1], y0, y0 + height)
+        if not fill:
+            kwargs['facecolor'] = 'none'
+        return PolyCollection(verts, closed=False, **kwargs)
+
     def set_xlim(self, *args, **kwargs):
         out = super(SegmentAxes, self).set_xlim(*args, **kwargs)
         _xlim = self.get_xlim()
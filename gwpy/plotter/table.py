@@ -38,10 +38,20 @@ from ..time import LIGOTimeGPS
 from .core import Plot
 from .timeseries import (TimeSeriesAxes, TimeSeriesPlot)
 from .frequencyseries import FrequencySeriesPlot
-from .utils import float_to_latex
+from .utils import (float_to_latex, rectangle_vertices)
 
 __all__ = ['EventTableAxes', 'EventTablePlot']
 
+# fractional (x, y) offset of the lower-left corner of a tile from its
+# anchor point, in units of the tile (width, height)
+TILE_ANCHORS = {
+    'll': (0., 0.),
+    'lr': (1., 0.),
+    'ul': (0., 1.),
+    'ur': (1., 1.),
+    'center': (.5, .5),
+}
+
 
 class EventTableAxes(TimeSeriesAxes):
     """Custom `Axes` for an ~gwpy.plotter.EventTablePlot`.
@@ -116,30 +126,17 @@ class EventTableAxes(TimeSeriesAxes):
         # rank data by size or colour
         sizecol = size_by or size_by_log or (size_range and color)
         if color:
-            cdata = table[color]
+            cdata = numpy.asarray(table[color])
         if sizecol:
-            sdata = table[sizecol]
-        if color and sizecol:
-            zipped = list(zip(xdata, ydata, cdata, sdata))
-            zipped.sort(key=lambda row: row[2])
-            try:
-                xdata, ydata, cdata, sdata = map(numpy.asarray, zip(*zipped))
-            except ValueError:
-                pass
-        elif sizecol:
-            zipped = list(zip(xdata, ydata, sdata))
-            zipped.sort(key=lambda row: row[-1])
-            try:
-                xdata, ydata, sdata = map(numpy.asarray, zip(*zipped))
-            except ValueError:
-                pass
-        elif color:
-            zipped = list(zip(xdata, ydata, cdata))
-            zipped.sort(key=lambda row: row[-1])
-            try:
-                xdata, ydata, cdata = map(numpy.asarray, zip(*zipped))
-            except ValueError:
-                pass
+            sdata = numpy.asarray(table[sizecol])
+        if color or sizecol:
+            order = numpy.argsort(cdata if color else sdata, kind='mergesort')
+            xdata = numpy.asarray(xdata)[order]
+            ydata = numpy.asarray(ydata)[order]
+            if color:
+                cdata = cdata[order]
+            if sizecol:
+                sdata = sdata[order]
 
         # work out sizing
         if sizecol:
@@ -177,43 +174,28 @@ class EventTableAxes(TimeSeriesAxes):
 
         # get color and sort
         if color:
-            cdata = table[color]
-            zipped = list(zip(xdata, ydata, wdata, hdata, cdata))
-            zipped.sort(key=lambda row: row[-1])
-            try:
-                xdata, ydata, wdata, hdata, cdata = map(numpy.asarray,
-                                                        zip(*zipped))
-            except ValueError:
-                pass
+            cdata = numpy.asarray(table[color])
+            order = numpy.argsort(cdata, kind='mergesort')
+            xdata, ydata, wdata, hdata, cdata = (
+                numpy.asarray(a)[order] for
+                a in (xdata, ydata, wdata, hdata, cdata))
+        else:
+            xdata, ydata, wdata, hdata = map(numpy.asarray,
+                                             (xdata, ydata, wdata, hdata))
 
         # construct vertices
-        if anchor == 'll':
-            verts = [((x, y), (x, y+height), (x+width, y+height),
-                      (x+width, y)) for (x, y, width, height) in
-                     zip(xdata, ydata, wdata, hdata)]
-        elif anchor == 'lr':
-            verts = [((x-width, y), (x-width, y+height), (x, y+height),
-                      (x, y)) for (x, y, width, height) in
-                     zip(xdata, ydata, wdata, hdata)]
-        elif anchor == 'ul':
-            verts = [((x, y-height), (x, y), (x+width, y),
-                      (x+width, y-height)) for (x, y, width, height) in
-                     zip(xdata, ydata, wdata, hdata)]
-        elif anchor == 'ur':
-            verts = [((x-width, y-height), (x-width, y), (x, y),
-                      (x, y-height)) for (x, y, width, height) in
-                     zip(xdata, ydata, wdata, hdata)]
-        elif anchor == 'center':
-            verts = [((x-width/2., y-height/2.), (x-width/2., y+height/2.),
-                      (x+width/2., y+height/2.), (x+width/2., y-height/2.))
-                     for (x, y, width, height) in
-                     zip(xdata, ydata, wdata, hdata)]
-        else:
+        try:
+            xoff, yoff = TILE_ANCHORS[anchor]
+        except KeyError:
             raise ValueError("Unrecognised tile anchor '%s'." % anchor)
+        left = xdata - xoff * wdata
+        bottom = ydata - yoff * hdata
+        verts = rectangle_vertices(left, left + wdata, bottom, bottom + hdata)
 
         # build collection
         cmap = kwargs.pop('cmap', pyplot.rcParams['image.cmap'])
-        coll = collections.PolyCollection(verts, edgecolors=edgecolors,
+        coll = collections.PolyCollection(verts, closed=False,
+                                          edgecolors=edgecolors,
                                           linewidth=linewidth, **kwargs)
         if color:
             coll.set_array(cdata)
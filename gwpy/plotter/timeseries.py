@@ -20,6 +20,8 @@
 """
 
 import re
+from weakref import WeakKeyDictionary
+
 import numpy
 
 from matplotlib import (pyplot, colors, rcParams)
@@ -31,14 +33,18 @@ from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 from ..time import (Time, LIGOTimeGPS)
 from ..segments import SegmentList
-from . import text
+from . import (text, utils)
 from .core import Plot
 from .axes import Axes
 from .decorators import auto_refresh
+from .decimate import (MinMaxPyramid, BlockImage, band_vertices)
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 __all__ = ['TimeSeriesPlot', 'TimeSeriesAxes']
 
+# series longer than this are decimated for display by default
+DECIMATION_THRESHOLD = 2 ** 16
+
 
 class TimeSeriesAxes(Axes):
     """Custom `Axes` for a `~gwpy.plotter.TimeSeriesPlot`.
@@ -50,12 +56,19 @@ class TimeSeriesAxes(Axes):
         super(TimeSeriesAxes, self).__init__(*args, **kwargs)
         self.fmt_xdata = lambda t: LIGOTimeGPS(t)
         self.set_xlabel('_auto')
+        # map decimated artists to their MinMaxPyramid(s)
+        self._decimated = WeakKeyDictionary()
+        # map spectrogram images to their BlockImage
+        self._rasters = WeakKeyDictionary()
 
     @allow_rasterization
     def draw(self, *args, **kwargs):
         # dynamically set scaling
         if self.get_xscale() == 'auto-gps':
             self.auto_gps_scale()
+        # decimate long series for the current view
+        self.update_decimation()
+        self.update_rasters()
         # dynamically set x-axis label
         nolabel = self.get_xlabel() == '_auto'
         if nolabel:
@@ -120,6 +133,131 @@ class TimeSeriesAxes(Axes):
                                              auto=auto, **kw)
     set_xlim.__doc__ = Axes.set_xlim.__doc__
 
+    # -------------------------------------------
+    # level-of-detail decimation
+
+    def _get_npix(self):
+        return max(int(numpy.ceil(self.bbox.width)), 1)
+
+    @staticmethod
+    def _get_pyramid(series, decimate=None):
+        """Return a `MinMaxPyramid` for a series, if it should be decimated
+        """
+        if decimate is None:
+            decimate = series.size > DECIMATION_THRESHOLD
+        if not decimate or series.ndim != 1:
+            return None
+        try:
+            dx = series.dx.value
+        except AttributeError:  # irregular series
+            return None
+        return MinMaxPyramid(series.value, series.x0.value, dx)
+
+    def update_decimation(self):
+        """Recompute the displayed data of decimated series
+
+        Each decimated line is redrawn using the minimum and maximum of the
+        data in each pixel column of the current view, this method is
+        called automatically each time the axes are drawn, so that the
+        level of detail follows any changes to the view limits.
+        """
+        if not self._decimated:
+            return
+        xmin, xmax = self.get_xlim()
+        npix = self._get_npix()
+        for artist, pyramids in list(self._decimated.items()):
+            if artist.axes is not self:
+                continue
+            # update data without re-triggering a draw
+            callback, artist.stale_callback = artist.stale_callback, None
+            try:
+                if isinstance(pyramids, MinMaxPyramid):
+                    artist.set_data(*pyramids.envelope(xmin, xmax, npix))
+                else:
+                    artist.set_verts(band_vertices(*_band_extrema(
+                        pyramids, xmin, xmax, npix)))
+            finally:
+                artist.stale_callback = callback
+
+    def _get_pixel_size(self, axis):
+        """Return the smallest size (in data units) of a pixel along an axis
+
+        For non-linear scales (e.g. ``'log'``) the size of a pixel varies
+        across the view, so the smallest size is returned.
+        """
+        if axis is self.xaxis:
+            npix = self.bbox.width
+        else:
+            npix = self.bbox.height
+        vmin, vmax = sorted(axis.get_view_interval())
+        if npix < 1 or vmin == vmax:
+            return None
+        trans = axis.get_transform()
+        tmin, tmax = numpy.asarray(trans.transform(
+            numpy.array([vmin, vmax], dtype=float))).ravel()
+        step = (tmax - tmin) / npix
+        lower, upper = numpy.asarray(trans.inverted().transform(
+            numpy.array([tmin + step, tmax - step]))).ravel()
+        size = min(lower - vmin, vmax - upper)
+        return size if numpy.isfinite(size) and size > 0 else None
+
+    def update_rasters(self):
+        """Recompute the displayed data of block-reduced images
+
+        Each spectrogram image is redrawn from the part of the data inside
+        the current view, reduced in blocks no bigger than one pixel, this
+        method is called automatically each time the axes are drawn.
+        """
+        if not self._rasters:
+            return
+        xlim = self.get_xlim()
+        ylim = self.get_ylim()
+        xstep = self._get_pixel_size(self.xaxis)
+        ystep = self._get_pixel_size(self.yaxis)
+        logy = self.get_yscale() == 'log'
+        # set_extent re-scales the axes unless autoscaling is off
+        autox, autoy = self.get_autoscalex_on(), self.get_autoscaley_on()
+        self.set_autoscale_on(False)
+        try:
+            for image, block in list(self._rasters.items()):
+                if image.axes is not self:
+                    continue
+                callback, image.stale_callback = image.stale_callback, None
+                try:
+                    _update_raster(image, block, xlim, ylim, xstep, ystep,
+                                   logy=logy)
+                finally:
+                    image.stale_callback = callback
+        finally:
+            self.set_autoscalex_on(autox)
+            self.set_autoscaley_on(autoy)
+
+    def _plot_series(self, series, decimate=None, **kwargs):
+        """Plot a series as a line, decimating if required
+        """
+        pyramid = self._get_pyramid(series, decimate=decimate)
+        if pyramid is None:
+            return self.plot(series.times.value, series.value, **kwargs)
+        lines = self.plot(*pyramid.envelope(npix=self._get_npix()), **kwargs)
+        self._decimated[lines[0]] = pyramid
+        return lines
+
+    def _fill_between_series(self, series1, series2, decimate=None,
+                             **kwargs):
+        """Shade the region between two series, decimating if required
+        """
+        pyr1 = self._get_pyramid(series1, decimate=decimate)
+        pyr2 = self._get_pyramid(series2, decimate=decimate)
+        if (pyr1 is None or pyr2 is None or
+                (pyr1.x0, pyr1.dx, len(pyr1)) !=
+                (pyr2.x0, pyr2.dx, len(pyr2))):
+            return self.fill_between(series2.times.value, series1.value,
+                                     series2.value, **kwargs)
+        coll = self.fill_between(*_band_extrema(
+            (pyr1, pyr2), None, None, self._get_npix()), **kwargs)
+        self._decimated[coll] = (pyr1, pyr2)
+        return coll
+
     # -------------------------------------------
     # GWpy class plotting methods
 
@@ -156,7 +294,7 @@ class TimeSeriesAxes(Axes):
             return super(TimeSeriesAxes, self).plot(*args, **kwargs)
 
     @auto_refresh
-    def plot_timeseries(self, timeseries, **kwargs):
+    def plot_timeseries(self, timeseries, decimate=None, **kwargs):
         """Plot a `~gwpy.timeseries.TimeSeries` onto these
         axes
 
@@ -165,6 +303,13 @@ class TimeSeriesAxes(Axes):
         timeseries : `~gwpy.timeseries.TimeSeries`
             data to plot
 
+        decimate : `bool`, optional
+            if `True`, only draw the minimum and maximum of the data in
+            each pixel column of the current view, recomputed whenever the
+            view changes; this looks the same as drawing all of the data,
+            but is much faster for very long series; by default, series
+            longer than ``DECIMATION_THRESHOLD`` samples are decimated
+
         **kwargs
             any other keyword arguments acceptable for
             :meth:`~matplotlib.Axes.plot`
@@ -182,7 +327,7 @@ class TimeSeriesAxes(Axes):
         kwargs.setdefault('label', text.to_string(timeseries.name))
         if not self.epoch:
             self.set_epoch(timeseries.x0)
-        line = self.plot(timeseries.times.value, timeseries.value, **kwargs)
+        line = self._plot_series(timeseries, decimate=decimate, **kwargs)
         if len(self.lines) == 1 and timeseries.size:
             self.set_xlim(*timeseries.xspan)
         if not self.get_ylabel():
@@ -190,7 +335,8 @@ class TimeSeriesAxes(Axes):
         return line
 
     @auto_refresh
-    def plot_timeseries_mmm(self, mean_, min_=None, max_=None, **kwargs):
+    def plot_timeseries_mmm(self, mean_, min_=None, max_=None, decimate=None,
+                            **kwargs):
         """Plot a `TimeSeries` onto these axes, with shaded regions
 
         The ``mean_`` `TimeSeries` is plotted normally, while the ``min_``
@@ -208,6 +354,10 @@ class TimeSeriesAxes(Axes):
         max_ : `~gwpy.timeseries.TimeSeries`
             second data set to shade to ``mean_``
 
+        decimate : `bool`, optional
+            whether to decimate the lines and shading for display, see
+            :meth:`~TimeSeriesAxes.plot_timeseries`
+
         **kwargs
             any other keyword arguments acceptable for
             :meth:`~matplotlib.Axes.plot`
@@ -229,31 +379,32 @@ class TimeSeriesAxes(Axes):
             for a full description of acceptable ``*args`` and ``**kwargs``
         """
         # plot mean
-        line1 = self.plot_timeseries(mean_, **kwargs)[0]
+        line1 = self.plot_timeseries(mean_, decimate=decimate, **kwargs)[0]
         # plot min and max
         kwargs.pop('label', None)
         color = kwargs.pop('color', line1.get_color())
         linewidth = kwargs.pop('linewidth', line1.get_linewidth()) / 2
         if min_ is not None:
-            a = self.plot(min_.times.value, min_.value, color=color,
-                          linewidth=linewidth, **kwargs)
-            b = self.fill_between(min_.times.value, mean_.value, min_.value,
-                                  alpha=0.1, color=color,
-                                  rasterized=kwargs.get('rasterized'))
+            a = self._plot_series(min_, decimate=decimate, color=color,
+                                  linewidth=linewidth, **kwargs)
+            b = self._fill_between_series(
+                mean_, min_, decimate=decimate, alpha=0.1, color=color,
+                rasterized=kwargs.get('rasterized'))
         else:
             a = b = None
         if max_ is not None:
-            c = self.plot(max_.times.value, max_.value, color=color,
-                          linewidth=linewidth, **kwargs)
-            d = self.fill_between(max_.times.value, mean_.value, max_.value,
-                                  alpha=0.1, color=color,
-                                  rasterized=kwargs.get('rasterized'))
+            c = self._plot_series(max_, decimate=decimate, color=color,
+                                  linewidth=linewidth, **kwargs)
+            d = self._fill_between_series(
+                mean_, max_, decimate=decimate, alpha=0.1, color=color,
+                rasterized=kwargs.get('rasterized'))
         else:
             c = d = None
         return line1, a, b, c, d
 
     @auto_refresh
-    def plot_spectrogram(self, spectrogram, **kwargs):
+    def plot_spectrogram(self, spectrogram, imshow=None, downsample='max',
+                         **kwargs):
         """Plot a `~gwpy.spectrogram.core.Spectrogram` onto
         these axes
 
@@ -262,18 +413,35 @@ class TimeSeriesAxes(Axes):
         spectrogram : `~gwpy.spectrogram.core.Spectrogram`
             data to plot
 
+        imshow : `bool`, optional
+            if `True` render the spectrogram as an image, otherwise
+            use :meth:`~matplotlib.axes.Axes.pcolormesh`; by default
+            spectrograms with regular time and frequency axes are rendered
+            as an image, which is much faster to draw and save
+
+        downsample : `str`, optional
+            the method with which to combine elements of an image that fall
+            within a single pixel, one of ``'max'`` (default), ``'min'``,
+            or ``'mean'``, or `False` to not downsample the image;
+            only used when ``imshow=True``
+
         **kwargs
             any other keyword arguments acceptable for
-            :meth:`~matplotlib.Axes.plot`
+            :meth:`~matplotlib.axes.Axes.imshow` or
+            :meth:`~matplotlib.axes.Axes.pcolormesh`
 
         Returns
         -------
-        Line2D
-            the `~matplotlib.lines.Line2D` for this line layer
+        image : `~matplotlib.image.AxesImage`
+            the image layer, if ``imshow=True``
+
+        mesh : `~matplotlib.collections.QuadMesh`
+            the mesh layer, if ``imshow=False``
 
         See Also
         --------
-        matplotlib.axes.Axes.plot
+        matplotlib.axes.Axes.imshow
+        matplotlib.axes.Axes.pcolormesh
             for a full description of acceptable ``*args`` and ``**kwargs``
         """
         # rescue grid settings
@@ -288,13 +456,30 @@ class TimeSeriesAxes(Axes):
         kwargs['norm'] = norm
         if not self.epoch:
             self.set_epoch(spectrogram.x0)
-        x = numpy.concatenate((spectrogram.times.value,
-                               [spectrogram.span[-1]]))
-        y = numpy.concatenate((spectrogram.frequencies.value,
-                               [spectrogram.band[-1]]))
-        X, Y = numpy.meshgrid(x, y, copy=False, sparse=True)
-        mesh = self.pcolormesh(X, Y, spectrogram.value.T, **kwargs)
-        if len(self.collections) == 1:
+
+        # find regular sampling
+        try:
+            steps = (spectrogram.dx.value, spectrogram.dy.value)
+        except AttributeError:  # irregular time or frequency axis
+            steps = None
+        if imshow is None:
+            imshow = steps is not None
+        elif imshow and steps is None:
+            raise ValueError("Cannot render spectrogram with irregular "
+                             "time or frequency axis as an image, please "
+                             "give imshow=False")
+
+        if imshow:
+            layer = self._imshow_spectrogram(spectrogram, downsample,
+                                             **kwargs)
+        else:
+            x = numpy.concatenate((spectrogram.times.value,
+                                   [spectrogram.span[-1]]))
+            y = numpy.concatenate((spectrogram.frequencies.value,
+                                   [spectrogram.band[-1]]))
+            X, Y = numpy.meshgrid(x, y, copy=False, sparse=True)
+            layer = self.pcolormesh(X, Y, spectrogram.value.T, **kwargs)
+        if len(self.collections) + len(self.images) == 1:
             self.set_xlim(*spectrogram.span)
             self.set_ylim(*spectrogram.band)
         if not self.get_ylabel():
@@ -309,12 +494,77 @@ class TimeSeriesAxes(Axes):
             self.yaxis.grid(True, 'major')
         if grid[3]:
             self.yaxis.grid(True, 'minor')
-        return mesh
+        return layer
+
+    def _imshow_spectrogram(self, spectrogram, downsample='max', **kwargs):
+        """Render a regularly-sampled spectrogram as an image
+        """
+        block = BlockImage(spectrogram.value, spectrogram.x0.value,
+                           spectrogram.dx.value, spectrogram.y0.value,
+                           spectrogram.dy.value, method=downsample or 'max')
+        kwargs.setdefault('origin', 'lower')
+        kwargs.setdefault('aspect', 'auto')
+        kwargs.setdefault('interpolation', 'nearest')
+        if kwargs['origin'] != 'lower':
+            raise ValueError("Spectrograms can only be drawn with "
+                             "origin='lower'")
+        # draw a (reduced) image of the full data to set the data limits,
+        # the displayed data are updated for the view at each draw
+        if downsample:
+            nx, ny = block.shape
+            width = max(int(self.bbox.width), 1)
+            height = max(int(self.bbox.height), 1)
+            data, extent = block.view(
+                xstep=(nx * block.dx) / width,
+                ystep=(ny * block.dy) / height)
+        else:
+            data, extent = block.view()
+        image = self.imshow(data, extent=extent, **kwargs)
+        if downsample:
+            self._rasters[image] = block
+        return image
+
+
+def _update_raster(image, block, xlim, ylim, xstep, ystep, logy=False):
+    """Update a spectrogram image for the given view
+    """
+    try:
+        data, extent = block.view(xlim, ylim, xstep, ystep, positive=logy)
+    except ValueError:  # no rows can be drawn on a log scale
+        data, extent = block.view(xlim, ylim, xstep, ystep)
+    image.set_data(data)
+    image.set_extent(extent)
 
 
 register_projection(TimeSeriesAxes)
 
 
+def _band_extrema(pyramids, xmin, xmax, npix):
+    """Return the decimated lower and upper edges of a band between series
+    """
+    pyr1, pyr2 = pyramids
+    x, min1, max1 = pyr1.extrema(xmin, xmax, npix)
+    min2, max2 = pyr2.extrema(xmin, xmax, npix)[1:]
+    return x, numpy.fmin(min1, min2), numpy.fmax(max1, max2)
+
+
+def _artist_kwargs(data, kwargs):
+    """Return the keyword arguments from ``kwargs`` that apply to ``data``
+
+    Options that only apply to a `~gwpy.timeseries.TimeSeries`, or to a
+    `~gwpy.spectrogram.Spectrogram`, are removed when plotting anything
+    else, so that they can be given for a figure that mixes data types.
+    """
+    from ..timeseries import TimeSeriesBase
+    from ..spectrogram import Spectrogram
+    skip = []
+    if not isinstance(data, TimeSeriesBase):
+        skip.extend(utils.TIMESERIES_PARAMS)
+    if not isinstance(data, Spectrogram):
+        skip.extend(utils.SPECTROGRAM_PARAMS)
+    return dict((key, val) for key, val in kwargs.items() if key not in skip)
+
+
 class TimeSeriesPlot(Plot):
     """`Figure` for displaying a `~gwpy.timeseries.TimeSeries`.
 
@@ -351,7 +601,7 @@ class TimeSeriesPlot(Plot):
         for data in axesdata:
             ax = self._add_new_axes(**axargs)
             for ts in data:
-                ax.plot(ts, **plotargs)
+                ax.plot(ts, **_artist_kwargs(ts, plotargs))
             if 'sharex' not in axargs and sharex is True:
                 axargs['sharex'] = ax
             if 'sharey' not in axargs and sharey is True:
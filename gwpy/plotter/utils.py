@@ -22,6 +22,8 @@
 import itertools
 import re
 
+import numpy
+
 from . import rcParams
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
@@ -42,7 +44,14 @@ LINE_PARAMS = [
 COLLECTION_PARAMS = [
     'cmap', 'vmin', 'vmax', 'marker', 's', 'norm', 'rasterized',
 ]
-ARTIST_PARAMS = set(LINE_PARAMS + COLLECTION_PARAMS)
+TIMESERIES_PARAMS = [
+    'decimate',
+]
+SPECTROGRAM_PARAMS = [
+    'imshow', 'downsample',
+]
+ARTIST_PARAMS = set(LINE_PARAMS + COLLECTION_PARAMS + TIMESERIES_PARAMS +
+                    SPECTROGRAM_PARAMS)
 LEGEND_PARAMS = [
     'loc', 'borderaxespad', 'ncol',
 ]
@@ -88,3 +97,30 @@ def marker_cycle(markers=None):
         return itertools.cycle(markers)
     else:
         return itertools.cycle(('o', 'x', '+', '^', 'D', 'H', '1'))
+
+
+def rectangle_vertices(left, right, bottom, top):
+    """Build the vertices of many axis-aligned rectangles at once
+
+    Parameters
+    ----------
+    left, right, bottom, top : `float`, array-like
+        the edges of each rectangle, arrays are broadcast against each other
+
+    Returns
+    -------
+    verts : `numpy.ndarray`
+        a ``(N, 5, 2)`` array of closed vertex loops, running
+        anticlockwise from the lower-left corner (as for
+        `~matplotlib.patches.Rectangle`), suitable for
+        `~matplotlib.collections.PolyCollection` with ``closed=False``
+    """
+    left, right, bottom, top = numpy.broadcast_arrays(
+        *(numpy.asarray(a, dtype=float).ravel() for a in
+          (left, right, bottom, top)))
+    verts = numpy.empty((left.size, 5, 2))
+    verts[:, (0, 3, 4), 0] = left[:, None]
+    verts[:, (1, 2), 0] = right[:, None]
+    verts[:, (0, 1, 4), 1] = bottom[:, None]
+    verts[:, (2, 3), 1] = top[:, None]
+    return verts
@@ -28,12 +28,11 @@ for handling multiple flags over the same global time interval.
 
 from __future__ import absolute_import
 
-import json
 import operator
 import re
 import warnings
-from io import StringIO
 from copy import (copy as shallowcopy, deepcopy)
+from functools import partial
 from math import (floor, ceil)
 from threading import Thread
 
@@ -43,6 +42,7 @@ from six.moves.urllib.error import (URLError, HTTPError)
 from six.moves.urllib.parse import urlparse
 from six.moves.queue import Queue
 
+import numpy
 from numpy import inf
 
 from astropy.io import registry as io_registry
@@ -61,6 +61,56 @@ re_IFO_TAG = re.compile(r"\A(?P<ifo>[A-Z]\d):(?P<tag>[^/]+)\Z")
 re_TAG_VERSION = re.compile(r"\A(?P<tag>[^/]+):(?P<version>\d+)\Z")
 
 
+# keyword arguments for DataQualityFlag._query_dqsegdb
+DQSEGDB_KWARGS = ('request', 'maxgap', 'cache')
+
+
+def _parse_query_segments(args):
+    """Parse query arguments into a `SegmentList`
+
+    ``args`` can be either a `SegmentList`, a single ``(start, end)``
+    pair, or two separate ``start, end`` arguments.
+    """
+    if len(args) == 1 and isinstance(args[0], SegmentList):
+        return args[0]
+    if len(args) == 1 and len(args[0]) == 2:
+        return SegmentList([Segment(to_gps(args[0][0]),
+                                    to_gps(args[0][1]))])
+    return SegmentList([Segment(*map(to_gps, args))])
+
+
+def _format_cache(cache):
+    """Format the ``cache`` keyword for segment database queries
+
+    Returns either `None` (no caching) or a
+    `~gwpy.io.dqsegdb.SegmentCache`.
+    """
+    from ..io.dqsegdb import SegmentCache
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return SegmentCache()
+    if isinstance(cache, string_types):
+        return SegmentCache(cache)
+    return cache
+
+
+def _pop_unused_kwargs(kwargs, used, method):
+    """Remove (with a warning) keyword arguments that ``method`` ignores
+
+    Earlier versions of the DQSegDB queries silently ignored any other
+    keyword arguments, so these are dropped rather than raising a
+    `TypeError`.
+    """
+    unused = sorted(key for key in kwargs if key not in used)
+    if unused:
+        warnings.warn("%s doesn't accept the keyword argument(s) %s, "
+                      "these will be ignored"
+                      % (method, ', '.join(map(repr, unused))))
+    for key in unused:
+        kwargs.pop(key)
+
+
 class DataQualityFlag(object):
     """A representation of a named set of segments.
 
@@ -465,26 +515,38 @@ class DataQualityFlag(object):
         url : `str`, optional, default: ``'https://segments.ligo.org'``
             URL of the segment database
 
+        maxgap : `float`, optional
+            the largest gap between query segments to span with a single
+            request, default: `numpy.inf` (one request per flag version)
+
+        cache : `bool`, `str`, `~gwpy.io.dqsegdb.SegmentCache`, optional
+            local cache of query results, either `True` to use the default
+            cache location, or the path of a cache file; only the parts of
+            the query not already covered by the cache are requested from
+            the server, default: `None` (no caching)
+
         Returns
         -------
         flag : `DataQualityFlag`
             A new `DataQualityFlag`, with the `known` and `active` lists
             filled appropriately.
         """
-        from dqsegdb import apicalls
+        from ..io.dqsegdb import DQSegDBClient
 
-        # parse arguments
-        if len(args) == 1 and isinstance(args[0], SegmentList):
-            qsegs = args[0]
-        elif len(args) == 1 and len(args[0]) == 2:
-            qsegs = SegmentList([Segment(to_gps(args[0][0]),
-                                         to_gps(args[0][1]))])
-        else:
-            qsegs = SegmentList([Segment(*map(to_gps, args))])
+        qsegs = _parse_query_segments(args)
+        url = kwargs.pop('url', 'https://segments.ligo.org')
+        _pop_unused_kwargs(kwargs, DQSEGDB_KWARGS,
+                           '%s.query_dqsegdb' % cls.__name__)
+        kwargs['cache'] = _format_cache(kwargs.get('cache'))
+        with DQSegDBClient(url) as client:
+            return cls._query_dqsegdb(client, flag, qsegs, **kwargs)
 
-        # get server
-        protocol, server = kwargs.pop(
-            'url', 'https://segments.ligo.org').split('://', 1)
+    @classmethod
+    def _query_dqsegdb(cls, client, flag, qsegs, request=None, maxgap=inf,
+                       cache=None):
+        """Query for a flag using an open `~gwpy.io.dqsegdb.DQSegDBClient`
+        """
+        from ..io.dqsegdb import DEFAULT_INCLUDE
 
         # parse flag
         out = cls(name=flag)
@@ -492,45 +554,30 @@ class DataQualityFlag(object):
             raise ValueError("Cannot parse ifo or tag (name) for flag %r"
                              % flag)
 
-        # other keyword arguments
-        request = kwargs.pop('request', 'metadata,active,known')
-
-        # process query
-        for start, end in qsegs:
-            if float(end) == +inf:
-                end = to_gps('now').seconds
-            if out.version is None:
-                data, versions, _ = apicalls.dqsegdbCascadedQuery(
-                    protocol, server, out.ifo, out.tag, request,
-                    int(start), int(end))
-                data['metadata'] = versions[-1]['metadata']
-            else:
-                try:
-                    data, _ = apicalls.dqsegdbQueryTimes(
-                        protocol, server, out.ifo, out.tag, out.version,
-                        request, int(start), int(end))
-                except HTTPError as e:
-                    if e.code == 404:  # if not found, annotate with flag name
-                        e.msg += ' [{0}]'.format(flag)
-                    raise
-            # read from json buffer
-            try:
-                new = cls.read(StringIO(json.dumps(data)), format='json')
-            except TypeError as e:
-                if 'initial_value must be unicode' in str(e):  # python2
-                    new = cls.read(StringIO(json.dumps(data).decode('utf-8')),
-                                   format='json')
-                else:
-                    raise
-            # restrict to query segments
-            segl = SegmentList([Segment(start, end)])
-            new.known &= segl
-            new.active &= segl
-            out += new
-            # replace metadata
-            out.description = new.description
-            out.isgood = new.isgood
+        # replace infinite end with 'now'
+        segarr = numpy.array(qsegs, dtype=float).reshape(-1, 2)
+        if (segarr[:, 1] == inf).any():
+            segarr[segarr[:, 1] == inf, 1] = int(to_gps('now'))
 
+        # process query (via the local cache, if given)
+        if cache is None:
+            query = client.query
+        else:
+            query = partial(cache.query, client)
+        try:
+            known, active, metadata = query(
+                out.ifo, out.tag, out.version, segarr,
+                include=request or DEFAULT_INCLUDE, maxgap=maxgap)
+        except HTTPError as e:
+            if e.code == 404:  # if not found, annotate with flag name
+                e.msg += ' [{0}]'.format(flag)
+            raise
+        out.known = SegmentList(map(Segment, known.tolist()))
+        out.active = SegmentList(map(Segment, active.tolist()))
+        if metadata:
+            out.description = metadata.get('flag_description', None)
+            out.isgood = not metadata.get('active_indicates_ifo_badness',
+                                          False)
         return out
 
     @classmethod
@@ -915,25 +962,36 @@ class DataQualityFlag(object):
 
 
 class _QueryDQSegDBThread(Thread):
-    """Threaded DQSegDB query
+    """Worker thread for DQSegDB queries
+
+    Each worker keeps a single connection to the server open, and
+    processes ``(index, flag)`` pairs from the input queue until it
+    receives `None`.
     """
-    def __init__(self, inqueue, outqueue, *args, **kwargs):
+    def __init__(self, inqueue, outqueue, url, qsegs, **kwargs):
         Thread.__init__(self)
         self.in_ = inqueue
         self.out = outqueue
-        self.args = args
+        self.url = url
+        self.qsegs = qsegs
         self.kwargs = kwargs
 
     def run(self):
-        i, flag = self.in_.get()
-        self.in_.task_done()
-        try:
-            self.out.put(
-                (i, DataQualityFlag.query_dqsegdb(flag, *self.args,
-                                                  **self.kwargs)))
-        except Exception as e:
-            self.out.put((i, e))
-        self.out.task_done()
+        from ..io.dqsegdb import DQSegDBClient
+        with DQSegDBClient(self.url) as client:
+            while True:
+                item = self.in_.get()
+                if item is None:
+                    self.in_.task_done()
+                    break
+                i, flag = item
+                try:
+                    result = DataQualityFlag._query_dqsegdb(
+                        client, flag, self.qsegs, **self.kwargs)
+                except Exception as e:
+                    result = e
+                self.out.put((i, result))
+                self.in_.task_done()
 
 
 class DataQualityDict(OrderedDict):
@@ -1105,34 +1163,54 @@ class DataQualityDict(OrderedDict):
         url : `str`, optional, default: ``'https://segments.ligo.org'``
             URL of the segment database.
 
+        nthreads : `int`, optional
+            the maximum number of flags to query in parallel, each using
+            a single (persistent) connection to the server, default: ``8``
+
+        maxgap : `float`, optional
+            the largest gap between query segments to span with a single
+            request, default: `numpy.inf` (one request per flag version)
+
+        cache : `bool`, `str`, `~gwpy.io.dqsegdb.SegmentCache`, optional
+            local cache of query results, see
+            :meth:`DataQualityFlag.query_dqsegdb` for details
+
         Returns
         -------
         flagdict : `DataQualityDict`
             An ordered `DataQualityDict` of (name, `DataQualityFlag`)
             pairs.
         """
+        from ..io.dqsegdb import MAX_CONNECTIONS
+
         # check on_error flag
         on_error = kwargs.pop('on_error', 'raise').lower()
         if on_error not in ['raise', 'warn', 'ignore']:
             raise ValueError("on_error must be one of 'raise', 'warn', "
                              "or 'ignore'")
 
-        # set up threading
+        # set up a bounded pool of worker threads
+        qsegs = _parse_query_segments(args)
+        url = kwargs.pop('url', 'https://segments.ligo.org')
+        nthreads = kwargs.pop('nthreads', None) or MAX_CONNECTIONS
+        _pop_unused_kwargs(kwargs, DQSEGDB_KWARGS,
+                           '%s.query_dqsegdb' % cls.__name__)
+        kwargs['cache'] = _format_cache(kwargs.get('cache'))
         inq = Queue()
         outq = Queue()
-        for i in range(len(flags)):
-            t = _QueryDQSegDBThread(inq, outq, *args, **kwargs)
-            t.setDaemon(True)
-            t.start()
         for i, flag in enumerate(flags):
             inq.put((i, flag))
+        for i in range(min(nthreads, len(flags))):
+            inq.put(None)
+            t = _QueryDQSegDBThread(inq, outq, url, qsegs, **kwargs)
+            t.setDaemon(True)
+            t.start()
 
         # capture output
         inq.join()
-        outq.join()
         new = cls()
-        results = list(zip(*sorted([outq.get() for i in range(len(flags))],
-                                   key=lambda x: x[0])))[1]
+        results = [r for _, r in sorted(
+            [outq.get() for i in range(len(flags))], key=lambda x: x[0])]
         for result, flag in zip(results, flags):
             if isinstance(result, Exception):
                 result.args = ('%s [%s]' % (str(result), str(flag)),)
@@ -1326,7 +1404,8 @@ class DataQualityDict(OrderedDict):
             if segments is None and source.netloc:
                 try:
                     tmp = {key: self[key].query(
-                        self[key].name, self[key].known, **kwargs)}
+                        self[key].name, self[key].known,
+                        url=source.geturl(), **kwargs)}
                 except URLError as e:
                     if on_error == 'ignore':
                         pass
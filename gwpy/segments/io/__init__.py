@@ -19,11 +19,19 @@
 """Input/output routines for the `gwpy.segments` classes
 """
 
-from . import (  # pylint: disable=unused-import
-    ligolw,  # LIGO_LW XML
-    segwizard,  # LIGO SegWizard ASCII
-    hdf5,  # HDF5
-    json,  # segments-web.ligo.org JSON
-)
+from ...io import registry as io_registry
+
+from ..segments import SegmentList
+from ..flag import (DataQualityFlag, DataQualityDict)
+
+# build the read/write docstrings once, not once per format
+with io_registry.delay_doc_updates(SegmentList, DataQualityFlag,
+                                   DataQualityDict):
+    from . import (  # pylint: disable=unused-import
+        ligolw,  # LIGO_LW XML
+        segwizard,  # LIGO SegWizard ASCII
+        hdf5,  # HDF5
+        json,  # segments-web.ligo.org JSON
+    )
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
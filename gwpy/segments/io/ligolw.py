@@ -23,17 +23,183 @@ import datetime
 
 from six import string_types
 
+import numpy
+
 from ...time import (LIGOTimeGPS, to_gps)
 from ...io import registry
-from ...io.ligolw import (identify_ligolw, write_tables)
+from ...io.ligolw import (identify_ligolw, write_tables, iter_tables,
+                          unquote)
 from ...io.cache import (file_list, FILE_LIKE)
-from ...segments import (Segment, DataQualityFlag, DataQualityDict)
+from ...segments import (Segment, SegmentList, DataQualityFlag,
+                         DataQualityDict)
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
 
 # -- read ---------------------------------------------------------------------
 
+SEGMENT_TABLES = ('segment_definer', 'segment_summary', 'segment')
+
+SEGMENT_COLUMNS = ('segment_def_id', 'ifos', 'name', 'version',
+                   'start_time', 'start_time_ns', 'end_time', 'end_time_ns')
+
+
+def _flag_name(ifos, name, version):
+    """Format the name of a flag from its segment_definer columns
+    """
+    if ifos and name:
+        name = ':'.join([''.join(ifos), name])
+        if version is not None:
+            name += ':%d' % version
+        return name
+    return None
+
+
+def _int_column(tokens):
+    """Convert an array of integer tokens, treating null values as 0
+    """
+    tokens = numpy.asarray(tokens)
+    if not tokens.size:
+        return numpy.zeros(0, dtype=numpy.int64)
+    return numpy.where(tokens == '', '0', tokens).astype(numpy.int64)
+
+
+def _segment_columns(tokens):
+    """Parse a segment or segment_summary stream into arrays
+
+    Returns
+    -------
+    ids : `numpy.ndarray`
+        the (raw) ``segment_def_id`` of each row
+
+    times : `numpy.ndarray`
+        ``(nrows, 4)`` array of ``start_time, start_time_ns, end_time,
+        end_time_ns``
+    """
+    ids = numpy.array(tokens['segment_def_id'], dtype=str)
+
+    def _get(name):
+        try:
+            return _int_column(tokens[name])
+        except KeyError:  # column not present, fill with zeros
+            return numpy.zeros(ids.size, dtype=numpy.int64)
+
+    times = numpy.column_stack([_get(name) for name in (
+        'start_time', 'start_time_ns', 'end_time', 'end_time_ns')])
+    return ids, times
+
+
+def _read_ligolw_segment_tables(source):
+    """Read the segment tables from a LIGO_LW file as arrays
+
+    Returns
+    -------
+    definers : `list` of `tuple`
+        ``(segment_def_id, flag name)`` pairs for each segment definer
+
+    known, active : `list` of `tuple`
+        ``(ids, times)`` arrays from each segment_summary and segment
+        table, see `_segment_columns`
+    """
+    from glue.ligolw.lsctables import instrumentsproperty
+
+    definers = []
+    known = []
+    active = []
+    for name, _, tokens in iter_tables(source, SEGMENT_TABLES,
+                                       columns=SEGMENT_COLUMNS):
+        if name == 'segment_definer':
+            ids = tokens['segment_def_id']
+            empty = [''] * len(ids)
+            for id_, ifos, flag, version in zip(ids, *(
+                    unquote(tokens.get(col, empty)) for
+                    col in ('ifos', 'name', 'version'))):
+                definers.append((id_, _flag_name(
+                    instrumentsproperty.get(ifos), flag,
+                    None if version is None else int(version))))
+        elif name == 'segment_summary':
+            known.append(_segment_columns(tokens))
+        else:
+            active.append(_segment_columns(tokens))
+    return definers, known, active
+
+
+def _read_ligolw_segment_document(files, contenthandler):
+    """Read the segment tables from LIGO_LW files via a glue Document
+
+    Returns the same as `_read_ligolw_segment_tables`
+    """
+    from glue.ligolw import lsctables
+    from glue.ligolw.ligolw import Document
+    from glue.ligolw.utils.ligolw_add import ligolw_add
+
+    lsctables.use_in(contenthandler)
+    xmldoc = Document()
+    ligolw_add(xmldoc, files, non_lsc_tables_ok=True,
+               contenthandler=contenthandler)
+
+    definers = [(row.segment_def_id, _flag_name(
+        row.get_ifos(), row.name, row.version)) for
+        row in lsctables.SegmentDefTable.get_table(xmldoc)]
+
+    def _columns(table):
+        ids = numpy.array([row.segment_def_id for row in table],
+                          dtype=object)
+        times = numpy.array([
+            (row.start_time, row.start_time_ns or 0, row.end_time,
+             row.end_time_ns or 0) for row in table],
+            dtype=numpy.int64).reshape(-1, 4)
+        return ids, times
+
+    return (definers,
+            [_columns(lsctables.SegmentSumTable.get_table(xmldoc))],
+            [_columns(lsctables.SegmentTable.get_table(xmldoc))])
+
+
+def _group_rows(tables, idmap, nflags):
+    """Split segment rows into a list of times arrays per flag
+
+    Each row is assigned to a flag by looking up its ``segment_def_id`` in
+    ``idmap`` (rows with unknown IDs are dropped), with the original row
+    order preserved within each flag.
+    """
+    out = [[] for _ in range(nflags)]
+    for ids, times in tables:
+        if not ids.size:
+            continue
+        if None in idmap:  # catch-all flag
+            out[idmap[None]].append(times)
+            continue
+        uniq, inverse = numpy.unique(ids, return_inverse=True)
+        lookup = numpy.array([idmap.get(id_, -1) for id_ in uniq])
+        flagidx = lookup[inverse]
+        order = numpy.argsort(flagidx, kind='mergesort')
+        counts = numpy.bincount(flagidx + 1, minlength=nflags + 1)
+        bounds = numpy.cumsum(counts)
+        for k in range(nflags):
+            if counts[k+1]:
+                out[k].append(times[order[bounds[k]:bounds[k+1]]])
+    return out
+
+
+def _to_segmentlist(times, gpstype):
+    """Convert a ``(N, 4)`` times array into a `SegmentList`
+    """
+    if not times:
+        return SegmentList()
+    times = numpy.concatenate(times)
+    if gpstype in (float, numpy.float64):
+        segs = (times[:, ::2] + times[:, 1::2] * 1e-9).tolist()
+        return SegmentList(map(Segment, segs))
+    if gpstype is LIGOTimeGPS:
+        return SegmentList([
+            Segment(LIGOTimeGPS(a, an), LIGOTimeGPS(b, bn)) for
+            a, an, b, bn in times.tolist()])
+    return SegmentList([
+        Segment(gpstype(LIGOTimeGPS(a, an)), gpstype(LIGOTimeGPS(b, bn))) for
+        a, an, b, bn in times.tolist()])
+
+
 def read_ligolw_dict(f, flags=None, gpstype=LIGOTimeGPS, coalesce=False,
                      contenthandler=None, nproc=1):
     """Read segments for the given flag from the LIGO_LW XML file.
@@ -45,6 +211,11 @@ def read_ligolw_dict(f, flags=None, gpstype=LIGOTimeGPS, coalesce=False,
     flags : `list`, `None`, optional
         list of flags to read or `None` to read all into a single
         `DataQualityFlag`.
+    contenthandler : `~glue.ligolw.ligolw.LIGOLWContentHandler`, optional
+        SAX content handler to use to build a full
+        :class:`~glue.ligolw.ligolw.Document`, by default the segment
+        tables are streamed directly from each file, skipping all other
+        tables
 
     Returns
     -------
@@ -59,88 +230,62 @@ def read_ligolw_dict(f, flags=None, gpstype=LIGOTimeGPS, coalesce=False,
                                     contenthandler=contenthandler,
                                     format='cache', nproc=nproc)
 
-    from glue.ligolw import lsctables
-    from glue.ligolw.ligolw import (Document, LIGOLWContentHandler)
-    from glue.ligolw.utils.ligolw_add import ligolw_add
-
-    if contenthandler is None:
-        contenthandler = LIGOLWContentHandler
-
-    lsctables.use_in(contenthandler)
-
-    # generate Document and populate
-    xmldoc = Document()
     files = [fp.name if isinstance(fp, FILE_LIKE) else fp
              for fp in file_list(f)]
-    ligolw_add(xmldoc, files, non_lsc_tables_ok=True,
-               contenthandler=contenthandler)
-
-    # read segment definers and generate DataQualityFlag object
-    seg_def_table = lsctables.SegmentDefTable.get_table(xmldoc)
+    if contenthandler is None:
+        tables = [_read_ligolw_segment_tables(fp) for fp in files]
+    else:
+        tables = [_read_ligolw_segment_document(files, contenthandler)]
 
     # find flags
     if isinstance(flags, string_types):
         flags = flags.split(',')
-    out = DataQualityDict()
-    id_ = dict()
+    names = []
     if flags is not None and len(flags) == 1 and flags[0] is None:
-        out[None] = DataQualityFlag()
-        id_[None] = []
-    for row in seg_def_table:
-        ifos = row.get_ifos()
-        name = row.name
-        if ifos and name:
-            name = ':'.join([''.join(row.get_ifos()), row.name])
-            if row.version is not None:
-                name += ':%d' % row.version
-        else:
-            name = None
-        if flags is None or name in flags:
-            out[name] = DataQualityFlag(name)
-            try:
-                id_[name].append(row.segment_def_id)
-            except (AttributeError, KeyError):
-                id_[name] = [row.segment_def_id]
-    if flags is None and not len(out.keys()):
+        names.append(None)
+    else:
+        for definers, _, _ in tables:
+            for _, name in definers:
+                if (flags is None or name in flags) and name not in names:
+                    names.append(name)
+    if flags is None and not names:
         raise RuntimeError("No segment definitions found in file.")
-    elif flags is not None and len(out.keys()) != len(flags):
+    elif flags is not None and len(names) != len(flags):
         for flag in flags:
-            if flag not in out:
+            if flag not in names:
                 raise ValueError("No segment definition found for flag=%r "
                                  "in file." % flag)
-    # read segment summary table as 'known'
-    seg_sum_table = lsctables.SegmentSumTable.get_table(xmldoc)
-    for row in seg_sum_table:
-        for flag in out:
-            if not id_[flag] or row.segment_def_id in id_[flag]:
-                try:
-                    s = row.get()
-                except AttributeError:
-                    s = row.start_time, row.end_time
-                out[flag].known.append(Segment(gpstype(s[0]), gpstype(s[1])))
-    for dqf in out:
-        if coalesce:
-            out[dqf].coalesce()
-    # read segment table as 'active'
-    seg_table = lsctables.SegmentTable.get_table(xmldoc)
-    for row in seg_table:
-        for flag in out:
-            if not id_[flag] or row.segment_def_id in id_[flag]:
-                try:
-                    s = row.get()
-                except AttributeError:
-                    s = row.start_time, row.end_time
-                out[flag].active.append(Segment(gpstype(s[0]), gpstype(s[1])))
-    for dqf in out:
+
+    # map segment_def_id to flag index (separately for each file, since
+    # IDs are only unique within a single document) and group rows
+    flagidx = dict((name, i) for i, name in enumerate(names))
+    known = [[] for _ in names]
+    active = [[] for _ in names]
+    for definers, ktables, atables in tables:
+        if names == [None]:
+            idmap = {None: 0}
+        else:
+            idmap = dict((id_, flagidx[name]) for id_, name in definers if
+                         name in flagidx)
+        for out, group in ((known, ktables), (active, atables)):
+            for k, times in enumerate(_group_rows(group, idmap, len(names))):
+                out[k].extend(times)
+
+    # convert to segments once for each flag
+    out = DataQualityDict()
+    for k, name in enumerate(names):
+        out[name] = DataQualityFlag(
+            name, known=_to_segmentlist(known[k], gpstype),
+            active=_to_segmentlist(active[k], gpstype))
         if coalesce:
-            out[dqf].coalesce()
+            out[name].coalesce()
     return out
 
 
 def read_ligolw_flag(fp, flag=None, **kwargs):
     """Read a single `DataQualityFlag` from a LIGO_LW XML file
     """
-    return read_ligolw_dict(fp, flags=flag, **kwargs).values()[0]
+    return list(read_ligolw_dict(fp, flags=flag, **kwargs).values())[0]
 
 
 # -- write --------------------------------------------------------------------
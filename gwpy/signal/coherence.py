@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Array-level utilities for many-channel coherence calculations
+
+These methods are used by :meth:`gwpy.timeseries.TimeSeriesDict.coherence_scan`
+to correlate a single reference signal against many witness signals,
+computing the segment FFTs of the reference only once.
+"""
+
+from __future__ import division
+
+import numpy
+from numpy import fft as npfft
+
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['segment_ffts', 'ReferenceFFT', 'coherence_from_reference',
+           'band_peaks']
+
+#: default number of segments to FFT in a single block
+CHUNK_SIZE = 64
+
+
+def _format_window(window, nfft):
+    if window is None:
+        return numpy.ones(nfft)
+    if isinstance(window, (str, tuple)):
+        return signal.get_window(window, nfft)
+    window = numpy.asarray(window)
+    if window.shape != (nfft,):
+        raise ValueError("window must be 1-D with length %d" % nfft)
+    return window
+
+
+def segment_ffts(data, nfft, noverlap=0, window='hann', chunksize=CHUNK_SIZE):
+    """Iterate over the windowed one-sided FFTs of overlapping segments
+
+    Segments are transformed in blocks of at most ``chunksize`` so that
+    the memory required is independent of the length of the input.
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        the input (1-D) data array
+
+    nfft : `int`
+        the number of samples per segment
+
+    noverlap : `int`, optional
+        the number of samples of overlap between segments
+
+    window : `str`, `numpy.ndarray`, optional
+        the window to apply to each (mean-detrended) segment
+
+    chunksize : `int`, optional
+        the maximum number of segments to transform in one block
+
+    Yields
+    ------
+    ffts : `numpy.ndarray`
+        a 2-D ``(nsegments, nfft // 2 + 1)`` array of complex FFTs
+    """
+    data = numpy.asarray(data)
+    nstep = nfft - noverlap
+    if nstep <= 0:
+        raise ValueError("overlap must be less than fftlength")
+    if data.size < nfft:
+        raise ValueError("fftlength cannot be greater than the duration "
+                         "of the input data")
+    window = _format_window(window, nfft)
+    nseg = 1 + (data.size - nfft) // nstep
+    offsets = numpy.arange(nfft)
+    for i in range(0, nseg, chunksize):
+        starts = numpy.arange(i, min(i + chunksize, nseg)) * nstep
+        segments = signal.detrend(data[starts[:, None] + offsets],
+                                  type='constant', axis=-1)
+        yield npfft.rfft(segments * window, axis=-1)
+
+
+class ReferenceFFT(object):
+    """The stored segment FFTs of a reference signal
+
+    Parameters
+    ----------
+    data : `numpy.ndarray`
+        the reference data array
+
+    nfft : `int`
+        the number of samples per segment
+
+    noverlap : `int`, optional
+        the number of samples of overlap between segments
+
+    window : `str`, `numpy.ndarray`, optional
+        the window to apply to each segment
+
+    Attributes
+    ----------
+    ffts : `numpy.ndarray`
+        2-D array of segment FFTs, one row per segment
+
+    power : `numpy.ndarray`
+        the sum of the squared magnitudes of the segment FFTs
+    """
+    def __init__(self, data, nfft, noverlap=0, window='hann'):
+        self.size = numpy.asarray(data).size
+        self.nfft = nfft
+        self.noverlap = noverlap
+        self.window = _format_window(window, nfft)
+        self.ffts = numpy.concatenate(list(segment_ffts(
+            data, nfft, noverlap=noverlap, window=self.window)))
+        self.power = (self.ffts.real ** 2 + self.ffts.imag ** 2).sum(axis=0)
+
+
+def coherence_from_reference(reference, data, chunksize=CHUNK_SIZE):
+    """Calculate the coherence between a stored reference and new data
+
+    The segment FFTs of ``data`` are streamed in blocks of ``chunksize``
+    segments, and only the cross-spectral and power sums are kept.
+
+    Parameters
+    ----------
+    reference : `ReferenceFFT`
+        the stored FFTs of the reference signal
+
+    data : `numpy.ndarray`
+        the witness data array, must be the same length (and sampled at
+        the same rate) as the reference data
+
+    chunksize : `int`, optional
+        the maximum number of segments to transform in one block
+
+    Returns
+    -------
+    coherence : `numpy.ndarray`
+        the magnitude-squared coherence at each frequency
+    """
+    data = numpy.asarray(data)
+    if data.size != reference.size:
+        raise ValueError("cannot calculate coherence between arrays of "
+                         "different length (%d vs %d)"
+                         % (reference.size, data.size))
+    csd = numpy.zeros(reference.ffts.shape[1], dtype=complex)
+    power = numpy.zeros(reference.ffts.shape[1])
+    i = 0
+    for block in segment_ffts(data, reference.nfft,
+                              noverlap=reference.noverlap,
+                              window=reference.window, chunksize=chunksize):
+        j = i + block.shape[0]
+        csd += (reference.ffts[i:j].conj() * block).sum(axis=0)
+        power += (block.real ** 2 + block.imag ** 2).sum(axis=0)
+        i = j
+    denom = reference.power * power
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        coh = (csd.real ** 2 + csd.imag ** 2) / denom
+    coh[denom == 0] = 0.
+    return coh
+
+
+def band_peaks(coherence, frequencies, bands):
+    """Find the peak coherence in each of a set of frequency bands
+
+    Parameters
+    ----------
+    coherence : `numpy.ndarray`
+        the coherence at each frequency
+
+    frequencies : `numpy.ndarray`
+        the frequency array for ``coherence``
+
+    bands : `list` of `tuple`
+        list of ``(flow, fhigh)`` pairs, each band is treated as the
+        semi-open interval ``[flow, fhigh)``
+
+    Returns
+    -------
+    peakf, peakc : `numpy.ndarray`
+        the frequency and value of the peak coherence in each band, bands
+        containing no frequency bins return ``nan`` for both
+    """
+    bands = numpy.asarray(bands, dtype=float).reshape(-1, 2)
+    peakf = numpy.empty(bands.shape[0])
+    peakc = numpy.empty(bands.shape[0])
+    peakf.fill(numpy.nan)
+    peakc.fill(numpy.nan)
+    lower = numpy.searchsorted(frequencies, bands[:, 0], side='left')
+    upper = numpy.searchsorted(frequencies, bands[:, 1], side='left')
+    for k, (i, j) in enumerate(zip(lower, upper)):
+        if j > i:
+            idx = i + coherence[i:j].argmax()
+            peakf[k] = frequencies[idx]
+            peakc[k] = coherence[idx]
+    return peakf, peakc
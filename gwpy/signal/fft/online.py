@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Incremental PSD estimation for streams of `TimeSeries` data
+
+The `OnlinePSD` keeps a ring buffer of single-segment periodograms, so
+that each new block of data only requires the FFTs of the new segments,
+rather than recalculating the full average from scratch.
+"""
+
+from __future__ import division
+
+import numpy
+from numpy import fft as npfft
+
+from astropy.units import Quantity
+
+from . import registry as fft_registry
+from .utils import scale_timeseries_unit
+from ..window import (canonical_name, recommended_overlap)
+from ...utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['OnlinePSD']
+
+# map registered method names to incremental averaging modes
+AVERAGES = {
+    'welch': 'mean',
+    'bartlett': 'mean',
+    'lal_welch': 'mean',
+    'lal_bartlett': 'mean',
+    'median': 'median',
+    'median_mean': 'median-mean',
+}
+
+
+def median_bias(n):
+    """Return the bias of the median of ``n`` exponentially-distributed
+    periodogram values
+
+    Parameters
+    ----------
+    n : `int`
+        the number of values (segments) being averaged
+
+    Returns
+    -------
+    bias : `float`
+        the ratio of the expected median to the expected mean
+    """
+    ii_2 = 2 * numpy.arange(1, (n - 1) // 2 + 1)
+    return 1 + numpy.sum(1. / (ii_2 + 1) - 1. / ii_2)
+
+
+class OnlinePSD(object):
+    """Incremental power spectral density estimator
+
+    Parameters
+    ----------
+    fftlength : `float`
+        number of seconds in single FFT
+
+    overlap : `float`, optional
+        number of seconds of overlap between FFTs, defaults to the
+        recommended overlap for the given window (if given), or 0
+
+    window : `str`, `numpy.ndarray`, optional
+        window function to apply to each segment prior to FFT,
+        see :func:`scipy.signal.get_window` for details on acceptable
+        formats
+
+    method : `str`, optional
+        name of the registered FFT-averaging method to emulate, one of
+        ``'welch'``, ``'bartlett'``, ``'lal-welch'``, ``'lal-bartlett'``,
+        ``'median'``, or ``'median-mean'``, default: ``'welch'``
+
+    nsegments : `int`, optional
+        the maximum number of segment periodograms to keep, defaults to
+        ``32``
+
+    alpha : `float`, optional
+        the weight given to each new segment in the exponential average,
+        defaults to ``1 / nsegments``
+
+    Examples
+    --------
+    >>> from gwpy.signal.fft.online import OnlinePSD
+    >>> estimator = OnlinePSD(4, method='median', nsegments=16)
+    >>> for block in blocks:  # e.g. a stream of `TimeSeries` data
+    ...     estimator.update(block)
+    ...     psd = estimator.psd()
+    """
+    def __init__(self, fftlength, overlap=None, window='hann',
+                 method='welch', nsegments=32, alpha=None):
+        # check method is registered, and get averaging mode
+        method = method.lower().replace('-', '_')
+        fft_registry.get_method(method, scaling='density')
+        try:
+            self.average = AVERAGES[method]
+        except KeyError:
+            raise ValueError("FFT method %r does not support incremental "
+                             "updates" % method)
+        if method.endswith('bartlett'):
+            overlap = 0
+        if isinstance(window, str):
+            window = canonical_name(window)
+        self.method = method
+        self.fftlength = Quantity(fftlength, 's').value
+        self.overlap = overlap
+        self.window = window
+        self.nsegments = int(nsegments)
+        self.alpha = 1. / self.nsegments if alpha is None else float(alpha)
+        self.reset()
+
+    def reset(self):
+        """Discard all stored data and periodograms
+        """
+        self.sample_rate = None
+        self.unit = None
+        self.channel = None
+        self.name = None
+        self.end = None
+        self._buffer = None
+        self._bufstart = None
+        self._times = None
+        self._periodograms = None
+        self._sum = None
+        self._exp = None
+        self._count = 0
+        self._next = 0
+
+    # -- properties -----------------------------
+
+    @property
+    def count(self):
+        """The number of segment periodograms currently stored
+        """
+        return min(self._count, self.nsegments)
+
+    @property
+    def epoch(self):
+        """The GPS start time of the oldest stored segment
+        """
+        if not self._count:
+            return None
+        if self._count <= self.nsegments:
+            return self._times[0]
+        return self._times[self._next]
+
+    @property
+    def frequencies(self):
+        """The frequency array of the PSD estimate
+        """
+        if self.sample_rate is None:
+            return None
+        return npfft.rfftfreq(self._nfft, d=1/self.sample_rate)
+
+    # -- updates --------------------------------
+
+    def _setup(self, timeseries):
+        rate = timeseries.sample_rate.to('Hertz').value
+        self.sample_rate = rate
+        self.unit = timeseries.unit
+        self.channel = timeseries.channel
+        self.name = timeseries.name
+        self._nfft = nfft = int(self.fftlength * rate)
+        if self.overlap is None and isinstance(self.window, str):
+            self._noverlap = recommended_overlap(self.window, nfft)
+        elif self.overlap is None:
+            self._noverlap = 0
+        else:
+            self._noverlap = int(Quantity(self.overlap, 's').value * rate)
+        if self._noverlap >= nfft:
+            raise ValueError("overlap must be less than fftlength")
+        if isinstance(self.window, (str, tuple)):
+            self._window = signal.get_window(self.window, nfft)
+        elif self.window is None:
+            self._window = numpy.ones(nfft)
+        else:
+            self._window = numpy.asarray(self.window)
+        # scipy.signal.welch 'density' normalisation
+        self._scale = 1. / (rate * (self._window ** 2).sum())
+        nfreq = nfft // 2 + 1
+        self._periodograms = numpy.zeros((self.nsegments, nfreq))
+        self._sum = numpy.zeros(nfreq)
+        self._times = numpy.zeros(self.nsegments)
+        self._buffer = numpy.zeros(0, dtype=timeseries.dtype)
+
+    def update(self, timeseries):
+        """Add a new block of data to this estimate
+
+        Only the segments completed by the new data are transformed, with
+        any trailing samples kept for the next update.
+        If the new data do not start where the previous block ended, the
+        incomplete segment from the previous block is discarded, but the
+        stored periodograms are kept.
+
+        Parameters
+        ----------
+        timeseries : `~gwpy.timeseries.TimeSeries`
+            the new data to add
+
+        Returns
+        -------
+        nnew : `int`
+            the number of new segments added to the estimate
+        """
+        if self.sample_rate is None:
+            self._setup(timeseries)
+        elif (timeseries.sample_rate.to('Hertz').value !=
+                self.sample_rate):
+            raise ValueError("Cannot update OnlinePSD (sample_rate=%s Hz) "
+                             "with data sampled at %s"
+                             % (self.sample_rate, timeseries.sample_rate))
+        t0 = timeseries.t0.value
+        # allow for floating-point error in the epoch of contiguous blocks
+        if self.end is None or abs(t0 - self.end) >= .5 / self.sample_rate:
+            self._buffer = self._buffer[:0]
+            self._bufstart = t0
+        self.end = t0 + timeseries.duration.value
+        data = numpy.concatenate((self._buffer, timeseries.value))
+
+        # find complete segments
+        nfft = self._nfft
+        nstep = nfft - self._noverlap
+        if data.size < nfft:
+            self._buffer = data
+            return 0
+        nseg = 1 + (data.size - nfft) // nstep
+        starts = numpy.arange(nseg) * nstep
+        # only the last nsegments can survive in the ring buffer
+        starts = starts[-self.nsegments:]
+        segments = data[starts[:, None] + numpy.arange(nfft)]
+        times = self._bufstart + starts / self.sample_rate
+        self._buffer = data[nseg * nstep:]
+        self._bufstart += nseg * nstep / self.sample_rate
+
+        ffts = npfft.rfft(signal.detrend(segments, type='constant', axis=-1) *
+                          self._window, axis=-1)
+        pgrams = (ffts.real ** 2 + ffts.imag ** 2) * self._scale
+        if nfft % 2:
+            pgrams[:, 1:] *= 2
+        else:
+            pgrams[:, 1:-1] *= 2
+
+        for pgram, time in zip(pgrams, times):
+            self._add(pgram, time)
+        return nseg
+
+    def _add(self, pgram, time):
+        idx = self._next
+        self._times[idx] = time
+        if self._count >= self.nsegments:
+            self._sum -= self._periodograms[idx]
+        self._periodograms[idx] = pgram
+        self._sum += pgram
+        if self._exp is None:
+            self._exp = pgram.copy()
+        else:
+            self._exp *= 1 - self.alpha
+            self._exp += self.alpha * pgram
+        self._count += 1
+        self._next = (idx + 1) % self.nsegments
+        # recompute the running sum once per cycle of the ring buffer,
+        # to stop rounding errors from accumulating
+        if self._next == 0:
+            self._sum = self._periodograms.sum(axis=0)
+
+    # -- outputs --------------------------------
+
+    def _ordered(self):
+        """Return the stored periodograms in time order
+        """
+        n = self.count
+        if self._count <= self.nsegments:
+            return self._periodograms[:n]
+        return numpy.roll(self._periodograms, -self._next, axis=0)
+
+    def _median(self, pgrams):
+        return numpy.median(pgrams, axis=0) / median_bias(pgrams.shape[0])
+
+    def psd(self, average=None):
+        """Return the current PSD estimate
+
+        Parameters
+        ----------
+        average : `str`, optional
+            the averaging to use, one of ``'mean'``, ``'median'``,
+            ``'median-mean'``, or ``'exponential'``, defaults to the
+            average corresponding to the ``method`` of this estimator
+
+        Returns
+        -------
+        psd : `~gwpy.frequencyseries.FrequencySeries`
+            the current PSD estimate
+        """
+        from ...frequencyseries import FrequencySeries
+        if not self._count:
+            raise ValueError("Cannot calculate PSD before any complete "
+                             "segments have been added")
+        if average is None:
+            average = self.average
+        average = average.lower().replace('_', '-')
+
+        if average == 'mean':
+            data = self._sum / self.count
+        elif average == 'exponential':
+            data = self._exp.copy()
+        elif average == 'median':
+            data = self._median(self._ordered())
+        elif average == 'median-mean':
+            pgrams = self._ordered()
+            if pgrams.shape[0] < 2:
+                raise ValueError("Cannot calculate median-mean PSD with "
+                                 "fewer than two segments")
+            data = (self._median(pgrams[::2]) +
+                    self._median(pgrams[1::2])) / 2.
+        else:
+            raise ValueError("Unrecognised PSD average %r" % average)
+
+        return FrequencySeries(
+            data, f0=0, df=1 / self.fftlength, epoch=self.epoch,
+            channel=self.channel, name=self.name,
+            unit=scale_timeseries_unit(self.unit, scaling='density'))
@@ -23,11 +23,12 @@ from __future__ import absolute_import
 
 import numpy
 
-import scipy.signal
-
 from ...frequencyseries import FrequencySeries
 from .utils import scale_timeseries_unit
 from . import registry as fft_registry
+from ...utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -56,9 +57,9 @@ def welch(timeseries, segmentlength, noverlap=None, **kwargs):
     scipy.signal.welch
     """
     # calculate PSD
-    f, psd_ = scipy.signal.welch(timeseries.value, noverlap=noverlap,
-                                 fs=timeseries.sample_rate.decompose().value,
-                                 nperseg=segmentlength, **kwargs)
+    f, psd_ = signal.welch(timeseries.value, noverlap=noverlap,
+                           fs=timeseries.sample_rate.decompose().value,
+                           nperseg=segmentlength, **kwargs)
     # generate FrequencySeries and return
     unit = scale_timeseries_unit(timeseries.unit,
                                  kwargs.get('scaling', 'density'))
@@ -167,10 +168,10 @@ def csd(timeseries, other, segmentlength, noverlap=None, **kwargs):
     scipy.signal.csd
     """
     # calculate CSD
-    f, csd_ = scipy.signal.csd(timeseries.value, other.value,
-                               noverlap=noverlap,
-                               fs=timeseries.sample_rate.decompose().value,
-                               nperseg=segmentlength, **kwargs)
+    f, csd_ = signal.csd(timeseries.value, other.value,
+                         noverlap=noverlap,
+                         fs=timeseries.sample_rate.decompose().value,
+                         nperseg=segmentlength, **kwargs)
     # generate FrequencySeries and return
     unit = scale_timeseries_unit(timeseries.unit,
                                  kwargs.get('scaling', 'density'))
@@ -28,13 +28,14 @@ from functools import wraps
 
 import numpy
 
-from scipy.signal import (get_window, periodogram)
-
 from astropy.units import Quantity
 
 from . import utils as fft_utils
 from ...utils import mp as mp_utils
 from ..window import (canonical_name, recommended_overlap)
+from ...utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -237,7 +238,7 @@ def average_spectrogram(timeseries, method_func, stride, *args, **kwargs):
             kwargs['plan'] = generate_fft_plan(nfft, dtype=timeseries.dtype)
     else:
         if isinstance(window, (str, tuple)):
-            window = get_window(window, nfft)
+            window = signal.get_window(window, nfft)
     # don't operate on None, let the method_func work out its own defaults
     if window is not None:
         kwargs['window'] = window
@@ -293,7 +294,7 @@ def spectrogram(timeseries, method_func, *args, **kwargs):
     # get window once (if given)
     window = kwargs.pop('window', None) or 'hann'
     if isinstance(window, (str, tuple)):
-        window = get_window(window, nfft)
+        window = signal.get_window(window, nfft)
 
     # set up single process Spectrogram method
     def _psd(ts):
@@ -337,7 +338,7 @@ def spectrogram(timeseries, method_func, *args, **kwargs):
 
     # normalize over-dense grid
     density = nfft // nstride
-    weights = get_window('triangle', density)
+    weights = signal.get_window('triangle', density)
     for i in range(nt):
         # get indices of overlapping columns
         x0 = max(0, i+1-density)
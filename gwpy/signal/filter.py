@@ -19,14 +19,16 @@
 """Extensions to `scipy.signal.signaltools`.
 """
 
+import numpy
 from numpy import (asarray, reshape)
 
-from scipy.signal.signaltools import (sosfilt, sosfilt_zi)
-from scipy.signal._arraytools import (axis_slice, axis_reverse, odd_ext,
-                                      even_ext, const_ext)
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
+_arraytools = LazyModule('scipy.signal._arraytools')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
-__all__ = ['sosfiltfilt']
+__all__ = ['sosfiltfilt', 'fftfilt', 'fftfiltfilt', 'BlockFilter']
 
 
 def sosfiltfilt(sos, x, axis=-1, padtype='odd', padlen=0):
@@ -54,16 +56,16 @@ def sosfiltfilt(sos, x, axis=-1, padtype='odd', padlen=0):
         # Make an extension of length `edge` at each
         # end of the input array.
         if padtype == 'even':
-            ext = even_ext(x, edge, axis=axis)
+            ext = _arraytools.even_ext(x, edge, axis=axis)
         elif padtype == 'odd':
-            ext = odd_ext(x, edge, axis=axis)
+            ext = _arraytools.odd_ext(x, edge, axis=axis)
         else:
-            ext = const_ext(x, edge, axis=axis)
+            ext = _arraytools.const_ext(x, edge, axis=axis)
     else:
         ext = x
 
     # Get the steady state of the filter's step response.
-    zi = sosfilt_zi(sos)
+    zi = signal.sosfilt_zi(sos)
 
     # Reshape zi and create x0 so that zi*x0 broadcasts
     # to the correct value for the 'zi' keyword argument
@@ -71,24 +73,561 @@ def sosfiltfilt(sos, x, axis=-1, padtype='odd', padlen=0):
     zi_shape = [1] * x.ndim
     zi_shape[axis] = zi.size
     zi = reshape(zi, zi_shape)
-    x0 = axis_slice(ext, stop=1, axis=axis)
+    x0 = _arraytools.axis_slice(ext, stop=1, axis=axis)
     zix0 = reshape(zi * x0, (sos.shape[0], 2))
 
     # Forward filter
-    (y, zf) = sosfilt(sos, ext, axis=axis, zi=zix0)
+    (y, zf) = signal.sosfilt(sos, ext, axis=axis, zi=zix0)
 
     # Backward filter
     # Create y0 so zi*y0 broadcasts appropriately.
-    y0 = axis_slice(y, start=-1, axis=axis)
+    y0 = _arraytools.axis_slice(y, start=-1, axis=axis)
     ziy0 = reshape(zi * y0, (sos.shape[0], 2))
 
-    (y, zf) = sosfilt(sos, axis_reverse(y, axis=axis), axis=axis, zi=ziy0)
+    (y, zf) = signal.sosfilt(sos, _arraytools.axis_reverse(y, axis=axis),
+                             axis=axis, zi=ziy0)
 
     # Reverse y
-    y = axis_reverse(y, axis=axis)
+    y = _arraytools.axis_reverse(y, axis=axis)
 
     if edge > 0:
         # Slice the actual signal from the extended signal.
-        y = axis_slice(y, start=edge, stop=-edge, axis=axis)
+        y = _arraytools.axis_slice(y, start=edge, stop=-edge, axis=axis)
 
     return y
+
+
+# -- FFT convolution ----------------------------------------------------------
+
+#: number of FIR taps above which FFT convolution is used by default
+FFT_FILTER_THRESHOLD = 128
+
+# keyword arguments accepted by fftfilt and fftfiltfilt
+FFT_FILTER_KWARGS = {
+    False: ('nfft',),
+    True: ('padtype', 'padlen', 'nfft'),
+}
+
+#: cache of FIR filter spectra, keyed by taps and FFT length
+FFT_FILTERS = {}
+
+
+def _fft_filter_size(ntaps, nsamp):
+    """Choose the FFT length for overlap-save convolution
+
+    Each block uses roughly four times as many samples as there are taps,
+    but never more than is needed to filter ``nsamp`` samples at once.
+    """
+    full = int(2 ** numpy.ceil(numpy.log2(ntaps + nsamp - 1)))
+    return min(int(2 ** numpy.ceil(numpy.log2(4 * ntaps))), full)
+
+
+def _fft_filter_spectrum(b, nfft):
+    """Return the (cached) one-sided FFT of ``b`` zero-padded to ``nfft``
+    """
+    key = (b.tobytes(), nfft)
+    try:
+        return FFT_FILTERS[key]
+    except KeyError:
+        if len(FFT_FILTERS) >= 16:  # don't let the cache grow forever
+            FFT_FILTERS.clear()
+        FFT_FILTERS[key] = spec = numpy.fft.rfft(b, n=nfft)
+        return spec
+
+
+def _overlap_save(b, x, history=None, nfft=None):
+    """Convolve ``x`` with ``b`` along the last axis using overlap-save
+
+    ``history`` gives the ``len(b) - 1`` input samples preceding ``x``
+    (default: zeros), so that the output matches
+    ``scipy.signal.lfilter(b, [1], x, zi=...)`` with the equivalent state.
+    """
+    ntaps = b.size
+    nsamp = x.shape[-1]
+    if nfft is None:
+        nfft = _fft_filter_size(ntaps, nsamp)
+    if nfft < ntaps:
+        raise ValueError("nfft must be at least the number of filter taps")
+    step = nfft - ntaps + 1
+    nblocks = -(-nsamp // step)
+    if history is None:
+        history = numpy.zeros(x.shape[:-1] + (ntaps - 1,))
+    pad = numpy.zeros(x.shape[:-1] + (nblocks * step - nsamp,))
+    ext = numpy.concatenate((history, x, pad), axis=-1)
+    spec = _fft_filter_spectrum(b, nfft)
+    out = numpy.empty(x.shape[:-1] + (nblocks * step,),
+                      dtype=numpy.result_type(b, x))
+    # transform a bounded number of blocks at a time to limit memory
+    chunk = max(1, 2 ** 20 // nfft)
+    offsets = numpy.arange(nfft)
+    for i in range(0, nblocks, chunk):
+        starts = numpy.arange(i, min(i + chunk, nblocks)) * step
+        segments = ext[..., starts[:, None] + offsets]
+        conv = numpy.fft.irfft(numpy.fft.rfft(segments, axis=-1) * spec,
+                               n=nfft, axis=-1)[..., ntaps-1:]
+        out[..., starts[0]:starts[-1]+step] = conv.reshape(
+            conv.shape[:-2] + (-1,))
+    return out[..., :nsamp]
+
+
+def fftfilt(b, x, axis=-1, nfft=None):
+    """Apply an FIR filter using FFT (overlap-save) convolution
+
+    This is equivalent to ``scipy.signal.lfilter(b, [1], x, axis=axis)``,
+    but is much faster for filters with many taps.
+
+    Parameters
+    ----------
+    b : `numpy.ndarray`
+        the FIR filter coefficients (taps)
+
+    x : `numpy.ndarray`
+        the data to filter
+
+    axis : `int`, optional
+        the axis of ``x`` along which to filter, default: ``-1``
+
+    nfft : `int`, optional
+        the FFT length of each overlap-save block, default is chosen
+        from the number of taps
+
+    Returns
+    -------
+    y : `numpy.ndarray`
+        the filtered data
+    """
+    b = numpy.atleast_1d(numpy.asarray(b, dtype=float))
+    x = numpy.moveaxis(asarray(x), axis, -1)
+    return numpy.moveaxis(_overlap_save(b, x, nfft=nfft), -1, axis)
+
+
+def fftfiltfilt(b, x, axis=-1, padtype='odd', padlen=None, nfft=None):
+    """Apply an FIR filter forward and backward using FFT convolution
+
+    This is equivalent to ``scipy.signal.filtfilt(b, [1], x, axis=axis)``,
+    including the padding and steady-state initial conditions.
+
+    Parameters
+    ----------
+    b : `numpy.ndarray`
+        the FIR filter coefficients (taps)
+
+    x : `numpy.ndarray`
+        the data to filter
+
+    axis : `int`, optional
+        the axis of ``x`` along which to filter, default: ``-1``
+
+    padtype : `str`, `None`, optional
+        type of extension to use for the padded signal, one of
+        ``'odd'``, ``'even'``, ``'constant'``, or `None`
+
+    padlen : `int`, optional
+        the number of samples by which to extend ``x`` at both ends,
+        defaults to ``3 * len(b)``
+
+    nfft : `int`, optional
+        the FFT length of each overlap-save block
+
+    Returns
+    -------
+    y : `numpy.ndarray`
+        the filtered data
+    """
+    b = numpy.atleast_1d(numpy.asarray(b, dtype=float))
+    x = numpy.moveaxis(asarray(x), axis, -1)
+    if padtype not in ['even', 'odd', 'constant', None]:
+        raise ValueError(("Unknown value '%s' given to padtype.  padtype "
+                          "must be 'even', 'odd', 'constant', or None.") %
+                         padtype)
+    if padtype is None:
+        edge = 0
+    elif padlen is None:
+        edge = 3 * b.size
+    else:
+        edge = padlen
+    if x.shape[-1] <= edge:
+        raise ValueError("The length of the input vector x must be at least "
+                         "padlen, which is %d." % edge)
+    if edge > 0:
+        ext = {'even': _arraytools.even_ext, 'odd': _arraytools.odd_ext,
+               'constant': _arraytools.const_ext}[padtype](x, edge, axis=-1)
+    else:
+        ext = x
+
+    # steady-state initial conditions are equivalent to a constant history
+    hist = numpy.ones(b.size - 1)
+    y = _overlap_save(b, ext, history=hist * ext[..., :1], nfft=nfft)
+    y = y[..., ::-1]
+    y = _overlap_save(b, y, history=hist * y[..., :1], nfft=nfft)[..., ::-1]
+    if edge > 0:
+        y = y[..., edge:-edge]
+    return numpy.moveaxis(y, -1, axis)
+
+
+def use_fftfilt(ftype, filt, threshold=None, filtfilt=False, **kwargs):
+    """Determine whether a parsed filter should use FFT convolution
+
+    Parameters
+    ----------
+    ftype : `str`
+        the filter type, as returned by `parse_filter`
+
+    filt
+        the filter, as returned by `parse_filter`
+
+    threshold : `int`, optional
+        the minimum number of taps for FFT convolution, defaults to
+        `FFT_FILTER_THRESHOLD`
+
+    filtfilt : `bool`, optional
+        whether the filter is to be applied forward and backward
+
+    **kwargs
+        other keyword arguments to be passed to the filter method
+
+    Returns
+    -------
+    usefft : `bool`
+        `True` if ``filt`` is an FIR filter with more than ``threshold``
+        taps, and all of ``kwargs`` are supported by `fftfilt` (or
+        `fftfiltfilt`)
+    """
+    if threshold is None:
+        threshold = FFT_FILTER_THRESHOLD
+    if ftype != 'ba':
+        return False
+    if set(kwargs) - set(FFT_FILTER_KWARGS[bool(filtfilt)]):
+        return False
+    b, a = filt
+    return numpy.size(a) == 1 and numpy.size(b) > threshold
+
+
+def parse_filter(*filt):
+    """Parse arbitrary filter arguments into SOS or ``(b, a)`` format
+
+    Parameters
+    ----------
+    *filt
+        one of:
+
+        - `scipy.signal.lti`
+        - `MxN` `numpy.ndarray` of second-order-sections
+        - ``(numerator, denominator)`` polynomials
+        - ``(zeros, poles, gain)``
+        - ``(A, B, C, D)`` 'state-space' representation
+        - FIR filter coefficients (taps)
+
+    Returns
+    -------
+    ftype, filt
+        either ``('sos', sos)`` or ``('ba', (b, a))``
+
+    Raises
+    ------
+    ValueError
+        If ``filt`` arguments cannot be interpreted properly
+    """
+    # single argument given
+    if len(filt) == 1:
+        filt = filt[0]
+        # detect LTI
+        if isinstance(filt, signal.lti):
+            return 'ba', (filt.num, filt.den)
+        # detect ZPK
+        if (isinstance(filt, (tuple, list)) and len(filt) == 3 and
+                isinstance(filt[0], numpy.ndarray) and
+                isinstance(filt[1], numpy.ndarray) and
+                isinstance(filt[2], float)):
+            return 'sos', signal.zpk2sos(*filt)
+        # detect SOS
+        if isinstance(filt, numpy.ndarray) and filt.ndim == 2:
+            return 'sos', filt
+        # detect taps
+        return 'ba', (filt, [1])
+    # detect TF
+    elif len(filt) == 2:
+        return 'ba', tuple(filt)
+    elif len(filt) == 3:
+        try:
+            return 'sos', signal.zpk2sos(*filt)
+        except AttributeError:
+            return 'ba', signal.zpk2tf(*filt)
+    elif len(filt) == 4:
+        try:
+            zpk = signal.ss2zpk(*filt)
+            return 'sos', signal.zpk2sos(zpk)
+        except AttributeError:
+            return 'ba', signal.ss2tf(*filt)
+    raise ValueError("Cannot interpret filter arguments. Please "
+                     "give either a signal.lti object, or a "
+                     "tuple in zpk or ba format. See "
+                     "scipy.signal docs for details.")
+
+
+# -- block-wise filtering -----------------------------------------------------
+
+class BlockFilter(object):
+    """A digital filter that carries its state between calls
+
+    This allows consecutive blocks of a long data stream to be filtered
+    without edge transients at the block boundaries, with the output
+    identical to filtering the full stream in one call.
+
+    Parameters
+    ----------
+    *filt
+        any filter definition accepted by
+        :meth:`TimeSeries.filter <gwpy.timeseries.TimeSeries.filter>`
+
+    filtfilt : `bool`, optional
+        apply the filter forward and backward to preserve phase,
+        default: `False`; in this mode the output is delayed by
+        ``lookahead`` samples relative to the input, see *Notes*
+
+    lookahead : `int`, optional
+        number of samples of forward-filtered data to buffer before
+        applying the backward pass in ``filtfilt`` mode, defaults to the
+        length over which the filter impulse response decays by a factor
+        of ``1e9``
+
+    Notes
+    -----
+    Data are given as 1-D arrays, or 2-D ``(nchannels, nsamples)`` arrays
+    to filter many channels at once.
+
+    In ``filtfilt`` mode the backward pass for each block is started
+    ``lookahead`` samples into the future, so each call returns the
+    output for the samples lagging the input by that many samples;
+    call `BlockFilter.flush` at the end of a stream to return the
+    remainder.
+
+    Examples
+    --------
+    >>> from gwpy.signal import (BlockFilter, highpass)
+    >>> hpf = BlockFilter(highpass(10, 4096))
+    >>> for block in blocks:
+    ...     out = hpf.apply(block)
+    """
+    def __init__(self, *filt, **kwargs):
+        self.filtfilt = kwargs.pop('filtfilt', False)
+        lookahead = kwargs.pop('lookahead', None)
+        if kwargs:
+            raise TypeError("%s() got an unexpected keyword argument %r"
+                            % (type(self).__name__, list(kwargs)[0]))
+        self.ftype, self.filt = parse_filter(*filt)
+        if self.ftype == 'ba':
+            b, a = self.filt
+            self.filt = (numpy.atleast_1d(b).astype(float),
+                         numpy.atleast_1d(a).astype(float))
+        # long FIR filters are applied with FFT convolution, in which case
+        # the filter state is the history of the last len(b) - 1 inputs
+        self._fft = use_fftfilt(self.ftype, self.filt)
+        if self._fft:
+            b, a = self.filt
+            self.filt = (b / a[0], a[:1] / a[0])
+        if self.filtfilt and lookahead is None:
+            lookahead = self._decay_length()
+        self.lookahead = int(lookahead or 0)
+        self.reset()
+
+    # -- alternative constructors ---------------
+
+    @classmethod
+    def zpk(cls, zeros, poles, gain, sample_rate, analog=True, unit='Hz',
+            **kwargs):
+        """Create a `BlockFilter` from a zero-pole-gain definition
+
+        See :meth:`TimeSeries.zpk <gwpy.timeseries.TimeSeries.zpk>` for
+        details of the parameters, other keyword arguments are passed to
+        the `BlockFilter` constructor.
+        """
+        from .filter_design import bilinear_zpk
+        if analog:
+            zeros, poles, gain = bilinear_zpk(zeros, poles, gain,
+                                              fs=sample_rate, unit=unit)
+        return cls(zeros, poles, gain, **kwargs)
+
+    @classmethod
+    def highpass(cls, frequency, sample_rate, filtfilt=False, lookahead=None,
+                 **kwargs):
+        """Create a high-pass `BlockFilter`
+
+        See :func:`gwpy.signal.filter_design.highpass` for details of the
+        design parameters.
+        """
+        from .filter_design import highpass
+        filt = highpass(frequency, sample_rate, **kwargs)
+        return cls(*_as_args(filt), filtfilt=filtfilt, lookahead=lookahead)
+
+    @classmethod
+    def lowpass(cls, frequency, sample_rate, filtfilt=False, lookahead=None,
+                **kwargs):
+        """Create a low-pass `BlockFilter`
+
+        See :func:`gwpy.signal.filter_design.lowpass` for details of the
+        design parameters.
+        """
+        from .filter_design import lowpass
+        filt = lowpass(frequency, sample_rate, **kwargs)
+        return cls(*_as_args(filt), filtfilt=filtfilt, lookahead=lookahead)
+
+    @classmethod
+    def bandpass(cls, flow, fhigh, sample_rate, filtfilt=False,
+                 lookahead=None, **kwargs):
+        """Create a band-pass `BlockFilter`
+
+        See :func:`gwpy.signal.filter_design.bandpass` for details of the
+        design parameters.
+        """
+        from .filter_design import bandpass
+        filt = bandpass(flow, fhigh, sample_rate, **kwargs)
+        return cls(*_as_args(filt), filtfilt=filtfilt, lookahead=lookahead)
+
+    @classmethod
+    def notch(cls, frequency, sample_rate, filtfilt=False, lookahead=None,
+              **kwargs):
+        """Create a notch `BlockFilter`
+
+        See :func:`gwpy.signal.filter_design.notch` for details of the
+        design parameters.
+        """
+        from .filter_design import notch
+        filt = notch(frequency, sample_rate, **kwargs)
+        return cls(*_as_args(filt), filtfilt=filtfilt, lookahead=lookahead)
+
+    # -- filtering ------------------------------
+
+    def reset(self):
+        """Discard the filter state, and any buffered data
+        """
+        self._zi = None
+        self._pending = None
+
+    def _decay_length(self, tol=1e-9, maxlen=2**20):
+        """Length over which the impulse response decays below ``tol``
+        """
+        if self.ftype == 'ba' and self.filt[1].size == 1:
+            return self.filt[0].size
+        n = 1024
+        while True:
+            imp = numpy.zeros(n)
+            imp[0] = 1
+            h = numpy.abs(self._lfilter(imp, None)[0])
+            above = numpy.nonzero(h > tol * h.max())[0]
+            if above[-1] < n // 2 or n >= maxlen:
+                return int(above[-1] + 1)
+            n *= 2
+
+    def _lfilter(self, data, zi):
+        """Apply the forward filter, returning the output and final state
+        """
+        if self.ftype == 'sos':
+            if zi is None:
+                zi = numpy.zeros((self.filt.shape[0],) + data.shape[:-1] +
+                                 (2,))
+            return signal.sosfilt(self.filt, data, axis=-1, zi=zi)
+        b, a = self.filt
+        if self._fft:
+            out = _overlap_save(b, data, history=zi)
+            if zi is not None:
+                data = numpy.concatenate((zi, data), axis=-1)
+            hist = data[..., max(0, data.shape[-1]-b.size+1):]
+            if hist.shape[-1] < b.size - 1:  # pad short history with zeros
+                hist = numpy.concatenate((numpy.zeros(
+                    hist.shape[:-1] + (b.size - 1 - hist.shape[-1],)),
+                    hist), axis=-1)
+            return out, hist
+        if zi is None:
+            zi = numpy.zeros(data.shape[:-1] + (max(a.size, b.size) - 1,))
+        return signal.lfilter(b, a, data, axis=-1, zi=zi)
+
+    def _steady_state(self, x0):
+        """Steady-state initial conditions for a step of size ``x0``
+        """
+        if self.ftype == 'sos':
+            zi = signal.sosfilt_zi(self.filt)
+            return zi.reshape((zi.shape[0],) + (1,) * x0.ndim + (2,)) * \
+                x0[..., None]
+        b, a = self.filt
+        if self._fft:
+            return numpy.ones(b.size - 1) * x0[..., None]
+        n = max(a.size, b.size)
+        zi = signal.lfilter_zi(numpy.pad(b, (0, n - b.size), 'constant'),
+                               numpy.pad(a, (0, n - a.size), 'constant'))
+        return zi * x0[..., None]
+
+    def apply(self, data, out=None):
+        """Filter the next block of data
+
+        Parameters
+        ----------
+        data : `numpy.ndarray`
+            the next block of data, either 1-D, or 2-D with one row per
+            channel
+
+        out : `numpy.ndarray`, optional
+            the array into which to write the output, can be ``data``
+            itself to filter in-place; in ``filtfilt`` mode the output
+            is shorter than the input until enough data are buffered, so
+            only the leading samples of ``out`` are written
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            the filtered data
+        """
+        data = numpy.asarray(data)
+        if self.filtfilt:
+            result = self._apply_filtfilt(data)
+        else:
+            result, self._zi = self._lfilter(data, self._zi)
+        if out is None:
+            return result
+        out[..., :result.shape[-1]] = result
+        return out[..., :result.shape[-1]]
+
+    __call__ = apply
+
+    def _apply_filtfilt(self, data):
+        if self._pending is None:
+            # initialise forward filter at steady state, like sosfiltfilt
+            self._zi = self._steady_state(data[..., 0])
+            self._pending = numpy.zeros(data.shape[:-1] + (0,))
+        forward, self._zi = self._lfilter(data, self._zi)
+        self._pending = numpy.concatenate((self._pending, forward), axis=-1)
+        nout = self._pending.shape[-1] - self.lookahead
+        if nout <= 0:
+            return self._pending[..., :0].copy()
+        out = self._backward(self._pending)[..., :nout]
+        self._pending = self._pending[..., nout:]
+        return out
+
+    def _backward(self, data):
+        reverse = data[..., ::-1]
+        zi = self._steady_state(reverse[..., 0])
+        return self._lfilter(reverse, zi)[0][..., ::-1]
+
+    def flush(self):
+        """Return the remaining buffered output at the end of a stream
+
+        This is only relevant in ``filtfilt`` mode, and resets the filter.
+
+        Returns
+        -------
+        out : `numpy.ndarray`, `None`
+            the remaining filtered data, or `None`
+        """
+        pending = self._pending
+        self.reset()
+        if not self.filtfilt or pending is None or not pending.shape[-1]:
+            return None
+        return self._backward(pending)
+
+
+def _as_args(filt):
+    """Return filter design output as positional arguments for parse_filter
+    """
+    if isinstance(filt, tuple):
+        return filt
+    return (filt,)
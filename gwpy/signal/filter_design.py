@@ -25,14 +25,18 @@ from math import (pi, log10)
 
 from six.moves import reduce
 
+import numpy
 from numpy import (atleast_1d, concatenate)
 
-from scipy import signal
+from astropy.units import (Quantity, Unit)
 
-from astropy.units import Quantity
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
-__all__ = ['lowpass', 'highpass', 'bandpass', 'notch', 'concatenate_zpks']
+__all__ = ['lowpass', 'highpass', 'bandpass', 'notch', 'concatenate_zpks',
+           'bilinear_zpk']
 
 
 def _as_float(x):
@@ -122,6 +126,54 @@ def num_taps(sample_rate, transitionwidth, gpass, gstop):
                sample_rate / transitionwidth)
 
 
+def bilinear_zpk(zeros, poles, gain, fs=1.0, unit='Hz'):
+    """Convert an analogue ZPK filter to digital using a bilinear transform
+
+    Parameters
+    ----------
+    zeros : array-like
+        list of analogue zero frequencies
+
+    poles : array-like
+        list of analogue pole frequencies
+
+    gain : `float`
+        DC gain of filter
+
+    fs : `float`, `~astropy.units.Quantity`, optional
+        sample rate (in Hertz) of the target digital filter
+
+    unit : `str`, `~astropy.units.Unit`, optional
+        unit of zeros and poles, either ``'Hz'`` or ``'rad/s'``,
+        default is ``'Hz'``
+
+    Returns
+    -------
+    zpk : `tuple` of `numpy.ndarray`, `float`
+        the digital zeros, poles, and gain
+    """
+    # cast to arrays for ease
+    z = numpy.array(zeros)
+    p = numpy.array(poles)
+    k = gain
+    # convert from Hz to rad/s if needed
+    unit = Unit(unit)
+    if unit == Unit('Hz'):
+        z = -2 * pi * z
+        p = -2 * pi * p
+    elif unit != Unit('rad/s'):
+        raise ValueError("zpk can only be given with unit='Hz' "
+                         "or 'rad/s'")
+    # convert to Z-domain via bilinear transform
+    fs = 2 * Quantity(fs, 'Hz').value
+    z = z[numpy.isfinite(z)]
+    pd = (1 + p/fs) / (1 - p/fs)
+    zd = (1 + z/fs) / (1 - z/fs)
+    kd = k * numpy.prod(fs - z)/numpy.prod(fs - p)
+    zd = numpy.concatenate((zd, -numpy.ones(len(pd)-len(zd))))
+    return zd, pd, kd
+
+
 # -- user methods -------------------------------------------------------------
 
 def lowpass(frequency, sample_rate, fstop=None, gpass=2, gstop=30, type='iir',
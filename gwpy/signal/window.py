@@ -21,7 +21,9 @@
 
 from math import ceil
 
-from scipy.signal import windows as scipy_windows
+from ..utils.lazy import LazyModule
+
+scipy_windows = LazyModule('scipy.signal.windows')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -26,7 +26,6 @@ from six import string_types
 import numpy
 
 import scipy
-from scipy import signal
 
 from astropy import units
 from astropy.io import registry as io_registry
@@ -37,6 +36,9 @@ from ..segments import Segment
 from ..timeseries import (TimeSeries, TimeSeriesList)
 from ..timeseries.core import _format_time
 from ..frequencyseries import FrequencySeries
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org"
 
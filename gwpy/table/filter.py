@@ -25,6 +25,7 @@ import re
 from tokenize import generate_tokens
 from collections import OrderedDict
 
+from six import string_types
 from six.moves import StringIO
 
 import numpy
@@ -129,8 +130,8 @@ def parse_column_filter(definition):
     """
     # parse definition into parts
     parts = list(generate_tokens(StringIO(definition.strip()).readline))
-    if parts[-1][0] == token.ENDMARKER:  # remove end marker
-        parts = parts[:-1]
+    while parts[-1][0] in (token.ENDMARKER, token.NEWLINE):
+        parts = parts[:-1]  # remove end markers
 
     # parse simple definition: e.g: snr > 5
     if len(parts) == 3:
@@ -139,15 +140,18 @@ def parse_column_filter(definition):
             name = re_quote.sub('', a[1])
             op = OPERATORS[b[1]]
             value = _float_or_str(c[1])
-        elif b[0] in [token.NAME, token.STRING]:
-            name = re_quote.sub('', b[1])
+        elif c[0] in [token.NAME, token.STRING]:  # reversed: 5 < snr
+            name = re_quote.sub('', c[1])
             op = OPERATORS_INV[b[1]]
             value = _float_or_str(a[1])
+        else:
+            raise ValueError("Cannot parse filter definition from %r"
+                             % definition)
         return name, [(value, op)]
 
     # parse between definition: e.g: 5 < snr < 10
     elif len(parts) == 5:
-        a, b, c, d, e = zip(*parts)[1]
+        a, b, c, d, e = list(zip(*parts))[1]
         return re_quote.sub('', c), [(_float_or_str(a), OPERATORS_INV[b]),
                                      (_float_or_str(e), OPERATORS[d])]
 
@@ -157,6 +161,9 @@ def parse_column_filter(definition):
 def parse_column_filters(*definitions):
     """Parse multiple compound column filter definitions
 
+    Filters that have already been parsed (i.e. as returned by this
+    function) are passed through unchanged.
+
     Examples
     --------
     >>> parse_column_filters('snr > 10', 'frequency < 1000')
@@ -168,22 +175,225 @@ def parse_column_filters(*definitions):
     """
     fltrs = []
     for def_ in _flatten(definitions):
+        if _is_parsed(def_):
+            fltrs.append(def_)
+            continue
         for splitdef in re_delim.split(def_)[::2]:
             fltrs.append(parse_column_filter(splitdef))
     return fltrs
 
 
+def parse_selection(selection):
+    """Parse a ``selection`` keyword into a list of column filters
+
+    Parameters
+    ----------
+    selection : `str`, `list`, `None`
+        one or more column filter definitions, multiple definitions in a
+        single `str` can be joined by ``'&&'``
+
+    Returns
+    -------
+    filters : `list` of `tuple`
+        the parsed filters, see
+        :func:`~gwpy.table.filter.parse_column_filters`
+    """
+    if not selection:
+        return []
+    if isinstance(selection, string_types):
+        selection = [selection]
+    return parse_column_filters(selection)
+
+
+def filter_columns(filters):
+    """Return the `list` of column names referenced by some filters
+    """
+    names = []
+    for name, _ in filters:
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _is_parsed(definition):
+    """Returns `True` if ``definition`` is a parsed column filter tuple
+    """
+    return (isinstance(definition, tuple) and len(definition) == 2 and
+            isinstance(definition[1], list))
+
+
 def _flatten(container):
-    """Flatten arbitrary nested list into strings
+    """Flatten arbitrary nested list into strings (or parsed filters)
     """
     for i in container:
-        if isinstance(i, (list, tuple)):
+        if isinstance(i, (list, tuple)) and not _is_parsed(i):
             for j in _flatten(i):
                 yield j
         else:
             yield i
 
 
+# -- compiled filters ---------------------------------------------------------
+
+# maximum number of compiled filters to cache in `filter_table`
+FILTER_CACHE_SIZE = 64
+FILTER_CACHE = OrderedDict()
+
+
+class TableFilter(object):
+    """A set of column filters, parsed once for repeated application
+
+    When applied to a table, the individual comparisons are evaluated in
+    order of increasing pass rate (as estimated from a sample of rows),
+    with each comparison only evaluated for those rows that passed all
+    of the previous ones.
+
+    Parameters
+    ----------
+    *column_filters : `str`, `tuple`
+        one or more column filter definitions, e.g. ``'snr > 10'``, or
+        filters that have already been parsed by `parse_column_filters`
+
+    chunksize : `int`, optional
+        the number of rows to evaluate at once, limiting the size of
+        temporary arrays for very long tables, default: all rows
+
+    Examples
+    --------
+    >>> from gwpy.table.filter import TableFilter
+    >>> loud = TableFilter('snr > 10', 'frequency < 1000')
+    >>> for table in tables:
+    ...     print(len(loud(table)))
+    """
+    #: number of rows used to estimate the pass rate of each comparison
+    SAMPLE_SIZE = 1024
+
+    def __init__(self, *column_filters, **kwargs):
+        self.chunksize = kwargs.pop('chunksize', None)
+        if kwargs:
+            raise TypeError("TableFilter() got an unexpected keyword "
+                            "argument %r" % list(kwargs)[0])
+        self.filters = parse_column_filters(*column_filters)
+        self._comparisons = [(name, threshold, oprtr) for
+                             name, math in self.filters for
+                             threshold, oprtr in math]
+
+    @property
+    def columns(self):
+        """The `list` of columns referenced by this filter
+        """
+        return filter_columns(self.filters)
+
+    def _order(self, data, nrows):
+        """Sort the comparisons by their pass rate for a sample of rows
+        """
+        if len(self._comparisons) < 2 or not nrows:
+            return self._comparisons
+        sample = numpy.linspace(0, nrows - 1, num=min(nrows, self.SAMPLE_SIZE),
+                                dtype=int)
+        rates = [oprtr(numpy.asarray(data[name])[sample], threshold).mean()
+                 for name, threshold, oprtr in self._comparisons]
+        return [self._comparisons[i] for
+                i in numpy.argsort(rates, kind='mergesort')]
+
+    def _evaluate(self, data, comparisons, start, stop):
+        """Return the indices of rows in ``[start, stop)`` that pass
+        """
+        idx = None
+        for name, threshold, oprtr in comparisons:
+            col = numpy.asarray(data[name])[start:stop]
+            if idx is None:
+                idx = numpy.flatnonzero(oprtr(col, threshold))
+            else:
+                idx = idx[oprtr(col[idx], threshold)]
+            if not idx.size:
+                break
+        if idx is None:  # no filters
+            idx = numpy.arange(stop - start)
+        return idx + start
+
+    def indices(self, data):
+        """Return the indices of the rows that pass this filter
+
+        Parameters
+        ----------
+        data : `~astropy.table.Table`, `dict`-like
+            the table to filter, this can be any object that supports
+            ``len(data)`` and returns array-like columns via ``data[name]``
+
+        Returns
+        -------
+        indices : `numpy.ndarray`
+            the (sorted) integer indices of the passing rows
+        """
+        nrows = len(data)
+        comparisons = self._order(data, nrows)
+        chunksize = self.chunksize or max(nrows, 1)
+        chunks = [self._evaluate(data, comparisons, i, min(i + chunksize,
+                                                           nrows))
+                  for i in range(0, nrows, chunksize)]
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            return numpy.zeros(0, dtype=int)
+        return numpy.concatenate(chunks)
+
+    def mask(self, data):
+        """Return the boolean mask of rows that pass this filter
+
+        See `TableFilter.indices` for details of the input.
+        """
+        keep = numpy.zeros(len(data), dtype=bool)
+        keep[self.indices(data)] = True
+        return keep
+
+    def filter(self, table, copy=True):
+        """Apply this filter to a table
+
+        Parameters
+        ----------
+        table : `~astropy.table.Table`
+            the table to filter
+
+        copy : `bool`, optional
+            if `False`, return a view of the input table if the passing
+            rows form a single contiguous block (e.g. when filtering a
+            sorted column), otherwise a new table is always returned,
+            default: `True`
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            a table with only those rows passing this filter
+        """
+        idx = self.indices(table)
+        if not copy and idx.size and idx[-1] - idx[0] + 1 == idx.size:
+            return table[idx[0]:idx[-1] + 1]
+        return table[idx]
+
+    __call__ = filter
+
+
+def compile_filter(*column_filters):
+    """Return a (cached) `TableFilter` for the given column filters
+
+    Filters defined by `str` are cached, so that applying the same set of
+    filters to many tables only parses the definitions once.
+    """
+    try:
+        return FILTER_CACHE[column_filters]
+    except (KeyError, TypeError):  # not cached, or not hashable
+        pass
+    filt = TableFilter(*column_filters)
+    if all(isinstance(f, string_types) for f in column_filters):
+        if len(FILTER_CACHE) >= FILTER_CACHE_SIZE:
+            FILTER_CACHE.popitem(last=False)
+        FILTER_CACHE[column_filters] = filt
+    return filt
+
+
+# -- filtering ----------------------------------------------------------------
+
 def filter_table(table, *column_filters):
     """Apply one or more column slice filters to a `Table`
 
@@ -203,13 +413,41 @@ def filter_table(table, *column_filters):
     table : `~astropy.table.Table`
         a view of the input table with only those rows matching the filters
 
+    See Also
+    --------
+    TableFilter
+        for details on how filters are applied, and to build a filter
+        for repeated use
+
     Examples
     --------
     >>> filter(my_table, 'snr>10', 'frequency<1000')
     """
-    keep = numpy.ones(len(table), dtype=bool)
-    for name, math in parse_column_filters(*column_filters):
-        col = table[name].view(numpy.ndarray)
-        for threshold, oprtr in math:
-            keep &= oprtr(col, threshold)
-    return table[keep]
+    return compile_filter(*column_filters).filter(table)
+
+
+def filter_mask(data, *column_filters):
+    """Return the boolean mask of rows that pass one or more column filters
+
+    Parameters
+    ----------
+    data : `~astropy.table.Table`, `dict`-like
+        the table to filter, this can be any object that supports
+        ``len(data)`` and returns array-like columns via ``data[name]``
+
+    column_filter : `str`, `tuple`
+        a column slice filter definition, e.g. ``'snr > 10``, or a filter
+        that has already been parsed by `parse_column_filters`
+
+    Returns
+    -------
+    mask : `numpy.ndarray`
+        boolean array with one element per row, `True` for rows that
+        pass all filters
+
+    See Also
+    --------
+    filter_table
+        for details of the column filter syntax
+    """
+    return compile_filter(*column_filters).mask(data)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Sorted time index for fast windowed queries of an `EventTable`
+"""
+
+import numpy
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['TimeIndex']
+
+
+def _fingerprint(column):
+    """Return a `tuple` identifying the memory and shape of a column
+
+    Adding or removing rows (or replacing the column) reallocates the
+    column data, and so changes the fingerprint.
+    """
+    arr = numpy.asarray(column)
+    return (arr.__array_interface__['data'][0], arr.shape, arr.strides)
+
+
+def _segment_arrays(segments):
+    """Parse a list of ``[start, end)`` pairs into two arrays
+    """
+    segs = numpy.asarray([tuple(map(float, seg)) for seg in segments],
+                         dtype=float).reshape((-1, 2))
+    return segs[:, 0], segs[:, 1]
+
+
+class TimeIndex(object):
+    """A sorted index of the times in one column of a table
+
+    The index is built once (at a cost of ``O(n log n)``, or ``O(n)``
+    if the column is already sorted), and thereafter the rows in any
+    time window can be found in ``O(log n)``.
+
+    Parameters
+    ----------
+    table : `~astropy.table.Table`
+        the table to index
+
+    timecolumn : `str`, optional
+        the name of the column to index, default: ``'time'``
+
+    Notes
+    -----
+    The index is not updated when the table changes, use
+    `TimeIndex.is_valid` to check whether it still describes a table;
+    changing values of the time column in place (e.g.
+    ``table['time'][0] = 0``) is not detected.
+
+    See Also
+    --------
+    EventTable.index_time
+        to attach a `TimeIndex` to an `EventTable`
+    """
+    def __init__(self, table, timecolumn='time'):
+        self.timecolumn = timecolumn
+        times = numpy.asarray(table[timecolumn])
+        self._fingerprint = _fingerprint(times)
+        if times.size < 2 or (times[1:] >= times[:-1]).all():
+            #: the row index of each element of `times`, or `None` if the
+            #: table is already time-ordered
+            self.order = None
+            #: the indexed times, in sorted order
+            self.times = times
+        else:
+            self.order = numpy.argsort(times, kind='mergesort')
+            self.times = times[self.order]
+
+    def __len__(self):
+        return self.times.size
+
+    @property
+    def sorted(self):
+        """`True` if the indexed table is time-ordered
+        """
+        return self.order is None
+
+    def is_valid(self, table):
+        """Returns `True` if this index can be used for the given table
+        """
+        try:
+            column = table[self.timecolumn]
+        except KeyError:
+            return False
+        return _fingerprint(column) == self._fingerprint
+
+    # -- queries --------------------------------
+
+    def search(self, starts, ends):
+        """Find the positions in the sorted times of many windows at once
+
+        Parameters
+        ----------
+        starts, ends : `float`, array-like
+            the (inclusive) start and (exclusive) end times of each
+            window
+
+        Returns
+        -------
+        first, last : `numpy.ndarray`
+            the position in the sorted times of the first event in each
+            window, and of the first event after each window
+        """
+        first = numpy.searchsorted(self.times, starts, side='left')
+        last = numpy.searchsorted(self.times, ends, side='left')
+        return first, numpy.maximum(first, last)
+
+    def rows(self, start=None, end=None):
+        """Find the rows of the table in the window ``[start, end)``
+
+        Parameters
+        ----------
+        start : `float`, optional
+            the GPS start time of the window, defaults to the first event
+
+        end : `float`, optional
+            the GPS end time of the window, defaults to after the last event
+
+        Returns
+        -------
+        rows : `slice`, `numpy.ndarray`
+            a `slice` if the table is time-ordered, otherwise the
+            (sorted) array of row indices
+        """
+        nrows = self.times.size
+        first = 0 if start is None else int(
+            numpy.searchsorted(self.times, float(start)))
+        last = nrows if end is None else int(
+            numpy.searchsorted(self.times, float(end)))
+        last = max(first, last)
+        if self.order is None:
+            return slice(first, last)
+        return numpy.sort(self.order[first:last])
+
+    def count(self, segments):
+        """Count the events in each of a list of segments
+
+        Parameters
+        ----------
+        segments : `list` of ``[start, end)`` pairs
+            the windows in which to count, e.g. a
+            `~gwpy.segments.SegmentList`
+
+        Returns
+        -------
+        counts : `numpy.ndarray`
+            the number of events in each segment
+        """
+        first, last = self.search(*_segment_arrays(segments))
+        return last - first
+
+    def in_segmentlist(self, segmentlist):
+        """Return a mask of rows whose time lies inside the segments
+
+        Parameters
+        ----------
+        segmentlist : `~gwpy.segments.SegmentList`, `list`
+            the ``[start, end)`` segments to test, these need not be
+            coalesced
+
+        Returns
+        -------
+        mask : `numpy.ndarray`
+            a boolean array with one element per table row
+        """
+        first, last = self.search(*_segment_arrays(segmentlist))
+        # mark the start and end of each run of sorted positions
+        nbins = self.times.size + 1
+        edges = (numpy.bincount(first, minlength=nbins) -
+                 numpy.bincount(last, minlength=nbins))
+        insorted = numpy.cumsum(edges[:-1]) > 0
+        if self.order is None:
+            return insorted
+        mask = numpy.zeros_like(insorted)
+        mask[self.order] = insorted
+        return mask
@@ -19,16 +19,23 @@
 """Input/output methods for tabular data.
 """
 
-from . import (  # pylint: disable=unused-import
-    ligolw,  # glue.ligolw XML format
-    root,  # generic ROOT stuff
-    omicron,  # Omicron ROOT format
-    omega,  # Omega ASCII format
-    cwb,  # cWB ROOT and ASCII formats
-    pycbc,  # PyCBC (Live) HDF5
-    hacr,  # Hierarchichal Algorithm for Curves and Ridges
-    gwf,  # GWF FrEvents (e.g. MBTA)
-    gravityspy,  # Gravity Spy Triggers
-)
+from ...io import registry as io_registry
+
+from .. import (Table, EventTable, GravitySpyTable)
+
+# build the read/write docstrings once, not once per format
+with io_registry.delay_doc_updates(Table, EventTable, GravitySpyTable):
+    from . import (  # pylint: disable=unused-import
+        ligolw,  # glue.ligolw XML format
+        root,  # generic ROOT stuff
+        omicron,  # Omicron ROOT format
+        omega,  # Omega ASCII format
+        cwb,  # cWB ROOT and ASCII formats
+        pycbc,  # PyCBC (Live) HDF5
+        hacr,  # Hierarchichal Algorithm for Curves and Ridges
+        gwf,  # GWF FrEvents (e.g. MBTA)
+        gravityspy,  # Gravity Spy Triggers
+        columnar,  # GWpy columnar binary format
+    )
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Read and write tables in a simple columnar binary format
+
+Each table is stored as a directory containing a JSON schema, and one
+sub-directory per row group, holding one ``.npy`` file per column::
+
+    triggers.columnar/
+        schema.json
+        000000/
+            time.npy
+            snr.npy
+        000001/
+            ...
+
+Row groups are sorted by the ``sortby`` column (if given), and the
+schema records the minimum and maximum of each numeric column in each
+group, so that reads with a ``selection`` can skip groups that cannot
+contain any matching rows. Columns are memory-mapped, and only those
+columns needed for the output, or the selection, are opened at all.
+"""
+
+import json
+import os
+import shutil
+from numbers import Number
+
+import numpy
+
+from ...io import registry
+from .. import (Table, EventTable)
+from ..filter import (OPERATORS, TableFilter, filter_columns)
+from .utils import read_with_filters
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_VERSION = 1
+
+#: name of the schema file in a columnar table directory
+SCHEMA_FILE = 'schema.json'
+
+#: default number of rows per row group
+ROW_GROUP_SIZE = 2 ** 16
+
+
+# -- utilities ----------------------------------------------------------------
+
+def _read_schema(path):
+    with open(os.path.join(path, SCHEMA_FILE), 'r') as fobj:
+        schema = json.load(fobj)
+    if schema.get('format') != COLUMNAR_FORMAT:
+        raise ValueError("%s is not a %s table directory"
+                         % (path, COLUMNAR_FORMAT))
+    return schema
+
+
+def _is_columnar(path):
+    """Returns `True` if ``path`` is a columnar table directory
+    """
+    try:
+        _read_schema(path)
+    except (IOError, OSError, ValueError):
+        return False
+    return True
+
+
+def _write_schema(path, schema):
+    # write to temporary file, then move, so that readers never see a
+    # partially-written schema
+    tmp = os.path.join(path, SCHEMA_FILE + '.tmp')
+    with open(tmp, 'w') as fobj:
+        json.dump(schema, fobj, indent=1)
+    os.rename(tmp, os.path.join(path, SCHEMA_FILE))
+
+
+def _json_meta(meta):
+    """Return the items of ``meta`` that can be stored as JSON
+    """
+    out = {}
+    for key, val in meta.items():
+        try:
+            json.dumps({key: val})
+        except (TypeError, ValueError):
+            continue
+        out[key] = val
+    return out
+
+
+def _column_array(col):
+    """Return the data for a column as a (non-object) `numpy.ndarray`
+    """
+    if getattr(col, 'mask', None) is not None and numpy.any(col.mask):
+        raise ValueError("cannot write masked column %r in %s format"
+                         % (col.name, COLUMNAR_FORMAT))
+    arr = numpy.asarray(col)
+    if arr.dtype.kind == 'O':  # try and convert to fixed-width strings
+        arr = numpy.asarray(arr.tolist())
+        if arr.dtype.kind == 'O':
+            raise TypeError("cannot write column %r with dtype object in %s "
+                            "format" % (col.name, COLUMNAR_FORMAT))
+    return arr
+
+
+def _statistics(arr):
+    """Return the ``[min, max]`` of a numeric array, or `None`
+    """
+    if not arr.size or arr.dtype.kind not in 'iuf':
+        return None
+    with numpy.errstate(invalid='ignore'):
+        low, high = numpy.nanmin(arr), numpy.nanmax(arr)
+    if numpy.isnan(low):  # all NaN
+        return None
+    return [low.item(), high.item()]
+
+
+def _group_may_pass(stats, filters):
+    """Returns `False` if no rows in a row group can pass the filters
+    """
+    for name, math in filters:
+        try:
+            low, high = stats[name]
+        except (KeyError, TypeError):  # no statistics for this column
+            continue
+        for threshold, op_ in math:
+            if not isinstance(threshold, Number):
+                continue
+            if (op_ is OPERATORS['>'] and high <= threshold or
+                    op_ is OPERATORS['>='] and high < threshold or
+                    op_ is OPERATORS['<'] and low >= threshold or
+                    op_ is OPERATORS['<='] and low > threshold or
+                    op_ is OPERATORS['=='] and not low <= threshold <= high):
+                return False
+    return True
+
+
+class _RowGroup(object):
+    """Lazy view of the columns of a single row group
+
+    Each column file is only opened on first access.
+    """
+    def __init__(self, path, nrows, memmap=True):
+        self.path = path
+        self.nrows = nrows
+        self.mmap_mode = 'r' if memmap else None
+        self._cache = {}
+
+    def __len__(self):
+        return self.nrows
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            arr = self._cache[name] = numpy.load(
+                os.path.join(self.path, '%s.npy' % name),
+                mmap_mode=self.mmap_mode)
+            return arr
+
+
+# -- read ---------------------------------------------------------------------
+
+@read_with_filters
+def table_from_columnar(source, columns=None, filters=None, memmap=True):
+    """Read a `Table` from a columnar table directory
+
+    Parameters
+    ----------
+    source : `str`
+        path of the table directory
+
+    columns : `list` of `str`, optional
+        the names of the columns to read, default: all columns
+
+    filters : `list`, optional
+        parsed column filters to apply, see
+        `~gwpy.table.filter.parse_column_filters`; row groups whose
+        statistics show that no rows can pass are not read at all
+
+    memmap : `bool`, optional
+        if `True` (default) memory-map the column files, otherwise read
+        them into memory
+
+    Returns
+    -------
+    table : `~astropy.table.Table`
+        the table of data, if a single row group is read without
+        ``filters`` (and ``memmap=True``), the columns of the table are
+        read-only memory-mapped arrays
+    """
+    schema = _read_schema(source)
+    specs = schema['columns']
+    if columns is None:
+        columns = [c['name'] for c in specs]
+    else:
+        columns = list(columns)
+        known = [c['name'] for c in specs]
+        for name in columns + filter_columns(filters):
+            if name not in known:
+                raise ValueError("column %r not found in %s"
+                                 % (name, source))
+
+    # find row groups that might contain matching rows
+    groups = [_RowGroup(os.path.join(source, group['path']),
+                        group['nrows'], memmap=memmap) for
+              group in schema['rowgroups'] if
+              _group_may_pass(group['stats'], filters)]
+
+    # read data
+    filt = TableFilter(*filters) if filters else None
+    data = dict((c, []) for c in columns)
+    for group in groups:
+        if filt is not None:
+            idx = filt.indices(group)
+            if not idx.size:
+                continue
+        for name in columns:
+            arr = group[name]
+            data[name].append(arr if filt is None else arr[idx])
+
+    # build table
+    cols = []
+    for spec in specs:
+        name = spec['name']
+        if name not in data:
+            continue
+        if len(data[name]) == 1:
+            arr = data[name][0]
+        elif data[name]:
+            arr = numpy.concatenate(data[name])
+        else:
+            arr = numpy.zeros(0, dtype=spec['dtype'])
+        cols.append(Table.Column(arr, name=name, unit=spec.get('unit'),
+                                 description=spec.get('description'),
+                                 copy=False))
+    cols.sort(key=lambda c: columns.index(c.name))
+    return Table(cols, meta=schema.get('meta', {}), copy=False)
+
+
+# -- write --------------------------------------------------------------------
+
+def table_to_columnar(table, target, overwrite=False, append=False,
+                      sortby=None, rowgroupsize=ROW_GROUP_SIZE):
+    """Write a `Table` to a columnar table directory
+
+    Parameters
+    ----------
+    table : `~astropy.table.Table`
+        the table to write
+
+    target : `str`
+        path of the output directory
+
+    overwrite : `bool`, optional
+        if `True` replace an existing table at ``target``, default: `False`
+
+    append : `bool`, optional
+        if `True` add the rows of ``table`` as new row groups of an
+        existing table at ``target``, default: `False`
+
+    sortby : `str`, optional
+        name of column by which to sort the rows before grouping, defaults
+        to ``'time'`` if such a column exists; when appending, the
+        existing table's ``sortby`` is used
+
+    rowgroupsize : `int`, optional
+        the maximum number of rows in each row group
+
+    Raises
+    ------
+    IOError
+        if ``target`` exists and neither ``overwrite`` nor ``append``
+        are given, or if ``target`` exists and is not a columnar table
+        directory
+
+    ValueError
+        if appending a table whose columns do not match the existing table
+    """
+    exists = os.path.exists(target)
+    if exists and not (overwrite or append):
+        raise IOError("File exists: %s" % target)
+    if exists and not _is_columnar(target):
+        # never replace (or add to) anything else
+        raise IOError("%s exists and is not a %s table directory"
+                      % (target, COLUMNAR_FORMAT))
+    append &= exists
+
+    arrays = [(name, _column_array(table[name])) for name in table.colnames]
+    specs = [{
+        'name': name,
+        'dtype': arr.dtype.str,
+        'unit': None if table[name].unit is None else str(table[name].unit),
+        'description': table[name].description,
+    } for name, arr in arrays]
+
+    if append:
+        schema = _read_schema(target)
+        old = [(c['name'], numpy.dtype(c['dtype'])) for c in schema['columns']]
+        new = [(c['name'], numpy.dtype(c['dtype'])) for c in specs]
+        if [c[0] for c in old] != [c[0] for c in new] or not all(
+                numpy.can_cast(n[1], o[1], 'same_kind') for
+                o, n in zip(old, new)):
+            raise ValueError("cannot append table with columns %s to %s "
+                             "table with columns %s" % (new, target, old))
+        arrays = [(name, arr.astype(dtype, copy=False)) for
+                  (name, arr), (_, dtype) in zip(arrays, old)]
+        sortby = schema['sortby']
+    else:
+        if exists:
+            shutil.rmtree(target)
+        os.makedirs(target)
+        if sortby is None and 'time' in table.colnames:
+            sortby = 'time'
+        schema = {
+            'format': COLUMNAR_FORMAT,
+            'version': COLUMNAR_VERSION,
+            'sortby': sortby,
+            'columns': specs,
+            'meta': _json_meta(table.meta),
+            'rowgroups': [],
+        }
+
+    # sort rows
+    if sortby is not None:
+        order = numpy.argsort(dict(arrays)[sortby], kind='mergesort')
+        arrays = [(name, arr[order]) for name, arr in arrays]
+
+    # write row groups
+    nrows = len(table)
+    start = sum(g['nrows'] for g in schema['rowgroups'])
+    for i in range(0, nrows, rowgroupsize):
+        path = '%06d' % len(schema['rowgroups'])
+        os.makedirs(os.path.join(target, path))
+        stats = {}
+        for name, arr in arrays:
+            chunk = arr[i:i+rowgroupsize]
+            numpy.save(os.path.join(target, path, '%s.npy' % name), chunk)
+            stats[name] = _statistics(chunk)
+        schema['rowgroups'].append({
+            'path': path,
+            'start': start + i,
+            'nrows': min(rowgroupsize, nrows - i),
+            'stats': stats,
+        })
+    _write_schema(target, schema)
+
+
+# -- identify -----------------------------------------------------------------
+
+def identify_columnar(origin, filepath, fileobj, *args, **kwargs):
+    """Identify a columnar table directory by its schema file
+    """
+    # pylint: disable=unused-argument
+    return bool(filepath is not None and
+                os.path.isfile(os.path.join(str(filepath), SCHEMA_FILE)))
+
+
+# -- registration -------------------------------------------------------------
+
+def _reader(table_class):
+    """Return a reader that builds a ``table_class`` without copying
+
+    The unified I/O registry would otherwise copy the memory-mapped
+    columns when converting a `Table` into an `EventTable`.
+    """
+    def read_table(source, *args, **kwargs):
+        return table_class(table_from_columnar(source, *args, **kwargs),
+                           copy=False)
+    read_table.__doc__ = table_from_columnar.__doc__
+    return read_table
+
+
+for table_class in (Table, EventTable):
+    registry.register_reader(COLUMNAR_FORMAT, table_class,
+                             _reader(table_class))
+    registry.register_writer(COLUMNAR_FORMAT, table_class, table_to_columnar)
+    registry.register_identifier(COLUMNAR_FORMAT, table_class,
+                                 identify_columnar)
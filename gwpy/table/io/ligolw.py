@@ -30,8 +30,10 @@ except ImportError:
     TableByName = dict()
 
 from ...io import registry
-from ...io.ligolw import (table_from_file, write_tables)
+from ...io.ligolw import (table_from_file, read_table_columns,
+                          write_tables)
 from .. import (Table, EventTable)
+from ..filter import parse_selection
 from .utils import read_with_selection
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
@@ -161,6 +163,84 @@ def _table_from_ligolw(llwtable, target, copy, columns=None,
                   meta={'type': 'ligolw.%s' % str(llwtable.Name)})
 
 
+def _time_prefix(tablename):
+    """Return the prefix of the columns that define 'time' for a table
+    """
+    if tablename.endswith('_burst'):
+        return 'peak'
+    elif tablename.endswith('_inspiral'):
+        return 'end'
+    elif tablename.endswith('_ringdown'):
+        return 'start'
+    raise ValueError("'time' column requested from a table that "
+                     "doesn't supply it or have a good proxy "
+                     "(e.g. 'peak_time')")
+
+
+# keyword arguments for table_from_file supported by _table_from_columns
+FAST_READ_KWARGS = ('columns', 'nproc', 'contenthandler', 'verbose')
+
+
+def _table_from_columns(f, table_, columns=None, llwcolumns=None,
+                        selection=None, rename=None, nproc=1):
+    """Read a LIGO_LW table into a `Table` column-by-column
+
+    This bypasses the `glue.ligolw` row objects entirely, see
+    :func:`gwpy.io.ligolw.read_table_columns` for details.
+    Filters in ``selection`` are applied while parsing, apart from those
+    on a derived ``'time'`` column, which are applied once that column
+    has been built.
+
+    Unlike the `glue.ligolw` reader, ``ilwd:char`` ID columns (e.g.
+    ``event_id``) are returned as `numpy.int64` arrays of the integer
+    ID, rather than `ilwdchar` objects.
+    """
+    tablename = table_.TableName(table_.tableName)
+    validcolumns = table_.validcolumns
+    if rename is None:
+        rename = {}
+    filters = parse_selection(selection)
+    post = [f_ for f_ in filters if f_[0] not in validcolumns]
+    filters = [f_ for f_ in filters if f_[0] in validcolumns]
+    for name, _ in post:
+        if name != 'time':
+            raise KeyError("cannot filter on column %r, not found in %s "
+                           "table" % (name, tablename))
+    needtime = 'time' not in validcolumns and bool(
+        post or (columns is not None and 'time' in columns))
+
+    # work out which columns to read from the file
+    if llwcolumns is None:
+        llwcolumns = columns
+    if needtime:
+        tname = _time_prefix(tablename)
+        timecols = ['%s_time' % tname, '%s_time_ns' % tname]
+        if llwcolumns is not None:
+            llwcolumns = [col for col in llwcolumns if col != 'time']
+            llwcolumns.extend(col for col in timecols if
+                              col not in llwcolumns)
+
+    names, arrays = read_table_columns(f, tablename, columns=llwcolumns,
+                                       filters=filters, nproc=nproc)
+    data = dict(zip(names, arrays))
+    if columns is None:
+        columns = names
+
+    # build 'time' column and apply remaining filters
+    if needtime:
+        data['time'] = data[timecols[0]] + data[timecols[1]] * 1e-9
+    if post:
+        keep = numpy.ones(data['time'].size, dtype=bool)
+        for _, math in post:
+            for threshold, oprtr in math:
+                keep &= oprtr(data['time'], threshold)
+        data = dict((key, val[keep]) for key, val in data.items())
+
+    return Table([data[name] for name in columns],
+                 names=[rename.get(name, name) for name in columns],
+                 copy=False, meta={'type': 'ligolw.%s:table' % tablename})
+
+
 # -- write --------------------------------------------------------------------
 
 def table_to_ligolw(table, tablename):
@@ -215,21 +295,23 @@ def ligolw_io_factory(table_):
         if reckwargs['rename'] is None:
             reckwargs['rename'] = {}
 
+        # read directly into columns, unless the glue.ligolw row objects
+        # are needed, or other options for table_from_file are given
+        if (not args and not reckwargs['get_as_columns'] and
+                kwargs.get('contenthandler') is None and
+                not set(kwargs) - set(FAST_READ_KWARGS)):
+            return _table_from_columns(
+                f, table_, columns=reckwargs['columns'],
+                llwcolumns=kwargs['columns'],
+                selection=reckwargs['selection'],
+                rename=reckwargs['rename'], nproc=kwargs.get('nproc', 1))
+
         # handle requests for 'time' as a special case
         needtime = (reckwargs['columns'] is not None and
                     'time' in reckwargs['columns'] and
                     'time' not in table_.validcolumns)
         if needtime:
-            if tablename.endswith('_burst'):
-                tname = 'peak'
-            elif tablename.endswith('_inspiral'):
-                tname = 'end'
-            elif tablename.endswith('_ringdown'):
-                tname = 'start'
-            else:
-                raise ValueError("'time' column requested from a table that "
-                                 "doesn't supply it or have a good proxy "
-                                 "(e.g. 'peak_time')")
+            tname = _time_prefix(tablename)
             # replace 'time' with get_xxx method name
             reckwargs['columns'] = list(reckwargs['columns'])
             idx = reckwargs['columns'].index('time')
@@ -245,6 +327,9 @@ def ligolw_io_factory(table_):
         llw = table_from_file(f, table_.tableName, *args, **kwargs)
         return Table(llw, **reckwargs)
 
+    # other keyword arguments (e.g. verbose) are passed to table_from_file
+    _read_table.__wrapped__ = table_from_file
+
     def _write_table(table, f, *args, **kwargs):
         return write_tables(f, [table_to_ligolw(table, tablename)],
                             *args, **kwargs)
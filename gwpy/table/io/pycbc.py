@@ -27,7 +27,8 @@ import numpy
 from ...io.hdf5 import (identify_hdf5, with_read_hdf5)
 from ...io.registry import (register_reader, register_identifier)
 from .. import (Table, EventTable)
-from .utils import read_with_selection
+from ..filter import filter_mask
+from .utils import read_with_filters
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 __credits__ = 'Alex Nitz <alex.nitz@ligo.org>'
@@ -37,11 +38,70 @@ PYCBC_LIVE_FORMAT = 'hdf5.pycbc_live'
 INVALID_COLUMNS = ['psd', 'loudest']
 PYCBC_FILENAME = re.compile('([A-Z][0-9])+-Live-[0-9.]+-[0-9.]+.hdf')
 
+# number of rows to read at once when filtering
+CHUNK_SIZE = 2 ** 16
+
+
+class _Rows(object):
+    """Read-only view of a subset of rows from a PyCBC live HDF5 group
+
+    Each column is only read from disk on first access, with processed
+    columns (see ``GET_COLUMN``) calculated from the same rows.
+    """
+    def __init__(self, group, index):
+        self.group = group
+        self.index = index
+        self._cache = {}
+
+    def __len__(self):
+        if isinstance(self.index, slice):
+            start, stop, _ = self.index.indices(self.group.nrows)
+            return max(stop - start, 0)
+        return len(self.index)
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        try:
+            dset = self.group[name]
+        except KeyError:
+            if name in GET_COLUMN:
+                arr = GET_COLUMN[name](self)
+            else:
+                raise
+        else:
+            if isinstance(self.index, slice):
+                arr = dset[self.index]
+            else:  # h5py fancy indexing needs sorted indices
+                arr = dset[:][self.index]
+        self._cache[name] = arr
+        return arr
+
+
+class _Group(object):
+    """Thin wrapper around an `h5py.Group` recording the number of rows
+    """
+    def __init__(self, group, columns):
+        self.group = group
+        names = [c for c in columns if c in group] or [
+            c for c in group if c not in INVALID_COLUMNS]
+        self.nrows = len(group[names[0]]) if names else 0
+
+    def __getitem__(self, name):
+        return self.group[name]
+
 
 @with_read_hdf5
-@read_with_selection
-def table_from_file(source, ifo=None, columns=None, loudest=False):
+@read_with_filters
+def table_from_file(source, ifo=None, columns=None, loudest=False,
+                    filters=None, chunksize=CHUNK_SIZE):
     """Read a `Table` from a PyCBC live HDF5 file
+
+    Any ``selection`` filters are evaluated in chunks of ``chunksize``
+    rows, with the requested ``columns`` only read for those rows that
+    pass.
     """
     import h5py
 
@@ -87,22 +147,35 @@ def table_from_file(source, ifo=None, columns=None, loudest=False):
         meta['psd'] = FrequencySeries(
             psd[:], f0=0, df=df, name='pycbc_live')
 
-    # map data to columns
-    data = []
+    # read data, one chunk of rows at a time
+    group = _Group(source, columns)
+    if loudest:
+        chunks = [_Rows(group, meta['loudest'])]
+    elif filters:
+        chunks = (_Rows(group, slice(i, i + chunksize)) for
+                  i in range(0, group.nrows, chunksize))
+    else:
+        chunks = [_Rows(group, slice(None))]
+    data = dict((c, []) for c in columns)
+    for rows in chunks:
+        if filters:
+            keep = filter_mask(rows, *filters)
+            if not keep.any():
+                continue
+        for c in columns:
+            arr = rows[c]
+            data[c].append(arr[keep] if filters else arr)
+
+    empty = _Rows(group, slice(0, 0))
     for c in columns:
-        # convert hdf5 dataset into Column
-        try:
-            arr = source[c][:]
-        except KeyError:
-            if c in GET_COLUMN:
-                arr = GET_COLUMN[c](source)
-            else:
-                raise
-        if loudest:
-            arr = arr[meta['loudest']]
-        data.append(Table.Column(arr, name=c))
-
-    return Table(data, meta=meta)
+        if len(data[c]) == 1:
+            data[c] = data[c][0]
+        elif data[c]:
+            data[c] = numpy.concatenate(data[c])
+        else:  # no rows passed the filters
+            data[c] = empty[c]
+    return Table([Table.Column(data[c], name=c) for c in columns],
+                 meta=meta)
 
 
 def filter_empty_files(files, ifo=None):
@@ -21,14 +21,53 @@
 
 import warnings
 
+from six import string_types
+
 from ...io import registry
 from ...io.utils import identify_factory
 from ...io.cache import file_list
 from .. import (Table, EventTable)
+from ..filter import (OPERATORS, parse_column_filter)
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
 
+def format_root_selection(selection):
+    """Format column filters as a ROOT ``TTree`` selection expression
+
+    Parameters
+    ----------
+    selection : `str`, `list`
+        one or more column filters, either as `str` definitions, or as
+        parsed by :func:`~gwpy.table.filter.parse_column_filters`;
+        definitions that cannot be parsed are assumed to be valid ROOT
+        expressions and are passed through unchanged
+
+    Returns
+    -------
+    expression : `str`
+        a ROOT selection expression, e.g. ``'snr > 8 && frequency < 100'``
+    """
+    if isinstance(selection, (string_types, tuple)):
+        selection = [selection]
+    parts = []
+    for def_ in selection:
+        if isinstance(def_, string_types):
+            try:
+                def_ = parse_column_filter(def_)
+            except (KeyError, ValueError, TypeError):  # assume ROOT syntax
+                parts.append(def_)
+                continue
+        col, math = def_
+        for value, op_ in math:
+            # use last matching key, so that ``eq`` maps to '=='
+            opstr = [key for key in OPERATORS if OPERATORS[key] is op_][-1]
+            if isinstance(value, string_types):
+                value = '"%s"' % value
+            parts.append('{0} {1} {2}'.format(col, opstr, value))
+    return ' && '.join(parts)
+
+
 def table_from_root(f, treename=None, include_names=None, **kwargs):
     import root_numpy
 
@@ -43,15 +82,15 @@ def table_from_root(f, treename=None, include_names=None, **kwargs):
                           "astropy.table.Table.read kwargs, please update "
                           "your call.", DeprecationWarning)
 
-    # parse column filters into tree2array ``selection`` keyword
-    try:
-        filters = kwargs.pop('selection')
-    except KeyError:
-        pass
-    else:
-        if isinstance(filters, (list, tuple)):
-            filters = ' && '.join(filters)
-        kwargs['selection'] = filters
+    # parse column filters into tree2array ``selection`` keyword, so that
+    # rows are filtered by ROOT as the tree is read
+    filters = kwargs.pop('filters', None) or []
+    selection = kwargs.pop('selection', None) or []
+    if isinstance(selection, string_types):
+        selection = selection.split('&&')
+    if filters or selection:
+        kwargs['selection'] = format_root_selection(
+            list(selection) + list(filters))
 
     # find single tree (if only one tree present)
 
@@ -21,26 +21,21 @@
 
 from functools import wraps
 
-from six import string_types
-
-from ..filter import (filter_table, parse_column_filters)
+from ..filter import (filter_table, parse_selection)
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
 
 def read_with_selection(func):
     """Decorate a Table read method to apply ``selection`` keyword
+
+    The full table is read, then filtered, see `read_with_filters` for
+    readers that can apply filters as they go.
     """
     @wraps(func)
     def decorated_func(*args, **kwargs):
         # parse selection
-        try:
-            selection = kwargs.pop('selection')
-        except KeyError:
-            selection = []
-        else:
-            if isinstance(selection, string_types):
-                selection = selection.replace('&&', '&').split('&')
+        selection = parse_selection(kwargs.pop('selection', None))
 
         # read table
         tab = func(*args, **kwargs)
@@ -52,3 +47,22 @@ def read_with_selection(func):
         return tab
 
     return decorated_func
+
+
+def read_with_filters(func):
+    """Decorate a Table read method to push the ``selection`` keyword down
+
+    The ``selection`` is parsed and passed to the reader as the ``filters``
+    keyword argument (a `list` of parsed column filters), so that the
+    reader can skip rows as they are read, rather than loading the full
+    table and filtering afterwards.
+    Readers decorated in this way should also honour the ``columns``
+    keyword, allowing filters on columns that aren't returned.
+    """
+    @wraps(func)
+    def decorated_func(*args, **kwargs):
+        filters = parse_selection(kwargs.pop('selection', None))
+        filters.extend(kwargs.pop('filters', None) or [])
+        return func(*args, filters=filters, **kwargs)
+
+    return decorated_func
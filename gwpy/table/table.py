@@ -30,12 +30,166 @@ from astropy.table import (Table, Column, vstack)
 from astropy.io.registry import write as io_write
 
 from ..io.mp import read_multi as io_read_multi
-from .filter import (filter_table, parse_operator)
+from .filter import (filter_table, filter_columns, parse_operator,
+                     parse_selection)
+from .index import (TimeIndex, _segment_arrays)
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 __all__ = ['EventColumn', 'EventTable']
 
 
+def concatenate_tables(tables):
+    """Concatenate a list of tables with the same columns
+
+    The output columns are allocated once, using the schema of the first
+    table, with each table copied into place, which is much faster than
+    :func:`astropy.table.vstack` for long lists of tables.
+
+    Parameters
+    ----------
+    tables : `list` of `~astropy.table.Table`
+        the tables to concatenate, if they do not all have the same
+        column names (in the same order) and column shapes, or any are
+        masked, this method falls back to :func:`astropy.table.vstack`
+
+    Returns
+    -------
+    table : `~astropy.table.Table`
+        a new table containing the rows of all of the input tables,
+        with the same type as the first table
+
+    Raises
+    ------
+    ValueError
+        if ``tables`` is empty
+    """
+    tables = list(tables)
+    if not tables:
+        raise ValueError("cannot concatenate an empty list of tables")
+    first = tables[0]
+    if len(tables) == 1:
+        return first
+    if any(t.colnames != first.colnames or t.masked or
+           any(t[name].shape[1:] != first[name].shape[1:] for
+               name in first.colnames) for t in tables):
+        return vstack(tables)
+
+    # allocate new arrays and copy in place
+    sizes = [len(t) for t in tables]
+    edges = numpy.concatenate(([0], numpy.cumsum(sizes)))
+    columns = []
+    for name in first.colnames:
+        dtype = numpy.result_type(*[t[name].dtype for t in tables])
+        data = numpy.empty((edges[-1],) + first[name].shape[1:],
+                           dtype=dtype)
+        for i, tab in enumerate(tables):
+            data[edges[i]:edges[i+1]] = tab[name]
+        col = first[name]
+        columns.append(type(first).Column(
+            data, name=name, unit=col.unit, description=col.description,
+            format=col.format, meta=col.meta, copy=False))
+
+    # merge metadata (later tables take precedence, as with vstack)
+    meta = type(first.meta)()
+    for tab in tables:
+        meta.update(tab.meta)
+    return type(first)(columns, meta=meta, copy=False)
+
+
+# operators that can be evaluated for many bins via cumulative sums
+_CUMULATIVE_OPERATORS = (
+    _operator.ge, _operator.gt, _operator.le, _operator.lt,
+    _operator.eq, _operator.ne,
+)
+
+
+def _binned_counts(tidx, intime, nsamp, data, bins, op=None):
+    """Count events in each time bin for a number of column bins
+
+    The column is ranked against the sorted, unique bin values once, with
+    the count for every bin then derived from a single 2-D histogram of
+    (time bin, rank) using cumulative sums.
+
+    Parameters
+    ----------
+    tidx : `numpy.ndarray`
+        the index of the time bin for each event
+
+    intime : `numpy.ndarray`
+        boolean array, `True` for events inside the time span
+
+    nsamp : `int`
+        the number of time bins
+
+    data : `numpy.ndarray`
+        the column values for each event
+
+    bins : `list`
+        the column bins, either a `list` of ``(low, high)`` `tuple` bins
+        (where ``low <= x < high``), or a `list` of `float` values to
+        compare against using ``op``
+
+    op : `callable`, optional
+        the comparison operator, one of those in ``_CUMULATIVE_OPERATORS``,
+        only required if ``bins`` is a list of `float`
+
+    Returns
+    -------
+    counts : `list` of `numpy.ndarray`
+        the number of events in each time bin, for each column bin
+    """
+    if op is None:
+        values = [v for bin_ in bins for v in bin_]
+    else:
+        values = bins
+    edges = numpy.unique(numpy.asarray(values, dtype=float))
+    nedge = edges.size
+    nan = numpy.isnan(data)
+    valid = intime & ~nan
+
+    def _hist(rank, keep):
+        # histogram over (time, rank), then sum ranks >= r for each r
+        hist = numpy.bincount(tidx[keep] * (nedge + 1) + rank[keep],
+                              minlength=nsamp * (nedge + 1)).reshape(
+                                  nsamp, nedge + 1)
+        cumsum = numpy.zeros((nsamp, nedge + 2), dtype=hist.dtype)
+        cumsum[:, :-1] = hist[:, ::-1].cumsum(axis=1)[:, ::-1]
+        return cumsum
+
+    need_right = op is None or op in (_operator.ge, _operator.lt)
+    need_left = op in (_operator.gt, _operator.le)
+    if need_right or op in (_operator.eq, _operator.ne):
+        right = numpy.searchsorted(edges, data, side='right')
+    if need_left or op in (_operator.eq, _operator.ne):
+        left = numpy.searchsorted(edges, data, side='left')
+    if need_right:  # number of events with x >= edges[k]
+        above = _hist(right, valid)
+    elif need_left:  # number of events with x > edges[k]
+        above = _hist(left, valid)
+    else:  # number of events with x == edges[k]
+        equal = _hist(left, valid & (right > left))
+        equal = equal[:, :-1] - equal[:, 1:]
+    total = numpy.bincount(tidx[valid], minlength=nsamp)
+
+    def _column(value):
+        k = numpy.searchsorted(edges, value) + 1
+        if op is _operator.ge or op is _operator.gt:
+            return above[:, k]
+        if op is _operator.lt or op is _operator.le:
+            return total - above[:, k]
+        if op is _operator.eq:
+            return equal[:, k - 1]
+        # NaN != value for all values
+        return (total + numpy.bincount(tidx[intime & nan], minlength=nsamp) -
+                equal[:, k - 1])
+
+    if op is None:
+        return [numpy.clip(above[:, numpy.searchsorted(edges, lo) + 1] -
+                           above[:, numpy.searchsorted(edges, hi) + 1],
+                           0, None) for lo, hi in bins]
+    return [_column(value) for value in bins]
+
+
 class EventColumn(Column):
     """Custom `Column` that allows filtering with segments
     """
@@ -49,32 +203,13 @@ class EventColumn(Column):
 
         """
         segmentlist = type(segmentlist)(segmentlist).coalesce()
-        idx = self.argsort()
-        contains = numpy.zeros(self.shape[0], dtype=bool)
-        j = 0
-        try:
-            a, b = segmentlist[j]
-        except IndexError:  # no segments, return all False
-            return contains
-        i = 0
-        while i < contains.shape[0]:
-            x = idx[i]
-            v = self[x]
-            # if before start, move to next value
-            if v < a:
-                i += 1
-                continue
-            # if after end, find the next segment and check value again
-            if v >= b:
-                j += 1
-                try:
-                    a, b = segmentlist[j]
-                    continue
-                except IndexError:
-                    break
-            # otherwise value must be in this segment
-            contains[x] = True
-            i += 1
+        starts, ends = _segment_arrays(segmentlist)
+        values = numpy.asarray(self)
+        # find the first segment that ends after each value, then check
+        # that the value is after the start of that segment
+        seg = numpy.searchsorted(ends, values, side='right')
+        contains = seg < ends.size
+        contains[contains] = values[contains] >= starts[seg[contains]]
         return contains
 
     def not_in_segmentlist(self, segmentlist):
@@ -82,7 +217,7 @@ class EventColumn(Column):
 
         See `~EventColumn.in_segmentlist` for more details
         """
-        return self.in_segmentlist(~segmentlist)
+        return ~self.in_segmentlist(segmentlist)
 
 
 class EventTable(Table):
@@ -102,6 +237,7 @@ class EventTable(Table):
         for details on parameters for creating an `EventTable`
     """
     Column = EventColumn
+    _time_index = None
 
     # -- i/o ------------------------------------
 
@@ -132,6 +268,10 @@ class EventTable(Table):
         nproc : `int`, optional, default: 1
             number of CPUs to use for parallel file reading
 
+        verbose : `bool`, optional, default: `False`
+            print the number of rows read from each file, and the read
+            throughput
+
         .. note::
 
            Keyword arguments other than those listed here may be required
@@ -149,22 +289,30 @@ class EventTable(Table):
         Notes
         -----"""
         # astropy's ASCII formats don't support on-the-fly selection, so
-        # we pop the selection argument out here
+        # we pop the selection argument out here, and map the columns
+        # (including those needed for the selection) to ``include_names``
+        columns = None
         if str(kwargs.get('format')).startswith('ascii'):
-            selection = kwargs.pop('selection', [])
-            if isinstance(selection, string_types):
-                selection = [selection]
+            selection = parse_selection(kwargs.pop('selection', []))
+            columns = kwargs.pop('columns', None)
+            if columns is not None:
+                kwargs.setdefault('include_names', list(columns) + [
+                    c for c in filter_columns(selection) if
+                    c not in columns])
         else:
             selection = []
 
         # read the table
-        tab = io_read_multi(vstack, cls, source, *args, **kwargs)
+        tab = io_read_multi(concatenate_tables, cls, source, *args,
+                            **kwargs)
 
         # apply the selection if required:
         if selection:
             tab = tab.filter(*selection)
 
-        # and return
+        # and return (only the requested columns)
+        if columns is not None and tab.colnames != list(columns):
+            return tab[list(columns)]
         return tab
 
     def write(self, target, *args, **kwargs):
@@ -286,6 +434,115 @@ class EventTable(Table):
         """
         return self[name]
 
+    # -- time index -----------------------------
+
+    def index_time(self, timecolumn='time'):
+        """Build a sorted index of the times in this table
+
+        Once built, `EventTable.crop` and `EventTable.event_rate` use the
+        index to find the events in a time window in ``O(log n)``, rather
+        than scanning the whole column, and `EventTable.time_index`
+        supports bulk queries for many windows or segments at once.
+
+        Parameters
+        ----------
+        timecolumn : `str`, optional
+            the name of the column to index, default: ``'time'``
+
+        Returns
+        -------
+        index : `~gwpy.table.index.TimeIndex`
+            the new index, also available as `EventTable.time_index`
+
+        Notes
+        -----
+        The index is discarded when rows are added or removed, or the
+        table is sorted or reversed, and must be rebuilt by calling this
+        method again. Changing values of the time column in place is
+        not detected.
+
+        Examples
+        --------
+        >>> events.index_time('time')
+        >>> for seg in segments:
+        ...     print(len(events.crop(*seg)))
+        """
+        self._time_index = TimeIndex(self, timecolumn=timecolumn)
+        return self._time_index
+
+    @property
+    def time_index(self):
+        """The `~gwpy.table.index.TimeIndex` for this table
+
+        This is `None` if `EventTable.index_time` has not been called,
+        or if the table has changed since.
+        """
+        index = self._time_index
+        if index is not None and not index.is_valid(self):
+            index = self._time_index = None
+        return index
+
+    def _get_time_index(self, timecolumn):
+        index = self.time_index
+        if index is not None and index.timecolumn == timecolumn:
+            return index
+        return None
+
+    def sort(self, *args, **kwargs):
+        self._time_index = None
+        return super(EventTable, self).sort(*args, **kwargs)
+    sort.__doc__ = Table.sort.__doc__
+
+    def reverse(self, *args, **kwargs):
+        self._time_index = None
+        return super(EventTable, self).reverse(*args, **kwargs)
+    reverse.__doc__ = Table.reverse.__doc__
+
+    def crop(self, start=None, end=None, timecolumn='time', copy=False):
+        """Return the events in the time window ``[start, end)``
+
+        Parameters
+        ----------
+        start : `float`, optional
+            GPS start time of window, defaults to the first event
+
+        end : `float`, optional
+            GPS end time of window, defaults to after the last event
+
+        timecolumn : `str`, optional
+            name of time-column to use, default: ``'time'``
+
+        copy : `bool`, optional
+            if `True` always return a copy of the data, otherwise the
+            output will be a view of this table wherever possible,
+            default: `False`
+
+        Returns
+        -------
+        table : `EventTable`
+            the events in the window; if this table has a time index
+            (see `EventTable.index_time`) and is time-ordered, this is a
+            view, otherwise the rows are copied
+
+        Notes
+        -----
+        If the table has a time index for ``timecolumn`` the window is
+        found by binary search, otherwise the whole column is scanned.
+        """
+        index = self._get_time_index(timecolumn)
+        if index is not None:
+            rows = index.rows(start, end)
+        else:
+            times = self[timecolumn]
+            rows = numpy.ones(len(self), dtype=bool)
+            if start is not None:
+                rows &= times >= start
+            if end is not None:
+                rows &= times < end
+        if copy:
+            return self[rows].copy()
+        return self[rows]
+
     # -- extensions -----------------------------
 
     def event_rate(self, stride, start=None, end=None, timecolumn='time'):
@@ -309,17 +566,24 @@ class EventTable(Table):
             a `TimeSeries` of events per second (Hz)
         """
         from gwpy.timeseries import TimeSeries
-        times = self[timecolumn]
+        index = self._get_time_index(timecolumn)
+        times = self[timecolumn] if index is None else index.times
         if not start:
-            start = times.min()
+            start = times.min() if index is None else times[0]
         if not end:
-            end = times.max()
+            end = times.max() if index is None else times[-1]
         nsamp = int(ceil((end - start) / stride))
         timebins = numpy.arange(nsamp + 1) * stride + start
         # histogram data and return
-        out = TimeSeries(
-            numpy.histogram(times, bins=timebins)[0] / float(stride),
-            t0=start, dt=stride, unit='Hz', name='Event rate')
+        if index is None:
+            counts = numpy.histogram(times, bins=timebins)[0]
+        else:  # count events between bin edges by binary search
+            edges = numpy.searchsorted(times, timebins, side='left')
+            # numpy.histogram includes the right-hand edge of the last bin
+            edges[-1] = numpy.searchsorted(times, timebins[-1], side='right')
+            counts = numpy.diff(edges)
+        out = TimeSeries(counts / float(stride), t0=start, dt=stride,
+                         unit='Hz', name='Event rate')
         return out
 
     def binned_event_rates(self, stride, column, bins, operator='>=',
@@ -370,14 +634,21 @@ class EventTable(Table):
             a dict of (bin, `~gwpy.timeseries.TimeSeries`) pairs describing a
             rate of events per second (Hz) for each of the bins.
         """
-        from gwpy.timeseries import TimeSeriesDict
+        from gwpy.timeseries import (TimeSeries, TimeSeriesDict)
 
         # work out time boundaries
-        times = self[timecolumn]
+        times = numpy.asarray(self[timecolumn])
         if not start:
             start = times.min()
         if not end:
             end = times.max()
+        nsamp = int(ceil((end - start) / stride))
+        timebins = numpy.arange(nsamp + 1) * stride + start
+
+        # map each event to its time bin (matching numpy.histogram)
+        tidx = numpy.searchsorted(timebins, times, side='right') - 1
+        tidx[times == timebins[-1]] = nsamp - 1
+        intime = (tidx >= 0) & (tidx < nsamp)
 
         # generate column bins
         if not bins:
@@ -392,18 +663,24 @@ class EventTable(Table):
         else:
             op = operator
 
-        coldata = self[column]
+        coldata = numpy.asarray(self[column])
+
+        # count events in each (time, bin) pair
+        if isinstance(bins[0], tuple) or op in _CUMULATIVE_OPERATORS:
+            counts = _binned_counts(tidx, intime, nsamp, coldata, bins,
+                                    None if isinstance(bins[0], tuple)
+                                    else op)
+        else:  # arbitrary function, but still don't copy the table
+            counts = [numpy.bincount(tidx[intime & op(coldata, bin_)],
+                                     minlength=nsamp) for bin_ in bins]
 
         # generate one TimeSeries per bin
         out = TimeSeriesDict()
-        for bin_ in bins:
-            if isinstance(bin_, tuple):
-                keep = (coldata >= bin_[0]) & (coldata < bin_[1])
-            else:
-                keep = op(coldata, bin_)
-            out[bin_] = self[keep].event_rate(stride, start=start, end=end,
-                                              timecolumn=timecolumn)
-            out[bin_].name = '%s $%s$ %s' % (column, operator, bin_)
+        for bin_, count in zip(bins, counts):
+            out[bin_] = TimeSeries(count / float(stride), t0=start,
+                                   dt=stride, unit='Hz',
+                                   name='%s $%s$ %s' % (column, operator,
+                                                        bin_))
 
         return out
 
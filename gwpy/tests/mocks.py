@@ -22,13 +22,16 @@
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
 import inspect
+import json
+from threading import Thread
 
 try:
     from unittest import mock
 except ImportError:
     import mock
 
-from six.moves.urllib.error import HTTPError
+from six.moves.BaseHTTPServer import (HTTPServer, BaseHTTPRequestHandler)
+from six.moves.urllib.parse import (urlparse, parse_qs)
 
 import pytest
 
@@ -38,57 +41,89 @@ from gwpy.segments import (Segment, SegmentList)
 
 # -- DQSEGDB calls ------------------------------------------------------------
 
-def dqsegdb_query_times(result, deactivated=False,
-                        active_indicates_ifo_badness=False, **kwargs):
-    """Build a mock of `dqsegdb.apicalls.dqsegdbQueryTimes` for testing
-    """
+class DQSegDBServer(object):
+    """A stand-in DQSegDB server, running on localhost, for testing
+
+    The server answers version and segment queries for the flags in
+    ``result`` (a `dict` of `~gwpy.segments.DataQualityFlag`), and
+    records the path of each request in `DQSegDBServer.requests`.
+
+    Use as a context manager to get the URL of the running server::
 
-    def query_times(protocol, server, ifo, name, version, request, start, end):
-        flag = '%s:%s:%d' % (ifo, name, version)
-        span = SegmentList([Segment(start, end)])
-        if flag not in result:
-            raise HTTPError('test-url/', 404, 'Not found', None, None)
+        >>> with DQSegDBServer(result) as url:
+        ...     DataQualityFlag.query_dqsegdb('X1:TEST-FLAG:1', 0, 10, url=url)
+    """
+    PREFIX = '/dqsegdb'
+
+    def __init__(self, result, **metadata):
+        self.result = result
+        self.metadata = metadata
+        self.requests = []
+        self.connections = 0
+        self.server = None
+
+    def __enter__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # support keep-alive
+
+            def setup(self):
+                server.connections += 1
+                BaseHTTPRequestHandler.setup(self)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(self.path)
+                try:
+                    data = server.respond(self.path)
+                except KeyError:
+                    body = b'Not found'
+                    self.send_response(404, 'Not found')
+                else:
+                    body = json.dumps(data).encode('utf-8')
+                    self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return 'http://127.0.0.1:%d%s' % (self.server.server_port,
+                                          self.PREFIX)
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, path):
+        url = urlparse(path)
+        parts = url.path[len(self.PREFIX):].strip('/').split('/')
+        ifo, name = parts[1:3]
+        if len(parts) == 3:  # versions query
+            versions = [int(key.rsplit(':', 1)[1]) for key in self.result if
+                        key.rsplit(':', 1)[0] == '%s:%s' % (ifo, name)]
+            if not versions:
+                raise KeyError(name)
+            return {'resource_type': 'version', 'version': versions}
+        flag = self.result['%s:%s:%s' % (ifo, name, parts[3])]
+        query = parse_qs(url.query)
+        span = SegmentList([Segment(float(query['s'][0]),
+                                    float(query['e'][0]))])
         return {
             'ifo': ifo,
             'name': name,
-            'version': version,
-            'known': list(map(tuple, result[flag].known & span)),
-            'active': list(map(tuple, result[flag].active & span)),
+            'version': int(parts[3]),
+            'known': list(map(tuple, flag.known & span)),
+            'active': list(map(tuple, flag.active & span)),
             'query_information': {},
-            'metadata': kwargs,
-        }, 'BOGUS_QUERY_STRING'
-
-    return query_times
-
-
-def dqsegdb_cascaded_query(result, deactivated=False,
-                           active_indicates_ifo_badness=False,
-                           **kwargs):
-    """Build a mock of `dqsegdb.apicalls.dqsegdbCascadedQuery` for testing
-    """
-
-    def cascaded_query(protocol, server, ifo, name, request, start, end):
-        # this is a bit hacky, but it's just for tests
-        flag = [x for x in result if
-                x.rsplit(':', 1)[0] == '%s:%s' % (ifo, name)][0]
-        version = int(flag.split(':')[-1])
-        return (
-            {'known': list(map(tuple, result[flag].known)),
-             'active': list(map(tuple, result[flag].active)),
-             'ifo': ifo,
-             'name': 'RESULT',
-             'version': 1},
-            [{'ifo': ifo,
-              'name': name,
-              'version': version,
-              'known': list(map(tuple, result[flag].known)),
-              'active': list(map(tuple, result[flag].active)),
-              'query_information': {},
-              'metadata': kwargs}],
-            {},
-        )
-
-    return cascaded_query
+            'metadata': self.metadata,
+        }
 
 
 def segdb_expand_version_number(min_, max_):
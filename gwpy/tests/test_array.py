@@ -31,7 +31,7 @@ import numpy
 from astropy import units
 from astropy.time import Time
 
-from gwpy.types import (Array, Series, Array2D)
+from gwpy.types import (Array, Series, Array2D, Index, RegularIndex)
 from gwpy.detector import Channel
 from gwpy.segments import Segment
 from gwpy.time import LIGOTimeGPS
@@ -339,6 +339,21 @@ class TestSeries(TestArray):
             series.xindex,
             units.Quantity(x_default, self.TEST_CLASS._default_xunit))
 
+        # test regular index is not stored, and follows x0
+        index = series.xindex
+        assert isinstance(index, RegularIndex)
+        assert series.xindex is index
+        assert not hasattr(series, '_xindex')
+        series.x0 = series.x0 + 1 * series.xunit
+        assert series.xindex is not index
+        assert series.xindex[0] == series.x0
+
+        # test creating from a RegularIndex
+        series = self.create(xindex=index)
+        assert not hasattr(series, '_xindex')
+        assert series.x0 == index.start
+        assert series.dx == index.step
+
         # test setting of x0 and dx
         series = self.create(xindex=units.Quantity(x, 'Farad'))
         assert series.x0 == units.Quantity(x[0], 'Farad')
@@ -360,6 +375,32 @@ class TestSeries(TestArray):
         assert series.x0 == units.Quantity(1, 'Mpc')
         assert series.xspan == (x[0], x[-1] + x[-1] - x[-2])
 
+    def test_xindex_setitem(self):
+        series = self.create(x0=10, dx=1)
+        unit = series.xunit
+
+        # check assigning to a regular index stores the new index
+        series.xindex[0] = units.Quantity(0, unit)
+        assert isinstance(series.xindex, Index)
+        assert series.x0 == units.Quantity(0, unit)
+        assert series.xindex[1] == units.Quantity(11, unit)
+        with pytest.raises(AttributeError):
+            series.dx
+
+        # check a copy doesn't modify the original
+        series = self.create(x0=10, dx=1)
+        index = series.xindex
+        new = pickle.loads(pickle.dumps(series))
+        new.xindex[-1] = units.Quantity(1000, unit)
+        assert new.xindex[-1] == units.Quantity(1000, unit)
+        assert series.xindex is index
+
+        # check an index that is out of date can't be modified
+        series.x0 = 0
+        with pytest.raises(TypeError):
+            index[0] = units.Quantity(0, unit)
+        assert series.x0 == units.Quantity(0, unit)
+
     def test_xunit(self, unit=None):
         if unit is None:
             unit = self.TEST_CLASS._default_xunit
@@ -449,14 +490,21 @@ class TestSeries(TestArray):
         with pytest.raises(ValueError):
             a3.append(array)
 
-        # test appending with one xindex deletes it in the output
+        # test that regular xindexes are not stored
         array.xindex
         a3 = array.append(a2, inplace=False)
+        assert hasattr(array, '_xindex') is False
+        assert hasattr(a3, '_xindex') is False
+        utils.assert_quantity_almost_equal(
+            a3.xindex[-a2.shape[0]:].materialize(), a2.xindex.materialize())
+
+        # test appending with one xindex deletes it in the output
+        array.xindex = array.xindex.value
+        a3 = array.append(a2, inplace=False)
         assert hasattr(a3, '_xindex') is False
 
         # test appending with both xindex appends as well
-        array.xindex
-        a2.xindex
+        a2.xindex = a2.xindex.value
         a3 = array.append(a2, inplace=False)
         assert hasattr(a3, '_xindex')
         utils.assert_array_equal(
@@ -639,6 +687,8 @@ class TestArray2D(TestSeries):
         utils.assert_quantity_equal(
             series.yindex,
             units.Quantity(y_default, self.TEST_CLASS._default_yunit))
+        assert isinstance(series.yindex, RegularIndex)
+        assert not hasattr(series, '_yindex')
 
         # test setting of y0 and dy
         series = self.create(yindex=units.Quantity(y, 'Farad'))
@@ -661,6 +711,16 @@ class TestArray2D(TestSeries):
         assert series.y0 == units.Quantity(1, 'Mpc')
         assert series.yspan == (y[0], y[-1] + y[-1] - y[-2])
 
+    def test_yindex_setitem(self):
+        array = self.create(y0=10, dy=1)
+        unit = array.yunit
+        array.yindex[-1] = units.Quantity(100, unit)
+        assert isinstance(array.yindex, Index)
+        assert array.yindex[-1] == units.Quantity(100, unit)
+        assert array.y0 == units.Quantity(10, unit)
+        with pytest.raises(AttributeError):
+            array.dy
+
     def test_yunit(self, unit=None):
         if unit is None:
             unit = self.TEST_CLASS._default_yunit
@@ -717,3 +777,147 @@ class TestArray2D(TestSeries):
 
     def test_pad(self):
         return NotImplemented
+
+
+# -- RegularIndex -------------------------------------------------------------
+
+class TestRegularIndex(object):
+    TEST_CLASS = RegularIndex
+
+    def create(self, start=10, step=.25, size=100, unit='s'):
+        return self.TEST_CLASS(units.Quantity(start, unit), step, size)
+
+    @pytest.fixture()
+    def index(self):
+        return self.create()
+
+    @pytest.fixture()
+    def values(self, index):
+        return numpy.arange(index.size) * index.step.value + index.start.value
+
+    def test_new(self, index):
+        assert index.start == units.Quantity(10, 's')
+        assert index.step == units.Quantity(.25, 's')
+        assert index.size == len(index) == 100
+        assert index.shape == (100,)
+        assert index.unit == units.s
+        assert index.regular is True
+
+        # check step is converted to the unit of start
+        index = self.TEST_CLASS(units.Quantity(1, 's'),
+                                units.Quantity(500, 'ms'), 10)
+        assert index.step == units.Quantity(.5, 's')
+        assert index.step.unit == units.s
+
+    def test_value(self, index, values):
+        utils.assert_array_equal(index.value, values)
+        utils.assert_array_equal(numpy.asarray(index), values)
+        idx = index.materialize()
+        assert isinstance(idx, Index)
+        utils.assert_quantity_equal(idx, units.Quantity(values, 's'))
+
+    def test_getitem(self, index, values):
+        # check single values
+        assert index[0] == index.start
+        assert index[2] == units.Quantity(values[2], 's')
+        assert index[-1] == units.Quantity(values[-1], 's')
+        with pytest.raises(IndexError):
+            index[index.size]
+
+        # check slices stay regular
+        for item in (slice(2, 20), slice(None, None, 3), slice(-5, None),
+                     slice(None, None, -2), slice(50, 10)):
+            sliced = index[item]
+            assert isinstance(sliced, RegularIndex)
+            utils.assert_array_equal(sliced.value, values[item])
+
+        # check index arrays
+        mask = values > 20
+        utils.assert_quantity_equal(index[mask],
+                                    units.Quantity(values[mask], 's'))
+        utils.assert_quantity_equal(index[numpy.array([0, 5, -1])],
+                                    units.Quantity(values[[0, 5, -1]], 's'))
+
+    def test_arithmetic(self, index, values):
+        for new, expected in (
+                (index + 1 * units.s, values + 1),
+                (index - 1 * units.s, values - 1),
+                (index * 2, values * 2),
+                (2 * index, values * 2),
+                (index / 2, values / 2),
+                (-index, -values)):
+            assert isinstance(new, RegularIndex)
+            utils.assert_allclose(new.value, expected)
+        assert (index * units.m).unit == units.s * units.m
+        index2 = self.create(unit='')
+        for new in (1 - index2, numpy.float64(1) - index2):
+            assert isinstance(new, RegularIndex)
+            utils.assert_allclose(new.value, 1 - index2.value)
+
+        # check operations with quantities on the left still work
+        utils.assert_quantity_almost_equal(
+            1 * units.s - index, units.Quantity(1 - values, 's'))
+
+        # check operations with arrays use the full index
+        other = numpy.ones(index.size) * units.m
+        utils.assert_quantity_almost_equal(
+            index * other, units.Quantity(values, 's') * other)
+        utils.assert_quantity_almost_equal(
+            other * index, other * units.Quantity(values, 's'))
+
+    def test_setitem(self, index):
+        with pytest.raises(TypeError):
+            index[0] = units.Quantity(0, 's')
+
+    @pytest.mark.skipif(not hasattr(numpy.ndarray, '__array_function__'),
+                        reason='numpy does not support __array_function__')
+    def test_array_function(self, index, values):
+        diff = numpy.diff(index)
+        assert isinstance(diff, units.Quantity)
+        utils.assert_quantity_almost_equal(
+            diff, units.Quantity(numpy.diff(values), 's'))
+        utils.assert_quantity_equal(
+            numpy.concatenate((index, index[:2])),
+            units.Quantity(numpy.concatenate((values, values[:2])), 's'))
+
+    def test_comparison(self, index, values):
+        utils.assert_array_equal(index > 20 * units.s, values > 20)
+        utils.assert_array_equal(index == index[4], values == values[4])
+
+    def test_min_max(self, index, values):
+        assert index.min() == units.Quantity(values.min(), 's')
+        assert index.max() == units.Quantity(values.max(), 's')
+        assert (-index).min() == units.Quantity(-values.max(), 's')
+
+    @pytest.mark.parametrize('side', ('left', 'right'))
+    def test_searchsorted(self, side):
+        index = self.create(start=1e9, step=1/4096., size=10000)
+        values = index.value
+        v = numpy.concatenate((values[::7], values[::13] + 1e-5,
+                               [values[0] - 1, values[-1] + 1]))
+        utils.assert_array_equal(index.searchsorted(v, side=side),
+                                 values.searchsorted(v, side=side))
+        assert index.searchsorted(values[10], side=side) == (
+            values.searchsorted(values[10], side=side))
+        # check quantities are converted
+        assert index.searchsorted(
+            units.Quantity(values[10] * 1000, 'ms'), side=side) == (
+            values.searchsorted(values[10], side=side))
+
+    def test_to(self, index, values):
+        ms = index.to('ms')
+        assert isinstance(ms, RegularIndex)
+        assert ms.unit == units.ms
+        utils.assert_allclose(ms.value, values * 1000)
+
+    def test_str(self, index, values):
+        assert str(index) == str(units.Quantity(values, 's'))
+        assert repr(index) == ('<RegularIndex(start=10.0 s, step=0.25 s, '
+                               'size=100)>')
+        big = self.create(size=10000)
+        assert str(big).startswith(str(big[:3].value)[:-1])
+        assert str(big).endswith(str(big[-3:].value)[1:] + ' s')
+
+    def test_pickle(self, index):
+        new = pickle.loads(pickle.dumps(index))
+        utils.assert_quantity_equal(new.materialize(), index.materialize())
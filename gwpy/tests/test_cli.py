@@ -19,10 +19,15 @@
 """Unit tests for :mod:`gwpy.cli`
 """
 
+import errno
 import os
+import signal
+import socket
 import tempfile
+import time
 import importlib
 import argparse
+from io import BytesIO
 
 import pytest
 
@@ -31,8 +36,9 @@ from numpy import random
 from matplotlib import use
 use('agg')  # nopep8
 
-from gwpy.timeseries import TimeSeries
+from gwpy.timeseries import (TimeSeries, TimeSeriesDict)
 from gwpy.plotter import rcParams
+from gwpy.cli import (daemon, gwpy_plot)
 
 # local imports
 import mocks
@@ -104,6 +110,25 @@ class CliTestBase(object):
 
         return product, args
 
+    def test_get_timeseries_framecache(self):
+        product, parser = self.test_init_cli()
+        args = parser.parse_args(self.TEST_ARGS + ['--framecache', 'X.lcf'])
+
+        def read(source, channels, start=None, end=None):
+            return TimeSeriesDict((c, TimeSeries(
+                random.rand(1024 * (end - start)), t0=start,
+                sample_rate=1024, name=c)) for c in channels)
+
+        with mock.patch('gwpy.timeseries.TimeSeriesDict.read',
+                        side_effect=read) as mock_read:
+            product.getTimeSeries(args)
+
+        # check all channels are read in one call
+        mock_read.assert_called_once_with('X.lcf', product.chan_list,
+                                          start=1000000000, end=1000000010)
+        assert [ts.name for ts in product.timeseries] == product.chan_list
+        assert product.time_groups == [list(range(len(product.chan_list)))]
+
     def test_gen_plot(self):
         product, args = self.test_get_timeseries()
         product.config_plot(args)
@@ -184,3 +209,78 @@ class TestCliCoherence(CliTestBase):
 class TestCliCoherencegram(TestCliCoherence):
     PRODUCT_NAME = 'gwpy.cli.coherencegram.Coherencegram'
     ACTION = 'coherencegram'
+
+
+# -- gwpy-plot ----------------------------------------------------------------
+
+def test_create_parser():
+    parser, actions = gwpy_plot.create_parser()
+    assert sorted(actions) == ['coherence', 'coherencegram', 'spectrogram',
+                               'spectrum', 'timeseries']
+    args = parser.parse_args(['spectrum'] + CliTestBase.TEST_ARGS)
+    assert args.func == 'spectrum'
+    assert args.chan == [['X1:TEST-CHANNEL']]
+
+
+def test_daemon(tmpdir):
+    path = str(tmpdir.join('gwpy-plot.sock'))
+    pid = os.fork()
+    if pid == 0:  # server
+        try:
+            daemon.serve(path)
+        finally:
+            os._exit(0)
+    try:
+        timeout = time.time() + 30
+        while not os.path.exists(path):
+            assert time.time() < timeout, "server did not start"
+            time.sleep(.1)
+
+        # check output and exit code are returned
+        out = BytesIO()
+        assert daemon.run_client(['spectrum', '--help'], path=path,
+                                 stdout=out) == 0
+        assert out.getvalue().startswith(b'usage: gwpy-plot spectrum')
+        out = BytesIO()
+        assert daemon.run_client(['spectrum'], path=path, stdout=out) == 2
+        assert b'arguments are required: --chan' in out.getvalue()
+    finally:
+        os.kill(pid, signal.SIGINT)
+        os.waitpid(pid, 0)
+    assert not os.path.exists(path)
+
+    # check error with no server
+    with pytest.raises(Exception):
+        daemon.run_client(['spectrum', '--help'], path=path)
+
+
+def test_daemon_socket(tmpdir):
+    # check default path
+    with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': str(tmpdir)}):
+        os.environ.pop(daemon.SOCKET_ENV, None)
+        assert daemon.default_socket() == str(tmpdir.join('gwpy-plot.sock'))
+        os.environ[daemon.SOCKET_ENV] = 'test.sock'
+        assert daemon.default_socket() == 'test.sock'
+
+    # check that only private sockets are accepted
+    path = str(tmpdir.join('test.sock'))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        os.chmod(path, 0o600)
+        daemon.check_socket(path)
+        os.chmod(path, 0o666)
+        with pytest.raises(socket.error) as exc:
+            daemon.check_socket(path)
+        assert exc.value.errno == errno.EPERM
+        with pytest.raises(socket.error):
+            daemon.run_client(['spectrum', '--help'], path=path)
+    finally:
+        sock.close()
+
+    # check that regular files are rejected
+    path = str(tmpdir.join('test.txt'))
+    open(path, 'w').close()
+    os.chmod(path, 0o600)
+    with pytest.raises(socket.error):
+        daemon.check_socket(path)
@@ -200,6 +200,9 @@ class TestSpectralVariance(TestArray2D):
     def test_yindex(self, array):
         utils.assert_array_equal(array.yindex, array.bins[:-1])
 
+    def test_yindex_setitem(self):
+        return NotImplemented
+
     # -- test methods ---------------------------
 
     def test_init(self, array):
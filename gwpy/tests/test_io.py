@@ -28,15 +28,19 @@ import sys
 
 from six import PY2
 
+import numpy
+
 import pytest
 
 from gwpy.io import (cache as io_cache,
                      datafind as io_datafind,
+                     dqsegdb as io_dqsegdb,
                      gwf as io_gwf,
                      kerberos as io_kerberos,
                      nds2 as io_nds2,
+                     registry as io_registry,
                      utils as io_utils)
-from gwpy.segments import (Segment, SegmentList)
+from gwpy.segments import (Segment, SegmentList, DataQualityFlag)
 
 import utils
 import mocks
@@ -275,6 +279,17 @@ class TestIoCache(object):
         with pytest.raises(ValueError):
             io_cache.file_name(['test.txt'])
 
+    @utils.skip_missing_dependency('glue.lal')
+    def test_glue_cache_entry(self):
+        from glue.lal import (Cache, CacheEntry)
+        # check that entries of a cache built by glue itself are recognised
+        cache = Cache([CacheEntry.from_T050017('/tmp/A-B-0-1.tmp')])
+        assert io_cache.is_cache(cache)
+        assert io_cache.is_cache_entry(cache[0])
+        assert io_cache.file_name(cache[0]) == '/tmp/A-B-0-1.tmp'
+        assert io_cache.file_list(cache) == ['/tmp/A-B-0-1.tmp']
+        assert not io_cache.is_cache_entry('/tmp/A-B-0-1.tmp')
+
     def test_cache_segments(self):
         """Test :func:`gwpy.io.cache.cache_segments`
         """
@@ -458,6 +473,59 @@ class TestIoDatafind(object):
                 'L1:LDAS-STRAIN', 968654552, 968654553) == 'GW100916'
 
 
+# -- gwpy.io.dqsegdb ----------------------------------------------------------
+
+class TestIoDqsegdb(object):
+    """Tests for :mod:`gwpy.io.dqsegdb`
+    """
+    def test_coalesce_array(self):
+        segs = [(4, 5), (0, 1), (1, 2), (0.5, 1.5), (7, 7)]
+        utils.assert_array_equal(io_dqsegdb.coalesce_array(segs),
+                                 [(0, 2), (4, 5)])
+        utils.assert_array_equal(io_dqsegdb.coalesce_array(segs, maxgap=2),
+                                 [(0, 5)])
+        assert io_dqsegdb.coalesce_array([]).shape == (0, 2)
+
+    def test_intersect_arrays(self):
+        a = [(0, 3), (5, 10), (12, 13)]
+        b = [(1, 2), (2.5, 6), (9, 20)]
+        utils.assert_array_equal(
+            io_dqsegdb.intersect_arrays(a, b),
+            [(1, 2), (2.5, 3), (5, 6), (9, 10), (12, 13)])
+        # check against SegmentList
+        ref = SegmentList(map(Segment, a)) & SegmentList(map(Segment, b))
+        utils.assert_array_equal(io_dqsegdb.intersect_arrays(a, b), ref)
+        assert io_dqsegdb.intersect_arrays(a, []).shape == (0, 2)
+
+    def test_subtract_arrays(self):
+        a = [(0, 10)]
+        b = [(1, 2), (5, 20)]
+        utils.assert_array_equal(io_dqsegdb.subtract_arrays(a, b),
+                                 [(0, 1), (2, 5)])
+        utils.assert_array_equal(io_dqsegdb.subtract_arrays(a, []), a)
+
+    def test_client(self):
+        flag = DataQualityFlag('X1:TEST:1', known=[(0, 10)],
+                               active=[(1, 2), (6, 9)])
+        old = DataQualityFlag('X1:TEST:2', known=[(0, 5)],
+                              active=[(3, 4)])
+        with mocks.DQSegDBServer({'X1:TEST:1': flag,
+                                  'X1:TEST:2': old}) as url:
+            with io_dqsegdb.DQSegDBClient(url) as client:
+                assert client.versions('X1', 'TEST') == [1, 2]
+                segs = numpy.array([(0, 2), (4, 7), (8, 10)])
+                known, active, _ = client.query('X1', 'TEST', 1, segs)
+                utils.assert_array_equal(known, segs)
+                utils.assert_array_equal(active, [(1, 2), (6, 7), (8, 9)])
+                # check cascade, version 2 takes precedence on [0, 5)
+                known, active, _ = client.query('X1', 'TEST', None, segs)
+                utils.assert_array_equal(known, segs)
+                utils.assert_array_equal(active, [(6, 7), (8, 9)])
+                with pytest.raises(io_dqsegdb.HTTPError) as exc:
+                    client.query('X1', 'TEST', 3, segs)
+                assert exc.value.code == 404
+
+
 # -- gwpy.io.kerberos ---------------------------------------------------------
 
 KLIST = """Keytab name: FILE:/test.keytab
@@ -546,6 +614,133 @@ class TestIoKerberos(object):
             ['/bin/kinit', 'rainer.weiss@LIGO.ORG'], **popen_kwargs)
 
 
+# -- gwpy.io.ligolw -----------------------------------------------------------
+
+class TestIoLigolw(object):
+    TEST_XML = """<?xml version='1.0' encoding='utf-8'?>
+<LIGO_LW>
+	<Table Name="process:table">
+		<Column Type="lstring" Name="process:program"/>
+		<Stream Delimiter="," Type="Local" Name="process:table">
+			"test",
+		</Stream>
+	</Table>
+	<Table Name="segment:table">
+		<Column Type="int_4s" Name="segment:start_time"/>
+		<Column Type="lstring" Name="segment:comment"/>
+		<Column Type="int_4s" Name="segment:end_time"/>
+		<Stream Delimiter="," Type="Local" Name="segment:table">
+			1,"a, \\"b\\"",2,
+			3,,4
+		</Stream>
+	</Table>
+</LIGO_LW>
+"""  # nopep8
+
+    def test_strip_names(self):
+        from gwpy.io.ligolw import (strip_table_name, strip_column_name)
+        assert strip_table_name('segment:table') == 'segment'
+        assert strip_table_name('grp:sngl_burst:table') == 'sngl_burst'
+        assert strip_table_name('segment') == 'segment'
+        assert strip_column_name('segment:start_time') == 'start_time'
+        assert strip_column_name('start_time') == 'start_time'
+
+    def test_tokenize_stream(self):
+        from gwpy.io.ligolw import (tokenize_stream, unquote)
+        tokens = tokenize_stream('1,"a, \\"b\\"",2,\n 3,,4', 3)
+        assert tokens[0] == ['1', '3']
+        assert tokens[2] == ['2', '4']
+        assert unquote(tokens[1]) == ['a, "b"', None]
+        assert tokenize_stream('1;2;3;4', 2, delimiter=';') == [
+            ['1', '3'], ['2', '4']]
+        assert tokenize_stream('', 2) == [[], []]
+        # check only requested columns are returned
+        assert tokenize_stream('1,2,3,4,5,6', 3, usecols=[2, 0]) == [
+            ['3', '6'], ['1', '4']]
+        # check trailing delimiter is allowed
+        assert tokenize_stream('1,2,3,4,', 2) == [['1', '3'], ['2', '4']]
+        # check incomplete rows raise an error
+        with pytest.raises(ValueError):
+            tokenize_stream('1,2,3', 2)
+
+    def test_iter_tables(self):
+        from gwpy.io.ligolw import iter_tables
+        with tempfile.NamedTemporaryFile(suffix='.xml', mode='w') as f:
+            f.write(self.TEST_XML)
+            f.flush()
+            tables = list(iter_tables(f.name))
+            assert [t[0] for t in tables] == ['process', 'segment']
+            name, columns, tokens = list(iter_tables(f.name, ['segment']))[0]
+            assert columns == [('start_time', 'int_4s'),
+                               ('comment', 'lstring'),
+                               ('end_time', 'int_4s')]
+            assert tokens == {'start_time': ['1', '3'],
+                              'comment': ['"a, \\"b\\""', ''],
+                              'end_time': ['2', '4']}
+            name, columns, tokens = list(iter_tables(
+                f.name, ['segment'], columns=['end_time', 'blah']))[0]
+            assert len(columns) == 3
+            assert tokens == {'end_time': ['2', '4']}
+
+    def test_read_table_columns(self):
+        from gwpy.io.ligolw import read_table_columns
+        xml = self.TEST_XML.replace(
+            '"segment:start_time"/>',
+            '"segment:start_time"/>\n\t\t<Column Type="ilwd:char" '
+            'Name="segment:segment_id"/>').replace(
+            '1,"a, ', '1,"segment:segment_id:5","a, ').replace(
+            '3,,4', '3,,,4')
+        with tempfile.NamedTemporaryFile(suffix='.xml', mode='w') as f:
+            f.write(xml)
+            f.flush()
+            names, arrays = read_table_columns(f.name, 'segment')
+            assert names == ['start_time', 'segment_id', 'comment',
+                             'end_time']
+            assert arrays[0].dtype == numpy.int32
+            utils.assert_array_equal(arrays[0], [1, 3])
+            utils.assert_array_equal(arrays[1], [5, 0])
+            assert arrays[2].tolist() == ['a, "b"', '']
+
+            # check columns and filters
+            from operator import gt
+            names, arrays = read_table_columns(
+                [f.name, f.name], 'segment', columns=['end_time'],
+                filters=[('start_time', [(2, gt)])])
+            assert names == ['end_time']
+            utils.assert_array_equal(arrays[0], [4, 4])
+
+            with pytest.raises(ValueError):
+                read_table_columns(f.name, 'sngl_burst')
+
+
+# -- gwpy.io.registry ---------------------------------------------------------
+
+class TestIoRegistry(object):
+    def test_delay_doc_updates(self):
+        class Blah(object):
+            @classmethod
+            def read(cls, *args, **kwargs):
+                """Read a Blah
+
+                Notes
+                -----"""
+
+        def read(*args, **kwargs):
+            pass
+
+        try:
+            with io_registry.delay_doc_updates(Blah):
+                io_registry.register_reader('blah1', Blah, read)
+                io_registry.register_reader('blah2', Blah, read)
+                # docstring not updated yet
+                assert 'blah1' not in Blah.read.__doc__
+            assert 'blah1' in Blah.read.__doc__
+            assert 'blah2' in Blah.read.__doc__
+        finally:
+            io_registry.astropy_registry.unregister_reader('blah1', Blah)
+            io_registry.astropy_registry.unregister_reader('blah2', Blah)
+
+
 # -- gwpy.io.utils ------------------------------------------------------------
 
 class TestIoUtils(object):
@@ -19,6 +19,9 @@
 """Unit tests for plotter module
 """
 
+import json
+import os
+import re
 import tempfile
 
 import pytest
@@ -33,8 +36,8 @@ use('agg')  # nopep8
 from matplotlib import pyplot
 from matplotlib.legend import Legend
 from matplotlib.colors import (LogNorm, ColorConverter)
-from matplotlib.collections import (PathCollection, PatchCollection,
-                                    PolyCollection)
+from matplotlib.image import AxesImage
+from matplotlib.collections import (PathCollection, PolyCollection)
 
 from astropy import units
 
@@ -51,8 +54,11 @@ from gwpy.plotter import (figure, rcParams, Plot, Axes,
                           SegmentPlot, SegmentAxes,
                           SpectrogramPlot, BodePlot)
 from gwpy.plotter.rc import (SUBPLOT_WIDTH, SUBPLOT_HEIGHT)
+from gwpy.plotter.batch import (PlotSpec, render_batch)
+from gwpy.plotter.decimate import (MinMaxPyramid, BlockImage,
+                                   band_vertices)
 from gwpy.plotter.gps import (GPSTransform, InvertedGPSTransform)
-from gwpy.plotter.html import (map_data, map_artist)
+from gwpy.plotter.html import (map_data, map_artist, html_area)
 from gwpy.plotter.log import CombinedLogFormatterMathtext
 from gwpy.plotter.text import (to_string, unit_as_label)
 from gwpy.plotter.tex import (float_to_latex, label_to_latex,
@@ -490,6 +496,20 @@ class TestTimeSeriesPlot(TimeSeriesMixin, TestPlot):
         # test kwarg parsing
         fig = self.FIGURE_CLASS(self.ts, figsize=[12, 6], rasterized=True)
 
+    def test_init_decimate(self):
+        ts = TimeSeries(numpy.random.randn(2 ** 17), sample_rate=1024)
+        # check decimate is passed to the axes
+        fig = ts.plot(decimate=False)
+        nptest.assert_array_equal(fig.gca().lines[0].get_ydata(), ts.value)
+        self.save_and_close(fig)
+        fig = ts.plot(decimate=True)
+        assert fig.gca().lines[0].get_ydata().size < ts.size
+        self.save_and_close(fig)
+        # check it is ignored for other data types
+        fig = self.FIGURE_CLASS(ts, self.sg, sep=True, decimate=False)
+        assert len(fig.axes[1].images + fig.axes[1].collections) == 1
+        self.save_and_close(fig)
+
     def test_add_colorbar(self):
         def make_fig():
             fig = self.FIGURE_CLASS(self.sg ** (1/2.))
@@ -583,10 +603,39 @@ class TestTimeSeriesAxes(TimeSeriesMixin, TestAxes):
         assert len(ax.lines) == 2
         assert len(ax.collections) == 1
 
+    def test_plot_timeseries_decimate(self):
+        fig, ax = self.new()
+        ts = TimeSeries(numpy.random.randn(2 ** 17), sample_rate=1024,
+                        epoch=100)
+        line = ax.plot_timeseries(ts)[0]
+        # check that only a few vertices per pixel are drawn, with the
+        # same envelope as the data
+        assert line.get_xdata().size <= 4 * ax.bbox.width + 2
+        assert line.get_ydata().min() == ts.value.min()
+        assert line.get_ydata().max() == ts.value.max()
+        assert ax.get_xlim() == tuple(ts.span)
+        # check that zooming in draws the raw data
+        ax.set_xlim(110, 110.5)
+        fig.canvas.draw()
+        idx = slice(10 * 1024 - 1, int(10.5 * 1024) + 2)
+        nptest.assert_array_equal(line.get_xdata(), ts.times.value[idx])
+        nptest.assert_array_equal(line.get_ydata(), ts.value[idx])
+        self.save_and_close(fig)
+        # check decimate=False
+        fig, ax = self.new()
+        line = ax.plot_timeseries(ts, decimate=False)[0]
+        nptest.assert_array_equal(line.get_ydata(), ts.value)
+        # check bands are decimated in mmm plot
+        artists = ax.plot_timeseries_mmm(ts, ts - 1, ts + 1, decimate=True)
+        verts = artists[2].get_paths()[0].vertices
+        assert verts.shape[0] <= 8 * ax.bbox.width + 4
+        assert verts[:, 1].min() == (ts - 1).value.min()
+        self.save_and_close(fig)
+
     def test_plot_spectrogram(self):
         fig, ax = self.new()
         # check method
-        ax.plot_spectrogram(self.sg)
+        ax.plot_spectrogram(self.sg, imshow=False)
         coll = ax.collections[0]
         nptest.assert_array_equal(coll.get_array(), self.sg.value.T.flatten())
         # check GPS axis is set ok
@@ -602,6 +651,48 @@ class TestTimeSeriesAxes(TimeSeriesMixin, TestAxes):
         assert isinstance(c.norm, LogNorm)
         self.save_and_close(fig)
 
+    def test_plot_spectrogram_imshow(self):
+        fig, ax = self.new()
+        # check regular spectrograms are rendered as a reduced image
+        image = ax.plot_spectrogram(self.sg)
+        assert isinstance(image, AxesImage)
+        assert not ax.collections
+        assert ax.get_xlim() == tuple(self.sg.xspan)
+        nptest.assert_array_equal(image.get_extent(),
+                                  tuple(self.sg.xspan) + tuple(self.sg.yspan))
+        fig.canvas.draw()
+        nt, nf = image.get_array().shape[::-1]
+        assert nt <= 2 * ax.bbox.width < self.sg.shape[0]
+        assert nf == self.sg.shape[1]
+
+        # check zooming in recovers the full resolution
+        nzoom = 50
+        ax.set_xlim(self.sg.x0.value,
+                    self.sg.x0.value + nzoom * self.sg.dx.value)
+        fig.canvas.draw()
+        nptest.assert_array_equal(image.get_array(), self.sg.value[:nzoom].T)
+
+        # check log-frequency axis skips the 0 Hz row
+        ax.set_yscale('log')
+        ax.set_ylim(1, 64)
+        fig.canvas.draw()
+        assert image.get_extent()[2] == self.sg.df.value
+        nptest.assert_array_equal(image.get_array(),
+                                  self.sg.value[:nzoom, 1:-1].T)
+
+        # check raw data
+        image = ax.plot_spectrogram(self.sg, downsample=False)
+        nptest.assert_array_equal(image.get_array(), self.sg.value.T)
+
+        # check irregular spectrograms
+        irregular = self.sg[:, :10].copy()
+        irregular.yindex = irregular.yindex.value ** 2
+        with pytest.raises(ValueError):
+            ax.plot_spectrogram(irregular, imshow=True)
+        mesh = ax.plot_spectrogram(irregular)
+        assert mesh is ax.collections[0]
+        self.save_and_close(fig)
+
     def test_plot(self):
         fig, ax = self.new()
         ax.plot(self.ts)
@@ -734,6 +825,16 @@ class TestEventTableAxes(EventTableMixin, TestAxes):
         c = ax.plot_tiles(table, 'time', 'frequency', 'duration',
                           'bandwidth', 'snr')
         assert isinstance(c, PolyCollection)
+        nptest.assert_array_equal(c.get_array(), snrs)
+        # check tile positions
+        order = numpy.argsort(table['snr'], kind='mergesort')
+        row = table[order[0]]
+        nptest.assert_array_almost_equal(
+            c.get_paths()[0].get_extents().get_points(),
+            [[row['time'] - row['duration'] / 2.,
+              row['frequency'] - row['bandwidth'] / 2.],
+             [row['time'] + row['duration'] / 2.,
+              row['frequency'] + row['bandwidth'] / 2.]])
         # test other anchors
         c = ax.plot_tiles(table, 'time', 'frequency', 'duration',
                           'bandwidth', 'snr', anchor='ll')
@@ -743,6 +844,10 @@ class TestEventTableAxes(EventTableMixin, TestAxes):
                           'bandwidth', 'snr', anchor='ul')
         c = ax.plot_tiles(table, 'time', 'frequency', 'duration',
                           'bandwidth', 'snr', anchor='ur')
+        nptest.assert_array_almost_equal(
+            c.get_paths()[0].get_extents().get_points(),
+            [[row['time'] - row['duration'], row['frequency'] -
+              row['bandwidth']], [row['time'], row['frequency']]])
         with pytest.raises(ValueError):
             ax.plot_tiles(table, 'time', 'frequency', 'duration',
                           'bandwidth', 'snr', anchor='other')
@@ -808,10 +913,27 @@ class TestSegmentAxes(SegmentMixin, TestAxes):
         patch = self.AXES_CLASS.build_segment((1.1, 2.4), 10, valign='bottom')
         assert patch.get_xy() == (1.1, 10.0)
 
+    def test_build_segment_collection(self, segments):
+        coll = self.AXES_CLASS.build_segment_collection(segments, 10)
+        assert isinstance(coll, PolyCollection)
+        assert len(coll.get_paths()) == len(segments)
+        for path, seg in zip(coll.get_paths(), segments):
+            patch = self.AXES_CLASS.build_segment(seg, 10)
+            nptest.assert_array_almost_equal(
+                path.vertices, patch.get_verts())
+        # check kwarg passing
+        coll = self.AXES_CLASS.build_segment_collection(
+            segments, 10, valign='top', fill=False, edgecolor='red')
+        assert coll.get_paths()[0].get_extents().y1 == 10.
+        assert not coll.get_facecolor()[:, 3].any()
+        with pytest.raises(ValueError):
+            self.AXES_CLASS.build_segment_collection(segments, 10,
+                                                     valign='blah')
+
     def test_plot_segmentlist(self, segments):
         fig, ax = self.new()
         c = ax.plot_segmentlist(segments)
-        assert isinstance(c, PatchCollection)
+        assert isinstance(c, PolyCollection)
         assert numpy.isclose(ax.dataLim.x0, 0.)
         assert numpy.isclose(ax.dataLim.x1, 7.)
         assert len(c.get_paths()) == len(segments)
@@ -829,7 +951,7 @@ class TestSegmentAxes(SegmentMixin, TestAxes):
         # test collection=False
         c = ax.plot_segmentlist(segments, collection=False, label='test')
         assert isinstance(c, list)
-        assert not isinstance(c, PatchCollection)
+        assert not isinstance(c, PolyCollection)
         assert c[0].get_label() == 'test'
         assert c[1].get_label() == ''
         assert len(ax.patches) == len(segments)
@@ -950,6 +1072,125 @@ class TestBodePlot(PlottingTestBase):
         nptest.assert_array_almost_equal(lp.get_ydata(), PHASE)
 
 
+# -- gwpy.plotter.decimate module tests ---------------------------------------
+
+class TestMinMaxPyramid(object):
+    def test_extrema(self):
+        data = numpy.random.randn(100000)
+        data[500:600] = numpy.nan
+        pyramid = MinMaxPyramid(data, 10, 0.5)
+        assert [lvl[0] for lvl in pyramid.levels] == [1, 16, 256]
+        assert pyramid.xspan == (10, 50010)
+
+        # check raw data for short views
+        x, mins, maxs = pyramid.extrema(100, 200, npix=1000)
+        assert mins is maxs
+        nptest.assert_array_equal(x, 10 + numpy.arange(179, 382) * .5)
+
+        # check blocks against brute force
+        x, mins, maxs = pyramid.extrema(npix=100)
+        step = int(round((x[1] - x[0]) / .5))
+        assert x.size == mins.size == maxs.size == -(-data.size // step)
+        for i in range(x.size):
+            chunk = data[i*step:(i+1)*step]
+            assert mins[i] == numpy.nanmin(chunk)
+            assert maxs[i] == numpy.nanmax(chunk)
+
+        # check envelope interleaves min and max
+        x2, y2 = pyramid.envelope(npix=100)
+        nptest.assert_array_equal(x2[::2], x)
+        nptest.assert_array_equal(y2[1::2], maxs)
+
+    def test_band_vertices(self):
+        x = numpy.arange(6.)
+        lower = numpy.array([0, 1, numpy.nan, 1, 2, 3])
+        polys = band_vertices(x, lower, lower + 1)
+        assert len(polys) == 2
+        nptest.assert_array_equal(polys[0], [[0, 1], [1, 2], [1, 1], [0, 0]])
+
+
+class TestBlockImage(object):
+    def test_view(self):
+        data = numpy.random.rand(1000, 50)
+        block = BlockImage(data, 10, 0.5, 0, 2)
+        assert block.extent == (10, 510, 0, 100)
+
+        # check full view without reduction
+        image, extent = block.view()
+        nptest.assert_array_equal(image, data.T)
+        assert extent == block.extent
+
+        # check blocks against brute force
+        image, extent = block.view(xstep=5, ystep=4.5)
+        assert image.shape == (25, 100)
+        assert extent == block.extent
+        nptest.assert_array_equal(image[3, 7], data[70:80, 6:8].max())
+        block = BlockImage(data, 10, 0.5, 0, 2, method='mean')
+        image = block.view(xstep=5, ystep=4.5)[0]
+        nptest.assert_allclose(image[3, 7], data[70:80, 6:8].mean())
+
+        # check cropping, and block alignment
+        image, extent = block.view(xlim=(35, 50), xstep=2)
+        assert extent == (34, 50, 0, 100)
+        assert image.shape == (50, 8)
+
+        # check positive rows
+        extent = block.view(ylim=(-10, 10), positive=True)[1]
+        assert extent == (10, 510, 2, 10)
+
+        with pytest.raises(ValueError):
+            BlockImage(data, 10, 0.5, 0, 2, method='median')
+
+
+# -- gwpy.plotter.batch module tests ------------------------------------------
+
+@utils.skip_missing_dependency('h5py')
+class TestRenderBatch(object):
+    @classmethod
+    def setup_class(cls):
+        numpy.random.seed(0)
+        cls.ts = TimeSeries(numpy.random.rand(1000), sample_rate=128,
+                            name='test')
+
+    def _specs(self, tmpdir):
+        hdf = str(tmpdir.join('data.h5'))
+        self.ts.write(hdf, path='test')
+        return [
+            PlotSpec(self.ts, str(tmpdir.join('a.png')), figsize=(6, 4)),
+            PlotSpec([self.ts, self.ts * 2], str(tmpdir.join('b.png')),
+                     plot=TimeSeriesPlot, sep=True),
+            PlotSpec(hdf, str(tmpdir.join('c.png')), cls=TimeSeries,
+                     read_kw={'path': 'test'}, rc={'lines.linewidth': 4}),
+            PlotSpec(hdf, str(tmpdir.join('d.png'))),  # no cls
+            PlotSpec(self.ts, str(tmpdir.join('e.png')), badkwarg=1),
+        ]
+
+    @pytest.mark.parametrize('nproc', [1, 2])
+    def test_render_batch(self, tmpdir, nproc):
+        specs = self._specs(tmpdir)
+        with rc_context(rc={'text.usetex': False}):
+            results = render_batch(specs, nproc=nproc)
+        assert [r.output for r in results] == [s.output for s in specs]
+        assert [r.success for r in results] == [True] * 3 + [False] * 2
+        for result in results[:3]:
+            assert os.path.isfile(result.output)
+            assert sorted(result.timing) == ['load', 'plot', 'save']
+            assert result.elapsed == sum(result.timing.values())
+        assert 'ValueError' in results[3].error
+        assert 'load' in results[3].timing
+        assert 'plot' in results[4].timing
+        assert not os.path.isfile(results[4].output)
+
+    def test_load_cache(self, tmpdir):
+        spec = self._specs(tmpdir)[2]
+        cache = {}
+        a = spec.load(cache=cache)[0]
+        b = spec.load(cache=cache)[0]
+        assert len(cache) == 1
+        assert a is b
+        nptest.assert_array_equal(a.value, self.ts.value)
+
+
 # -- gwpy.plotter.gps module tests --------------------------------------------
 
 class TestGpsTransform(object):
@@ -1075,3 +1316,61 @@ class TestHtml(object):
         areas = soup.find_all('area')
         assert len(areas) == 5
         assert sorted([eval(a.attrs['alt']) for a in areas]) == data
+
+    def test_map_cull_merge(self):
+        fig = figure()
+        ax = fig.gca()
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        # two points on the same pixel, and one outside the axes
+        data = numpy.array([[1, 1], [1, 1.0001], [5, 5], [20, 5]])
+        html = map_data(data, ax, 'test.png', standalone=False,
+                        popup=['a', 'b', 'c', 'd'])
+        assert html.count('<area') == 2
+        assert 'alt="c"' in html and 'alt="b"' in html
+        assert 'alt="a"' not in html and 'alt="d"' not in html
+        html = map_data(data, ax, 'test.png', merge=False,
+                        popup=lambda x, y: 'x=%s' % x)
+        assert html.count('<area') == 3
+        assert 'alt="x=20' not in html
+
+    def test_map_escape(self):
+        fig = figure()
+        ax = fig.gca()
+        data = numpy.array([[.5, .5]])
+        html = map_data(data, ax, 'test.png', standalone=False,
+                        popup=['"a" <b>'])
+        assert 'alt="&quot;a&quot; &lt;b&gt;"' in html
+        assert '<b>' not in html
+        assert html_area(1, 2, href='a.html?b=1&c="2"', alt='<i>',
+                         target='"x"') == (
+            '<area shape="circle" coords="1,2,5" '
+            'href="a.html?b=1&amp;c=&quot;2&quot;" alt="&lt;i&gt;" '
+            'target="&quot;x&quot;" />')
+
+    def test_map_json(self):
+        fig = figure()
+        ax = fig.gca()
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        data = numpy.array([[1., 2.], [5., 5.]])
+        html = map_data(data, ax, 'test.png', mode='json', standalone=False)
+        assert '<area' not in html
+        points = json.loads(re.search(r'var points = (.*);', html).group(1))
+        assert [p[2] for p in points] == ['(5.0, 5.0)', '(1.0, 2.0)']
+        pix = ax.transData.transform(data[::-1])
+        height = int(fig.get_figheight() * fig.dpi)
+        nptest.assert_array_equal([p[:2] for p in points],
+                                  [[round(x), height - round(y)] for
+                                   x, y in pix])
+        with pytest.raises(ValueError):
+            map_data(data, ax, 'test.png', mode='canvas')
+
+        # check that popup text cannot break out of the script
+        popup = '</script><script>alert("&")</script>'
+        html = map_data(data, ax, 'test.png', mode='json', standalone=False,
+                        popup=[popup] * 2)
+        assert html.count('</script>') == 1
+        assert '&")' not in html
+        points = json.loads(re.search(r'var points = (.*);', html).group(1))
+        assert points[0][2] == popup
@@ -166,16 +166,10 @@ def query_segdb(query_func, *args, **kwargs):
 
 
 def query_dqsegdb(query_func, *args, **kwargs):
-    """Mock a query to an aLIGO DQSEGDB database
+    """Run a query against a stand-in aLIGO DQSEGDB server
     """
-    try:
-        with mock.patch('dqsegdb.apicalls.dqsegdbQueryTimes',
-                        mocks.dqsegdb_query_times(QUERY_RESULT)), \
-             mock.patch('dqsegdb.apicalls.dqsegdbCascadedQuery',
-                        mocks.dqsegdb_cascaded_query(QUERY_RESULT)):
-            return query_func(*args, **kwargs)
-    except ImportError as e:
-        pytest.skip(str(e))
+    with mocks.DQSegDBServer(QUERY_RESULT) as url:
+        return query_func(*args, url=url, **kwargs)
 
 
 # -----------------------------------------------------------------------------
@@ -538,14 +532,12 @@ class TestDataQualityFlag(object):
         assert f.name == 'X1:TEST-FLAG'
         assert f.version is None
 
-    @utils.skip_missing_dependency('dqsegdb')
     def test_populate(self):
         name = QUERY_FLAGS[0]
         flag = self.TEST_CLASS(name, known=QUERY_RESULT[name].known)
 
-        with mock.patch('dqsegdb.apicalls.dqsegdbQueryTimes',
-                        mocks.dqsegdb_query_times(QUERY_RESULT)):
-            flag.populate()
+        with mocks.DQSegDBServer(QUERY_RESULT) as url:
+            flag.populate(source=url)
         utils.assert_flag_equal(flag, QUERY_RESULTC[name])
 
     # -- test I/O -------------------------------
@@ -648,6 +640,64 @@ class TestDataQualityFlag(object):
                           'X1:GWPY-TEST:0', 0, 10)
         assert str(exc.value) == 'HTTP Error 404: Not found [X1:GWPY-TEST:0]'
 
+        # check other keyword arguments are ignored, with a warning
+        with pytest.warns(UserWarning) as record:
+            result2 = query_dqsegdb(self.TEST_CLASS.query_dqsegdb, name,
+                                    0, 10, on_error='ignore', blah=1)
+        utils.assert_flag_equal(result, result2)
+        assert len(record) == 1
+        assert "'blah', 'on_error'" in str(record[0].message)
+
+    def test_query_dqsegdb_cache(self, tmpdir):
+        cache = str(tmpdir.join('segments.sqlite'))
+        flag = QUERY_FLAGS[0]
+        RESULT = QUERY_RESULTC[flag]
+        server = mocks.DQSegDBServer(QUERY_RESULT)
+        with server as url:
+            # first query goes to the server
+            result = self.TEST_CLASS.query_dqsegdb(flag, 0, 5, url=url,
+                                                   cache=cache)
+            assert len(server.requests) == 1
+            # second query only requests the new interval
+            result = self.TEST_CLASS.query_dqsegdb(flag, 0, 10, url=url,
+                                                   cache=cache)
+            assert len(server.requests) == 2
+            assert 's=5' in server.requests[-1]
+            utils.assert_segmentlist_equal(result.known, RESULT.known)
+            utils.assert_segmentlist_equal(result.active, RESULT.active)
+            # third query is answered from the cache
+            result = self.TEST_CLASS.query_dqsegdb(flag, 2, 8, url=url,
+                                                   cache=cache)
+            assert len(server.requests) == 2
+            span = SegmentList([Segment(2, 8)])
+            utils.assert_segmentlist_equal(result.active,
+                                           RESULT.active & span)
+
+    def test_query_dqsegdb_cache_ttl(self, tmpdir):
+        from gwpy.io.dqsegdb import SegmentCache
+        cache = SegmentCache(str(tmpdir.join('segments.sqlite')), ttl=50)
+        name = QUERY_FLAGS[0].rsplit(':', 1)[0]
+        server = mocks.DQSegDBServer(QUERY_RESULT)
+        with server as url, mock.patch.object(SegmentCache, '_now') as now:
+            # query at GPS 5, so only [0, 5) can be cached
+            now.return_value = 5
+            self.TEST_CLASS.query_dqsegdb(name, 0, 10, url=url, cache=cache)
+            nreq = len(server.requests)
+            # shortly afterwards, only [5, 10) is queried again
+            now.return_value = 10
+            self.TEST_CLASS.query_dqsegdb(name, 0, 10, url=url, cache=cache)
+            assert 's=5' in server.requests[-1]
+            nreq2 = len(server.requests)
+            assert nreq2 == 2 * nreq
+            # once the ttl expires, versionless results are refreshed
+            now.return_value = 100
+            result = self.TEST_CLASS.query_dqsegdb(name, 0, 10, url=url,
+                                                   cache=cache)
+            assert 's=0' in server.requests[-1]
+            assert len(server.requests) == nreq2 + nreq
+        utils.assert_segmentlist_equal(result.known,
+                                       QUERY_RESULTC[QUERY_FLAGS[0]].known)
+
     def test_query_dqsegdb_multi(self):
         segs = SegmentList([Segment(0, 2), Segment(8, 10)])
         result = query_dqsegdb(self.TEST_CLASS.query_dqsegdb,
@@ -816,6 +866,48 @@ class TestDataQualityDict(object):
             _read_write(autoidentify=True)
         _read_write(autoidentify=True, write_kw={'overwrite': True})
 
+    @utils.skip_missing_dependency('glue.ligolw.lsctables')
+    def test_read_ligolw(self, instance):
+        from glue.ligolw.ligolw import LIGOLWContentHandler
+        instance['X1:TEST-FLAG:1'].active.append(Segment(
+            LIGOTimeGPS(8, 250000000), LIGOTimeGPS(9, 5)))
+        with tempfile.NamedTemporaryFile(suffix='.xml') as f:
+            instance.write(f.name, format='ligolw', overwrite=True)
+
+            # check reading all flags, a subset, and with a full Document
+            for kwargs in ({}, {'contenthandler': LIGOLWContentHandler}):
+                new = self.TEST_CLASS.read(f.name, format='ligolw', **kwargs)
+                utils.assert_dict_equal(new, instance,
+                                        utils.assert_flag_equal)
+                assert list(new.keys()) == list(instance.keys())
+                assert isinstance(new['X1:TEST-FLAG:1'].active[-1][1],
+                                  LIGOTimeGPS)
+            new = self.TEST_CLASS.read(f.name, ['Y1:TEST-FLAG:2'],
+                                       format='ligolw')
+            assert list(new.keys()) == ['Y1:TEST-FLAG:2']
+            utils.assert_flag_equal(new['Y1:TEST-FLAG:2'],
+                                    instance['Y1:TEST-FLAG:2'])
+
+            # check gpstype conversion
+            new = self.TEST_CLASS.read(f.name, format='ligolw',
+                                       gpstype=float)
+            seg = new['X1:TEST-FLAG:1'].active[-1]
+            assert isinstance(seg[0], float)
+            assert seg == (8.25, 9.000000005)
+
+            # check reading all flags into one
+            new = self.TEST_CLASS.read(f.name, [None], format='ligolw')
+            assert list(new.keys()) == [None]
+            utils.assert_segmentlist_equal(
+                new[None].known,
+                instance['X1:TEST-FLAG:1'].known +
+                instance['Y1:TEST-FLAG:2'].known)
+
+            # check missing flag
+            with pytest.raises(ValueError):
+                self.TEST_CLASS.read(f.name, ['Z1:TEST-FLAG:1'],
+                                     format='ligolw')
+
     # -- test queries ---------------------------
 
     @pytest.mark.parametrize('api', ('dqsegdb', 'segdb'))
@@ -852,12 +944,34 @@ class TestDataQualityDict(object):
         with pytest.raises(ValueError):
             self.TEST_CLASS.query_dqsegdb(QUERY_FLAGS, 0, 10, on_error='blah')
 
+        # check other keyword arguments are ignored, with a single warning
+        with pytest.warns(UserWarning) as record:
+            result = query_dqsegdb(self.TEST_CLASS.query_dqsegdb,
+                                   QUERY_FLAGS, 0, 10, blah=1)
+        utils.assert_dict_equal(result, RESULT, utils.assert_flag_equal)
+        assert len(record) == 1
+
+    def test_query_dqsegdb_batched(self):
+        segs = SegmentList([Segment(i, i + .5) for i in range(10)])
+        server = mocks.DQSegDBServer(QUERY_RESULT)
+        with server as url:
+            result = self.TEST_CLASS.query_dqsegdb(QUERY_FLAGS, segs,
+                                                   url=url, nthreads=1)
+        # check query segments were coalesced into a single request per
+        # flag, all made over a single connection
+        assert len(server.requests) == len(QUERY_FLAGS)
+        assert server.connections == 1
+        for flag in QUERY_FLAGS:
+            utils.assert_segmentlist_equal(result[flag].known,
+                                           QUERY_RESULTC[flag].known & segs)
+            utils.assert_segmentlist_equal(result[flag].active,
+                                           QUERY_RESULTC[flag].active & segs)
+
     def test_query_segdb(self):
         result = query_segdb(self.TEST_CLASS.query_segdb, QUERY_FLAGS, 0, 10)
         assert isinstance(result, self.TEST_CLASS)
         utils.assert_dict_equal(result, QUERY_RESULT, utils.assert_flag_equal)
 
-    @utils.skip_missing_dependency('dqsegdb')
     def test_populate(self):
         def fake():
             return self.TEST_CLASS({
@@ -875,22 +989,21 @@ class TestDataQualityDict(object):
         span = SegmentList([Segment(0, 2)])
 
         # and populate using a mocked query
-        with mock.patch('dqsegdb.apicalls.dqsegdbQueryTimes',
-                        mocks.dqsegdb_query_times(QUERY_RESULT)):
-            vdf.populate()
-            vdf2.populate()
-            vdf3.populate(segments=span)
+        with mocks.DQSegDBServer(QUERY_RESULT) as url:
+            vdf.populate(source=url)
+            vdf2.populate(source=url)
+            vdf3.populate(source=url, segments=span)
 
             # test warnings on bad entries
             vdf['TEST'] = self.ENTRY_CLASS('X1:BLAHBLAHBLAH:1', known=[(0, 1)])
             with pytest.warns(UserWarning) as record:
-                vdf.populate(on_error='warn')
-                vdf.populate(on_error='ignore')
+                vdf.populate(source=url, on_error='warn')
+                vdf.populate(source=url, on_error='ignore')
             assert len(record) == 1
             vdf.pop('TEST')
 
             with pytest.raises(ValueError):
-                vdf.populate(on_error='blah')
+                vdf.populate(source=url, on_error='blah')
 
         # check basic populate worked
         utils.assert_dict_equal(vdf, QUERY_RESULTC, utils.assert_flag_equal)
@@ -23,6 +23,8 @@ import pytest
 
 import numpy
 
+from scipy import signal
+
 from astropy import units
 
 try:
@@ -31,9 +33,10 @@ except ImportError:
     pass
 
 from gwpy import signal as gwpy_signal
-from gwpy.signal import window
+from gwpy.signal import (window, coherence as coh_utils)
 from gwpy.signal.fft import (lal as fft_lal, utils as fft_utils,
-                             registry as fft_registry, ui as fft_ui)
+                             registry as fft_registry, ui as fft_ui,
+                             online as fft_online)
 from gwpy.timeseries import TimeSeries
 
 import utils
@@ -182,6 +185,131 @@ class TestSignalFilterDesign(object):
             ([1, 2, 3, 1, 2, 3, 4], [4, 5, 6, 5, 6, 7, 8], 100))
 
 
+# -- gwpy.signal.filter -------------------------------------------------------
+
+class TestSignalFilter(object):
+    """Tests for :mod:`gwpy.signal.filter`
+    """
+    @staticmethod
+    def _blocks(data, sizes=(100, 1, 513, 1000)):
+        i = 0
+        for size in sizes:
+            yield data[..., i:i+size]
+            i += size
+        yield data[..., i:]
+
+    def test_block_filter(self):
+        data = numpy.random.normal(size=4096)
+        sos = signal.zpk2sos(*HIGHPASS_IIR_100HZ)
+        bfilt = gwpy_signal.BlockFilter(*HIGHPASS_IIR_100HZ)
+        out = numpy.concatenate([bfilt.apply(b) for b in self._blocks(data)])
+        utils.assert_allclose(out, signal.sosfilt(sos, data))
+
+        # test FIR taps
+        bfilt = gwpy_signal.BlockFilter(LOWPASS_FIR_100HZ)
+        out = numpy.concatenate([bfilt.apply(b) for b in self._blocks(data)])
+        utils.assert_allclose(
+            out, signal.lfilter(LOWPASS_FIR_100HZ, [1], data))
+
+        # test reset
+        bfilt.reset()
+        utils.assert_allclose(
+            bfilt.apply(data), signal.lfilter(LOWPASS_FIR_100HZ, [1], data))
+
+        # test alternative constructor
+        bfilt = gwpy_signal.BlockFilter.highpass(100, 1024)
+        sos = signal.zpk2sos(*gwpy_signal.highpass(100, 1024))
+        out = numpy.concatenate([bfilt.apply(b) for b in self._blocks(data)])
+        utils.assert_allclose(out, signal.sosfilt(sos, data))
+
+    def test_block_filter_2d(self):
+        data = numpy.random.normal(size=(3, 4096))
+        sos = signal.zpk2sos(*HIGHPASS_IIR_100HZ)
+        bfilt = gwpy_signal.BlockFilter(sos)
+        out = data.copy()
+        for block in self._blocks(out):
+            bfilt.apply(block, out=block)  # filter in-place
+        utils.assert_allclose(
+            out, signal.sosfilt(sos, data, axis=-1))
+
+    def test_fftfilt(self):
+        data = numpy.random.normal(size=(2, 10000))
+        taps = signal.firwin(501, 0.1)
+        utils.assert_allclose(gwpy_signal.fftfilt(taps, data),
+                              signal.lfilter(taps, [1], data), atol=1e-12)
+        utils.assert_allclose(gwpy_signal.fftfilt(taps, data.T, axis=0),
+                              signal.lfilter(taps, [1], data.T, axis=0),
+                              atol=1e-12)
+        # test filter spectra are cached
+        key = (taps.tobytes(), 2048)
+        assert key in gwpy_signal.filter.FFT_FILTERS
+        # test zero-phase filtering
+        utils.assert_allclose(gwpy_signal.fftfiltfilt(taps, data),
+                              signal.filtfilt(taps, [1], data), atol=1e-12)
+        utils.assert_allclose(
+            gwpy_signal.fftfiltfilt(taps, data, padtype='even', padlen=10),
+            signal.filtfilt(taps, [1], data, padtype='even', padlen=10),
+            atol=1e-12)
+        with pytest.raises(ValueError):
+            gwpy_signal.fftfiltfilt(taps, data[:, :1000])
+
+        # test block filtering with FFT convolution
+        bfilt = gwpy_signal.BlockFilter(taps)
+        out = numpy.concatenate([bfilt.apply(b) for b in self._blocks(data)],
+                                axis=-1)
+        utils.assert_allclose(out, signal.lfilter(taps, [1], data), atol=1e-12)
+
+    def test_block_filter_filtfilt(self):
+        data = numpy.random.normal(size=8192)
+        sos = signal.zpk2sos(*HIGHPASS_IIR_100HZ)
+        bfilt = gwpy_signal.BlockFilter(sos, filtfilt=True)
+        assert bfilt.lookahead > 0
+        out = [bfilt.apply(b) for b in self._blocks(data)]
+        assert out[0].size == max(0, 100 - bfilt.lookahead)
+        out.append(bfilt.flush())
+        out = numpy.concatenate(out)
+        assert out.size == data.size
+        utils.assert_allclose(out, gwpy_signal.sosfiltfilt(sos, data),
+                              atol=1e-5)
+        assert bfilt.flush() is None
+
+
+# -- gwpy.signal.coherence ----------------------------------------------------
+
+class TestSignalCoherence(object):
+    """Tests for :mod:`gwpy.signal.coherence`
+    """
+    def test_segment_ffts(self):
+        data = numpy.random.normal(size=1024)
+        blocks = list(coh_utils.segment_ffts(data, 128, noverlap=64,
+                                             chunksize=4))
+        assert [b.shape for b in blocks] == [(4, 65)] * 3 + [(3, 65)]
+        with pytest.raises(ValueError):
+            list(coh_utils.segment_ffts(data, 128, noverlap=128))
+        with pytest.raises(ValueError):
+            list(coh_utils.segment_ffts(data, 2048))
+
+    def test_coherence_from_reference(self):
+        x = numpy.random.normal(size=4096)
+        y = x * .5 + numpy.random.normal(size=4096)
+        ref = coh_utils.ReferenceFFT(x, 256, noverlap=128, window='hann')
+        coh = coh_utils.coherence_from_reference(ref, y, chunksize=5)
+        _, scoh = signal.coherence(x, y, nperseg=256, noverlap=128,
+                                   window='hann')
+        utils.assert_allclose(coh, scoh)
+        with pytest.raises(ValueError):
+            coh_utils.coherence_from_reference(ref, y[:-1])
+
+    def test_band_peaks(self):
+        freqs = numpy.arange(10.)
+        coh = numpy.asarray([0, 1, 2, 1, 0, 0, 5, 1, 0, 0]) / 5.
+        peakf, peakc = coh_utils.band_peaks(coh, freqs,
+                                            [(0, 4), (4, 10), (20, 30)])
+        utils.assert_array_equal(peakf[:2], [2, 6])
+        utils.assert_array_equal(peakc[:2], [.4, 1.])
+        assert numpy.isnan(peakf[2]) and numpy.isnan(peakc[2])
+
+
 # -- gwpy.signal.window -------------------------------------------------------
 
 class TestSignalWindow(object):
@@ -321,6 +449,89 @@ class TestSignalFftUtils(object):
         assert scale_(None) == units.Unit('Hz^-1')
 
 
+# -- gwpy.signal.fft.online ---------------------------------------------------
+
+class TestSignalFftOnline(object):
+    """Tests for :mod:`gwpy.signal.fft.online`
+    """
+    def test_online_psd(self):
+        data = TimeSeries(numpy.random.normal(size=256 * 64),
+                          sample_rate=256, unit='m')
+        blocks = [data[i:i+1000] for i in range(0, data.size, 1000)]
+        est = fft_online.OnlinePSD(4, nsegments=31)
+        with pytest.raises(ValueError):
+            est.psd()
+        assert sum(map(est.update, blocks)) == 31
+        assert est.count == 31
+        assert est.epoch == 0
+
+        # check against scipy
+        _, welch = signal.welch(data.value, fs=256, nperseg=1024,
+                                noverlap=512)
+        _, _, pgrams = signal.spectrogram(data.value, fs=256, nperseg=1024,
+                                          noverlap=512, window='hann')
+        median = (numpy.median(pgrams, axis=-1) /
+                  fft_online.median_bias(pgrams.shape[-1]))
+        psd = est.psd()
+        assert psd.unit == units.Unit('m^2/Hz')
+        assert psd.df == ONE_HZ / 4.
+        utils.assert_allclose(psd.value, welch)
+        utils.assert_allclose(est.psd('median').value, median)
+        assert est.psd('exponential').size == welch.size
+        assert est.psd('median-mean').size == welch.size
+        with pytest.raises(ValueError):
+            est.psd('blah')
+
+    @utils.skip_missing_dependency('lal')
+    def test_online_psd_median(self):
+        # 'median' is only registered by gwpy.signal.fft.lal
+        data = TimeSeries(numpy.random.normal(size=256 * 64),
+                          sample_rate=256)
+        est = fft_online.OnlinePSD(4, method='median')
+        est.update(data)
+        assert est.average == 'median'
+        utils.assert_allclose(est.psd().value, est.psd('median').value)
+
+    def test_online_psd_epoch_rounding(self):
+        # contiguous blocks whose epochs carry floating-point error
+        # should not discard the partial segment in the buffer
+        data = TimeSeries(numpy.random.normal(size=256 * 64),
+                          sample_rate=256, epoch=1e9 + .1)
+        est = fft_online.OnlinePSD(4, overlap=2)
+        for i, j in enumerate(range(0, data.size, 1000)):
+            block = data[j:j+1000]
+            block.t0 = block.t0.value + (-1) ** i * 1e-7
+            est.update(block)
+        assert est.count == 31
+
+    def test_online_psd_sum(self):
+        data = TimeSeries(numpy.random.normal(size=256 * 64),
+                          sample_rate=256)
+        est = fft_online.OnlinePSD(4, overlap=2, nsegments=5)
+        est.update(data)
+        utils.assert_allclose(est._sum, est._periodograms.sum(axis=0))
+
+    def test_online_psd_ring_buffer(self):
+        data = TimeSeries(numpy.random.normal(size=256 * 64),
+                          sample_rate=256)
+        est = fft_online.OnlinePSD(4, overlap=2, nsegments=10)
+        for i in range(0, data.size, 2000):
+            est.update(data[i:i+2000])
+        assert est.count == 10
+        assert est.epoch == 42
+        _, welch = signal.welch(data.value[-512 * 11:], fs=256, nperseg=1024,
+                                noverlap=512)
+        utils.assert_allclose(est.psd().value, welch)
+
+    def test_online_psd_errors(self):
+        with pytest.raises(KeyError):
+            fft_online.OnlinePSD(4, method='rayleigh')
+        est = fft_online.OnlinePSD(4)
+        est.update(TimeSeries(numpy.zeros(2048), sample_rate=256))
+        with pytest.raises(ValueError):
+            est.update(TimeSeries(numpy.zeros(2048), sample_rate=512))
+
+
 # -- gwpy.signal.fft.lal ------------------------------------------------------
 
 @utils.skip_missing_dependency('lal')
@@ -119,7 +119,18 @@ class TestSpectrogram(TestArray2D):
             assert isinstance(plot, TimeSeriesPlot)
             assert isinstance(plot.gca(), TimeSeriesAxes)
             assert plot.gca().lines == []
-            assert len(plot.gca().collections) == 1
+            # regular spectrograms are drawn as an image
+            assert plot.gca().collections == []
+            assert len(plot.gca().images) == 1
             with tempfile.NamedTemporaryFile(suffix='.png') as f:
                 plot.save(f.name)
             plot.close()
+            # check the image options are passed to the axes
+            plot = array.plot(imshow=False)
+            assert plot.gca().images == []
+            assert len(plot.gca().collections) == 1
+            plot.close()
+            plot = array.plot(downsample=False)
+            utils.assert_array_equal(plot.gca().images[0].get_array(),
+                                     array.value.T)
+            plot.close()
@@ -19,6 +19,7 @@
 """Unit tests for `gwpy.table`
 """
 
+import operator
 import os.path
 import shutil
 import tempfile
@@ -29,7 +30,7 @@ import pytest
 
 import sqlparse
 
-from numpy import (random, isclose)
+from numpy import (random, isclose, shares_memory)
 
 from matplotlib import use, rc_context
 use('agg')  # nopep8
@@ -39,8 +40,11 @@ from astropy.io.ascii import InconsistentTableError
 from astropy.table import vstack
 
 from gwpy.table import (Table, EventTable)
-from gwpy.table.filter import filter_table
+from gwpy.table.filter import (TableFilter, filter_table, filter_mask,
+                               parse_operator, parse_column_filters,
+                               parse_selection)
 from gwpy.table.io.hacr import (HACR_COLUMNS, get_hacr_triggers)
+from gwpy.segments import (Segment, SegmentList)
 from gwpy.timeseries import (TimeSeries, TimeSeriesDict)
 from gwpy.plotter import (EventTablePlot, EventTableAxes, TimeSeriesPlot,
                           HistogramPlot)
@@ -188,6 +192,50 @@ class TestTable(object):
             assert str(exc.value) == ('document must contain exactly '
                                       'one sngl_burst table')
 
+    @utils.skip_missing_dependency('glue.ligolw.lsctables')
+    def test_read_ligolw_columns(self):
+        from glue.ligolw.ligolw import LIGOLWContentHandler
+        table = self.create(
+            100, ['peak_time', 'peak_time_ns', 'snr', 'central_freq'],
+            ['i4', 'i4', 'f4', 'f4'])
+        with tempfile.NamedTemporaryFile(suffix='.xml') as f:
+            table.write(f.name, format='ligolw.sngl_burst', overwrite=True)
+
+            def _read(*args, **kwargs):
+                kwargs.setdefault('format', 'ligolw.sngl_burst')
+                return self.TABLE.read(*args, **kwargs)
+
+            # check columnar read matches read via glue.ligolw
+            t2 = _read(f.name, columns=['snr', 'peak_time'])
+            t3 = _read(f.name, columns=['snr', 'peak_time'],
+                       contenthandler=LIGOLWContentHandler)
+            assert t2.colnames == ['snr', 'peak_time']
+            utils.assert_table_equal(t2, t3)
+
+            # check selection is applied while reading (including on
+            # columns that aren't returned, and on the derived 'time')
+            t2 = _read(f.name, columns=['time', 'central_freq'],
+                       selection=['snr > 500', 'time < 800'])
+            time = table['peak_time'] + table['peak_time_ns'] * 1e-9
+            keep = (table['snr'] > 500) & (time < 800)
+            utils.assert_array_equal(t2['time'], time[keep])
+            utils.assert_allclose(t2['central_freq'],
+                                  table['central_freq'][keep])
+
+            # check other reader options use the glue.ligolw reader
+            t2 = _read(f.name, columns=['snr', 'peak_time'],
+                       filt=lambda row: row.snr > 500)
+            assert len(t2) == (table['snr'] > 500).sum()
+
+            # check multi-file read in parallel
+            t2 = _read(f.name, columns=['snr'])
+            t3 = _read([f.name, f.name], columns=['snr'], nproc=2)
+            utils.assert_table_equal(t3, vstack((t2, t2)))
+
+            # check missing column
+            with pytest.raises(ValueError):
+                _read(f.name, columns=['blah'])
+
     @utils.skip_missing_dependency('root_numpy')
     def test_read_write_root(self, table):
         tempdir = tempfile.mkdtemp()
@@ -219,6 +267,81 @@ class TestTable(object):
             if os.path.isdir(tempdir):
                 shutil.rmtree(tempdir)
 
+    def test_read_write_columnar(self, table):
+        from gwpy.table.io.columnar import _read_schema
+        table.meta['test'] = 1
+        table['time'].unit = 's'
+        tempdir = tempfile.mkdtemp()
+        try:
+            fp = os.path.join(tempdir, 'table.columnar')
+
+            def _read(*args, **kwargs):
+                kwargs.setdefault('format', 'columnar')
+                return self.TABLE.read(fp, *args, **kwargs)
+
+            # check write/read round-trip (rows sorted by time)
+            table.write(fp, format='columnar', rowgroupsize=30)
+            schema = _read_schema(fp)
+            assert [g['nrows'] for g in schema['rowgroups']] == [30, 30, 30,
+                                                                 10]
+            table.sort('time')
+            t2 = _read()
+            assert isinstance(t2, self.TABLE)
+            utils.assert_table_equal(table, t2)
+            assert t2['time'].unit == table['time'].unit
+
+            # check selections and columns
+            utils.assert_table_equal(
+                _read(selection='time < 500', columns=['snr', 'time']),
+                filter_table(table, 'time < 500')['snr', 'time'])
+            assert len(_read(selection='time > 1000')) == 0
+            with pytest.raises(ValueError):
+                _read(columns=['blah'])
+
+            # check that row group statistics are used
+            t2 = _read(selection=('%r <= time <= %r'
+                                  % (table['time'][40], table['time'][50])))
+            assert schema['rowgroups'][1]['stats']['time'] == [
+                table['time'][30], table['time'][59]]
+            utils.assert_table_equal(t2, table[40:51])
+
+            # check append
+            with pytest.raises(IOError):
+                table.write(fp, format='columnar')
+            table.write(fp, format='columnar', append=True)
+            t2 = _read()
+            assert len(t2) == 2 * len(table)
+            with pytest.raises(ValueError):
+                table['time', 'snr'].write(fp, format='columnar',
+                                           append=True)
+
+            # check that row groups not matching are never opened
+            shutil.rmtree(os.path.join(fp, '000000'))
+            assert len(_read(selection='time > %r' % table['time'][40])) == (
+                2 * (len(table) - 41))
+
+            # check overwrite
+            table[:10].write(fp, format='columnar', overwrite=True)
+            t2 = _read()
+            utils.assert_table_equal(t2, table[:10])
+            assert not t2['time'].data.flags.writeable  # memmap
+
+            # check that other paths are never overwritten
+            other = os.path.join(tempdir, 'other')
+            os.makedirs(other)
+            with open(os.path.join(other, 'keep.txt'), 'w') as fobj:
+                fobj.write('keep')
+            for target in (other, os.path.join(other, 'keep.txt')):
+                for kwargs in ({'overwrite': True}, {'append': True}):
+                    with pytest.raises(IOError):
+                        table.write(target, format='columnar', **kwargs)
+            assert os.listdir(other) == ['keep.txt']
+            with open(os.path.join(other, 'keep.txt')) as fobj:
+                assert fobj.read() == 'keep'
+        finally:
+            if os.path.isdir(tempdir):
+                shutil.rmtree(tempdir)
+
     def test_read_write_gwf(self):
         table = self.create(100, ['time', 'blah', 'frequency'])
         columns = table.dtype.names
@@ -249,6 +372,41 @@ class TestTable(object):
 class TestEventTable(TestTable):
     TABLE = EventTable
 
+    def test_read_verbose_csv(self, table):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            table.write(f.name, format='ascii.csv', overwrite=True)
+            # check verbose is not passed to a reader that doesn't take it
+            with mock.patch('gwpy.io.mp.gprint') as gprint:
+                t2 = self.TABLE.read([f.name, f.name], format='ascii.csv',
+                                     nproc=2, verbose=True)
+            assert len(t2) == 2 * len(table)
+            assert gprint.call_count == 2
+            assert gprint.call_args[0][0].startswith(
+                'Read %d rows from %s' % (len(table), f.name))
+
+    @utils.skip_missing_dependency('glue.ligolw.lsctables')
+    def test_read_verbose(self):
+        table = self.create(100, ['peak_time', 'peak_time_ns', 'snr'],
+                            ['i4', 'i4', 'f4'])
+        with tempfile.NamedTemporaryFile(suffix='.xml') as f:
+            table.write(f.name, format='ligolw.sngl_burst', overwrite=True)
+
+            # check verbose reports throughput for each file
+            with mock.patch('gwpy.io.mp.gprint') as gprint:
+                self.TABLE.read([f.name, f.name], columns=['snr'],
+                                format='ligolw.sngl_burst', nproc=2,
+                                verbose=True)
+            assert gprint.call_count == 2
+            assert gprint.call_args[0][0].startswith(
+                'Read 100 rows from %s' % f.name)
+
+            # check verbose is still passed to the reader
+            with mock.patch('gwpy.io.ligolw.gprint') as gprint:
+                self.TABLE.read(f.name, columns=['snr'],
+                                format='ligolw.sngl_burst',
+                                get_as_columns=True, verbose=True)
+            gprint.assert_any_call('100 rows found in sngl_burst table')
+
     def test_filter(self, table):
         # check simple filter
         lowf = table.filter('frequency < 100')
@@ -266,6 +424,79 @@ class TestEventTable(TestTable):
                             names=table.dtype.names)
         utils.assert_table_equal(brute, lowfloud)
 
+        # check pre-parsed filters and masks
+        filters = parse_column_filters('frequency < 100 && snr > 100')
+        utils.assert_table_equal(lowfloud, table.filter(*filters))
+        utils.assert_array_equal(
+            filter_mask(table, 'frequency < 100', filters[1]),
+            (table['frequency'] < 100) & (table['snr'] > 100))
+        assert parse_selection('5 < snr < 10') == [
+            ('snr', [(5., operator.gt), (10., operator.lt)])]
+
+    def test_table_filter(self, table):
+        filt = TableFilter('frequency < 100', 'snr > 100', '0 < time')
+        assert sorted(filt.columns) == ['frequency', 'snr', 'time']
+        mask = ((table['frequency'] < 100) & (table['snr'] > 100) &
+                (table['time'] > 0))
+        utils.assert_array_equal(filt.mask(table), mask)
+        utils.assert_array_equal(filt.indices(table), mask.nonzero()[0])
+        utils.assert_table_equal(filt(table), table[mask])
+
+        # check chunked evaluation matches
+        chunked = TableFilter('frequency < 100', 'snr > 100', chunksize=7)
+        utils.assert_array_equal(chunked.mask(table), mask)
+
+        # check contiguous results are returned as a view with copy=False
+        table.sort('time')
+        late = TableFilter('time > %r' % float(table['time'][-5]))
+        view = late.filter(table, copy=False)
+        assert len(view) == 4
+        assert shares_memory(view['time'], table['time'])
+        assert not shares_memory(late(table)['time'], table['time'])
+
+        with pytest.raises(TypeError):
+            TableFilter('snr > 5', blah=1)
+
+    def test_concatenate_tables(self, table):
+        from astropy.table.np_utils import TableMergeError
+        from gwpy.io.mp import (pack_table, unpack_table)
+        from gwpy.table.table import concatenate_tables
+        table['time'].unit = 's'
+        table.meta['test'] = 1
+        new = concatenate_tables([table, table[:10], table[10:20]])
+        assert isinstance(new, type(table))
+        utils.assert_table_equal(new, vstack((table, table[:10],
+                                              table[10:20])))
+        assert new['time'].unit == table['time'].unit
+        assert new.meta['test'] == 1
+
+        # check dtypes are promoted
+        t2 = table.copy()
+        t2['snr'] = t2['snr'].astype(int)
+        new = concatenate_tables([t2, table])
+        assert new['snr'].dtype == table['snr'].dtype
+
+        # check mismatched columns falls back to vstack
+        t2 = table['time', 'snr']
+        utils.assert_table_equal(concatenate_tables([t2, table]),
+                                 vstack((t2, table)))
+
+        # check mismatched column shapes falls back to vstack
+        t2 = table.copy()
+        t2['snr'] = random.random((len(t2), 2))
+        with pytest.raises(TableMergeError):
+            concatenate_tables([t2, table])
+
+        # check empty list
+        with pytest.raises(ValueError):
+            concatenate_tables([])
+
+        # check pack/unpack round trip
+        new = unpack_table(pack_table(table))
+        assert isinstance(new, type(table))
+        utils.assert_table_equal(new, table, is_copy=False)
+        assert new['time'].unit == table['time'].unit
+
     def test_event_rates(self, table):
         rate = table.event_rate(1)
         assert isinstance(rate, TimeSeries)
@@ -281,6 +512,77 @@ class TestEventTable(TestTable):
         table.binned_event_rates(100, 'snr', [10, 100], operator='in')
         table.binned_event_rates(100, 'snr', [(0, 10), (10, 100)])
 
+        # check binned rates match brute-force filtering
+        for op, bins in [
+                ('>=', [10, 100, 500]),
+                ('<', [10, 100]),
+                ('==', [table['snr'][0]]),
+                ('!=', [table['snr'][0]]),
+                ('in', [0, 10, 100, 1000]),
+                (operator.gt, [(0, 10), (5, 500)]),
+                (lambda x, y: x > 2 * y, [10, 100]),
+        ]:
+            rates = table.binned_event_rates(100, 'snr', bins, op,
+                                             start=100, end=900)
+            if op == 'in':
+                bins = list(zip(bins[:-1], bins[1:]))
+            for bin_ in bins:
+                if isinstance(bin_, tuple):
+                    keep = (table['snr'] >= bin_[0]) & (
+                        table['snr'] < bin_[1])
+                else:
+                    func = parse_operator(op) if isinstance(op, str) else op
+                    keep = func(table['snr'], bin_)
+                utils.assert_array_equal(
+                    rates[bin_].value,
+                    table[keep].event_rate(100, start=100, end=900).value)
+
+    def test_time_index(self, table):
+        times = table['time'].data
+        segs = SegmentList([Segment(100, 200), Segment(150, 300),
+                            Segment(800, 900)])
+        inseg = (((times >= 100) & (times < 300)) |
+                 ((times >= 800) & (times < 900)))
+
+        # check column segment methods
+        utils.assert_array_equal(table['time'].in_segmentlist(segs), inseg)
+        utils.assert_array_equal(table['time'].not_in_segmentlist(segs),
+                                 ~inseg)
+
+        # check crop without index
+        assert table.time_index is None
+        cropped = table.crop(100, 300)
+        utils.assert_table_equal(cropped, table[(times >= 100) &
+                                                (times < 300)])
+
+        # check index on unsorted table
+        index = table.index_time()
+        assert table.time_index is index
+        assert not index.sorted
+        utils.assert_table_equal(table.crop(100, 300), cropped)
+        utils.assert_array_equal(index.in_segmentlist(segs), inseg)
+        utils.assert_array_equal(index.count(segs), [
+            ((times >= a) & (times < b)).sum() for a, b in segs])
+        rate = table.event_rate(10, start=0, end=1000)
+        table._time_index = None
+        utils.assert_array_equal(
+            rate.value, table.event_rate(10, start=0, end=1000).value)
+
+        # check crop of sorted table returns a view
+        table.sort('time')
+        assert table.time_index is None
+        assert table.index_time().sorted
+        cropped = table.crop(100, 300)
+        assert shares_memory(cropped['time'], table['time'])
+        assert not shares_memory(table.crop(100, 300, copy=True)['time'],
+                                 table['time'])
+        assert len(table.crop(end=300)) == (times < 300).sum()
+
+        # check index is discarded when rows change
+        table.add_row(table[0])
+        assert table.time_index is None
+        assert table[:10].time_index is None
+
     def test_plot(self, table):
         with rc_context(rc={'text.usetex': False}):
             plot = table.plot('time', 'frequency', color='snr')
@@ -314,6 +616,14 @@ class TestEventTable(TestTable):
             utils.assert_table_equal(table, self.TABLE.read(f, format=fmt),
                                      almost_equal=True)
 
+            # check column projection with a selection on another column
+            f.seek(0)
+            t2 = self.TABLE.read(f, format=fmt, columns=['time'],
+                                 selection='frequency < 100')
+            assert t2.colnames == ['time']
+            utils.assert_allclose(
+                t2['time'], filter_table(table, 'frequency < 100')['time'])
+
         with tempfile.NamedTemporaryFile(suffix='.txt') as f:
             # assert reading blank file doesn't work with column name error
             with pytest.raises(InconsistentTableError) as exc:
@@ -346,6 +656,11 @@ class TestEventTable(TestTable):
             t2 = self.TABLE.read(fp, format='hdf5.pycbc_live', ifo='X1')
             utils.assert_table_equal(table, t2)
 
+            # check multi-file read in parallel
+            t2 = self.TABLE.read([fp, fp], format='hdf5.pycbc_live',
+                                 nproc=2)
+            utils.assert_table_equal(vstack((table, table)), t2)
+
             # add another IFO, then assert that reading the table without
             # specifying the IFO fails
             with h5py.File(fp) as h5f:
@@ -369,6 +684,20 @@ class TestEventTable(TestTable):
             t2 = self.TABLE.read(fp, format='hdf5.pycbc_live',
                                  ifo='X1', selection='snr>.5')
             utils.assert_table_equal(filter_table(table, 'snr>.5'), t2)
+
+            # test selection is applied chunk-wise, including on columns
+            # that aren't returned, and processed columns
+            t2 = self.TABLE.read(fp, format='hdf5.pycbc_live', ifo='X1',
+                                 columns=['a', 'mchirp'], chunksize=7,
+                                 selection=['snr>500', 'mchirp < 400'])
+            keep = (table['snr'] > 500) & (mchirp < 400)
+            assert t2.colnames == ['a', 'mchirp']
+            utils.assert_array_equal(t2['a'], table['a'][keep])
+            utils.assert_array_equal(t2['mchirp'], mchirp[keep])
+            t2 = self.TABLE.read(fp, format='hdf5.pycbc_live', ifo='X1',
+                                 columns=['a', 'b'], selection='snr > 2000')
+            assert len(t2) == 0
+            assert t2['a'].dtype == table['a'].dtype
         finally:
             if os.path.isdir(os.path.dirname(fp)):
                 shutil.rmtree(os.path.dirname(fp))
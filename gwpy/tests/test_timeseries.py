@@ -52,6 +52,8 @@ from gwpy.frequencyseries import (FrequencySeries, SpectralVariance)
 from gwpy.types import Array2D
 from gwpy.spectrogram import Spectrogram
 from gwpy.plotter import (TimeSeriesPlot, SegmentPlot)
+from gwpy import signal as gwpy_signal
+from gwpy.timeseries import pipeline
 
 import mocks
 import utils
@@ -1018,6 +1020,32 @@ class TestTimeSeries(TestTimeSeriesBase):
         # FIXME: this test needs to be more robust
         assert l2.sample_rate == 1024 * units.Hz
 
+        # test long FIR filter (applied using FFT convolution)
+        factor = int(losc.sample_rate.value // 1024)
+        l3 = losc.resample(1024, n=512)
+        taps = signal.firwin(513, 1./factor, window='hamming')
+        ref = signal.filtfilt(taps, [1], losc.value)[::factor]
+        nptest.assert_allclose(l3.value, ref, atol=1e-9 * abs(ref).max())
+        ref = losc.filter(taps, fftthreshold=numpy.inf).value
+        nptest.assert_allclose(losc.filter(taps).value, ref,
+                               atol=1e-9 * abs(ref).max())
+
+    def test_filter_fir_kwargs(self):
+        # keyword arguments not supported by FFT convolution should
+        # fall back to time-domain filtering
+        data = self.TEST_CLASS(numpy.random.normal(size=4096),
+                               sample_rate=1024)
+        taps = signal.firwin(257, .25)
+        ref = signal.filtfilt(taps, [1], data.value, method='gust')
+        nptest.assert_allclose(
+            data.filter(taps, filtfilt=True, method='gust').value, ref)
+        # supported keyword arguments still use FFT convolution
+        ref = data.filter(taps, filtfilt=True, padlen=0,
+                          fftthreshold=numpy.inf)
+        nptest.assert_allclose(
+            data.filter(taps, filtfilt=True, padlen=0).value, ref.value,
+            atol=1e-9 * abs(ref.value).max())
+
     def test_rms(self, losc):
         rms = losc.rms(1.)
         assert rms.sample_rate == 1 * units.Hz
@@ -1094,6 +1122,25 @@ class TestTimeSeries(TestTimeSeriesBase):
         assert comp.unit is units.Unit('')
         assert comp.name == '%s >= 2.0' % (array.name)
 
+    @utils.skip_missing_dependency('h5py')
+    def test_iterate(self):
+        array = self.TEST_CLASS(numpy.random.normal(size=800), name='TEST',
+                                sample_rate=16)
+        with tempfile.NamedTemporaryFile(suffix='.hdf5') as f:
+            array.write(f.name, overwrite=True)
+            blocks = list(self.TEST_CLASS.iterate(
+                f.name, 'TEST', 0, array.span[1], blocksize=20))
+            assert [b.span for b in blocks] == [(0, 20), (20, 40), (40, 50)]
+            utils.assert_array_equal(
+                numpy.concatenate([b.value for b in blocks]), array.value)
+            # check overlap
+            blocks = list(self.TEST_CLASS.iterate(
+                f.name, 'TEST', 0, array.span[1], blocksize=20, overlap=4))
+            assert [b.span for b in blocks] == [(0, 24), (20, 44), (40, 50)]
+            with pytest.raises(ValueError):
+                next(self.TEST_CLASS.iterate(f.name, 'TEST', 0, 10,
+                                             blocksize=2, overlap=2))
+
 
 # -- TimeSeriesDict -----------------------------------------------------------
 
@@ -1123,6 +1170,33 @@ class TestTimeSeriesDict(TestTimeSeriesBaseDict):
             for key in new:
                 utils.assert_quantity_sub_equal(new[key], instance[key])
 
+    def test_coherence_scan(self):
+        ref = numpy.random.normal(size=4096)
+        tsd = self.TEST_CLASS()
+        tsd['ref'] = self.ENTRY_CLASS(ref, sample_rate=256)
+        tsd['good'] = self.ENTRY_CLASS(
+            ref + numpy.random.normal(size=4096) * .1, sample_rate=256)
+        tsd['bad'] = self.ENTRY_CLASS(numpy.random.normal(size=8192),
+                                      sample_rate=512)
+        table = tsd.coherence_scan('ref', fftlength=1, bands=64)
+        assert table.colnames == ['channel', 'flow', 'fhigh', 'frequency',
+                                  'coherence', 'rank']
+        assert len(table) == 4
+        assert list(table['channel']) == ['good', 'bad'] * 2
+        assert list(table['rank']) == [1, 2] * 2
+        utils.assert_array_equal(table['flow'], [0, 0, 64, 64])
+
+        # check direct calculation
+        f, coh = signal.coherence(tsd['ref'].value, tsd['good'].value,
+                                  fs=256, nperseg=256, noverlap=128)
+        assert table['coherence'][0] > .9
+        nptest.assert_allclose(table['coherence'][0], coh[f < 64].max())
+
+        # check multiprocessing
+        table2 = tsd.coherence_scan(tsd['ref'], fftlength=1, bands=64,
+                                    nproc=2)
+        assert len(table2) == 6
+
 
 # -- TimeSeriesList -----------------------------------------------------------
 
@@ -1296,6 +1370,110 @@ class TestStateVector(TestTimeSeriesBase):
             array.resample(array.sample_rate * 1.5)
 
 
+# -- pipeline -----------------------------------------------------------------
+
+class TestPipeline(object):
+    """Tests for :mod:`gwpy.timeseries.pipeline`
+    """
+    @classmethod
+    def setup_class(cls):
+        cls.data = TimeSeries(numpy.random.normal(size=1024 * 20),
+                              sample_rate=1024, t0=100, name='TEST')
+        cls.blocks = [cls.data[i:i+3000] for
+                      i in range(0, cls.data.size, 3000)]
+
+    def test_filter(self):
+        filt = gwpy_signal.highpass(10, 1024)
+        out = list(pipeline.FilterStage(filt)(self.blocks))
+        assert len(out) == len(self.blocks)
+        assert out[1].t0 == self.blocks[1].t0
+        nptest.assert_allclose(numpy.concatenate([o.value for o in out]),
+                               self.data.filter(filt).value)
+
+        # check zero-phase filtering with look-ahead
+        stage = pipeline.FilterStage(filt, filtfilt=True)
+        out = list(stage(self.blocks))
+        assert out[0].t0 == self.data.t0
+        assert sum(o.size for o in out) == self.data.size
+        sos = signal.zpk2sos(*filt)
+        nptest.assert_allclose(numpy.concatenate([o.value for o in out]),
+                               gwpy_signal.sosfiltfilt(sos, self.data.value),
+                               atol=1e-5)
+
+    def test_resample(self):
+        out = list(pipeline.ResampleStage(256)(self.blocks))
+        assert out[0].t0 == self.data.t0
+        assert out[0].sample_rate == 256 * ONE_HZ
+        assert sum(o.size for o in out) == self.data.size // 4
+        # check alignment against a single (causal) filtering pass
+        taps = signal.firwin(61, 1/4., window='hamming')
+        ref = signal.lfilter(taps, 1, numpy.concatenate((self.data.value,
+                                                        numpy.zeros(30))))
+        nptest.assert_allclose(numpy.concatenate([o.value for o in out]),
+                               ref[30::4])
+        with pytest.raises(ValueError):
+            list(pipeline.ResampleStage(300)(self.blocks))
+
+    def test_rms(self):
+        out = list(pipeline.RMSStage(1)(self.blocks))
+        assert out[0].t0 == self.data.t0
+        nptest.assert_allclose(numpy.concatenate([o.value for o in out]),
+                               self.data.rms(1).value)
+
+    def test_spectrogram(self):
+        out = list(pipeline.SpectrogramStage(1)(self.blocks))
+        assert len(out) == len(self.blocks)
+        assert isinstance(out[0], Spectrogram)
+        assert out[0].shape == (1, 513)
+        nptest.assert_almost_equal(out[1].epoch.gps,
+                                   self.blocks[1].t0.value)
+
+    def test_pipeline(self):
+        pipe = (pipeline.FilterStage(gwpy_signal.highpass(10, 1024)) |
+                pipeline.ResampleStage(256) | pipeline.RMSStage(1))
+        assert isinstance(pipe, pipeline.Pipeline)
+        assert len(pipe.stages) == 3
+        out = list(pipe(self.blocks))
+        assert sum(o.size for o in out) == 20
+        assert out[0].t0 == self.data.t0
+
+    @utils.skip_missing_dependency('h5py')
+    def test_iterate_overlap(self):
+        pipe = (pipeline.FilterStage(gwpy_signal.highpass(10, 1024)) |
+                pipeline.RMSStage(1))
+        ref = list(pipe(self.blocks))
+        with tempfile.NamedTemporaryFile(suffix='.hdf5') as f:
+            self.data.write(f.name, overwrite=True)
+            blocks = TimeSeries.iterate(f.name, 'TEST', self.data.span[0],
+                                        self.data.span[1], blocksize=3,
+                                        overlap=1)
+            out = list(pipe(blocks))
+        # overlapping data should be discarded, not treated as a new stream
+        assert sum(o.size for o in out) == 20
+        assert out[0].t0 == self.data.t0
+        nptest.assert_allclose(numpy.concatenate([o.value for o in out]),
+                               numpy.concatenate([o.value for o in ref]))
+
+    def test_overlap(self):
+        stage = pipeline.RMSStage(1)
+        assert stage.push(self.data[:768]) is None
+        # the overlapping samples are discarded
+        out = stage.push(self.data[512:1024])
+        assert out.t0 == self.data.t0
+        assert out.size == 1
+        nptest.assert_allclose(out.value, self.data[:1024].rms(1).value)
+        # a block entirely within previous data is ignored
+        assert stage.push(self.data[512:1024]) is None
+
+    def test_gap(self):
+        stage = pipeline.RMSStage(1)
+        assert stage.push(self.data[:1000]) is None
+        # a gap resets the internal buffer
+        out = stage.push(self.data[1100:2200])
+        assert out.t0 == self.data.t0 + 1100 * self.data.dt
+        assert out.size == 1
+
+
 # -- StateVectorDict ----------------------------------------------------------
 
 class TestStateVectorDict(TestTimeSeriesBaseDict):
@@ -20,12 +20,13 @@
 """
 
 import subprocess
+import sys
 
 from six import PY2
 
 import pytest
 
-from gwpy.utils import shell
+from gwpy.utils import (shell, lazy)
 from gwpy.utils import deps  # deprecated
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
@@ -82,3 +83,40 @@ def test_with_import():
     # FIXME: this should really test the message
     with pytest.raises(ImportError) as exc:
         with_import_tester()
+
+
+def test_lazy_module():
+    mod = lazy.LazyModule('json')
+    assert mod.loaded is False
+    assert repr(mod) == "<LazyModule('json', loaded=False)>"
+    import json
+    assert mod.dumps is json.dumps
+    assert mod.loaded is True
+    assert 'dumps' in dir(mod)
+    with pytest.raises(AttributeError):
+        mod.__wrapped__
+
+    with pytest.raises(ImportError):
+        lazy.LazyModule('blah').thing
+
+
+def test_module_available():
+    assert lazy.module_available('json') is True
+    assert lazy.module_available('blah') is False
+    assert lazy.module_available('os.path') is True
+    assert lazy.module_available('json.blah') is False
+    assert lazy.module_available('blah.blah') is False
+
+
+@pytest.mark.parametrize('module, absent', [
+    ('gwpy.timeseries', ['scipy.signal', 'h5py', 'nds2', 'lalframe',
+                         'glue.lal', 'scipy.io.wavfile']),
+    ('gwpy.frequencyseries', ['scipy.signal', 'h5py']),
+])
+def test_deferred_imports(module, absent):
+    # import in a new interpreter, and list which modules were loaded
+    script = ('import sys, {0}; print(\' \'.join('
+              '[m for m in {1!r} if m in sys.modules]))').format(
+                  module, absent)
+    out = subprocess.check_output([sys.executable, '-c', script])
+    assert out.decode('utf-8').split() == []
@@ -30,6 +30,8 @@ import pytest
 import numpy
 from numpy.testing import (assert_array_equal, assert_allclose)
 
+from gwpy.types.index import RegularIndex
+
 import pytest
 
 
@@ -119,6 +121,10 @@ def assert_attributes(a, b, *attrs):
     for attr in attrs:
         x = getattr(a, attr, None)
         y = getattr(b, attr, None)
+        if isinstance(x, RegularIndex):  # compare values
+            x = x.materialize()
+        if isinstance(y, RegularIndex):
+            y = y.materialize()
         if isinstance(x, numpy.ndarray) and isinstance(b, numpy.ndarray):
             assert_array_equal(x, y)
         else:
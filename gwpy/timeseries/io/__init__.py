@@ -19,13 +19,20 @@
 """Input/Output routines for the TimeSeries and its sub-classes.
 """
 
-from . import (  # pylint: disable=unused-import
-    ascii,
-    gwf,
-    cache,
-    hdf5,
-    losc,
-    wav,
-)
+from ...io import registry as io_registry
+
+from .. import (TimeSeries, TimeSeriesDict, StateVector, StateVectorDict)
+
+# build the read/write docstrings once, not once per format
+with io_registry.delay_doc_updates(TimeSeries, TimeSeriesDict,
+                                   StateVector, StateVectorDict):
+    from . import (  # pylint: disable=unused-import
+        ascii,
+        gwf,
+        cache,
+        hdf5,
+        losc,
+        wav,
+    )
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
@@ -40,17 +40,10 @@ import numpy
 
 from astropy.io.registry import (get_formats, IORegistryError)
 
-try:
-    from glue.lal import Cache
-except ImportError:  # no lal
-    HAS_CACHE = False
-else:
-    HAS_CACHE = True
-
 from ....segments import Segment
 from ....time import to_gps
 from ....io.gwf import identify_gwf
-from ....io.cache import (FILE_LIKE, read_cache, find_contiguous)
+from ....io.cache import (FILE_LIKE, read_cache, find_contiguous, is_cache)
 from ....io.registry import (register_reader,
                              register_writer,
                              register_identifier)
@@ -138,17 +131,10 @@ def register_gwf_api(library):
 
     Additionally, the library must store the name of the third-party
     dependency using the ``FRAME_LIBRARY`` variable.
-    """
-    # import library to get details (don't require library to importable)
-    try:
-        lib = import_gwf_library(library)
-    except ImportError:
-        pass  # means any reads will fail at run-time
-    else:
-        framelibrary = lib.FRAME_LIBRARY
-        libread_ = lib.read
-        libwrite_ = lib.write
 
+    The library is not imported until data are read or written using
+    this format.
+    """
     # set I/O format name
     fmt = 'gwf.%s' % library
 
@@ -197,7 +183,7 @@ def register_gwf_api(library):
             dict of (channel, `TimeSeries`) data pairs
         """
         # import the frame library here to have any ImportErrors occur early
-        import_gwf_library(library)
+        lib = import_gwf_library(library)
 
         # run with multiprocessing
         if nproc > 1:
@@ -232,7 +218,7 @@ def register_gwf_api(library):
                     source.name.endswith(('.lcf', '.cache'))):
             source = read_cache(source)
         # separate cache into contiguous segments
-        if HAS_CACHE and isinstance(source, Cache):
+        if is_cache(source):
             if start is not None and end is not None:
                 source = source.sieve(segment=Segment(start, end))
             source = list(find_contiguous(source))
@@ -246,7 +232,7 @@ def register_gwf_api(library):
             if i == 1:  # force data into fresh memory so that append works
                 for name in out:
                     out[name] = numpy.require(out[name], requirements=['O'])
-            out.append(libread_(src, channels, start=start, end=end,
+            out.append(lib.read(src, channels, start=start, end=end,
                                 series_class=series_class, **kwargs),
                        gap=gap, pad=pad, copy=False)
 
@@ -315,10 +301,10 @@ def register_gwf_api(library):
             run number to write into frame header
         """
         # import the frame library here to have any ImportErrors occur early
-        import_gwf_library(library)
+        lib = import_gwf_library(library)
 
         # then write using the relevant API
-        return libwrite_(data, outfile, start=start, end=end,
+        return lib.write(data, outfile, start=start, end=end,
                          name=name, run=run)
 
     def write_timeseries(series, *args, **kwargs):
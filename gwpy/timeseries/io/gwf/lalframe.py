@@ -33,8 +33,7 @@ from six import string_types
 import lalframe
 import lal
 
-from ....io.cache import (FILE_LIKE, Cache as GlueCache,
-                          CacheEntry as GlueCacheEntry)
+from ....io.cache import (FILE_LIKE, is_cache, is_cache_entry)
 from ....utils import lal as lalutils
 from ... import TimeSeries
 
@@ -65,7 +64,7 @@ def open_data_source(source):
     """
     if isinstance(source, FILE_LIKE):
         source = source.name
-    if isinstance(source, GlueCacheEntry):
+    if is_cache_entry(source):
         source = source.path
 
     # read single file
@@ -76,7 +75,7 @@ def open_data_source(source):
           source.endswith(('.lcf', '.cache'))):
         return lalframe.FrStreamCacheOpen(lal.CacheImport(source))
     # read glue cache object
-    elif isinstance(source, GlueCache):
+    elif is_cache(source):
         cache = lal.Cache()
         for entry in source:
             cache = lal.CacheMerge(
@@ -42,13 +42,10 @@ from ...io.cache import (cache_segments, file_segment)
 from ...detector.units import parse_unit
 from ...segments import (Segment, SegmentList)
 from ...time import to_gps
+from ...utils.lazy import module_available
 
-try:
-    import h5py  # pylint: disable=unused-import
-except ImportError:
-    HAS_H5PY = False
-else:
-    HAS_H5PY = True
+# check for h5py without importing it
+HAS_H5PY = module_available('h5py')
 
 # default URL
 LOSC_URL = 'https://losc.ligo.org'
@@ -24,8 +24,6 @@ import wave
 
 import numpy
 
-from scipy.io import wavfile
-
 from .. import TimeSeries
 from ...io import registry as io_registry
 
@@ -53,6 +51,7 @@ def read(fobj, **kwargs):
     >>> from gwpy.timeseries import TimeSeries
     >>> t = TimeSeries.read('test.wav')
     """
+    from scipy.io import wavfile
     fsamp, arr = wavfile.read(fobj, **kwargs)
     return TimeSeries(arr, sample_rate=fsamp)
 
@@ -84,6 +83,7 @@ def write(series, output, scale=None):
     >>> t = TimeSeries([1, 2, 3, 4, 5])
     >>> t = TimeSeries.write('test.wav')
     """
+    from scipy.io import wavfile
     fsamp = int(series.sample_rate.decompose().value)
     data = series.value
     if scale is None:
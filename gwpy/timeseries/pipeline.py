@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Block-wise processing pipelines for long `TimeSeries` streams
+
+Each `Stage` consumes contiguous blocks of `TimeSeries` data, as generated
+by :meth:`TimeSeries.iterate <gwpy.timeseries.TimeSeries.iterate>`, and
+carries whatever state it needs across block boundaries, so that long
+spans of data can be processed in constant memory.
+
+Stages can be chained using the ``|`` operator to build a `Pipeline`:
+
+>>> from gwpy.timeseries import TimeSeries
+>>> from gwpy.timeseries.pipeline import (FilterStage, ResampleStage,
+...                                       RMSStage)
+>>> from gwpy.signal import highpass
+>>> blocks = TimeSeries.iterate(cache, 'L1:GDS-CALIB_STRAIN', start, end,
+...                             blocksize=64)
+>>> pipe = (FilterStage(highpass(10, 16384)) | ResampleStage(256) |
+...         RMSStage(1))
+>>> for rms in pipe(blocks):
+...     print(rms.t0, rms.value)
+"""
+
+from __future__ import division
+
+import numpy
+
+
+from ..signal.filter import BlockFilter
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['Stage', 'Pipeline', 'FilterStage', 'ResampleStage',
+           'RMSStage', 'SpectrogramStage']
+
+
+# -- base classes -------------------------------------------------------------
+
+class Stage(object):
+    """Base class for a single step in a block-processing `Pipeline`
+
+    Sub-classes should override `Stage.process` (and `Stage.reset` and
+    `Stage.flush` if they carry state between blocks).
+
+    Calling a `Stage` with an iterable of `TimeSeries` blocks returns a
+    generator of processed outputs.
+    """
+    def __init__(self):
+        self._end = None
+
+    def __call__(self, blocks):
+        self._end = None  # each new stream starts from scratch
+        for block in blocks:
+            out = self.push(block)
+            if out is not None:
+                yield out
+        out = self.flush()
+        if out is not None:
+            yield out
+
+    def __or__(self, other):
+        return Pipeline(self, other)
+
+    def push(self, block):
+        """Process a single block of data
+
+        If the block overlaps the end of the previous block (e.g. from
+        ``TimeSeries.iterate(..., overlap=...)``), the overlapping samples
+        are discarded. If the block does not follow on from the previous
+        block, the state of this stage is reset before processing.
+
+        Parameters
+        ----------
+        block : `~gwpy.timeseries.TimeSeries`
+            the next block of data
+
+        Returns
+        -------
+        out : `object`, `None`
+            the output for this block, or `None` if nothing is ready
+        """
+        t0 = block.t0.value
+        dt = block.dt.value
+        end = t0 + block.duration.value
+        # discard data already seen in the previous block
+        if self._end is not None and t0 < self._end - dt / 2.:
+            if end <= self._end + dt / 2.:
+                return None
+            block = block[int(round((self._end - t0) / dt)):]
+            t0 = block.t0.value
+        if self._end is None or abs(t0 - self._end) >= dt / 2.:
+            self.reset()
+        self._end = end
+        return self.process(block)
+
+    def process(self, block):
+        """Process a contiguous block of data
+        """
+        raise NotImplementedError("%s has not implemented process()"
+                                  % type(self).__name__)
+
+    def reset(self):
+        """Reset the internal state of this stage
+        """
+        pass
+
+    def flush(self):
+        """Return any output pending at the end of a stream
+        """
+        return None
+
+
+class Pipeline(Stage):
+    """A chain of `Stage` objects, each processing the output of the last
+
+    Parameters
+    ----------
+    *stages
+        the `Stage` objects to chain, in order
+    """
+    def __init__(self, *stages):
+        super(Pipeline, self).__init__()
+        self.stages = []
+        for stage in stages:
+            if isinstance(stage, Pipeline):
+                self.stages.extend(stage.stages)
+            else:
+                self.stages.append(stage)
+
+    def __or__(self, other):
+        return Pipeline(*(self.stages + [other]))
+
+    def __call__(self, blocks):
+        for stage in self.stages:
+            blocks = stage(blocks)
+        return blocks
+
+    def push(self, block):
+        for stage in self.stages:
+            if block is None:
+                return None
+            block = stage.push(block)
+        return block
+
+    def process(self, block):
+        return self.push(block)
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+
+# -- stages -------------------------------------------------------------------
+
+class FilterStage(Stage):
+    """Apply a digital filter, carrying the filter state across blocks
+
+    Parameters
+    ----------
+    *filt
+        any filter definition accepted by
+        :meth:`TimeSeries.filter <gwpy.timeseries.TimeSeries.filter>`
+
+    filtfilt : `bool`, optional
+        filter forward and backward to preserve phase, default: `False`
+
+    lookahead : `int`, optional
+        number of samples to buffer before the backward pass when
+        ``filtfilt=True``, see `~gwpy.signal.BlockFilter`
+
+    Notes
+    -----
+    For causal filtering the filter is initialised with zero state, so the
+    concatenated output is identical to
+    ``TimeSeries.filter(*filt, filtfilt=False)`` applied to the full span
+    of data.
+    In ``filtfilt`` mode the output lags the input by ``lookahead``
+    samples, with the remainder emitted by `FilterStage.flush`.
+    """
+    def __init__(self, *filt, **kwargs):
+        super(FilterStage, self).__init__()
+        self.filter = BlockFilter(*filt, **kwargs)
+        self.reset()
+
+    def reset(self):
+        self.filter.reset()
+        self._t0 = None
+        self._count = 0
+        self._template = None
+
+    def _wrap(self, data):
+        new = data.view(type(self._template))
+        new.__metadata_finalize__(self._template)
+        new._unit = self._template.unit
+        new.t0 = self._t0 + self._count * self._template.dt.value
+        self._count += data.size
+        return new
+
+    def process(self, block):
+        if self._t0 is None:
+            self._t0 = block.t0.value
+            self._template = block[:0]
+        data = self.filter.apply(block.value)
+        if not data.size:
+            return None
+        return self._wrap(data)
+
+    def flush(self):
+        if self._template is None:
+            return None
+        data = self.filter.flush()
+        if data is None:
+            return None
+        return self._wrap(data)
+
+
+class ResampleStage(Stage):
+    """Down-sample a stream of data by an integer factor
+
+    Parameters
+    ----------
+    rate : `float`
+        the output sample rate, must divide the input sample rate
+
+    window : `str`, `numpy.ndarray`, optional
+        window function used to design the FIR anti-aliasing filter
+
+    ftype : `str`, optional
+        type of filter, either 'fir' or 'iir', defaults to 'fir'
+
+    n : `int`, optional
+        if `ftype='fir'` the number of taps in the filter, otherwise
+        the order of the Chebyshev type I IIR filter
+
+    Notes
+    -----
+    The filter design matches that of
+    :meth:`TimeSeries.resample <gwpy.timeseries.TimeSeries.resample>`, but
+    is applied causally.
+    For FIR filters the (linear-phase) group delay is removed, so that the
+    output samples are correctly aligned in time, with the last few output
+    samples of a stream emitted by `ResampleStage.flush`.
+    """
+    def __init__(self, rate, window='hamming', ftype='fir', n=None):
+        super(ResampleStage, self).__init__()
+        self.rate = float(getattr(rate, 'value', rate))
+        self.window = window
+        self.ftype = ftype
+        if n is None and ftype == 'iir':
+            n = 8
+        elif n is None:
+            n = 60
+        self.n = n
+        self._factor = None
+        self.reset()
+
+    def _design(self, block):
+        factor = block.sample_rate.to('Hertz').value / self.rate
+        if not factor.is_integer():
+            raise ValueError("ResampleStage can only down-sample by an "
+                             "integer factor, cannot resample from %s to "
+                             "%s Hz" % (block.sample_rate, self.rate))
+        self._factor = int(factor)
+        if self.ftype == 'iir':
+            filt = signal.cheby1(self.n, 0.05, 0.8/factor, output='sos')
+            self._delay = 0
+        else:
+            filt = signal.firwin(self.n+1, 1./factor, window=self.window)
+            self._delay = self.n // 2
+        self._filter = FilterStage(filt)
+
+    def reset(self):
+        self._count = 0
+        self._t0 = None
+        self._template = None
+        if self._factor is not None:
+            self._filter.reset()
+
+    def _decimate(self, data):
+        # global index (relative to the stream start) of each sample
+        idx = self._count + numpy.arange(data.size) - self._delay
+        self._count += data.size
+        keep = (idx >= 0) & (idx % self._factor == 0)
+        if not keep.any():
+            return None
+        new = data[keep].view(type(self._template))
+        new.__metadata_finalize__(self._template)
+        new._unit = self._template.unit
+        new.sample_rate = self.rate
+        new.t0 = self._t0 + idx[keep][0] * self._template.dt.value
+        return new
+
+    def process(self, block):
+        if self._factor is None:
+            self._design(block)
+        if self._t0 is None:
+            self._t0 = block.t0.value
+            self._template = block[:0]
+        return self._decimate(self._filter.push(block).value)
+
+    def flush(self):
+        if not self._delay or self._template is None:
+            return None
+        pad = type(self._template)(numpy.zeros(self._delay), t0=self._end,
+                                   dt=self._template.dt)
+        return self._decimate(self._filter.push(pad).value)
+
+
+class RMSStage(Stage):
+    """Calculate the root-mean-square of a stream once per stride
+
+    Parameters
+    ----------
+    stride : `float`
+        stride (seconds) between RMS calculations
+
+    Notes
+    -----
+    Samples left over at the end of each block are carried into the next,
+    so that the output is identical to
+    :meth:`TimeSeries.rms <gwpy.timeseries.TimeSeries.rms>` for the
+    full span of data.
+    """
+    def __init__(self, stride=1):
+        super(RMSStage, self).__init__()
+        self.stride = stride
+        self.reset()
+
+    def reset(self):
+        self._buffer = None
+
+    def process(self, block):
+        if self._buffer is None:
+            data = block.value
+        else:
+            data = numpy.concatenate((self._buffer, block.value))
+        t0 = self._end - data.size * block.dt.value
+        stridesamp = int(self.stride * block.sample_rate.value)
+        nsteps = data.size // stridesamp
+        self._buffer = data[nsteps * stridesamp:]
+        if not nsteps:
+            return None
+        rms = numpy.sqrt(numpy.mean(
+            numpy.abs(data[:nsteps * stridesamp].reshape(
+                nsteps, stridesamp)) ** 2, axis=1))
+        name = '%s %.2f-second RMS' % (block.name, self.stride)
+        return type(block)(rms, channel=block.channel, t0=t0, name=name,
+                           sample_rate=(1/float(self.stride)))
+
+
+class SpectrogramStage(Stage):
+    """Calculate one average PSD column for each block of data
+
+    Parameters
+    ----------
+    fftlength : `float`, optional
+        number of seconds in single FFT, defaults to the block duration
+
+    overlap : `float`, optional
+        number of seconds of overlap between FFTs, defaults to the
+        recommended overlap for the given window (if given), or 0
+
+    window : `str`, `numpy.ndarray`, optional
+        window function to apply to timeseries prior to FFT
+
+    method : `str`, optional
+        FFT-averaging method, default: ``'welch'``
+
+    **kwargs
+        other keyword arguments are passed to
+        :meth:`TimeSeries.psd <gwpy.timeseries.TimeSeries.psd>`
+
+    Notes
+    -----
+    Each output is a single-column `~gwpy.spectrogram.Spectrogram` with
+    ``dt`` equal to the block duration; a full spectrogram can be built
+    by joining these columns with a `~gwpy.spectrogram.SpectrogramList`.
+    """
+    def __init__(self, fftlength=None, overlap=None, window='hann',
+                 method='welch', **kwargs):
+        super(SpectrogramStage, self).__init__()
+        self.kwargs = kwargs
+        self.kwargs.update({
+            'fftlength': fftlength,
+            'overlap': overlap,
+            'window': window,
+            'method': method,
+        })
+
+    def process(self, block):
+        from ..spectrogram import Spectrogram
+        psd = block.psd(**self.kwargs)
+        return Spectrogram.from_spectra(psd, epoch=block.t0.value,
+                                        dt=block.duration.value,
+                                        channel=block.channel)
@@ -22,24 +22,28 @@
 from __future__ import (division, print_function)
 
 from warnings import warn
-from math import (ceil, pi)
+from math import ceil
 from multiprocessing import (Process, Queue as ProcessQueue)
 
 from six.moves import range
 
 import numpy
 from numpy import fft as npfft
-from scipy import signal
 
 from astropy import units
 from astropy.io import registry as io_registry
 
 from ..segments import Segment
 from ..signal import (filter_design, sosfiltfilt)
+from ..signal.filter import (parse_filter, use_fftfilt, fftfilt,
+                             fftfiltfilt)
 from ..signal.fft import (registry as fft_registry, ui as fft_ui)
 from ..signal.window import recommended_overlap
 from .core import (TimeSeriesBase, TimeSeriesBaseDict, TimeSeriesBaseList,
                    as_series_dict_class)
+from ..utils.lazy import LazyModule
+
+signal = LazyModule('scipy.signal')
 
 __author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
 
@@ -201,6 +205,70 @@ class TimeSeries(TimeSeriesBase):
         -----"""
         return io_registry.write(self, target, *args, **kwargs)
 
+    @classmethod
+    def iterate(cls, source, channel, start, end, blocksize, overlap=0,
+                **kwargs):
+        """Read data for a channel in a sequence of fixed-duration blocks
+
+        This generator allows arbitrarily long spans of data to be
+        processed in constant memory, see :mod:`gwpy.timeseries.pipeline`
+        for block-wise processing stages that carry their state across
+        block boundaries.
+
+        Parameters
+        ----------
+        source : `str`, :class:`~glue.lal.Cache`
+            source of data, anything accepted by `TimeSeries.read`
+
+        channel : `str`, `~gwpy.detector.Channel`
+            the name of the channel to read, or a `Channel` object.
+
+        start : `~gwpy.time.LIGOTimeGPS`, `float`, `str`
+            GPS start time of required data,
+            any input parseable by `~gwpy.time.to_gps` is fine
+
+        end : `~gwpy.time.LIGOTimeGPS`, `float`, `str`
+            GPS end time of required data,
+            any input parseable by `~gwpy.time.to_gps` is fine
+
+        blocksize : `float`
+            the duration (seconds) of each block, the last block may be
+            shorter
+
+        overlap : `float`, optional
+            number of seconds of overlap between consecutive blocks,
+            default: ``0``, the overlapping data at the start of each
+            block are discarded by the `~gwpy.timeseries.pipeline.Stage`
+            objects in :mod:`gwpy.timeseries.pipeline`
+
+        **kwargs
+            other keyword arguments are passed to `TimeSeries.read`
+
+        Yields
+        ------
+        block : `TimeSeries`
+            the next block of data
+        """
+        from ..io.cache import is_cache
+        from ..time import to_gps
+        start = float(to_gps(start))
+        end = float(to_gps(end))
+        blocksize = units.Quantity(blocksize, 's').value
+        overlap = units.Quantity(overlap, 's').value
+        if overlap >= blocksize:
+            raise ValueError("overlap must be less than blocksize")
+        bstart = start
+        while bstart < end:
+            bend = min(bstart + blocksize + overlap, end)
+            if is_cache(source):
+                bsource = source.sieve(segment=Segment(bstart, bend))
+            else:
+                bsource = source
+            yield cls.read(bsource, channel, start=bstart, end=bend, **kwargs)
+            if bend >= end:
+                break
+            bstart += blocksize
+
     def fft(self, nfft=None):
         """Compute the one-dimensional discrete Fourier transform of
         this `TimeSeries`.
@@ -965,6 +1033,12 @@ class TimeSeries(TimeSeriesBase):
         Series
             a new Series with the resampling applied, and the same
             metadata
+
+        Notes
+        -----
+        For integer down-sampling the anti-aliasing filter is applied with
+        `TimeSeries.filter`, so FIR filters with many taps (large ``n``)
+        are applied using FFT convolution.
         """
         if n is None and ftype == 'iir':
             n = 8
@@ -1040,26 +1114,8 @@ class TimeSeries(TimeSeriesBase):
                  "was renamed 'analog' for consistency', and will be "
                  "removed in an upcoming release", DeprecationWarning)
         if analog:
-            # cast to arrays for ease
-            z = numpy.array(zeros)
-            p = numpy.array(poles)
-            k = gain
-            # convert from Hz to rad/s if needed
-            unit = units.Unit(unit)
-            if unit == units.Unit('Hz'):
-                z = -2 * pi * z
-                p = -2 * pi * p
-            elif unit != units.Unit('rad/s'):
-                raise ValueError("zpk can only be given with unit='Hz' "
-                                 "or 'rad/s'")
-            # convert to Z-domain via bilinear transform
-            fs = 2 * self.sample_rate.to('Hz').value
-            z = z[numpy.isfinite(z)]
-            pd = (1 + p/fs) / (1 - p/fs)
-            zd = (1 + z/fs) / (1 - z/fs)
-            kd = k * numpy.prod(fs - z)/numpy.prod(fs - p)
-            zd = numpy.concatenate((zd, -numpy.ones(len(pd)-len(zd))))
-            zeros, poles, gain = zd, pd, kd
+            zeros, poles, gain = filter_design.bilinear_zpk(
+                zeros, poles, gain, fs=self.sample_rate, unit=unit)
         # apply filter
         return self.filter(zeros, poles, gain, **kwargs)
 
@@ -1098,6 +1154,14 @@ class TimeSeries(TimeSeriesBase):
         filtfilt : `bool`, optional
             filter forward and backwards to preserve phase
 
+        fftthreshold : `int`, optional
+            number of taps above which FIR filters are applied using FFT
+            convolution, defaults to
+            `~gwpy.signal.filter.FFT_FILTER_THRESHOLD`, use `numpy.inf`
+            to always filter in the time domain; filters given keyword
+            arguments not supported by FFT convolution (e.g.
+            ``method='gust'``) are always applied in the time domain
+
         **kwargs
             other keyword arguments are passed to the filter method
 
@@ -1124,55 +1188,26 @@ class TimeSeries(TimeSeriesBase):
         """
         # parse keyword arguments
         filtfilt = kwargs.pop('filtfilt', False)
+        fftthreshold = kwargs.pop('fftthreshold', None)
 
-        sos = None
-        # single argument given
-        if len(filt) == 1:
-            filt = filt[0]
-            # detect LTI
-            if isinstance(filt, signal.lti):
-                filt = filt
-                a = filt.den
-                b = filt.num
-            # detect ZPK
-            elif (isinstance(filt, (tuple, list)) and len(filt) == 3 and
-                  isinstance(filt[0], numpy.ndarray) and
-                  isinstance(filt[1], numpy.ndarray) and
-                  isinstance(filt[2], float)):
-                sos = signal.zpk2sos(*filt)
-            # detect SOS
-            elif isinstance(filt, numpy.ndarray) and filt.ndim == 2:
-                sos = filt
-            # detect taps
-            else:
-                b = filt
-                a = [1]
-        # detect TF
-        elif len(filt) == 2:
-            b, a = filt
-        elif len(filt) == 3:
-            try:
-                sos = signal.zpk2sos(*filt)
-            except AttributeError:
-                b, a = signal.zpk2tf(*filt)
-        elif len(filt) == 4:
-            try:
-                zpk = signal.ss2zpk(*filt)
-                sos = signal.zpk2sos(zpk)
-            except AttributeError:
-                b, a = signal.ss2tf(*filt)
-        else:
-            raise ValueError("Cannot interpret filter arguments. Please "
-                             "give either a signal.lti object, or a "
-                             "tuple in zpk or ba format. See "
-                             "scipy.signal docs for details.")
+        ftype, filt = parse_filter(*filt)
         cls = type(self)
-        if sos is not None:
+        if ftype == 'sos':
+            sos = filt
             if filtfilt:
                 new = sosfiltfilt(sos, self, axis=0, **kwargs).view(cls)
             else:
                 new = signal.sosfilt(sos, self, axis=0, **kwargs).view(cls)
+        elif use_fftfilt(ftype, filt, threshold=fftthreshold,
+                         filtfilt=filtfilt, **kwargs):
+            # long FIR filter, use FFT convolution
+            b = numpy.asarray(filt[0]) / numpy.ravel(filt[1])[0]
+            if filtfilt:
+                new = fftfiltfilt(b, self.value, axis=0, **kwargs).view(cls)
+            else:
+                new = fftfilt(b, self.value, axis=0, **kwargs).view(cls)
         else:
+            b, a = filt
             if filtfilt:
                 new = signal.filtfilt(b, a, self, axis=0, **kwargs).view(cls)
             else:
@@ -1804,6 +1839,143 @@ class TimeSeriesDict(TimeSeriesBaseDict):
         -----"""
         return io_registry.write(self, target, *args, **kwargs)
 
+    def coherence_scan(self, reference, fftlength=None, overlap=None,
+                       window='hann', bands=None, nproc=1):
+        """Scan the coherence between a reference and all series in this dict
+
+        The segment FFTs of the reference are calculated only once (for
+        each distinct sample rate required), with the witness FFTs streamed
+        in blocks so that only the reduced band peaks are held in memory
+        for each witness.
+
+        Parameters
+        ----------
+        reference : `TimeSeries`, `str`
+            the reference series, or the key of the reference in this dict,
+            in which case that series is not scanned against itself
+
+        fftlength : `float`, optional
+            number of seconds in single FFT, defaults to half the duration
+            of the reference
+
+        overlap : `float`, optional
+            number of seconds of overlap between FFTs, defaults to the
+            recommended overlap for the given window (if given), or 0
+
+        window : `str`, `numpy.ndarray`, optional
+            window function to apply to timeseries prior to FFT,
+            see :func:`scipy.signal.get_window` for details on acceptable
+            formats
+
+        bands : `float`, `list` of `tuple`, optional
+            a list of ``(flow, fhigh)`` frequency bands in which to find the
+            peak coherence, or a `float` giving the width of contiguous
+            bands starting at 0 Hz, defaults to a single band covering all
+            frequencies
+
+        nproc : `int`, optional
+            number of parallel processes over which to distribute the
+            witness series
+
+        Returns
+        -------
+        table : `~gwpy.table.EventTable`
+            a table with one row per witness and band containing the
+            ``'channel'``, ``'flow'``, ``'fhigh'``, peak ``'frequency'``
+            and peak ``'coherence'``, sorted by band and then by
+            descending coherence, with the ``'rank'`` of each witness
+            within its band
+
+        Notes
+        -----
+        Witness series sampled at a higher rate than the reference are
+        down-sampled to match, otherwise the reference is down-sampled
+        to the rate of the witness.
+        Each witness is cropped to the span of the reference, and must
+        cover the full span.
+        """
+        from ..signal import coherence as coh_utils
+        from ..table import EventTable
+        from ..utils import mp as mp_utils
+
+        # get reference and witnesses
+        if isinstance(reference, TimeSeries):
+            witnesses = list(self.items())
+        else:
+            witnesses = [(key, self[key]) for key in self if key != reference]
+            reference = self[reference]
+        refrate = reference.sample_rate.to('Hertz').value
+
+        # format FFT parameters
+        if fftlength is None:
+            fftlength = reference.duration.value / 2.
+        fftlength = units.Quantity(fftlength, 's').value
+        if overlap is None and isinstance(window, str):
+            overlap = recommended_overlap(window) * fftlength
+        elif overlap is None:
+            overlap = 0
+        overlap = units.Quantity(overlap, 's').value
+
+        # format bands
+        if bands is None:
+            bands = [(0, numpy.inf)]
+        elif numpy.isscalar(bands) or isinstance(bands, units.Quantity):
+            width = units.Quantity(bands, 'Hz').value
+            edges = numpy.arange(0, refrate / 2. + width, width)
+            bands = list(zip(edges[:-1], edges[1:]))
+        bands = numpy.asarray(bands, dtype=float).reshape(-1, 2)
+
+        # calculate reference FFTs for each required rate up-front
+        refs = {}
+        for _, series in witnesses:
+            rate = min(series.sample_rate.to('Hertz').value, refrate)
+            if rate in refs:
+                continue
+            ref = reference if rate == refrate else reference.resample(rate)
+            nfft = int(fftlength * rate)
+            refs[rate] = (
+                coh_utils.ReferenceFFT(ref.value, nfft,
+                                       noverlap=int(overlap * rate),
+                                       window=window),
+                npfft.rfftfreq(nfft, d=1/rate),
+            )
+
+        def _scan(item):
+            name, series = item
+            try:
+                rate = min(series.sample_rate.to('Hertz').value, refrate)
+                series = series.crop(*reference.span)
+                if series.sample_rate.to('Hertz').value != rate:
+                    series = series.resample(rate)
+                ref, freqs = refs[rate]
+                coh = coh_utils.coherence_from_reference(ref, series.value)
+                return (str(name),) + coh_utils.band_peaks(coh, freqs, bands)
+            except Exception as e:
+                if nproc == 1:
+                    raise
+                return e
+
+        results = mp_utils.multiprocess_with_queues(
+            nproc, _scan, witnesses, raise_exceptions=True)
+
+        # build table of peaks
+        rows = []
+        for name, peakf, peakc in results:
+            for (flow, fhigh), freq, coh in zip(bands, peakf, peakc):
+                if not numpy.isnan(coh):
+                    rows.append((name, flow, fhigh, freq, coh))
+        rows.sort(key=lambda row: (row[1], -row[4]))
+        table = EventTable(
+            rows=rows or None,
+            names=('channel', 'flow', 'fhigh', 'frequency', 'coherence'),
+            dtype=(str, float, float, float, float))
+        rank = numpy.zeros(len(rows), dtype=int)
+        for i in range(1, len(rows)):
+            if rows[i][1] == rows[i-1][1]:
+                rank[i] = rank[i-1] + 1
+        table.add_column(EventTable.Column(rank + 1, name='rank'))
+        return table
+
 
 class TimeSeriesList(TimeSeriesBaseList):
     __doc__ = TimeSeriesBaseList.__doc__.replace('TimeSeriesBase',
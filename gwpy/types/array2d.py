@@ -26,7 +26,7 @@ import numpy
 from astropy.units import (Unit, Quantity)
 
 from .series import Series
-from .index import Index
+from .index import (Index, RegularIndex)
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
@@ -123,11 +123,14 @@ class Array2D(Series):
                 warn("yindex was given to %s(), y0 will be ignored"
                      % cls.__name__)
             # get unit
-            if yunit is None and isinstance(yindex, Quantity):
+            if yunit is None and isinstance(yindex, (Quantity, RegularIndex)):
                 yunit = yindex.unit
             elif yunit is None:
                 yunit = cls._default_yunit
-            new.yindex = Quantity(yindex, unit=yunit)
+            if isinstance(yindex, RegularIndex):
+                new.yindex = yindex.to(yunit)
+            else:
+                new.yindex = Quantity(yindex, unit=yunit)
         # or from y0 and dy
         else:
             if yunit is None and isinstance(dy, Quantity):
@@ -309,21 +312,27 @@ class Array2D(Series):
     def yindex(self):
         """Positions of the data on the y-axis
 
-        :type: `~astropy.units.Quantity` array
+        Unless an index has been given, this is a `RegularIndex`
+        calculated from `y0` and `dy`, which does not store the array of
+        positions.
+
+        :type: `~astropy.units.Quantity` array, or `RegularIndex`
         """
         try:
             return self._yindex
         except AttributeError:
-            # create regular index on-the-fly
-            self._yindex = Index(
-                self.y0 + (numpy.arange(self.shape[1]) * self.dy), copy=False)
-            return self._yindex
+            return self._regular_index('y', self.y0, self.dy, self.shape[1])
 
     @yindex.setter
     def yindex(self, index):
         if index is None:
             del self.yindex
             return
+        if isinstance(index, RegularIndex):
+            self.y0 = index.start
+            self.dy = index.step
+            del self.yindex
+            return
         if not isinstance(index, Index):
             try:
                 unit = index.unit
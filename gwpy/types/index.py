@@ -19,8 +19,12 @@
 """Quantity array for indexing a Series
 """
 
+from numbers import Integral
+
 import numpy
 
+from six.moves import range
+
 from astropy.units import Quantity
 
 
@@ -45,3 +49,405 @@ class Index(Quantity):
         if self.size <= 1:
             return False
         return numpy.isclose(numpy.diff(self.value, n=2), 0).all()
+
+
+# ufuncs that map to RegularIndex operators
+_OPERATORS = {
+    numpy.add: ('__add__', '__radd__'),
+    numpy.subtract: ('__sub__', '__rsub__'),
+    numpy.multiply: ('__mul__', '__rmul__'),
+    numpy.true_divide: ('__truediv__', '__rtruediv__'),
+    numpy.divide: ('__div__', '__rdiv__'),
+}
+
+
+def _materialize(obj):
+    """Replace each `RegularIndex` in ``obj`` with its `Index` array
+
+    ``obj`` can be a `RegularIndex`, or a `list`, `tuple`, or `dict`
+    that contains them (e.g. the arguments of a numpy function).
+    """
+    if isinstance(obj, RegularIndex):
+        return obj.materialize()
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(map(_materialize, obj))
+    if isinstance(obj, dict):
+        return dict((key, _materialize(val)) for key, val in obj.items())
+    return obj
+
+
+class RegularIndex(object):
+    """Regularly-spaced index for a `Series` that is calculated, not stored
+
+    A `RegularIndex` represents the `Index` array
+    ``start + numpy.arange(size) * step``, but (like the built-in `range`)
+    only stores the ``start``, ``step``, and ``size``.
+
+    Indexing with an `int` or a `slice`, arithmetic with a scalar, `min`,
+    `max`, `searchsorted`, and `to` are calculated without building the
+    array, and give a scalar `~astropy.units.Quantity` or another
+    `RegularIndex`.
+    Anything else (e.g. `value`, `numpy.asarray`, or a comparison) uses the
+    full array of values, which is built for that operation, then
+    discarded; use `materialize` to get an `Index` array to keep.
+    Other numpy functions (e.g. `numpy.diff`) act on the `Index` array, so
+    return a `~astropy.units.Quantity` (this needs ``numpy >= 1.17``,
+    older versions return a `numpy.ndarray` without units).
+
+    A `RegularIndex` cannot be modified, except for the index of a
+    `Series` (e.g. ``series.xindex[0] = 1``), which stores the modified
+    `Index` array on the `Series` in its place.
+
+    Parameters
+    ----------
+    start : `~astropy.units.Quantity`, `float`
+        the first value of the index
+
+    step : `~astropy.units.Quantity`, `float`
+        the separation between values, will be converted to the unit of
+        ``start``
+
+    size : `int`
+        the number of values
+
+    Examples
+    --------
+    >>> from gwpy.types.index import RegularIndex
+    >>> times = RegularIndex(1000000000, 0.5, 8)
+    >>> times[2]
+    <Quantity 1000000001.0>
+    >>> times[::2]
+    <RegularIndex(start=1000000000.0, step=1.0, size=4)>
+    >>> times.searchsorted(1000000002)
+    4
+    """
+    # higher than Quantity so that binary operators with arrays on the
+    # left-hand side defer to this class (for numpy < 1.13)
+    __array_priority__ = 20000
+
+    # (weakref to the array, attribute name) for the index of an array,
+    # see `gwpy.types.Series._regular_index`
+    _owner = None
+
+    def __init__(self, start, step, size):
+        if not isinstance(start, Quantity):
+            start = Quantity(start, getattr(step, 'unit', None))
+        self._start = start.value
+        self._step = Quantity(step, start.unit).value
+        self._size = int(size)
+        self._unit = start.unit
+
+    # -- properties -----------------------------
+
+    @property
+    def start(self):
+        """The first value of this index
+
+        :type: `~astropy.units.Quantity` scalar
+        """
+        return Quantity(self._start, self._unit)
+
+    @property
+    def step(self):
+        """The separation between values of this index
+
+        :type: `~astropy.units.Quantity` scalar
+        """
+        return Quantity(self._step, self._unit)
+
+    @property
+    def unit(self):
+        """The unit of this index
+
+        :type: `~astropy.units.UnitBase`
+        """
+        return self._unit
+
+    @property
+    def size(self):
+        """The number of values in this index
+        """
+        return self._size
+
+    @property
+    def shape(self):
+        return (self._size,)
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def dtype(self):
+        return numpy.result_type(self._start, self._step, numpy.int_)
+
+    @property
+    def regular(self):
+        """`True`, this index is always regular
+        """
+        return True
+
+    def is_regular(self):
+        """Returns `True`, this index is always regular
+        """
+        return True
+
+    @property
+    def value(self):
+        """The values of this index (without units)
+
+        The array is built each time this property is accessed.
+
+        :type: `numpy.ndarray`
+        """
+        return self._values(numpy.arange(self._size))
+
+    def _values(self, idx):
+        # all values are calculated this way, so that they always match
+        return self._start + idx * self._step
+
+    def materialize(self):
+        """Build the `Index` array of values
+
+        Returns
+        -------
+        index : `Index`
+            the array of values represented by this `RegularIndex`
+        """
+        return Index(self.value, unit=self._unit, copy=False)
+
+    def __reduce__(self):
+        # don't pickle (or copy) the owner
+        return type(self), (self.start, self.step, self._size)
+
+    def copy(self):
+        """Return a copy of this `RegularIndex`
+        """
+        return type(self)(self.start, self.step, self._size)
+
+    def to(self, unit, equivalencies=[]):
+        """Return this index in different units
+
+        See `astropy.units.Quantity.to` for details, the result is a
+        `RegularIndex` unless ``equivalencies`` are given, in which case it
+        is an `Index`.
+        """
+        if equivalencies:  # might not be linear
+            return self.materialize().to(unit, equivalencies=equivalencies)
+        return type(self)(self.start.to(unit), self.step.to(unit),
+                          self._size)
+
+    # -- array methods --------------------------
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.value
+        return self.value.astype(dtype, copy=False)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # use the operators below (e.g. for `Quantity` + `RegularIndex`)
+        if (method == '__call__' and not kwargs and len(inputs) == 2 and
+                ufunc in _OPERATORS):
+            if inputs[0] is self:
+                return getattr(self, _OPERATORS[ufunc][0])(inputs[1])
+            if inputs[1] is self:
+                return getattr(self, _OPERATORS[ufunc][1])(inputs[0])
+        inputs = [x.materialize() if isinstance(x, RegularIndex) else x for
+                  x in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        # other numpy functions (e.g. numpy.diff) use the Index array,
+        # so that the result keeps the unit
+        return func(*_materialize(args), **_materialize(kwargs))
+
+    def __getitem__(self, item):
+        if isinstance(item, Integral):
+            if item < 0:
+                item += self._size
+            if not 0 <= item < self._size:
+                raise IndexError("index %d is out of bounds for axis 0 with "
+                                 "size %d" % (item, self._size))
+            return Quantity(self._values(item), self._unit)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._size)
+            return type(self)(Quantity(self._values(start), self._unit),
+                              self.step * step,
+                              len(range(start, stop, step)))
+        key = numpy.asarray(item)
+        if key.dtype == bool and key.shape == self.shape:
+            key = numpy.flatnonzero(key)
+        elif key.dtype.kind in 'iu' and key.ndim == 1:
+            if ((key < -self._size) | (key >= self._size)).any():
+                raise IndexError("index out of bounds for axis 0 with "
+                                 "size %d" % self._size)
+            key = numpy.where(key < 0, key + self._size, key)
+        else:
+            return self.materialize()[item]
+        return Index(self._values(key), unit=self._unit, copy=False)
+
+    def __setitem__(self, item, value):
+        try:
+            ref, attr = self._owner
+        except TypeError:
+            owner = None
+        else:
+            owner = ref()
+        # only the current index of an array can be modified
+        if owner is None or getattr(owner, attr) is not self:
+            raise TypeError("%r object does not support item assignment, "
+                            "use materialize() to get an array that does"
+                            % type(self).__name__)
+        index = self.materialize()
+        index[item] = value
+        setattr(owner, attr, index)
+
+    def min(self, axis=None, out=None):
+        if not self._size or axis not in (None, 0) or out is not None:
+            return self.materialize().min(axis=axis, out=out)
+        return self[0] if self._step >= 0 else self[-1]
+
+    def max(self, axis=None, out=None):
+        if not self._size or axis not in (None, 0) or out is not None:
+            return self.materialize().max(axis=axis, out=out)
+        return self[-1] if self._step >= 0 else self[0]
+
+    def searchsorted(self, v, side='left', sorter=None):
+        """Find the indices at which to insert ``v`` to maintain order
+
+        See `numpy.searchsorted` for details, this method finds the indices
+        without building the array of values.
+        """
+        if isinstance(v, Quantity):
+            v = v.to(self._unit).value
+        v = numpy.asarray(v, dtype=float)
+        if sorter is not None or self._step <= 0 or numpy.isnan(v).any():
+            return self.materialize().value.searchsorted(v, side=side,
+                                                         sorter=sorter)
+        if side == 'left':
+            before = numpy.less
+        elif side == 'right':
+            before = numpy.less_equal
+        else:
+            raise ValueError("side must be 'left' or 'right' (got %r)"
+                             % side)
+        # estimate the position, then correct for rounding by comparing
+        # with the values either side
+        idx = numpy.clip(numpy.ceil((v - self._start) / self._step),
+                         0, self._size).astype(int)
+        while True:
+            down = (idx > 0) & ~before(self._values(idx - 1), v)
+            up = (idx < self._size) & before(self._values(idx), v)
+            if not (down.any() or up.any()):
+                return idx[()]
+            idx += up.astype(int) - down.astype(int)
+
+    def __getattr__(self, attr):
+        # anything else is evaluated on a temporary Index
+        if attr.startswith('_'):
+            raise AttributeError("%r object has no attribute %r"
+                                 % (type(self).__name__, attr))
+        return getattr(self.materialize(), attr)
+
+    # -- arithmetic -----------------------------
+    # operations with a scalar return a new RegularIndex, anything else
+    # acts on the materialized Index
+
+    @staticmethod
+    def _is_scalar(other):
+        return (not isinstance(other, RegularIndex) and
+                numpy.ndim(other) == 0)
+
+    def __add__(self, other):
+        if self._is_scalar(other):
+            return type(self)(self.start + other, self.step, self._size)
+        return self.materialize() + other
+
+    def __radd__(self, other):
+        if self._is_scalar(other):
+            return type(self)(other + self.start, self.step, self._size)
+        return other + self.materialize()
+
+    def __sub__(self, other):
+        if self._is_scalar(other):
+            return type(self)(self.start - other, self.step, self._size)
+        return self.materialize() - other
+
+    def __rsub__(self, other):
+        if self._is_scalar(other):
+            return type(self)(other - self.start, -self.step, self._size)
+        return other - self.materialize()
+
+    def __mul__(self, other):
+        if self._is_scalar(other):
+            return type(self)(self.start * other, self.step * other,
+                              self._size)
+        return self.materialize() * other
+
+    def __rmul__(self, other):
+        if self._is_scalar(other):
+            return type(self)(other * self.start, other * self.step,
+                              self._size)
+        return other * self.materialize()
+
+    def __truediv__(self, other):
+        if self._is_scalar(other):
+            return type(self)(self.start / other, self.step / other,
+                              self._size)
+        return self.materialize() / other
+
+    __div__ = __truediv__
+
+    def __rtruediv__(self, other):
+        return other / self.materialize()
+
+    __rdiv__ = __rtruediv__
+
+    def __neg__(self):
+        return type(self)(-self.start, -self.step, self._size)
+
+    # -- comparisons ----------------------------
+    # these are element-wise, as for a Quantity array
+
+    def __eq__(self, other):
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return self.materialize() != other
+
+    def __lt__(self, other):
+        return self.materialize() < other
+
+    def __le__(self, other):
+        return self.materialize() <= other
+
+    def __gt__(self, other):
+        return self.materialize() > other
+
+    def __ge__(self, other):
+        return self.materialize() >= other
+
+    __hash__ = None
+
+    # -- display --------------------------------
+
+    def __repr__(self):
+        return '<{0}(start={1}, step={2}, size={3})>'.format(
+            type(self).__name__, self.start, self.step, self._size)
+
+    def __str__(self):
+        opts = numpy.get_printoptions()
+        if self._size <= opts['threshold']:
+            return str(self.materialize())
+        # summarise, as numpy would, without building the full array
+        edge = opts['edgeitems']
+        head = str(self[:edge].value).rstrip(']')
+        tail = str(self[-edge:].value).lstrip('[')
+        return '{0} ..., {1} {2}'.format(head, tail, self._unit).rstrip()
@@ -19,6 +19,7 @@
 """The `Series` is a one-dimensional array with metadata
 """
 
+import weakref
 from numbers import Number
 from warnings import warn
 from math import floor
@@ -29,7 +30,7 @@ from astropy.units import (Unit, Quantity, dimensionless_unscaled)
 from astropy.io import registry as io_registry
 
 from .array import Array
-from .index import Index
+from .index import (Index, RegularIndex)
 
 __author__ = "Duncan Macleod <duncan.macleod@ligo.org>"
 
@@ -131,11 +132,14 @@ class Series(Array):
                 warn("xindex was given to %s(), x0 will be ignored"
                      % cls.__name__)
             # get unit
-            if xunit is None and isinstance(xindex, Quantity):
+            if xunit is None and isinstance(xindex, (Quantity, RegularIndex)):
                 xunit = xindex.unit
             elif xunit is None:
                 xunit = cls._default_xunit
-            new.xindex = Quantity(xindex, unit=xunit)
+            if isinstance(xindex, RegularIndex):
+                new.xindex = xindex.to(xunit)
+            else:
+                new.xindex = Quantity(xindex, unit=xunit)
         # or from x0 and dx
         else:
             if xunit is None and isinstance(dx, Quantity):
@@ -252,21 +256,27 @@ class Series(Array):
     def xindex(self):
         """Positions of the data on the x-axis
 
-        :type: `~astropy.units.Quantity` array
+        Unless an index has been given, this is a `RegularIndex`
+        calculated from `x0` and `dx`, which does not store the array of
+        positions.
+
+        :type: `~astropy.units.Quantity` array, or `RegularIndex`
         """
         try:
             return self._xindex
         except AttributeError:
-            # create regular index on-the-fly
-            self._xindex = Index(
-                self.x0 + (numpy.arange(self.shape[0]) * self.dx), copy=False)
-            return self._xindex
+            return self._regular_index('x', self.x0, self.dx, self.shape[0])
 
     @xindex.setter
     def xindex(self, index):
         if index is None:
             del self.xindex
             return
+        if isinstance(index, RegularIndex):
+            self.x0 = index.start
+            self.dx = index.step
+            del self.xindex
+            return
         if not isinstance(index, Index):
             try:
                 unit = index.unit
@@ -287,6 +297,29 @@ class Series(Array):
         except AttributeError:
             pass
 
+    def _regular_index(self, axis, start, step, size):
+        """Return the `RegularIndex` for an axis of this array
+
+        The same object is returned until any of ``start``, ``step``, or
+        ``size`` change. Assigning to an item of the index stores the
+        modified `Index` array as the index of this array.
+        """
+        key = (start.value, start.unit, step.value, step.unit, size)
+        attr = '_regular_%sindex' % axis
+        try:
+            cached, index = getattr(self, attr)
+        except AttributeError:
+            pass
+        else:
+            # (a copy of this array might have a copy of the cache)
+            if (cached == key and index._owner is not None and
+                    index._owner[0]() is self):
+                return index
+        index = RegularIndex(start, step, size)
+        index._owner = (weakref.ref(self), '%sindex' % axis)
+        setattr(self, attr, (key, index))
+        return index
+
     # xunit
     @property
     def xunit(self):
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2017)
+#
+# This file is part of GWpy.
+#
+# GWpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# GWpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GWpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Utilities for deferring imports until they are needed
+
+Modules that are slow to import (e.g. `scipy.signal`), or that are
+optional (e.g. `h5py`, `nds2`), should not be imported when a GWpy
+sub-package is imported, only when they are first used.
+"""
+
+import importlib
+
+try:
+    from importlib.util import find_spec
+except ImportError:  # python < 3.4
+    from pkgutil import find_loader as find_spec
+
+__author__ = 'Duncan Macleod <duncan.macleod@ligo.org>'
+__all__ = ['LazyModule', 'module_available']
+
+
+class LazyModule(object):
+    """A proxy for a module that is imported on first attribute access
+
+    Parameters
+    ----------
+    name : `str`
+        the fully-qualified name of the module to import
+
+    Examples
+    --------
+    >>> from gwpy.utils.lazy import LazyModule
+    >>> signal = LazyModule('scipy.signal')  # nothing imported yet
+    >>> signal.get_window('hann', 4)  # scipy.signal imported here
+    array([ 0.  ,  0.75,  0.75,  0.  ])
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        """Import the module (if needed) and return it
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        """`True` if the proxied module has been imported
+        """
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        # only called for attributes not found on the proxy itself
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return '<LazyModule(%r, loaded=%s)>' % (self._name, self.loaded)
+
+
+def module_available(name):
+    """Returns `True` if a module can be found, without importing it
+
+    Parameters
+    ----------
+    name : `str`
+        the name of the module, for sub-modules (e.g. ``'glue.lal'``)
+        the parent packages are imported
+
+    Notes
+    -----
+    This only checks that the module exists, any errors raised while
+    importing it are not caught until it is used.
+    """
+    try:
+        return find_spec(name) is not None
+    except (ImportError, AttributeError, ValueError):
+        return False